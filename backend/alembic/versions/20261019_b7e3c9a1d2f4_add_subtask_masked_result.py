@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Store a masked projection of subtask results.
+
+Revision ID: b7e3c9a1d2f4
+Revises: f82c5d1a9e37
+Create Date: 2026-10-19 10:00:00.000000
+
+Existing rows start at result_mask_version 0 (no projection) and are masked
+on read until the backfill task stores their projection.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "b7e3c9a1d2f4"
+down_revision: Union[str, Sequence[str], None] = "f82c5d1a9e37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_column(table_name: str, column_name: str) -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return any(
+        column["name"] == column_name for column in inspector.get_columns(table_name)
+    )
+
+
+def _has_index(table_name: str, index_name: str) -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return any(
+        index.get("name") == index_name for index in inspector.get_indexes(table_name)
+    )
+
+
+def upgrade() -> None:
+    # MySQL DDL is non-transactional; skip what an interrupted run already added.
+    if not _has_column("subtasks", "masked_result"):
+        op.add_column(
+            "subtasks",
+            sa.Column(
+                "masked_result",
+                sa.JSON(),
+                nullable=True,
+                comment="Masked projection of result, NULL when nothing is masked",
+            ),
+        )
+    if not _has_column("subtasks", "result_mask_version"):
+        op.add_column(
+            "subtasks",
+            sa.Column(
+                "result_mask_version",
+                sa.Integer(),
+                nullable=False,
+                server_default=sa.text("0"),
+                comment="Masking rules version of masked_result, 0 for none",
+            ),
+        )
+    if not _has_index("subtasks", "ix_subtasks_status_mask_version"):
+        op.create_index(
+            "ix_subtasks_status_mask_version",
+            "subtasks",
+            ["status", "result_mask_version"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_subtasks_status_mask_version", table_name="subtasks")
+    op.drop_column("subtasks", "result_mask_version")
+    op.drop_column("subtasks", "masked_result")
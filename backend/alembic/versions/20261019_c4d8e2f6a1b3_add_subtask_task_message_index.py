@@ -0,0 +1,45 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Index subtasks by task and message id.
+
+Revision ID: c4d8e2f6a1b3
+Revises: b7e3c9a1d2f4
+Create Date: 2026-10-19 14:00:00.000000
+
+Windowed task:join and history:page read the newest messages of a task
+before a cursor; the index lets them stop after the window.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "c4d8e2f6a1b3"
+down_revision: Union[str, Sequence[str], None] = "b7e3c9a1d2f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_index(table_name: str, index_name: str) -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return any(
+        index.get("name") == index_name for index in inspector.get_indexes(table_name)
+    )
+
+
+def upgrade() -> None:
+    if not _has_index("subtasks", "ix_subtasks_task_message"):
+        op.create_index(
+            "ix_subtasks_task_message",
+            "subtasks",
+            ["task_id", "message_id"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_subtasks_task_message", table_name="subtasks")
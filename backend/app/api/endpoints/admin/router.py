@@ -21,6 +21,7 @@ from app.api.endpoints.admin import (
     public_shells,
     public_teams,
     runtime_cleanup,
+    startup_profile,
     stats,
     subscription_monitor,
     system_config,
@@ -56,3 +57,4 @@ router.include_router(device_monitor.router, tags=["admin-device-monitor"])
 router.include_router(templates.router, tags=["admin-templates"])
 router.include_router(runtime_cleanup.router, tags=["admin-runtime-cleanup"])
 router.include_router(plugins.router, tags=["admin-plugins"])
+router.include_router(startup_profile.router, tags=["admin-startup-profile"])
@@ -0,0 +1,21 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Admin endpoint exposing the startup timing profile of this process."""
+
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+
+from app.core.security import get_admin_user
+from app.core.startup_profiler import startup_tracer
+from app.models.user import User
+
+router = APIRouter()
+
+
+@router.get("/startup-profile", response_model=Dict[str, Any])
+async def get_startup_profile(current_user: User = Depends(get_admin_user)):
+    """Return wall time per startup phase and per heavy import (milliseconds)."""
+    return startup_tracer.snapshot()
@@ -49,6 +49,7 @@ from app.services.knowledge.orchestrator import (
     MAX_KNOWLEDGE_LIST_LIMIT,
     knowledge_orchestrator,
 )
+from app.services.web_scraper import ScrapePriority
 from shared.telemetry.decorators import add_span_event, trace_async, trace_sync
 
 router = APIRouter()
@@ -435,6 +436,8 @@ async def create_document_open(
                 knowledge_base_id=data.knowledge_base_id,
                 name=data.name,
                 folder_id=data.folder_id,
+                # API clients import pages in bulk; keep UI scrapes ahead
+                priority=ScrapePriority.BULK,
             )
         except ValueError as exc:
             _raise_open_knowledge_http_error(exc)
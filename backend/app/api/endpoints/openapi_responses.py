@@ -74,23 +74,19 @@ class _DispatchWithoutTerminalError(RuntimeError):
     """Raised when dispatch fails before any terminal event is emitted."""
 
 
-async def _iter_callback_events(pubsub_obj: Any, cancel_event: Any):
+async def _iter_callback_events(subscription: Any, cancel_event: Any):
     """Yield callback events until the executor sends a terminal event."""
     from shared.models import EventType, ExecutionEvent
 
     while True:
         if cancel_event.is_set():
             return
-        message = await pubsub_obj.get_message(
-            ignore_subscribe_messages=True,
-            timeout=1.0,
-        )
-        if message is None or message.get("type") != "message":
+        # Waits on the subscription's local queue; the timeout only bounds
+        # how long a cancellation can go unnoticed
+        message = await subscription.get(timeout=1.0)
+        if message is None:
             continue
-        data = message["data"]
-        if isinstance(data, bytes):
-            data = data.decode("utf-8")
-        event = ExecutionEvent.from_dict(json.loads(data))
+        event = ExecutionEvent.from_dict(json.loads(message.data))
         yield event
         if event.type in (
             EventType.DONE.value,
@@ -972,8 +968,7 @@ async def _create_streaming_response_unified(
 
         emitter = None
         dispatch_task = None
-        pubsub_redis_client = None
-        pubsub_obj = None
+        callback_subscription = None
 
         try:
             cancel_event = await session_manager.register_stream(assistant_subtask_id)
@@ -1008,14 +1003,14 @@ async def _create_streaming_response_unified(
                     execution_dispatcher.dispatch(execution_request, emitter=emitter)
                 )
             else:
-                # HTTP+Callback mode (ClaudeCode/Agno/Dify): subscribe to Redis
-                # pub/sub channel; the /internal/callback handler publishes events
-                pubsub_redis_client, pubsub_obj = (
+                # HTTP+Callback mode (ClaudeCode/Agno/Dify): subscribe to the
+                # callback channel; the /internal/callback handler publishes events
+                callback_subscription = (
                     await session_manager.subscribe_callback_channel(
                         assistant_subtask_id
                     )
                 )
-                if pubsub_redis_client is None:
+                if callback_subscription is None:
                     raise RuntimeError("Failed to subscribe to callback stream channel")
                 # Fire-and-forget; executor sends events back via /internal/callback
                 asyncio.create_task(
@@ -1028,7 +1023,9 @@ async def _create_streaming_response_unified(
                     async for ev in emitter.stream():
                         yield ev
                 else:
-                    async for ev in _iter_callback_events(pubsub_obj, cancel_event):
+                    async for ev in _iter_callback_events(
+                        callback_subscription, cancel_event
+                    ):
                         yield ev
 
             # Stream events from the unified source
@@ -1295,14 +1292,9 @@ async def _create_streaming_response_unified(
             logger.exception(f"Error in streaming: {e}")
             raise
         finally:
-            if pubsub_obj is not None:
-                try:
-                    await pubsub_obj.unsubscribe()
-                except Exception:
-                    pass
-            if pubsub_redis_client is not None:
+            if callback_subscription is not None:
                 try:
-                    await pubsub_redis_client.aclose()
+                    await callback_subscription.close()
                 except Exception:
                     pass
             await session_manager.unregister_stream(assistant_subtask_id)
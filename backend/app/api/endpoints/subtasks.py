@@ -6,7 +6,7 @@ import json
 from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 from sqlalchemy.orm import Session
 from sse_starlette.sse import EventSourceResponse
 
@@ -287,12 +287,19 @@ async def subscribe_group_stream(
     task_id: int,
     subtask_id: int = Query(..., description="Subtask ID to subscribe to"),
     offset: Optional[int] = Query(0, description="Character offset for resuming"),
+    last_event_id: Optional[str] = Header(
+        None, description="SSE event id to resume after (replays missed updates)"
+    ),
     current_user: User = Depends(security.get_current_user),
     db: Session = Depends(get_db),
 ):
     """
     Subscribe to a group chat stream via SSE.
     Allows group members to receive streaming updates from any member's AI interaction.
+
+    Each update carries an SSE event id. A reconnecting client that sends
+    ``Last-Event-ID`` gets every update recorded after that id replayed
+    instead of the cached-content catch-up by ``offset``.
     """
     # Check if user is authorized
     if not task_access_store.is_member(db, task_id=task_id, user_id=current_user.id):
@@ -309,30 +316,31 @@ async def subscribe_group_stream(
 
     async def event_generator():
         """Generate SSE events for the subscribed stream."""
-        # Get current cached content
-        current_content = await session_manager.get_streaming_content(subtask_id)
-
-        # If offset is provided and we have cached content, send the portion after offset
-        if offset > 0 and current_content:
-            remaining_content = current_content[offset:]
-            if remaining_content:
-                yield {
-                    "event": "message",
-                    "data": json.dumps(
-                        {
-                            "content": remaining_content,
-                            "done": False,
-                            "subtask_id": subtask_id,
-                        }
-                    ),
-                }
+        if not last_event_id:
+            # Get current cached content
+            current_content = await session_manager.get_streaming_content(subtask_id)
+
+            # If offset is provided and we have cached content, send the portion after offset
+            if offset > 0 and current_content:
+                remaining_content = current_content[offset:]
+                if remaining_content:
+                    yield {
+                        "event": "message",
+                        "data": json.dumps(
+                            {
+                                "content": remaining_content,
+                                "done": False,
+                                "subtask_id": subtask_id,
+                            }
+                        ),
+                    }
 
-        # Subscribe to Redis Pub/Sub for real-time updates
-        redis_client, pubsub = await session_manager.subscribe_streaming_channel(
-            subtask_id
+        # Subscribe to real-time updates, replaying missed ones when resuming
+        subscription = await session_manager.subscribe_streaming_channel(
+            subtask_id, after_id=last_event_id or None
         )
 
-        if not redis_client or not pubsub:
+        if subscription is None:
             # Failed to subscribe, send error and close
             yield {
                 "event": "error",
@@ -341,52 +349,44 @@ async def subscribe_group_stream(
             return
 
         try:
-            # Listen for messages from Redis Pub/Sub
             while True:
-                message = await pubsub.get_message(
-                    ignore_subscribe_messages=True, timeout=30.0
-                )
-
-                if message and message["type"] == "message":
-                    chunk_data = message["data"]
-
-                    # Check if it's a done signal (JSON encoded)
-                    if isinstance(chunk_data, bytes):
-                        chunk_data = chunk_data.decode("utf-8")
-
-                    try:
-                        # Try to parse as JSON (done signal)
-                        parsed = json.loads(chunk_data)
-                        if parsed.get("__type__") == "STREAM_DONE":
-                            # Send done event
-                            yield {
-                                "event": "message",
-                                "data": json.dumps(
-                                    {
-                                        "content": "",
-                                        "done": True,
-                                        "result": parsed.get("result"),
-                                        "subtask_id": subtask_id,
-                                    }
-                                ),
-                            }
-                            break
-                    except json.JSONDecodeError:
-                        # Regular text chunk
+                message = await subscription.get()
+                chunk_data = message.data
+                sse_id = {"id": message.id} if message.id else {}
+
+                try:
+                    # Try to parse as JSON (done signal)
+                    parsed = json.loads(chunk_data)
+                    if parsed.get("__type__") == "STREAM_DONE":
+                        # Send done event
                         yield {
                             "event": "message",
+                            **sse_id,
                             "data": json.dumps(
                                 {
-                                    "content": chunk_data,
-                                    "done": False,
+                                    "content": "",
+                                    "done": True,
+                                    "result": parsed.get("result"),
                                     "subtask_id": subtask_id,
                                 }
                             ),
                         }
+                        break
+                except json.JSONDecodeError:
+                    # Regular text chunk
+                    yield {
+                        "event": "message",
+                        **sse_id,
+                        "data": json.dumps(
+                            {
+                                "content": chunk_data,
+                                "done": False,
+                                "subtask_id": subtask_id,
+                            }
+                        ),
+                    }
 
         finally:
-            # Clean up Redis connections
-            await pubsub.unsubscribe()
-            await redis_client.aclose()
+            await subscription.close()
 
     return EventSourceResponse(event_generator())
@@ -66,6 +66,9 @@ class WebDocumentRefreshResponse(BaseModel):
     )
     error_code: Optional[str] = Field(None, description="Error code if failed")
     error_message: Optional[str] = Field(None, description="Error message if failed")
+    unchanged: bool = Field(
+        False, description="Whether the page was unchanged and not re-indexed"
+    )
 
 
 @router.post("/scrape", response_model=WebScrapeResponse)
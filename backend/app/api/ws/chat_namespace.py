@@ -40,6 +40,8 @@ from app.api.ws.events import (
     ClientEvents,
     GenerateParams,
     GenericAck,
+    HistoryExpandPayload,
+    HistoryPagePayload,
     HistorySyncAck,
     HistorySyncPayload,
     ServerEvents,
@@ -47,6 +49,7 @@ from app.api.ws.events import (
     TaskJoinPayload,
     TaskLeavePayload,
 )
+from app.core.config import settings
 from app.core.constants import (
     CLIENT_ORIGIN_WEWORK,
     get_wework_task_room,
@@ -65,6 +68,7 @@ from app.services.chat.access import (
     get_token_expiry,
     verify_jwt_token,
 )
+from app.services.chat.access.decision_cache import TaskAccessDecisionCache
 from app.services.chat.config import get_team_first_bot_shell_type
 from app.services.chat.guidance_queue import guidance_queue
 from app.services.chat.operations import (
@@ -85,6 +89,7 @@ from app.services.chat.trigger import (
     trigger_ai_response_unified,
 )
 from app.services.chat.wework_task_defaults import apply_wework_task_defaults
+from app.services.subtask_result_masking import masked_subtask_result
 from app.services.task_fork_history import task_fork_history_resolver
 from app.utils.prompt_utils import extract_display_prompt
 from shared.telemetry.context import (
@@ -206,6 +211,7 @@ class ChatNamespace(socketio.AsyncNamespace):
         super().__init__(namespace)
         self._active_streams: Dict[int, asyncio.Task] = {}  # subtask_id -> stream task
         self._stream_versions: Dict[int, str] = {}  # subtask_id -> "v1" | "v2"
+        self._access_cache = TaskAccessDecisionCache()
 
         # Map colon-separated event names to handler methods
         self._event_handlers: Dict[str, str] = {
@@ -218,9 +224,17 @@ class ChatNamespace(socketio.AsyncNamespace):
             "task:leave": "on_task_leave",
             "task:close-session": "on_task_close_session",
             "history:sync": "on_history_sync",
+            "history:page": "on_history_page",
+            "history:expand": "on_history_expand",
             "skill:response": "on_skill_response",
         }
 
+    async def _can_access_task(self, sid: str, user_id: int, task_id: int) -> bool:
+        """Check task access, reusing recent positive decisions for the socket."""
+        return await self._access_cache.can_access(
+            sid, user_id, task_id, can_access_task
+        )
+
     async def _check_token_expiry(self, sid: str) -> bool:
         """
         Check if session token is expired.
@@ -280,7 +294,7 @@ class ChatNamespace(socketio.AsyncNamespace):
             return ChatGuideAck(error="Not authenticated").model_dump()
 
         payload = data
-        if not await can_access_task(user_id, payload.task_id):
+        if not await self._can_access_task(sid, user_id, payload.task_id):
             return ChatGuideAck(error="Task not found or access denied").model_dump()
 
         db = SessionLocal()
@@ -475,6 +489,7 @@ class ChatNamespace(socketio.AsyncNamespace):
         Args:
             sid: Socket ID
         """
+        self._access_cache.forget_socket(sid)
         try:
             session = await self.get_session(sid)
             user_id = session.get("user_id", "unknown")
@@ -504,14 +519,17 @@ class ChatNamespace(socketio.AsyncNamespace):
 
         Supports incremental sync via after_message_id parameter:
         - If after_message_id is provided, only returns messages after that ID (for reconnect)
-        - If after_message_id is None, returns all messages (for initial join)
+        - If window is provided instead, returns the latest N messages with large
+          results trimmed, plus a history_cursor for history:page
+        - Otherwise, returns all messages (for initial join)
 
         Args:
             sid: Socket ID
-            data: {"task_id": int, "after_message_id": int?}
+            data: {"task_id": int, "after_message_id": int?, "window": int?}
 
         Returns:
-            {"streaming": {...}, "subtasks": [...]} or {"error": "..."}
+            {"streaming": {...}, "subtasks": [...], "history_cursor": int?}
+            or {"error": "..."}
         """
         payload = data  # Already validated by decorator
 
@@ -532,7 +550,7 @@ class ChatNamespace(socketio.AsyncNamespace):
             return {"error": "Not authenticated"}
 
         # Check permission
-        if not await can_access_task(user_id, payload.task_id):
+        if not await self._can_access_task(sid, user_id, payload.task_id):
             logger.warning(
                 f"[WS] task:join error: Access denied, user={user_id}, task={payload.task_id}"
             )
@@ -553,25 +571,43 @@ class ChatNamespace(socketio.AsyncNamespace):
 
         # Get subtasks for immediate message sync
         # If after_message_id is provided, only fetch messages after that ID (incremental sync)
+        # If window is provided, fetch the latest messages (windowed join)
         # Otherwise, fetch all messages (initial join)
         subtasks_dict = None
+        history_cursor = None
         try:
-            subtasks_dict = await run_sync_in_executor(
-                _fetch_subtasks_for_task_join,
-                payload.task_id,
-                user_id,
-                payload.after_message_id,
-            )
-            if payload.after_message_id is not None:
+            if payload.after_message_id is None and payload.window is not None:
+                window = await run_sync_in_executor(
+                    _fetch_subtask_window,
+                    payload.task_id,
+                    user_id,
+                    payload.window,
+                    None,
+                )
+                subtasks_dict = window["subtasks"]
+                history_cursor = window["history_cursor"]
                 logger.info(
-                    f"[WS] task:join incremental sync: fetched {len(subtasks_dict) if subtasks_dict else 0} new messages "
-                    f"after message_id={payload.after_message_id} for task_id={payload.task_id}"
+                    f"[WS] task:join windowed sync: fetched {len(subtasks_dict)} "
+                    f"subtasks for task_id={payload.task_id}, "
+                    f"history_cursor={history_cursor}"
                 )
             else:
-                logger.info(
-                    f"[WS] task:join full sync: fetched {len(subtasks_dict) if subtasks_dict else 0} "
-                    f"subtasks for task_id={payload.task_id}"
+                subtasks_dict = await run_sync_in_executor(
+                    _fetch_subtasks_for_task_join,
+                    payload.task_id,
+                    user_id,
+                    payload.after_message_id,
                 )
+                if payload.after_message_id is not None:
+                    logger.info(
+                        f"[WS] task:join incremental sync: fetched {len(subtasks_dict) if subtasks_dict else 0} new messages "
+                        f"after message_id={payload.after_message_id} for task_id={payload.task_id}"
+                    )
+                else:
+                    logger.info(
+                        f"[WS] task:join full sync: fetched {len(subtasks_dict) if subtasks_dict else 0} "
+                        f"subtasks for task_id={payload.task_id}"
+                    )
         except Exception as e:
             logger.exception(f"[WS] task:join error fetching subtasks: {e}")
 
@@ -617,12 +653,17 @@ class ChatNamespace(socketio.AsyncNamespace):
                 },
                 "status_updated": cached_context_metrics,
                 "subtasks": subtasks_dict,
+                "history_cursor": history_cursor,
             }
 
         logger.info(
             f"[WS] task:join no active streaming found for task_id={payload.task_id}"
         )
-        return {"streaming": None, "subtasks": subtasks_dict}
+        return {
+            "streaming": None,
+            "subtasks": subtasks_dict,
+            "history_cursor": history_cursor,
+        }
 
     @auto_task_context(TaskLeavePayload)
     async def on_task_leave(self, sid: str, data: dict) -> dict:
@@ -1496,7 +1537,7 @@ class ChatNamespace(socketio.AsyncNamespace):
             return {"error": "Not authenticated"}
 
         # Check permission: verify user has access to the task
-        if not await can_access_task(user_id, payload.task_id):
+        if not await self._can_access_task(sid, user_id, payload.task_id):
             logger.error(
                 f"[WS] chat:retry error: Access denied for user={user_id} task={payload.task_id}"
             )
@@ -1581,7 +1622,7 @@ class ChatNamespace(socketio.AsyncNamespace):
             return {"error": "Not authenticated"}
 
         # Verify access
-        if not await can_access_task(user_id, payload.task_id):
+        if not await self._can_access_task(sid, user_id, payload.task_id):
             return {"error": "Access denied"}
 
         owns_subtask = await run_sync_in_executor(
@@ -1649,7 +1690,7 @@ class ChatNamespace(socketio.AsyncNamespace):
             return {"error": "Not authenticated"}
 
         # Verify access
-        if not await can_access_task(user_id, payload.task_id):
+        if not await self._can_access_task(sid, user_id, payload.task_id):
             return {"error": "Access denied"}
 
         # Fetch messages - run in executor to avoid blocking
@@ -1659,6 +1700,75 @@ class ChatNamespace(socketio.AsyncNamespace):
 
         return {"messages": messages}
 
+    @auto_task_context(HistoryPagePayload)
+    async def on_history_page(self, sid: str, data: dict) -> dict:
+        """
+        Handle history:page event.
+
+        Pages backwards from the history_cursor of a windowed task:join or a
+        previous history:page. Large results are trimmed as in the join.
+
+        Args:
+            sid: Socket ID
+            data: {"task_id": int, "before_message_id": int, "limit": int?}
+
+        Returns:
+            {"subtasks": [...], "history_cursor": int?} or {"error": "..."}
+        """
+        payload = data  # Already validated by decorator
+
+        session = await self.get_session(sid)
+        user_id = session.get("user_id")
+
+        if not user_id:
+            return {"error": "Not authenticated"}
+
+        # Verify access
+        if not await self._can_access_task(sid, user_id, payload.task_id):
+            return {"error": "Access denied"}
+
+        return await run_sync_in_executor(
+            _fetch_subtask_window,
+            payload.task_id,
+            user_id,
+            payload.limit or settings.TASK_JOIN_WINDOW_MAX_MESSAGES,
+            payload.before_message_id,
+        )
+
+    @auto_task_context(HistoryExpandPayload)
+    async def on_history_expand(self, sid: str, data: dict) -> dict:
+        """
+        Handle history:expand event.
+
+        Returns the full result of a subtask trimmed by a windowed task:join
+        or history:page, including subtasks inherited from a forked task.
+
+        Args:
+            sid: Socket ID
+            data: {"task_id": int, "subtask_id": int}
+
+        Returns:
+            {"subtask": {...}} or {"error": "..."}
+        """
+        payload = data  # Already validated by decorator
+
+        session = await self.get_session(sid)
+        user_id = session.get("user_id")
+
+        if not user_id:
+            return {"error": "Not authenticated"}
+
+        # Verify access
+        if not await self._can_access_task(sid, user_id, payload.task_id):
+            return {"error": "Access denied"}
+
+        subtask = await run_sync_in_executor(
+            _fetch_expanded_subtask, payload.task_id, user_id, payload.subtask_id
+        )
+        if subtask is None:
+            return {"error": "Subtask not found"}
+        return {"subtask": subtask}
+
     # ============================================================
     # Generic Skill Events
     # ============================================================
@@ -1977,44 +2087,9 @@ def _fetch_subtasks_for_task_join(
             subtasks = [item.subtask for item in items]
 
             # Convert to dict format matching task detail API
-            subtasks_dict = []
-            for st in subtasks:
-                # Get contexts for this subtask
-                contexts_briefs = context_service.get_briefs_by_subtask(db, st.id)
-                contexts_list = [ctx.model_dump(mode="json") for ctx in contexts_briefs]
-
-                subtask_dict = {
-                    "id": st.id,
-                    "message_id": st.message_id,
-                    "role": st.role.value,
-                    "prompt": extract_display_prompt(st.prompt),
-                    "result": st.result,
-                    "status": st.status.value,
-                    "progress": st.progress,
-                    "created_at": (
-                        st.created_at.isoformat() if st.created_at else None
-                    ),
-                    "updated_at": (
-                        st.updated_at.isoformat() if st.updated_at else None
-                    ),
-                    "completed_at": (
-                        st.completed_at.isoformat() if st.completed_at else None
-                    ),
-                    "contexts": contexts_list,
-                    "sender": None,
-                }
-
-                # Add sender info for user messages
-                if st.role == SubtaskRole.USER and st.user_id:
-                    user = db.query(User).filter(User.id == st.user_id).first()
-                    if user:
-                        subtask_dict["sender"] = {
-                            "user_id": user.id,
-                            "user_name": user.user_name,
-                            "avatar": user.avatar,
-                        }
-
-                subtasks_dict.append(subtask_dict)
+            subtasks_dict = [
+                _subtask_to_join_dict(db, st, context_service) for st in subtasks
+            ]
 
             return subtasks_dict
         else:
@@ -2027,6 +2102,185 @@ def _fetch_subtasks_for_task_join(
             return task_detail.get("subtasks")
 
 
+def _trim_result(value: Any, max_chars: int) -> tuple[Any, bool]:
+    """Cut strings in a result to max_chars; also return whether any was cut."""
+    if isinstance(value, str):
+        if len(value) > max_chars:
+            return value[:max_chars], True
+        return value, False
+    if isinstance(value, dict):
+        trimmed_dict = {}
+        truncated = False
+        for key, item in value.items():
+            trimmed_dict[key], item_truncated = _trim_result(item, max_chars)
+            truncated = truncated or item_truncated
+        return trimmed_dict, truncated
+    if isinstance(value, list):
+        trimmed_list = []
+        truncated = False
+        for item in value:
+            trimmed_item, item_truncated = _trim_result(item, max_chars)
+            trimmed_list.append(trimmed_item)
+            truncated = truncated or item_truncated
+        return trimmed_list, truncated
+    return value, False
+
+
+def _subtask_to_join_dict(
+    db: Session,
+    st: Subtask,
+    context_service: Any,
+    result_preview_chars: Optional[int] = None,
+) -> dict:
+    """
+    Convert a subtask to the task detail dict format used by task:join.
+
+    When result_preview_chars is given, long strings in the result are trimmed
+    and the dict carries result_truncated so the client can request
+    history:expand.
+    """
+    # Get contexts for this subtask
+    contexts_briefs = context_service.get_briefs_by_subtask(db, st.id)
+    contexts_list = [ctx.model_dump(mode="json") for ctx in contexts_briefs]
+
+    result = masked_subtask_result(st)
+    subtask_dict = {
+        "id": st.id,
+        "message_id": st.message_id,
+        "role": st.role.value,
+        "prompt": extract_display_prompt(st.prompt),
+        "result": result,
+        "status": st.status.value,
+        "progress": st.progress,
+        "created_at": (st.created_at.isoformat() if st.created_at else None),
+        "updated_at": (st.updated_at.isoformat() if st.updated_at else None),
+        "completed_at": (st.completed_at.isoformat() if st.completed_at else None),
+        "contexts": contexts_list,
+        "sender": None,
+    }
+    if result_preview_chars:
+        subtask_dict["result"], subtask_dict["result_truncated"] = _trim_result(
+            result, result_preview_chars
+        )
+
+    # Add sender info for user messages
+    if st.role == SubtaskRole.USER and st.user_id:
+        user = db.query(User).filter(User.id == st.user_id).first()
+        if user:
+            subtask_dict["sender"] = {
+                "user_id": user.id,
+                "user_name": user.user_name,
+                "avatar": user.avatar,
+            }
+
+    return subtask_dict
+
+
+def _fetch_subtask_window(
+    task_id: int,
+    user_id: int,
+    limit: int,
+    before_message_id: Optional[int],
+) -> dict:
+    """
+    Fetch the latest subtasks before a cursor for task:join and history:page.
+
+    The window is capped at TASK_JOIN_WINDOW_MAX_MESSAGES, so the response
+    size does not grow with the length of the task. A message is never split
+    across pages: when the oldest message in the window has several subtasks,
+    all of them are returned even if that exceeds the limit.
+
+    Args:
+        task_id: Task ID
+        user_id: User ID
+        limit: Requested number of messages
+        before_message_id: History cursor (None for the latest messages)
+
+    Returns:
+        {"subtasks": [...], "history_cursor": int?}, where history_cursor is
+        the before_message_id of the next older page, or None when there is
+        no older message
+    """
+    from app.services.context import context_service
+
+    limit = max(1, min(limit, settings.TASK_JOIN_WINDOW_MAX_MESSAGES))
+    with get_db_session() as db:
+        items = task_fork_history_resolver.resolve_for_task(
+            db,
+            task_id=task_id,
+            user_id=user_id,
+            before_message_id=before_message_id,
+            limit=limit,
+        )
+        # The window always ends on a whole message, so the oldest message_id
+        # is a safe cursor. Probe once below it to know if older history exists.
+        has_more = bool(items) and bool(
+            task_fork_history_resolver.resolve_for_task(
+                db,
+                task_id=task_id,
+                user_id=user_id,
+                before_message_id=items[0].subtask.message_id,
+                limit=1,
+            )
+        )
+        subtasks = [
+            _subtask_to_join_dict(
+                db,
+                item.subtask,
+                context_service,
+                settings.TASK_JOIN_RESULT_PREVIEW_CHARS,
+            )
+            for item in items
+        ]
+        return {
+            "subtasks": subtasks,
+            "history_cursor": (
+                subtasks[0]["message_id"] if has_more and subtasks else None
+            ),
+        }
+
+
+def _fetch_expanded_subtask(
+    task_id: int, user_id: int, subtask_id: int
+) -> Optional[dict]:
+    """
+    Fetch one subtask of a task's history with its full result.
+
+    The subtask must belong to the task or to a task it was forked from, up to
+    the fork point.
+
+    Args:
+        task_id: Task ID the subtask is shown in
+        user_id: User ID
+        subtask_id: Subtask ID
+
+    Returns:
+        Subtask dict, or None if the subtask is not part of the task history
+    """
+    from app.services.context import context_service
+
+    with get_db_session() as db:
+        try:
+            lineage = task_fork_history_resolver.resolve_lineage(
+                db, task_id=task_id, user_id=user_id
+            )
+        except ValueError:
+            return None
+        subtask = task_stores.subtask_store.get_by_id(db, subtask_id=subtask_id)
+        if subtask is None:
+            return None
+        for node in lineage:
+            if node.task.id != subtask.task_id:
+                continue
+            if (
+                node.inherited_cutoff is not None
+                and subtask.message_id > node.inherited_cutoff
+            ):
+                return None
+            return _subtask_to_join_dict(db, subtask, context_service)
+        return None
+
+
 def _get_subtask_for_cancel(subtask_id: int) -> Optional[dict]:
     """
     Get subtask info for chat:cancel event.
@@ -2165,7 +2419,7 @@ def _fetch_history_messages(task_id: int, user_id: int, after_message_id: int) -
                 "content": (
                     extract_display_prompt(st.prompt)
                     if st.role == SubtaskRole.USER
-                    else (st.result.get("value", "") if st.result else "")
+                    else (masked_subtask_result(st) or {}).get("value", "")
                 ),
                 "status": st.status.value,
                 "created_at": st.created_at.isoformat() if st.created_at else None,
@@ -60,6 +60,7 @@ from app.api.ws.wework_runtime_namespace import (
     wework_runtime_user_room,
 )
 from app.core.auth_utils import is_api_key, verify_api_key
+from app.core.config import settings
 from app.core.constants import get_wework_task_room, get_wework_user_room
 from app.core.events import TaskCompletedEvent, get_event_bus
 from app.core.socketio import get_sio
@@ -83,6 +84,10 @@ from app.services.chat.access import get_token_expiry, verify_jwt_token
 from app.services.chat.storage.db import get_db_session, run_sync_in_executor
 from app.services.chat.webpage_ws_chat_emitter import get_extended_emitter
 from app.services.device.capability_sync_service import device_capability_sync_service
+from app.services.device.heartbeat_aggregator import (
+    DeviceHeartbeat,
+    HeartbeatAggregator,
+)
 from app.services.device.terminal_session_service import (
     TerminalSessionRecord,
     terminal_session_service,
@@ -105,6 +110,7 @@ from app.services.plugin_device_installation_service import (
 )
 from app.services.plugin_marketplace_service import plugin_marketplace_service
 from app.services.project_chat.service import project_chat_service
+from app.services.runtime_work_snapshot import runtime_work_snapshot_store
 from app.services.user_runtime_config import (
     UserRuntimeConfigError,
     UserRuntimeConfigSyncError,
@@ -144,6 +150,20 @@ RUNTIME_TASK_NON_REPLY_TERMINAL_STATUSES = {
     "cancelled",
     "canceled",
 }
+# Runtime events that start a turn; the task is patched as running in the
+# runtime work snapshot
+RUNTIME_WORK_STARTED_EVENTS = {"response.created"}
+# Runtime events after which the task's summary (status, timestamps, goal)
+# is re-read from the device
+RUNTIME_WORK_REFRESH_EVENTS = {
+    "response.completed",
+    "response.failed",
+    "response.incomplete",
+    "runtime.task.completed",
+    "runtime.task.failed",
+    "runtime.task.cancelled",
+    "runtime.goal.updated",
+}
 
 
 @contextmanager
@@ -847,6 +867,11 @@ class DeviceNamespace(socketio.AsyncNamespace):
         self._connection_attempts: Dict[str, list[float]] = {}
         self._recent_registrations: Dict[tuple[int, str], tuple[float, str]] = {}
         self._background_tasks: set[asyncio.Task] = set()
+        self._heartbeats = HeartbeatAggregator(
+            interval_ms=settings.DEVICE_HEARTBEAT_FLUSH_INTERVAL_MS,
+            recover=self._recover_heartbeat_device,
+            on_slot_change=self._broadcast_device_slot_update,
+        )
 
     def _is_connection_rate_limited(
         self, key: str, now: Optional[float] = None
@@ -1207,6 +1232,9 @@ class DeviceNamespace(socketio.AsyncNamespace):
             )
 
             if user_id and device_id:
+                # A heartbeat still waiting for the next flush must not revive
+                # the online key once the device is marked offline
+                self._heartbeats.discard(user_id, device_id, sid)
                 online_info = await device_service.get_device_online_info(
                     user_id, device_id
                 )
@@ -1240,6 +1268,7 @@ class DeviceNamespace(socketio.AsyncNamespace):
 
                 # Remove from Redis online status
                 await device_service.set_device_offline(user_id, device_id)
+                await runtime_work_snapshot_store.invalidate(user_id, device_id)
 
                 # Database operation: run in executor to avoid blocking event loop
                 # Returns list of failed subtasks for WebSocket emission
@@ -1413,6 +1442,8 @@ class DeviceNamespace(socketio.AsyncNamespace):
             ),
         )
 
+        self._heartbeats.remember_owner(user_id, payload.device_id, sid)
+
         # Broadcast device online event to user room (via chat namespace)
         await self._broadcast_device_online(
             user_id, payload.device_id, effective_device_name
@@ -1433,6 +1464,19 @@ class DeviceNamespace(socketio.AsyncNamespace):
             ),
             "reconcile active executions after device registration",
         )
+        if (
+            payload.device_type != DeviceType.CLOUD
+            and runtime_work_snapshot_store.enabled
+        ):
+            # Tasks may have changed while the device was away
+            await runtime_work_snapshot_store.invalidate(user_id, payload.device_id)
+            self._schedule_background_task(
+                self._refresh_runtime_work_snapshot(
+                    user_id=int(user_id),
+                    device_id=payload.device_id,
+                ),
+                "refresh runtime work snapshot after device registration",
+            )
 
         logger.info(
             f"[Device WS] Device registered: user={user_id}, device={payload.device_id}"
@@ -1440,6 +1484,17 @@ class DeviceNamespace(socketio.AsyncNamespace):
 
         return {"success": True, "device_id": payload.device_id}
 
+    async def _refresh_runtime_work_snapshot(
+        self,
+        *,
+        user_id: int,
+        device_id: str,
+    ) -> None:
+        """Re-list a registered device's runtime work ahead of the next list call."""
+        from app.services.runtime_work_service import refresh_runtime_work_snapshot
+
+        await refresh_runtime_work_snapshot(user_id=user_id, device_id=device_id)
+
     async def _sync_global_capabilities_to_registered_device(
         self,
         *,
@@ -1582,7 +1637,9 @@ class DeviceNamespace(socketio.AsyncNamespace):
         """
         Handle device:heartbeat event.
 
-        Refreshes the device's online status in Redis and updates MySQL.
+        Validates the heartbeat against the socket session and queues it for
+        the next batched Redis refresh; slot updates are broadcast by the
+        aggregator only when the device's running tasks or capacity change.
 
         Args:
             sid: Socket ID
@@ -1606,20 +1663,28 @@ class DeviceNamespace(socketio.AsyncNamespace):
         if session_device_id != payload.device_id:
             return {"error": "Device ID mismatch"}
 
-        online_info = await device_service.get_device_online_info(
-            user_id, payload.device_id
-        )
-        online_socket_id = online_info.get("socket_id") if online_info else None
-        if online_socket_id and online_socket_id != sid:
-            logger.info(
-                "[Device WS] Ignoring stale heartbeat: user=%s, device=%s, "
-                "sid=%s, current_sid=%s",
-                user_id,
-                payload.device_id,
-                sid,
-                online_socket_id,
+        # Redis is only consulted when this process has not seen the device
+        # yet or believes another socket owns it; the batched refresh
+        # re-checks ownership before writing
+        if self._heartbeats.owner(user_id, payload.device_id) != sid:
+            online_info = await device_service.get_device_online_info(
+                user_id, payload.device_id
             )
-            return {"error": "Stale device connection"}
+            online_socket_id = online_info.get("socket_id") if online_info else None
+            if online_socket_id and online_socket_id != sid:
+                self._heartbeats.remember_owner(
+                    user_id, payload.device_id, online_socket_id
+                )
+                logger.info(
+                    "[Device WS] Ignoring stale heartbeat: user=%s, device=%s, "
+                    "sid=%s, current_sid=%s",
+                    user_id,
+                    payload.device_id,
+                    sid,
+                    online_socket_id,
+                )
+                return {"error": "Stale device connection"}
+            self._heartbeats.remember_owner(user_id, payload.device_id, sid)
 
         registered_runtime_instance_id = session.get("runtime_instance_id")
         if (
@@ -1631,62 +1696,17 @@ class DeviceNamespace(socketio.AsyncNamespace):
         runtime_transfer_host = _normalize_runtime_transfer_host(
             payload.runtime_transfer_host
         ) or session.get("runtime_transfer_host")
-        session["runtime_transfer_host"] = runtime_transfer_host
-        await self.save_session(sid, session)
-
-        # Refresh Redis TTL and update running_task_ids
-        success = await device_service.refresh_device_heartbeat(
-            user_id,
-            payload.device_id,
-            payload.running_task_ids,
-            payload.executor_version,
-            runtime_transfer_host=runtime_transfer_host,
-            runtime_instance_id=payload.runtime_instance_id,
-            runtime_capacity=(
-                payload.runtime_capacity.model_dump()
-                if payload.runtime_capacity is not None
-                else None
-            ),
-            runtime_features=(
-                payload.runtime_features.model_dump(
-                    by_alias=True,
-                    exclude_none=True,
-                )
-                if payload.runtime_features is not None
-                else None
-            ),
-        )
+        if session.get("runtime_transfer_host") != runtime_transfer_host:
+            session["runtime_transfer_host"] = runtime_transfer_host
+            await self.save_session(sid, session)
 
-        if not success:
-            # Redis key expired, recreate it to recover from ghost-offline state
-            device_name = session.get("device_name", f"device-{payload.device_id[:8]}")
-            logger.warning(
-                f"[Device WS] Heartbeat recovery: recreating Redis key for "
-                f"user={user_id}, device={payload.device_id}"
-            )
-            await device_service.set_device_online(
+        await self._heartbeats.submit(
+            DeviceHeartbeat(
                 user_id=user_id,
                 device_id=payload.device_id,
                 socket_id=sid,
-                name=device_name,
+                running_task_ids=payload.running_task_ids,
                 executor_version=payload.executor_version,
-                client_ip=session.get("client_ip"),
-                runtime_transfer_host=runtime_transfer_host,
-                runtime_instance_id=payload.runtime_instance_id,
-                runtime_features=(
-                    payload.runtime_features.model_dump(
-                        by_alias=True,
-                        exclude_none=True,
-                    )
-                    if payload.runtime_features is not None
-                    else None
-                ),
-            )
-            await device_service.refresh_device_heartbeat(
-                user_id,
-                payload.device_id,
-                payload.running_task_ids,
-                payload.executor_version,
                 runtime_transfer_host=runtime_transfer_host,
                 runtime_instance_id=payload.runtime_instance_id,
                 runtime_capacity=(
@@ -1702,9 +1722,12 @@ class DeviceNamespace(socketio.AsyncNamespace):
                     if payload.runtime_features is not None
                     else None
                 ),
+                device_name=session.get(
+                    "device_name", f"device-{payload.device_id[:8]}"
+                ),
+                client_ip=session.get("client_ip"),
             )
-            # Re-broadcast device online event
-            await self._broadcast_device_online(user_id, payload.device_id, device_name)
+        )
 
         if payload.capabilities:
             try:
@@ -1725,9 +1748,6 @@ class DeviceNamespace(socketio.AsyncNamespace):
         # Database operation: quick in, quick out
         _update_device_heartbeat(user_id, payload.device_id)
 
-        # Broadcast slot update to user
-        await self._broadcast_device_slot_update(user_id, payload.device_id)
-
         logger.debug(
             f"[Device WS] Heartbeat received: user={user_id}, device={payload.device_id}, "
             f"running_tasks={len(payload.running_task_ids)}"
@@ -1735,6 +1755,38 @@ class DeviceNamespace(socketio.AsyncNamespace):
 
         return {"success": True}
 
+    async def _recover_heartbeat_device(self, heartbeat: DeviceHeartbeat) -> None:
+        """Recreate an expired online key from a heartbeat (ghost-offline)."""
+        logger.warning(
+            f"[Device WS] Heartbeat recovery: recreating Redis key for "
+            f"user={heartbeat.user_id}, device={heartbeat.device_id}"
+        )
+        await device_service.set_device_online(
+            user_id=heartbeat.user_id,
+            device_id=heartbeat.device_id,
+            socket_id=heartbeat.socket_id,
+            name=heartbeat.device_name,
+            executor_version=heartbeat.executor_version,
+            client_ip=heartbeat.client_ip,
+            runtime_transfer_host=heartbeat.runtime_transfer_host,
+            runtime_instance_id=heartbeat.runtime_instance_id,
+            runtime_features=heartbeat.runtime_features,
+        )
+        await device_service.refresh_device_heartbeat(
+            heartbeat.user_id,
+            heartbeat.device_id,
+            heartbeat.running_task_ids,
+            heartbeat.executor_version,
+            runtime_transfer_host=heartbeat.runtime_transfer_host,
+            runtime_instance_id=heartbeat.runtime_instance_id,
+            runtime_capacity=heartbeat.runtime_capacity,
+            runtime_features=heartbeat.runtime_features,
+        )
+        # Re-broadcast device online event
+        await self._broadcast_device_online(
+            heartbeat.user_id, heartbeat.device_id, heartbeat.device_name
+        )
+
     async def on_device_status(self, sid: str, data: dict) -> dict:
         """
         Handle device:status event.
@@ -2099,6 +2151,13 @@ class DeviceNamespace(socketio.AsyncNamespace):
             address["workspacePath"] = workspace_path
 
         status = str(data.get("status") or "updated")
+        await self._record_runtime_work_task_update(
+            user_id=user_id,
+            device_id=device_id,
+            local_task_id=local_task_id,
+            status=status,
+            title=data.get("title"),
+        )
         if not _is_runtime_task_terminal_status(status):
             logger.info(
                 "[RuntimeTaskNotification] Skipped non-terminal update: "
@@ -2284,8 +2343,58 @@ class DeviceNamespace(socketio.AsyncNamespace):
             device_id=device_id,
             payload=payload["payload"],
         )
+        await self._record_runtime_work_event(
+            user_id=user_id,
+            device_id=device_id,
+            event=payload.get("event"),
+            payload=payload["payload"],
+        )
         return {"success": True}
 
+    async def _record_runtime_work_task_update(
+        self,
+        *,
+        user_id: int,
+        device_id: str,
+        local_task_id: str,
+        status: str,
+        title: Any,
+    ) -> None:
+        """Keep the runtime work snapshot current with a watcher task update."""
+
+        if _is_runtime_task_terminal_status(status):
+            await runtime_work_snapshot_store.invalidate(user_id, device_id)
+            return
+        if isinstance(title, str) and title.strip():
+            await runtime_work_snapshot_store.apply_task_patch(
+                user_id, device_id, local_task_id, {"title": title}
+            )
+
+    async def _record_runtime_work_event(
+        self,
+        *,
+        user_id: int,
+        device_id: str,
+        event: Any,
+        payload: dict[str, Any],
+    ) -> None:
+        """Keep the runtime work snapshot current with one runtime event."""
+
+        if event in RUNTIME_WORK_REFRESH_EVENTS:
+            await runtime_work_snapshot_store.invalidate(user_id, device_id)
+            return
+        if event not in RUNTIME_WORK_STARTED_EVENTS:
+            return
+        local_task_id = (
+            payload.get("taskId")
+            or payload.get("localTaskId")
+            or payload.get("task_id")
+        )
+        if local_task_id:
+            await runtime_work_snapshot_store.apply_task_patch(
+                user_id, device_id, str(local_task_id), {"running": True}
+            )
+
     async def _notify_runtime_event(
         self,
         *,
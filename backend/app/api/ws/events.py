@@ -37,6 +37,8 @@ class ClientEvents:
     # History sync
     # History sync
     HISTORY_SYNC = "history:sync"
+    HISTORY_PAGE = "history:page"
+    HISTORY_EXPAND = "history:expand"
 
     # Generic Skill Events
     SKILL_RESPONSE = "skill:response"  # Client -> Server: skill response
@@ -102,6 +104,9 @@ class ServerEvents:
     QUEUE_MESSAGE_PROCESSED = "queue:message_processed"  # Message processed
     QUEUE_REPLY_RECEIVED = "queue:reply_received"  # Received reply from processing
 
+    # Several events coalesced for one room: {"events": [{"event", "data"}, ...]}
+    EVENTS_BATCH = "events:batch"
+
 
 # ============================================================
 # Client -> Server Payloads
@@ -352,6 +357,11 @@ class TaskJoinPayload(BaseModel):
         None,
         description="If provided, only return messages after this message_id (for incremental sync on reconnect)",
     )
+    window: Optional[int] = Field(
+        None,
+        ge=1,
+        description="If provided without after_message_id, only return the latest N messages plus a history cursor",
+    )
 
 
 class TaskLeavePayload(BaseModel):
@@ -367,6 +377,23 @@ class HistorySyncPayload(BaseModel):
     after_message_id: int = Field(..., description="Get messages after this ID")
 
 
+class HistoryPagePayload(BaseModel):
+    """Payload for history:page event."""
+
+    task_id: int = Field(..., description="Task ID")
+    before_message_id: int = Field(
+        ..., description="History cursor: get messages before this ID"
+    )
+    limit: Optional[int] = Field(None, ge=1, description="Maximum messages to return")
+
+
+class HistoryExpandPayload(BaseModel):
+    """Payload for history:expand event."""
+
+    task_id: int = Field(..., description="Task ID the subtask is shown in")
+    subtask_id: int = Field(..., description="Subtask whose full result to return")
+
+
 # ============================================================
 # Server -> Client Payloads
 # ============================================================
@@ -795,6 +822,10 @@ class TaskJoinAck(BaseModel):
     status_updated: Optional[Dict[str, Any]] = Field(
         None, description="Latest cached chat:status_updated snapshot"
     )
+    history_cursor: Optional[int] = Field(
+        None,
+        description="For windowed joins, the before_message_id of the next history:page (None when no older messages)",
+    )
     error: Optional[str] = None
 
 
@@ -805,6 +836,23 @@ class HistorySyncAck(BaseModel):
     error: Optional[str] = None
 
 
+class HistoryPageAck(BaseModel):
+    """ACK response for history:page event."""
+
+    subtasks: List[Dict[str, Any]] = Field(default_factory=list)
+    history_cursor: Optional[int] = Field(
+        None, description="before_message_id of the next page, None when exhausted"
+    )
+    error: Optional[str] = None
+
+
+class HistoryExpandAck(BaseModel):
+    """ACK response for history:expand event."""
+
+    subtask: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
 class GenericAck(BaseModel):
     """Generic ACK response."""
 
@@ -14,6 +14,10 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Waiters re-check the building flag at this interval in case the builder
+# died without publishing the build-done notification
+_BUILD_WAIT_RECHECK_SECONDS = 2.0
+
 
 class RedisCache:
     """Redis-based cache manager for GitHub repositories"""
@@ -42,6 +46,9 @@ class RedisCache:
         # Keep the raw key without hashing, as requested
         return f"git_repos:{user_id}:{git_domain}"
 
+    def _build_channel(self, user_id: int, git_domain: str) -> str:
+        return f"git_repos_built:{user_id}:{git_domain}"
+
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
         try:
@@ -172,6 +179,44 @@ class RedisCache:
             logger.error(f"Error setting cache key {key}: {str(e)}")
             return False
 
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        expire: int | None = settings.REPO_CACHE_EXPIRED_TIME,
+        transaction: bool = False,
+    ) -> Dict[str, bool]:
+        """Set multiple values with the same expiration in one round trip.
+
+        By default the writes are pipelined without a transaction and each
+        key succeeds or fails on its own. With ``transaction=True`` they are
+        applied atomically (MULTI/EXEC), so readers never see a partial write.
+
+        Returns:
+            Dict mapping each key to whether its write succeeded
+        """
+        if not items:
+            return {}
+
+        try:
+            client = await self._get_client()
+            try:
+                async with client.pipeline(transaction=transaction) as pipe:
+                    for key, value in items.items():
+                        if expire is None:
+                            pipe.set(key, orjson.dumps(value))
+                        else:
+                            pipe.set(key, orjson.dumps(value), ex=expire)
+                    results = await pipe.execute(raise_on_error=False)
+            finally:
+                await client.aclose()
+            return {
+                key: not isinstance(ok, Exception) and bool(ok)
+                for key, ok in zip(items, results)
+            }
+        except Exception as e:
+            logger.error(f"Error setting {len(items)} cache keys: {str(e)}")
+            return {key: False for key in items}
+
     async def setnx(
         self, key: str, value: Any, expire: int = settings.REPO_CACHE_EXPIRED_TIME
     ) -> bool:
@@ -188,17 +233,17 @@ class RedisCache:
             logger.error(f"Error setting cache key {key} with SETNX: {str(e)}")
             return False
 
-    async def delete(self, key: str) -> bool:
-        """Delete key from cache"""
+    async def delete(self, *keys: str) -> bool:
+        """Delete one or more keys from cache"""
         try:
             client = await self._get_client()
             try:
-                deleted = await client.delete(key)
+                deleted = await client.delete(*keys)
                 return deleted > 0
             finally:
                 await client.aclose()
         except Exception as e:
-            logger.error(f"Error deleting cache key {key}: {str(e)}")
+            logger.error(f"Error deleting cache keys {keys}: {str(e)}")
             return False
 
     async def cleanup_expired(self):
@@ -238,13 +283,68 @@ class RedisCache:
             if building:
                 return await self.set(build_key, True, expire=300)  # 5 minutes timeout
             else:
-                return await self.delete(build_key)
+                deleted = await self.delete(build_key)
+                await self._publish_build_done(user_id, git_domain)
+                return deleted
         except Exception as e:
             logger.error(
                 f"Error setting building status for user {user_id}, domain {git_domain}: {str(e)}"
             )
             return False
 
+    async def _publish_build_done(self, user_id: int, git_domain: str) -> None:
+        """Wake requests waiting in wait_for_build for this user and domain"""
+        try:
+            client = await self._get_client()
+            try:
+                await client.publish(self._build_channel(user_id, git_domain), b"1")
+            finally:
+                await client.aclose()
+        except Exception as e:
+            logger.error(
+                f"Error publishing build completion for user {user_id}, domain {git_domain}: {str(e)}"
+            )
+
+    async def wait_for_build(
+        self, user_id: int, git_domain: str, timeout: float
+    ) -> bool:
+        """Wait until the repository cache build for a user and domain finishes.
+
+        Waiters subscribe to the build-done channel before checking the
+        building flag, so a build that finishes in between is not missed.
+
+        Returns:
+            True once no build is running, False if ``timeout`` elapsed first
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        channel = self._build_channel(user_id, git_domain)
+        try:
+            client = await self._get_client()
+            try:
+                pubsub = client.pubsub()
+                await pubsub.subscribe(channel)
+                try:
+                    while await self.is_building(user_id, git_domain):
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            return False
+                        await pubsub.get_message(
+                            ignore_subscribe_messages=True,
+                            timeout=min(remaining, _BUILD_WAIT_RECHECK_SECONDS),
+                        )
+                    return True
+                finally:
+                    await pubsub.unsubscribe(channel)
+                    await pubsub.aclose()
+            finally:
+                await client.aclose()
+        except Exception as e:
+            logger.error(
+                f"Error waiting for repository build for user {user_id}, domain {git_domain}: {str(e)}"
+            )
+            return not await self.is_building(user_id, git_domain)
+
 
 # Global cache instance
 cache_manager = RedisCache(settings.REDIS_URL)
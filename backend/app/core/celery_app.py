@@ -47,6 +47,8 @@ celery_app = Celery(
         "app.tasks.project_automation_tasks",
         "app.tasks.plugin_marketplace_tasks",
         "app.tasks.video_tasks",
+        "app.tasks.work_queue_tasks",
+        "app.tasks.subtask_result_tasks",
     ],
 )
 
@@ -100,6 +102,14 @@ celery_app.conf.update(
             "task": "app.tasks.plugin_marketplace_tasks.sync_plugin_upstreams",
             "schedule": 6 * 60 * 60,
         },
+        "reconcile-work-queue-counters": {
+            "task": "app.tasks.work_queue_tasks.reconcile_work_queue_counters",
+            "schedule": float(settings.WORK_QUEUE_COUNTER_RECONCILE_INTERVAL_SECONDS),
+        },
+        "backfill-masked-subtask-results": {
+            "task": "app.tasks.subtask_result_tasks.backfill_masked_subtask_results",
+            "schedule": float(settings.SUBTASK_RESULT_MASK_BACKFILL_INTERVAL_SECONDS),
+        },
     },
     # Beat scheduler class - Use default PersistentScheduler (file-based)
     # Note: Only run ONE Celery Beat instance in production
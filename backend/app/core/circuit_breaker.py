@@ -24,7 +24,7 @@ Usage:
 
 import logging
 from functools import wraps
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, Iterable, Optional
 
 import pybreaker
 from prometheus_client import Counter, Gauge
@@ -121,6 +121,42 @@ webhook_service_breaker = pybreaker.CircuitBreaker(
     name="webhook_service",
 )
 
+# Breakers created at runtime through create_circuit_breaker(), by name
+_dynamic_breakers: Dict[str, pybreaker.CircuitBreaker] = {}
+
+
+def create_circuit_breaker(
+    name: str,
+    *,
+    exclude: Optional[Iterable[Any]] = None,
+    throw_new_error_on_trip: bool = True,
+) -> pybreaker.CircuitBreaker:
+    """
+    Return the circuit breaker called ``name``, creating it on first use.
+
+    Breakers created here share the configured thresholds and metrics
+    listener with the module-level breakers and are reported by
+    get_circuit_breaker_status().
+
+    Args:
+        name: Breaker name, also used as the metrics label
+        exclude: Exception types that should not count as failures
+        throw_new_error_on_trip: Raise CircuitBreakerError instead of the
+            original exception for the call that opens the circuit
+    """
+    breaker = _dynamic_breakers.get(name)
+    if breaker is None:
+        breaker = pybreaker.CircuitBreaker(
+            fail_max=getattr(settings, "CIRCUIT_BREAKER_FAIL_MAX", 5),
+            reset_timeout=getattr(settings, "CIRCUIT_BREAKER_RESET_TIMEOUT", 60),
+            exclude=list(exclude or []),
+            listeners=[CircuitBreakerListener(name)],
+            name=name,
+            throw_new_error_on_trip=throw_new_error_on_trip,
+        )
+        _dynamic_breakers[name] = breaker
+    return breaker
+
 
 def with_circuit_breaker(
     breaker: pybreaker.CircuitBreaker,
@@ -218,7 +254,11 @@ def get_circuit_breaker_status() -> dict:
     Returns:
         dict: Status of all circuit breakers including state, failure count, etc.
     """
-    breakers = [ai_service_breaker, webhook_service_breaker]
+    breakers = [
+        ai_service_breaker,
+        webhook_service_breaker,
+        *_dynamic_breakers.values(),
+    ]
     status = {}
 
     for breaker in breakers:
@@ -146,6 +146,14 @@ class Settings(BaseSettings):
     # Optional local device command overrides/additions. API callers pass the key;
     # Backend resolves the shell command and optional post processor from registry.
     LOCAL_DEVICE_COMMANDS: dict[str, Any] = {}
+    # Device heartbeats are coalesced per device and written to Redis in one
+    # pipelined batch every this many milliseconds (0 writes each one inline)
+    DEVICE_HEARTBEAT_FLUSH_INTERVAL_MS: int = 250
+    # Keep each device's runtime task listing in Redis, patched from device task
+    # events, so listing runtime work does not RPC every online device
+    RUNTIME_WORK_SNAPSHOT_ENABLED: bool = True
+    # Idle snapshots expire after this many seconds (refreshed on every write)
+    RUNTIME_WORK_SNAPSHOT_TTL_SECONDS: int = 86400
 
     # Executor version checking configuration
     # If EXECUTOR_REGISTRY_URL is set, version is fetched from registry
@@ -216,6 +224,15 @@ class Settings(BaseSettings):
     STREAMING_DB_SAVE_INTERVAL: float = 5.0  # Database save interval (seconds)
     STREAMING_REDIS_TTL: int = 300  # Redis streaming cache TTL (seconds)
     STREAMING_MIN_CHARS_TO_SAVE: int = 50  # Minimum characters to save on disconnect
+    # Approximate cap on the per-subtask Redis Stream that records published
+    # streaming events so late or reconnecting consumers can replay
+    SUBTASK_EVENT_STREAM_MAXLEN: int = 10000
+    # Recorded events of one subtask published within this window share one
+    # stream entry and one pubsub message (milliseconds)
+    SUBTASK_EVENT_BATCH_INTERVAL_MS: int = 50
+    # Events queued per subscriber; a subscriber that falls further behind
+    # catches up from the stream (or loses events that were not recorded)
+    SUBTASK_EVENT_QUEUE_MAXSIZE: int = 1000
 
     # Task append expiration (hours)
     APPEND_CHAT_TASK_EXPIRE_HOURS: int = 2
@@ -250,6 +267,21 @@ class Settings(BaseSettings):
     ATTACHMENT_PUBLIC_BASE_URL: str = ""
     # Public Socket.IO origin returned to Wework desktop clients.
     WEGENT_SOCKET_URL: str = ""
+    # Window (ms) for coalescing batchable Socket.IO events per room into one
+    # events:batch frame; 0 sends every event immediately
+    WS_EMIT_BATCH_WINDOW_MS: int = 20
+    # Flush a room's pending frame early once it holds this many events
+    WS_EMIT_BATCH_MAX_EVENTS: int = 50
+    # Upper bound on messages returned by a windowed task:join or history:page
+    TASK_JOIN_WINDOW_MAX_MESSAGES: int = 200
+    # Strings in windowed subtask results are cut to this many characters
+    # until the client expands the subtask; 0 disables trimming
+    TASK_JOIN_RESULT_PREVIEW_CHARS: int = 2000
+    # Positive task access decisions of chat namespace events are cached per
+    # (user, task) in Redis and per socket in process memory; both are dropped
+    # when membership, share or task deletion commits. 0 disables a tier.
+    TASK_ACCESS_CACHE_TTL_SECONDS: int = 60
+    TASK_ACCESS_SOCKET_CACHE_TTL_SECONDS: int = 10
     # Optional Web URL used to build Wework desktop cloud authorization pages.
     # Defaults to FRONTEND_URL when empty.
     WEWORK_AUTHORIZE_BASE_URL: str = ""
@@ -278,6 +310,17 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://127.0.0.1:6379/0"
     TASK_RUN_METRICS_RETENTION_DAYS: int = 32
 
+    # Materialized work queue / inbox message counters (Redis)
+    WORK_QUEUE_COUNTERS_ENABLED: bool = True
+    WORK_QUEUE_COUNTER_TTL_SECONDS: int = 24 * 60 * 60
+    WORK_QUEUE_COUNTER_RECONCILE_INTERVAL_SECONDS: int = 10 * 60
+
+    # Backfill of masked subtask result projections (after a masking rules
+    # version bump, or for subtasks finalized by bulk status updates)
+    SUBTASK_RESULT_MASK_BACKFILL_INTERVAL_SECONDS: int = 10 * 60
+    SUBTASK_RESULT_MASK_BACKFILL_BATCH_SIZE: int = 200
+    SUBTASK_RESULT_MASK_BACKFILL_MAX_BATCHES: int = 50
+
     # Public base URL of this backend, reachable from executor devices. The
     # cloud-model LLM proxy URL is derived from it
     # (`{WEGENT_BACKEND_PUBLIC_URL}/api/runtime-work/llm-responses-proxy`).
@@ -307,6 +350,11 @@ class Settings(BaseSettings):
     EXTERNAL_KNOWLEDGE_MCP_DOWNLOAD_PREAUTH_DOCUMENT_RATE_LIMIT_WINDOW_SECONDS: int = 60
     EXTERNAL_KNOWLEDGE_MCP_DOWNLOAD_RATE_LIMIT_REQUESTS: int = 20
     EXTERNAL_KNOWLEDGE_MCP_DOWNLOAD_RATE_LIMIT_WINDOW_SECONDS: int = 60
+    # Token-bucket rate limits: each worker leases up to this many tokens per
+    # Redis round trip (at most 1/20 of a bucket) and spends them locally for
+    # RATE_LIMIT_LOCAL_LEASE_SECONDS. 0 disables local pre-admission.
+    RATE_LIMIT_LOCAL_LEASE_MAX_TOKENS: int = 10
+    RATE_LIMIT_LOCAL_LEASE_SECONDS: float = 1.0
 
     # Celery configuration
     CELERY_BROKER_URL: Optional[str] = None  # If None/empty, uses REDIS_URL
@@ -433,11 +481,16 @@ class Settings(BaseSettings):
     # Project robot queue scheduler
     ROBOT_QUEUE_SCHEDULER_ENABLED: bool = True
     ROBOT_QUEUE_SCAN_INTERVAL_SECONDS: int = 5
+    # Device claim pools in the execution scheduler index are reloaded from the
+    # database at least this often (between reloads only new rows are merged)
+    LOOP_EXECUTION_SCHEDULER_RECONCILE_SECONDS: int = 60
 
     # Knowledge indexing protection configuration
     KNOWLEDGE_INDEX_LOCK_TIMEOUT_SECONDS: int = 120
     KNOWLEDGE_INDEX_LOCK_EXTEND_INTERVAL_SECONDS: int = 30
     KNOWLEDGE_INDEX_LOCK_RETRY_DELAY_SECONDS: int = 15
+    # Wait for the current indexer's release before falling back to a retry
+    KNOWLEDGE_INDEX_LOCK_WAIT_SECONDS: int = 30
     KNOWLEDGE_INDEX_LOCK_MAX_RETRIES: int = 1
     KNOWLEDGE_INDEX_STALE_QUEUED_SECONDS: int = 600  # 10 min
     KNOWLEDGE_INDEX_STALE_PENDING_CONVERSION_SECONDS: int = 7200  # 120 min
@@ -504,6 +557,15 @@ class Settings(BaseSettings):
     CIRCUIT_BREAKER_FAIL_MAX: int = 5  # Open circuit after 5 consecutive failures
     CIRCUIT_BREAKER_RESET_TIMEOUT: int = 60  # Try to recover after 60 seconds
 
+    # Managed outbound HTTP clients (see app.core.http_clients)
+    OUTBOUND_HTTP_MAX_CONNECTIONS: int = 100
+    OUTBOUND_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OUTBOUND_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    # Connection attempts retried by the transport (requests are never resent)
+    OUTBOUND_HTTP_RETRIES: int = 1
+    # Negotiate HTTP/2 with targets that opt in (requires the h2 package)
+    OUTBOUND_HTTP2_ENABLED: bool = False
+
     # Service extension module (empty = disabled)
     SERVICE_EXTENSION: str = ""
 
@@ -559,6 +621,17 @@ class Settings(BaseSettings):
     # downloaded file directly. Keeps the prompt bounded for modes without the
     # chat_shell token-level preview (executor/device, which have no L3 guard).
     ATTACHMENT_INJECT_MAX_CHARS: int = 32000
+    # Parallel PDF parsing: large PDFs are split into page ranges that are
+    # text-extracted/OCR'd in a process pool shared by all requests.
+    # 0 disables the pool and parses pages serially.
+    PDF_PARSE_POOL_WORKERS: int = 0
+    PDF_PARSE_PARALLEL_MIN_PAGES: int = 40  # Smaller PDFs are parsed serially
+    PDF_PARSE_DEADLINE_SECONDS: int = 300  # Per-document deadline in pool mode
+    # Cache of attachment parse results keyed by content hash (Redis), so
+    # re-uploading or re-attaching identical bytes skips parsing
+    ATTACHMENT_PARSE_CACHE_ENABLED: bool = True
+    ATTACHMENT_PARSE_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    ATTACHMENT_PARSE_CACHE_MAX_ENTRY_BYTES: int = 16 * 1024 * 1024
 
     # Attachment storage backend configuration
     # Supported backends: "mysql" (default), "s3", "minio"
@@ -627,6 +700,18 @@ class Settings(BaseSettings):
     # - "direct": Legacy alias for "proxy"
     # Default is "fallback" for better reliability
     WEBSCRAPER_PROXY_MODE: str = "fallback"
+    # Refresh web documents with a conditional GET (ETag/Last-Modified) before
+    # falling back to a full browser scrape
+    WEBSCRAPER_CONDITIONAL_REFRESH_ENABLED: bool = True
+    # Browser pool for web scraping: browsers x page slots per browser bounds
+    # concurrent scrapes; at most WEBSCRAPER_PER_DOMAIN_CONCURRENCY run per host
+    WEBSCRAPER_BROWSER_POOL_SIZE: int = 2
+    WEBSCRAPER_BROWSER_PAGES_PER_BROWSER: int = 4
+    WEBSCRAPER_PER_DOMAIN_CONCURRENCY: int = 2
+    # Restart a pooled browser after this many pages (0 disables)
+    WEBSCRAPER_BROWSER_RECYCLE_PAGES: int = 200
+    # Restart a pooled browser once its processes exceed this RSS (0 disables)
+    WEBSCRAPER_BROWSER_MAX_RSS_MB: int = 1536
     # Web scraper site-specific configuration
     # Configuration for specific sites that require special handling
     # due to anti-bot detection, dynamic content loading, or navigation patterns
@@ -690,6 +775,16 @@ class Settings(BaseSettings):
     # When enabled, route_mode="auto" will always choose rag_retrieval.
     # Explicit route_mode="direct_injection" remains supported for manual testing.
     RAG_AUTO_DISABLE_DIRECT_INJECTION: bool = False
+    # Precomputed direct-injection bundles (document records + token totals per
+    # knowledge base or document scope), invalidated by document index generation
+    RAG_DIRECT_INJECTION_BUNDLE_ENABLED: bool = True
+    RAG_DIRECT_INJECTION_BUNDLE_TTL_SECONDS: int = 86400
+    # Scopes whose routing estimate exceeds this store token totals only, since
+    # they are too large to ever be injected directly
+    RAG_DIRECT_INJECTION_BUNDLE_MAX_TOKENS: int = 1_500_000
+    # Finished indexing warms the KB bundle once after this delay, so documents
+    # finishing within the window share one rebuild
+    RAG_DIRECT_INJECTION_BUNDLE_WARM_DELAY_SECONDS: int = 30
 
     # Streaming architecture mode configuration
     # "legacy" - WebSocketStreamingHandler directly emits to WebSocket (current behavior)
@@ -765,6 +860,9 @@ class Settings(BaseSettings):
     GRACEFUL_SHUTDOWN_TIMEOUT: int = 600
     # Whether to reject new requests during shutdown (503 Service Unavailable)
     SHUTDOWN_REJECT_NEW_REQUESTS: bool = True
+    # Seconds to wait after startup before running non-critical startup phases
+    # (IM channel start, video job recovery) so the server accepts traffic first
+    STARTUP_DEFERRED_PHASES_DELAY: float = 1.0
 
     # Data Table Configuration
     # JSON string containing table provider credentials (DingTalk, etc.)
@@ -803,6 +901,13 @@ class Settings(BaseSettings):
     # Since mem0 may be shared across multiple systems, this prefix ensures
     # wegent resources are isolated from other systems' resources
     MEMORY_USER_ID_PREFIX: str = "wegent_user:"
+    # Try mem0's batch delete endpoint (DELETE /batch) when cleaning up a task's
+    # memories; services without it fall back to concurrent single deletes
+    MEMORY_BATCH_DELETE_ENABLED: bool = True
+    # Maximum concurrent single-memory deletes during a task cleanup
+    MEMORY_DELETE_CONCURRENCY: int = 16
+    # Retries of memory deletes that failed within a cleanup batch
+    MEMORY_DELETE_RETRIES: int = 2
 
     # OpenTelemetry configuration is centralized in shared/telemetry/config.py
     # Use: from shared.telemetry.config import get_otel_config
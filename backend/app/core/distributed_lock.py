@@ -8,6 +8,12 @@ Distributed lock implementation using Redis for backend services.
 This module provides Redis-based distributed locking for coordinating
 operations across multiple service instances, such as Flow scheduler tasks.
 
+Every acquisition stores a unique owner token and takes a fencing token from
+a global counter, so release and extend only touch a lock that is still
+owned, and callers can reject writes from a holder whose lock expired.
+Releases are published on a per-lock channel, which wakes waiters without
+polling. Watchdog renewal of all held locks runs on one shared asyncio loop.
+
 Usage:
     from app.core.distributed_lock import distributed_lock
 
@@ -27,15 +33,25 @@ Usage:
             pass
         finally:
             distributed_lock.release("my_task")
+
+    # Wait up to 30s for the lock and pass the fencing token downstream
+    with distributed_lock.acquire_lease_context("my_task", 60, wait_seconds=30) as lease:
+        if lease:
+            write_result(fence=lease.fence)
 """
 
 import asyncio
 import logging
+import re
+import threading
+import time
+import uuid
 from contextlib import asynccontextmanager, contextmanager
-from threading import Event, Thread
-from typing import AsyncGenerator, Generator, Optional
+from dataclasses import dataclass, field
+from typing import AsyncGenerator, Dict, Generator, Optional
 
 import redis
+from prometheus_client import Counter, Histogram
 from redis.asyncio import Redis as AsyncRedis
 
 from app.core.config import settings
@@ -44,30 +60,243 @@ logger = logging.getLogger(__name__)
 
 # Lock key prefix
 LOCK_KEY_PREFIX = "wegent:lock:"
+# Global counter that hands out fencing tokens
+FENCE_KEY = "wegent:lock_fence"
+# Channel prefix on which releases are published to waiters
+RELEASE_CHANNEL_PREFIX = "wegent:lock_released:"
+
+LOCK_ACQUIRE_TOTAL = Counter(
+    "distributed_lock_acquire_total",
+    "Distributed lock acquisition attempts by result",
+    ["lock", "result"],
+)
+LOCK_WAIT_SECONDS = Histogram(
+    "distributed_lock_wait_seconds",
+    "Time spent waiting for a distributed lock before acquiring or giving up",
+    ["lock"],
+    buckets=(0.001, 0.01, 0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0),
+)
+LOCK_HOLD_SECONDS = Histogram(
+    "distributed_lock_hold_seconds",
+    "Time a distributed lock was held until released",
+    ["lock"],
+    buckets=(0.01, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0),
+)
+LOCK_LOST_TOTAL = Counter(
+    "distributed_lock_lost_total",
+    "Held distributed locks that expired or were taken over before release",
+    ["lock"],
+)
+
+# KEYS[1]: lock, KEYS[2]: fencing counter; ARGV[1]: owner id, ARGV[2]: TTL ms.
+# Returns {fencing token, 0} when acquired, {0, holder's PTTL} otherwise.
+ACQUIRE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return {0, redis.call('PTTL', KEYS[1])}
+end
+local fence = redis.call('INCR', KEYS[2])
+redis.call('SET', KEYS[1], fence .. ':' .. ARGV[1], 'PX', ARGV[2])
+return {fence, 0}
+"""
+
+# KEYS[1]: lock; ARGV[1]: owner token, ARGV[2]: release channel
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    redis.call('PUBLISH', ARGV[2], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+# KEYS[1]: lock; ARGV[1]: owner token, ARGV[2]: new TTL ms
+EXTEND_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_DYNAMIC_LOCK_NAME_PART = re.compile(r"^[a-z_]+$")
+
+
+def _lock_metric_name(lock_name: str) -> str:
+    """Collapse ids in lock names (``robot_exec:42``) into ``*`` for labels."""
+    return ":".join(
+        part if _DYNAMIC_LOCK_NAME_PART.match(part) else "*"
+        for part in lock_name.split(":")
+    )
+
+
+def _redis_url() -> Optional[str]:
+    return getattr(settings, "CELERY_BROKER_URL", None) or getattr(
+        settings, "REDIS_URL", None
+    )
+
+
+@dataclass
+class LockLease:
+    """A held lock: its owner token and fencing token.
+
+    ``fence`` increases with every acquisition of any lock, so a resource can
+    reject writes carrying a lower fence than one it has already seen.
+    ``fence`` is None when Redis was unavailable and the lock was granted
+    without coordination. ``lost`` is set when renewal finds the lock expired
+    or owned by someone else.
+    """
+
+    name: str
+    token: str
+    fence: Optional[int]
+    expire_seconds: int
+    acquired_at: float = field(default_factory=time.monotonic)
+    lost: bool = False
+
+    @property
+    def key(self) -> str:
+        return f"{LOCK_KEY_PREFIX}{self.name}"
+
+    @property
+    def is_fenced(self) -> bool:
+        return self.fence is not None
+
+
+def _unfenced_lease(lock_name: str, expire_seconds: int) -> LockLease:
+    return LockLease(
+        name=lock_name, token="", fence=None, expire_seconds=expire_seconds
+    )
+
+
+class _LockRenewer:
+    """Extends every watched lease from one asyncio loop on a daemon thread.
+
+    Each lease is renewed ``interval`` seconds after its last renewal with a
+    compare-and-extend, so a lease that was lost is marked and dropped
+    instead of extending someone else's lock.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        # lease token -> (lease, interval seconds, next renewal at)
+        self._entries: Dict[str, tuple[LockLease, float, float]] = {}
+
+    def watch(self, lease: LockLease, interval: float) -> None:
+        loop = self._ensure_loop()
+        entry = (lease, interval, time.monotonic() + interval)
+        loop.call_soon_threadsafe(self._add, lease.token, entry)
+
+    def unwatch(self, lease: LockLease) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._entries.pop, lease.token, None)
+
+    def _add(self, token: str, entry: tuple[LockLease, float, float]) -> None:
+        self._entries[token] = entry
+        self._wakeup.set()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+                thread = threading.Thread(
+                    target=self._run_loop,
+                    args=(loop, started),
+                    name="distributed-lock-renewer",
+                    daemon=True,
+                )
+                thread.start()
+                started.wait()
+                self._loop = loop
+            return self._loop
+
+    def _run_loop(self, loop: asyncio.AbstractEventLoop, started) -> None:
+        asyncio.set_event_loop(loop)
+        self._wakeup = asyncio.Event()
+        started.set()
+        loop.run_until_complete(self._renew_forever())
+
+    async def _renew_forever(self) -> None:
+        client = AsyncRedis.from_url(
+            _redis_url(),
+            decode_responses=True,
+            socket_timeout=5,
+            socket_connect_timeout=5,
+        )
+        extend = client.register_script(EXTEND_SCRIPT)
+        while True:
+            now = time.monotonic()
+            due = [
+                (token, lease, interval)
+                for token, (lease, interval, next_at) in self._entries.items()
+                if next_at <= now
+            ]
+            if due:
+                await asyncio.gather(
+                    *(
+                        self._renew(extend, token, lease, interval)
+                        for token, lease, interval in due
+                    )
+                )
+            next_at = min(
+                (entry[2] for entry in self._entries.values()), default=now + 60
+            )
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=max(next_at - time.monotonic(), 0)
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def _renew(self, extend, token: str, lease: LockLease, interval: float):
+        if token not in self._entries:
+            return
+        self._entries[token] = (lease, interval, time.monotonic() + interval)
+        try:
+            extended = await extend(
+                keys=[lease.key], args=[lease.token, lease.expire_seconds * 1000]
+            )
+        except Exception as e:
+            logger.error(f"[DistributedLock] Failed to renew lock {lease.name}: {e}")
+            return
+        # A lease unwatched meanwhile was released, not lost
+        if not extended and token in self._entries:
+            lease.lost = True
+            self._entries.pop(token, None)
+            LOCK_LOST_TOTAL.labels(lock=_lock_metric_name(lease.name)).inc()
+            logger.warning(
+                f"[DistributedLock] Lost lock {lease.name} (fence {lease.fence}) "
+                "before release"
+            )
 
 
 class DistributedLock:
     """
     Redis-based distributed lock for multi-instance coordination.
 
-    Uses Redis SET NX (set if not exists) with expiration for safe locking.
-    This prevents multiple Celery workers from processing the same periodic
-    task concurrently.
+    Uses an owner-token SET NX PX in Lua for safe locking, and
+    compare-and-delete / compare-and-extend scripts so a holder whose lock
+    expired cannot release or extend the next holder's lock. This prevents
+    multiple Celery workers from processing the same periodic task
+    concurrently.
     """
 
     def __init__(self):
         """Initialize the distributed lock with lazy Redis client loading."""
         self._redis_client: Optional[redis.Redis] = None
         self._async_redis_client: Optional[AsyncRedis] = None
+        # Leases acquired through acquire()/acquire_async(), by lock name
+        self._leases: Dict[str, LockLease] = {}
+        self._renewer = _LockRenewer()
 
     @property
     def redis_client(self) -> Optional[redis.Redis]:
         """Lazy-load Redis client from settings."""
         if self._redis_client is None:
             try:
-                redis_url = getattr(settings, "CELERY_BROKER_URL", None) or getattr(
-                    settings, "REDIS_URL", None
-                )
+                redis_url = _redis_url()
                 if redis_url:
                     self._redis_client = redis.from_url(
                         redis_url,
@@ -82,44 +311,112 @@ class DistributedLock:
                 self._redis_client = None
         return self._redis_client
 
-    def acquire(self, lock_name: str, expire_seconds: int = 60) -> bool:
+    def acquire_lease(
+        self, lock_name: str, expire_seconds: int = 60, wait_seconds: float = 0
+    ) -> Optional[LockLease]:
         """
-        Acquire a distributed lock.
+        Acquire a distributed lock and return its lease.
 
         Args:
             lock_name: Name of the lock (will be prefixed with LOCK_KEY_PREFIX)
             expire_seconds: Lock expiration time in seconds (default 60s).
                            The lock will auto-expire after this time to prevent
                            deadlocks if the holder crashes.
+            wait_seconds: How long to wait for the current holder to release
+                          the lock; waiters are woken by the release event.
 
         Returns:
-            True if lock acquired, False if already held by another instance
+            The lease, or None if the lock is still held by another owner
         """
-        if self.redis_client is None:
+        client = self.redis_client
+        if client is None:
             # If Redis is not available, allow the operation to proceed
             # (single instance mode or degraded mode)
             logger.debug(f"[DistributedLock] Redis not available, allowing {lock_name}")
-            return True
+            return _unfenced_lease(lock_name, expire_seconds)
 
-        lock_key = f"{LOCK_KEY_PREFIX}{lock_name}"
+        started_at = time.monotonic()
+        pubsub = None
         try:
-            # SET key value NX EX seconds - only set if not exists
-            result = self.redis_client.set(lock_key, "1", nx=True, ex=expire_seconds)
-            if result:
-                logger.debug(f"[DistributedLock] Acquired lock: {lock_name}")
-            else:
-                logger.debug(
-                    f"[DistributedLock] Lock {lock_name} already held by another instance"
+            if wait_seconds > 0:
+                # Subscribe before trying so a release in between is not missed
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(f"{RELEASE_CHANNEL_PREFIX}{lock_name}")
+            acquire = client.register_script(ACQUIRE_SCRIPT)
+            while True:
+                lease, holder_ttl_ms = self._try_acquire(
+                    acquire, lock_name, expire_seconds
+                )
+                remaining = started_at + wait_seconds - time.monotonic()
+                if lease is not None or pubsub is None or remaining <= 0:
+                    break
+                timeout = (
+                    min(remaining, holder_ttl_ms / 1000)
+                    if holder_ttl_ms > 0
+                    else remaining
                 )
-            return result is True
+                pubsub.get_message(timeout=timeout)
         except Exception as e:
             logger.error(f"[DistributedLock] Failed to acquire lock {lock_name}: {e}")
+            LOCK_ACQUIRE_TOTAL.labels(
+                lock=_lock_metric_name(lock_name), result="error"
+            ).inc()
             # On error, allow operation to proceed (fail-open for availability)
+            return _unfenced_lease(lock_name, expire_seconds)
+        finally:
+            if pubsub is not None:
+                pubsub.close()
+
+        self._record_acquire(lock_name, lease, started_at)
+        return lease
+
+    def acquire(self, lock_name: str, expire_seconds: int = 60) -> bool:
+        """
+        Acquire a distributed lock.
+
+        The lease is remembered by name so release() and extend() can find
+        its owner token; use acquire_lease() to keep the lease yourself.
+
+        Args:
+            lock_name: Name of the lock (will be prefixed with LOCK_KEY_PREFIX)
+            expire_seconds: Lock expiration time in seconds (default 60s).
+                           The lock will auto-expire after this time to prevent
+                           deadlocks if the holder crashes.
+
+        Returns:
+            True if lock acquired, False if already held by another instance
+        """
+        lease = self.acquire_lease(lock_name, expire_seconds)
+        if lease is None:
+            return False
+        self._leases[lock_name] = lease
+        return True
+
+    def release_lease(self, lease: LockLease) -> bool:
+        """
+        Release a lease if it still owns its lock.
+
+        Returns:
+            True if released, False if the lock expired or has another owner
+        """
+        self._renewer.unwatch(lease)
+        self._record_hold(lease)
+        if not lease.is_fenced or self.redis_client is None:
             return True
 
+        try:
+            released = self.redis_client.register_script(RELEASE_SCRIPT)(
+                keys=[lease.key],
+                args=[lease.token, f"{RELEASE_CHANNEL_PREFIX}{lease.name}"],
+            )
+        except Exception as e:
+            logger.error(f"[DistributedLock] Failed to release lock {lease.name}: {e}")
+            return False
+        return self._check_released(lease, released)
+
     def release(self, lock_name: str) -> bool:
         """
-        Release a distributed lock.
+        Release a distributed lock acquired with acquire().
 
         Args:
             lock_name: Name of the lock to release
@@ -127,21 +424,31 @@ class DistributedLock:
         Returns:
             True if released successfully, False otherwise
         """
-        if self.redis_client is None:
+        lease = self._leases.pop(lock_name, None)
+        if lease is None:
+            logger.warning(
+                f"[DistributedLock] Lock {lock_name} is not held by this process"
+            )
+            return False
+        return self.release_lease(lease)
+
+    def extend_lease(self, lease: LockLease, expire_seconds: int = 60) -> bool:
+        """Extend a lease if it still owns its lock."""
+        if not lease.is_fenced or self.redis_client is None:
             return True
 
-        lock_key = f"{LOCK_KEY_PREFIX}{lock_name}"
         try:
-            self.redis_client.delete(lock_key)
-            logger.debug(f"[DistributedLock] Released lock: {lock_name}")
-            return True
+            extended = self.redis_client.register_script(EXTEND_SCRIPT)(
+                keys=[lease.key], args=[lease.token, expire_seconds * 1000]
+            )
         except Exception as e:
-            logger.error(f"[DistributedLock] Failed to release lock {lock_name}: {e}")
+            logger.error(f"[DistributedLock] Failed to extend lock {lease.name}: {e}")
             return False
+        return self._check_extended(lease, extended)
 
     def extend(self, lock_name: str, expire_seconds: int = 60) -> bool:
         """
-        Extend the expiration time of a held lock.
+        Extend the expiration time of a lock acquired with acquire().
 
         Useful for long-running operations that may exceed the initial lock timeout.
 
@@ -152,16 +459,10 @@ class DistributedLock:
         Returns:
             True if extended successfully, False otherwise
         """
-        if self.redis_client is None:
-            return True
-
-        lock_key = f"{LOCK_KEY_PREFIX}{lock_name}"
-        try:
-            result = self.redis_client.expire(lock_key, expire_seconds)
-            return result is True
-        except Exception as e:
-            logger.error(f"[DistributedLock] Failed to extend lock {lock_name}: {e}")
+        lease = self._leases.get(lock_name)
+        if lease is None:
             return False
+        return self.extend_lease(lease, expire_seconds)
 
     def is_locked(self, lock_name: str) -> bool:
         """
@@ -183,9 +484,33 @@ class DistributedLock:
             logger.error(f"[DistributedLock] Failed to check lock {lock_name}: {e}")
             return False
 
+    @contextmanager
+    def acquire_lease_context(
+        self,
+        lock_name: str,
+        expire_seconds: int = 60,
+        extend_interval_seconds: int = 0,
+        wait_seconds: float = 0,
+    ) -> Generator[Optional[LockLease], None, None]:
+        """
+        Context manager yielding the lease, or None if the lock is held.
+
+        With ``extend_interval_seconds`` set (and shorter than the expiry),
+        the lease is renewed by the shared watchdog until the block exits.
+        """
+        lease = self.acquire_lease(lock_name, expire_seconds, wait_seconds)
+        if lease is not None:
+            self._hold(lease, extend_interval_seconds)
+        try:
+            yield lease
+        finally:
+            if lease is not None:
+                self._drop(lease)
+                self.release_lease(lease)
+
     @contextmanager
     def acquire_context(
-        self, lock_name: str, expire_seconds: int = 60
+        self, lock_name: str, expire_seconds: int = 60, wait_seconds: float = 0
     ) -> Generator[bool, None, None]:
         """
         Context manager for acquiring and releasing a lock.
@@ -199,16 +524,15 @@ class DistributedLock:
         Args:
             lock_name: Name of the lock
             expire_seconds: Lock expiration time
+            wait_seconds: How long to wait for the current holder to release
 
         Yields:
             True if lock was acquired, False otherwise
         """
-        acquired = self.acquire(lock_name, expire_seconds)
-        try:
-            yield acquired
-        finally:
-            if acquired:
-                self.release(lock_name)
+        with self.acquire_lease_context(
+            lock_name, expire_seconds, wait_seconds=wait_seconds
+        ) as lease:
+            yield lease is not None
 
     @contextmanager
     def acquire_watchdog_context(
@@ -216,53 +540,29 @@ class DistributedLock:
         lock_name: str,
         expire_seconds: int = 60,
         extend_interval_seconds: int = 30,
+        wait_seconds: float = 0,
     ) -> Generator[bool, None, None]:
         """
         Acquire a lock and keep extending it in the background.
 
         This is useful for long-running tasks whose execution time is unknown.
-        If the process exits unexpectedly, the watchdog thread also stops and
-        the lock will expire naturally after expire_seconds.
+        Renewal runs on the shared watchdog loop; if the process exits
+        unexpectedly, the lock will expire naturally after expire_seconds.
         """
-        acquired = self.acquire(lock_name, expire_seconds)
-        stop_event = Event()
-        watchdog_thread: Optional[Thread] = None
-
-        if (
-            acquired
-            and self.redis_client is not None
-            and extend_interval_seconds > 0
-            and extend_interval_seconds < expire_seconds
-        ):
-
-            def _watchdog() -> None:
-                while not stop_event.wait(extend_interval_seconds):
-                    self.extend(lock_name, expire_seconds)
-
-            watchdog_thread = Thread(
-                target=_watchdog,
-                name=f"distributed-lock-watchdog:{lock_name}",
-                daemon=True,
-            )
-            watchdog_thread.start()
-
-        try:
-            yield acquired
-        finally:
-            stop_event.set()
-            if watchdog_thread is not None:
-                watchdog_thread.join(timeout=1)
-            if acquired:
-                self.release(lock_name)
+        with self.acquire_lease_context(
+            lock_name,
+            expire_seconds,
+            extend_interval_seconds=extend_interval_seconds,
+            wait_seconds=wait_seconds,
+        ) as lease:
+            yield lease is not None
 
     @property
     def async_redis_client(self) -> Optional[AsyncRedis]:
         """Lazy-load async Redis client from settings."""
         if self._async_redis_client is None:
             try:
-                redis_url = getattr(settings, "CELERY_BROKER_URL", None) or getattr(
-                    settings, "REDIS_URL", None
-                )
+                redis_url = _redis_url()
                 if redis_url:
                     self._async_redis_client = AsyncRedis.from_url(
                         redis_url,
@@ -277,62 +577,107 @@ class DistributedLock:
                 self._async_redis_client = None
         return self._async_redis_client
 
-    async def acquire_async(self, lock_name: str, expire_seconds: int = 60) -> bool:
-        """Acquire a distributed lock asynchronously."""
-        if self.async_redis_client is None:
+    async def acquire_lease_async(
+        self, lock_name: str, expire_seconds: int = 60, wait_seconds: float = 0
+    ) -> Optional[LockLease]:
+        """Acquire a distributed lock asynchronously; see acquire_lease()."""
+        client = self.async_redis_client
+        if client is None:
             logger.debug(
                 f"[DistributedLock] Async Redis not available, allowing {lock_name}"
             )
-            return True
+            return _unfenced_lease(lock_name, expire_seconds)
 
-        lock_key = f"{LOCK_KEY_PREFIX}{lock_name}"
+        started_at = time.monotonic()
+        pubsub = None
         try:
-            result = await self.async_redis_client.set(
-                lock_key, "1", nx=True, ex=expire_seconds
-            )
-            if result:
-                logger.debug(f"[DistributedLock] Acquired async lock: {lock_name}")
-            else:
-                logger.debug(
-                    f"[DistributedLock] Async lock {lock_name} already held by another instance"
+            if wait_seconds > 0:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(f"{RELEASE_CHANNEL_PREFIX}{lock_name}")
+            acquire = client.register_script(ACQUIRE_SCRIPT)
+            while True:
+                lease, holder_ttl_ms = await self._try_acquire_async(
+                    acquire, lock_name, expire_seconds
+                )
+                remaining = started_at + wait_seconds - time.monotonic()
+                if lease is not None or pubsub is None or remaining <= 0:
+                    break
+                timeout = (
+                    min(remaining, holder_ttl_ms / 1000)
+                    if holder_ttl_ms > 0
+                    else remaining
                 )
-            return result is True
+                await pubsub.get_message(timeout=timeout)
         except Exception as e:
             logger.error(
                 f"[DistributedLock] Failed to acquire async lock {lock_name}: {e}"
             )
-            return True
+            LOCK_ACQUIRE_TOTAL.labels(
+                lock=_lock_metric_name(lock_name), result="error"
+            ).inc()
+            return _unfenced_lease(lock_name, expire_seconds)
+        finally:
+            if pubsub is not None:
+                await pubsub.aclose()
 
-    async def release_async(self, lock_name: str) -> bool:
-        """Release a distributed lock asynchronously."""
-        if self.async_redis_client is None:
+        self._record_acquire(lock_name, lease, started_at)
+        return lease
+
+    async def acquire_async(self, lock_name: str, expire_seconds: int = 60) -> bool:
+        """Acquire a distributed lock asynchronously."""
+        lease = await self.acquire_lease_async(lock_name, expire_seconds)
+        if lease is None:
+            return False
+        self._leases[lock_name] = lease
+        return True
+
+    async def release_lease_async(self, lease: LockLease) -> bool:
+        """Release a lease asynchronously if it still owns its lock."""
+        self._renewer.unwatch(lease)
+        self._record_hold(lease)
+        if not lease.is_fenced or self.async_redis_client is None:
             return True
 
-        lock_key = f"{LOCK_KEY_PREFIX}{lock_name}"
         try:
-            await self.async_redis_client.delete(lock_key)
-            logger.debug(f"[DistributedLock] Released async lock: {lock_name}")
-            return True
+            released = await self.async_redis_client.register_script(RELEASE_SCRIPT)(
+                keys=[lease.key],
+                args=[lease.token, f"{RELEASE_CHANNEL_PREFIX}{lease.name}"],
+            )
         except Exception as e:
             logger.error(
-                f"[DistributedLock] Failed to release async lock {lock_name}: {e}"
+                f"[DistributedLock] Failed to release async lock {lease.name}: {e}"
             )
             return False
+        return self._check_released(lease, released)
+
+    async def release_async(self, lock_name: str) -> bool:
+        """Release a distributed lock acquired with acquire_async()."""
+        lease = self._leases.pop(lock_name, None)
+        if lease is None:
+            logger.warning(
+                f"[DistributedLock] Async lock {lock_name} is not held by this process"
+            )
+            return False
+        return await self.release_lease_async(lease)
 
     async def extend_async(self, lock_name: str, expire_seconds: int = 60) -> bool:
         """Extend the expiration time of a held lock asynchronously."""
-        if self.async_redis_client is None:
+        lease = self._leases.get(lock_name)
+        if lease is None:
+            return False
+        if not lease.is_fenced or self.async_redis_client is None:
             return True
 
-        lock_key = f"{LOCK_KEY_PREFIX}{lock_name}"
         try:
-            result = await self.async_redis_client.expire(lock_key, expire_seconds)
-            return result is True
+            extended = await self.async_redis_client.register_script(EXTEND_SCRIPT)(
+                keys=[lease.key], args=[lease.token, expire_seconds * 1000]
+            )
         except Exception as e:
             logger.error(
                 f"[DistributedLock] Failed to extend async lock {lock_name}: {e}"
             )
             return False
+        return self._check_extended(lease, extended)
 
     @asynccontextmanager
     async def acquire_watchdog_context_async(
@@ -340,39 +685,118 @@ class DistributedLock:
         lock_name: str,
         expire_seconds: int = 60,
         extend_interval_seconds: int = 30,
+        wait_seconds: float = 0,
     ) -> AsyncGenerator[bool, None]:
-        """Acquire a lock and keep extending it with an async watchdog task."""
-        acquired = await self.acquire_async(lock_name, expire_seconds)
-        watchdog_task: Optional[asyncio.Task] = None
-
-        if (
-            acquired
-            and self.async_redis_client is not None
-            and extend_interval_seconds > 0
-            and extend_interval_seconds < expire_seconds
-        ):
-
-            async def _watchdog() -> None:
-                try:
-                    while True:
-                        await asyncio.sleep(extend_interval_seconds)
-                        await self.extend_async(lock_name, expire_seconds)
-                except asyncio.CancelledError:
-                    pass
-
-            watchdog_task = asyncio.create_task(_watchdog())
+        """Acquire a lock and keep extending it with the shared watchdog."""
+        lease = await self.acquire_lease_async(lock_name, expire_seconds, wait_seconds)
+        if lease is not None:
+            self._hold(lease, extend_interval_seconds)
 
         try:
-            yield acquired
+            yield lease is not None
         finally:
-            if watchdog_task is not None:
-                watchdog_task.cancel()
-                try:
-                    await watchdog_task
-                except asyncio.CancelledError:
-                    pass
-            if acquired:
-                await self.release_async(lock_name)
+            if lease is not None:
+                self._drop(lease)
+                await self.release_lease_async(lease)
+
+    def _hold(self, lease: LockLease, extend_interval_seconds: float) -> None:
+        """Track a context-held lease by name and start renewing it if asked.
+
+        Tracking by name keeps extend(lock_name) working inside the context.
+        """
+        self._leases[lease.name] = lease
+        if lease.is_fenced and 0 < extend_interval_seconds < lease.expire_seconds:
+            self._renewer.watch(lease, extend_interval_seconds)
+
+    def _drop(self, lease: LockLease) -> None:
+        if self._leases.get(lease.name) is lease:
+            del self._leases[lease.name]
+
+    @staticmethod
+    def _try_acquire(
+        acquire, lock_name: str, expire_seconds: int
+    ) -> tuple[Optional[LockLease], int]:
+        token = uuid.uuid4().hex
+        fence, holder_ttl_ms = acquire(
+            keys=[f"{LOCK_KEY_PREFIX}{lock_name}", FENCE_KEY],
+            args=[token, expire_seconds * 1000],
+        )
+        return _lease_from_reply(lock_name, expire_seconds, token, fence, holder_ttl_ms)
+
+    @staticmethod
+    async def _try_acquire_async(
+        acquire, lock_name: str, expire_seconds: int
+    ) -> tuple[Optional[LockLease], int]:
+        token = uuid.uuid4().hex
+        fence, holder_ttl_ms = await acquire(
+            keys=[f"{LOCK_KEY_PREFIX}{lock_name}", FENCE_KEY],
+            args=[token, expire_seconds * 1000],
+        )
+        return _lease_from_reply(lock_name, expire_seconds, token, fence, holder_ttl_ms)
+
+    @staticmethod
+    def _record_acquire(
+        lock_name: str, lease: Optional[LockLease], started_at: float
+    ) -> None:
+        metric_name = _lock_metric_name(lock_name)
+        LOCK_WAIT_SECONDS.labels(lock=metric_name).observe(
+            time.monotonic() - started_at
+        )
+        LOCK_ACQUIRE_TOTAL.labels(
+            lock=metric_name, result="acquired" if lease else "contended"
+        ).inc()
+        if lease is not None:
+            logger.debug(
+                f"[DistributedLock] Acquired lock: {lock_name} (fence {lease.fence})"
+            )
+        else:
+            logger.debug(
+                f"[DistributedLock] Lock {lock_name} already held by another instance"
+            )
+
+    @staticmethod
+    def _record_hold(lease: LockLease) -> None:
+        LOCK_HOLD_SECONDS.labels(lock=_lock_metric_name(lease.name)).observe(
+            time.monotonic() - lease.acquired_at
+        )
+
+    @staticmethod
+    def _check_released(lease: LockLease, released) -> bool:
+        if released:
+            logger.debug(f"[DistributedLock] Released lock: {lease.name}")
+            return True
+        LOCK_LOST_TOTAL.labels(lock=_lock_metric_name(lease.name)).inc()
+        logger.warning(
+            f"[DistributedLock] Lock {lease.name} (fence {lease.fence}) expired "
+            "or changed owner before release"
+        )
+        return False
+
+    @staticmethod
+    def _check_extended(lease: LockLease, extended) -> bool:
+        if extended:
+            return True
+        lease.lost = True
+        logger.warning(
+            f"[DistributedLock] Lock {lease.name} (fence {lease.fence}) expired "
+            "or changed owner before extend"
+        )
+        return False
+
+
+def _lease_from_reply(
+    lock_name: str, expire_seconds: int, token: str, fence, holder_ttl_ms
+) -> tuple[Optional[LockLease], int]:
+    fence = int(fence)
+    if fence <= 0:
+        return None, int(holder_ttl_ms)
+    lease = LockLease(
+        name=lock_name,
+        token=f"{fence}:{token}",
+        fence=fence,
+        expire_seconds=expire_seconds,
+    )
+    return lease, 0
 
 
 # Singleton instance
@@ -0,0 +1,266 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Managed outbound HTTP clients.
+
+Services that call other services (knowledge_runtime, LLM providers, search
+engines) used to open an ``httpx.AsyncClient`` per call, paying a TCP (and
+TLS) handshake every time. This registry hands out one pooled, traced client
+per named target instead:
+
+- every target declares its timeouts, pool limits, connect retries and
+  whether it may negotiate HTTP/2 (only when ``h2`` is installed);
+- ``request()`` guards calls to targets with a circuit breaker, so a failing
+  dependency is rejected fast with ``CircuitBreakerOpenError``;
+- per-target latency, request and new-connection counters are exported to
+  Prometheus, the ratio of the last two is the connection reuse rate;
+- clients are kept per event loop and closed by ``aclose()`` on that loop:
+  on application shutdown, and by sync wrappers before they close the
+  private loop they ran on.
+
+Usage:
+    from app.core.http_clients import KNOWLEDGE_RUNTIME, http_clients
+
+    response = await http_clients.request(
+        KNOWLEDGE_RUNTIME, "POST", f"{base_url}/internal/rag/query", json=body
+    )
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+import pybreaker
+from prometheus_client import Counter, Histogram
+
+from app.core.circuit_breaker import (
+    CIRCUIT_BREAKER_REJECTED,
+    CircuitBreakerOpenError,
+    create_circuit_breaker,
+)
+from app.core.config import settings
+from shared.utils.http_client import traced_async_client
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on installed extras
+    HTTP2_AVAILABLE = False
+
+KNOWLEDGE_RUNTIME = "knowledge_runtime"
+LLM_API = "llm_api"
+WEB_SEARCH = "web_search"
+
+OUTBOUND_HTTP_DURATION = Histogram(
+    "outbound_http_request_duration_seconds",
+    "Time until response headers are received from an outbound HTTP target",
+    ["target", "method", "status_class"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+OUTBOUND_HTTP_REQUESTS = Counter(
+    "outbound_http_requests_total",
+    "Total requests sent to an outbound HTTP target",
+    ["target"],
+)
+OUTBOUND_HTTP_CONNECTIONS = Counter(
+    "outbound_http_connections_opened_total",
+    "Total new connections opened to an outbound HTTP target",
+    ["target"],
+)
+
+_START_EXTENSION = "wegent_started_at"
+
+
+@dataclass(frozen=True)
+class HttpTarget:
+    """Connection settings of a named outbound HTTP target."""
+
+    name: str
+    timeout: float = 30.0
+    connect_timeout: Optional[float] = None
+    max_connections: Optional[int] = None
+    max_keepalive_connections: Optional[int] = None
+    keepalive_expiry: Optional[float] = None
+    retries: Optional[int] = None
+    http2: bool = False
+    follow_redirects: bool = False
+    circuit_breaker: bool = False
+
+
+class _UpstreamServerError(Exception):
+    """Carries a 5xx response through the circuit breaker as a failure."""
+
+    def __init__(self, response: httpx.Response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+class HttpClientRegistry:
+    """Registry of pooled, traced ``httpx.AsyncClient`` instances by target."""
+
+    def __init__(self) -> None:
+        self._targets: Dict[str, HttpTarget] = {}
+        # event loop -> target -> client; pooled connections belong to one loop
+        self._clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]
+        ] = weakref.WeakKeyDictionary()
+
+    def register(self, target: HttpTarget) -> None:
+        """Register or replace a target; its clients are rebuilt on next use."""
+        self._targets[target.name] = target
+        for clients in self._clients.values():
+            clients.pop(target.name, None)
+
+    def get_target(self, name: str) -> HttpTarget:
+        target = self._targets.get(name)
+        if target is None:
+            raise ValueError(f"Unknown outbound HTTP target: {name}")
+        return target
+
+    def client(self, name: str) -> httpx.AsyncClient:
+        """Return the shared client of target ``name``, creating it on first use.
+
+        Pooled connections cannot be reused across event loops, so each loop
+        gets its own client. Code running a private loop (Celery tasks, sync
+        wrappers) must ``await aclose()`` on it before closing the loop.
+        """
+        clients = self._clients.setdefault(asyncio.get_running_loop(), {})
+        client = clients.get(name)
+        if client is None or client.is_closed:
+            client = self._build_client(self.get_target(name))
+            clients[name] = client
+        return client
+
+    def breaker(self, name: str) -> Optional[pybreaker.CircuitBreaker]:
+        """Return the circuit breaker guarding target ``name``, if any."""
+        if not self.get_target(name).circuit_breaker:
+            return None
+        return create_circuit_breaker(
+            f"http_{name}",
+            exclude=[asyncio.CancelledError],
+            throw_new_error_on_trip=False,
+        )
+
+    async def request(
+        self, name: str, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        """Send a request to target ``name`` on its pooled client.
+
+        Transport errors and 5xx responses count as circuit breaker failures;
+        5xx responses are still returned to the caller.
+
+        Raises:
+            CircuitBreakerOpenError: If the target's circuit is open
+            httpx.RequestError: On transport errors
+        """
+        send = getattr(self.client(name), method.lower())
+        breaker = self.breaker(name)
+        if breaker is None:
+            return await send(url, **kwargs)
+
+        try:
+            with breaker.calling():
+                response = await send(url, **kwargs)
+                if response.status_code >= 500:
+                    raise _UpstreamServerError(response)
+                return response
+        except _UpstreamServerError as e:
+            return e.response
+        except pybreaker.CircuitBreakerError as e:
+            CIRCUIT_BREAKER_REJECTED.labels(breaker_name=breaker.name).inc()
+            logger.error(f"[CircuitBreaker] {breaker.name} is OPEN, rejecting request")
+            raise CircuitBreakerOpenError(
+                breaker.name,
+                f"Service temporarily unavailable. Circuit will reset in {breaker.reset_timeout}s",
+            ) from e
+
+    async def aclose(self) -> None:
+        """Close every client created on the current event loop."""
+        clients = self._clients.pop(asyncio.get_running_loop(), {})
+        for name, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"[http_clients] Failed to close {name} client: {e}")
+
+    @staticmethod
+    def _build_client(target: HttpTarget) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=(
+                target.max_connections or settings.OUTBOUND_HTTP_MAX_CONNECTIONS
+            ),
+            max_keepalive_connections=(
+                target.max_keepalive_connections
+                or settings.OUTBOUND_HTTP_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            keepalive_expiry=(
+                target.keepalive_expiry or settings.OUTBOUND_HTTP_KEEPALIVE_EXPIRY
+            ),
+        )
+        retries = (
+            target.retries
+            if target.retries is not None
+            else settings.OUTBOUND_HTTP_RETRIES
+        )
+        http2 = target.http2 and settings.OUTBOUND_HTTP2_ENABLED and HTTP2_AVAILABLE
+        transport = httpx.AsyncHTTPTransport(
+            limits=limits, retries=retries, http2=http2
+        )
+        return traced_async_client(
+            timeout=httpx.Timeout(
+                target.timeout, connect=target.connect_timeout or target.timeout
+            ),
+            transport=transport,
+            follow_redirects=target.follow_redirects,
+            event_hooks=_metric_hooks(target.name),
+        )
+
+
+def _metric_hooks(name: str) -> Dict[str, list]:
+    """Build event hooks that record latency and connection reuse of a target."""
+
+    async def on_connection_event(event_name: str, info: Dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            OUTBOUND_HTTP_CONNECTIONS.labels(target=name).inc()
+
+    async def on_request(request: httpx.Request) -> None:
+        OUTBOUND_HTTP_REQUESTS.labels(target=name).inc()
+        request.extensions[_START_EXTENSION] = time.perf_counter()
+        if "trace" not in request.extensions:
+            request.extensions["trace"] = on_connection_event
+
+    async def on_response(response: httpx.Response) -> None:
+        started_at = response.request.extensions.get(_START_EXTENSION)
+        if started_at is None:
+            return
+        OUTBOUND_HTTP_DURATION.labels(
+            target=name,
+            method=response.request.method,
+            status_class=f"{response.status_code // 100}xx",
+        ).observe(time.perf_counter() - started_at)
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+http_clients = HttpClientRegistry()
+http_clients.register(
+    HttpTarget(name=KNOWLEDGE_RUNTIME, timeout=30.0, http2=True, circuit_breaker=True)
+)
+http_clients.register(
+    HttpTarget(
+        name=LLM_API,
+        timeout=float(settings.CHAT_API_TIMEOUT_SECONDS),
+        connect_timeout=10.0,
+        follow_redirects=True,
+    )
+)
+http_clients.register(HttpTarget(name=WEB_SEARCH, timeout=10.0))
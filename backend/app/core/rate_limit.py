@@ -7,10 +7,17 @@ Rate limiting module for API endpoints.
 
 Uses slowapi with Redis backend for distributed rate limiting.
 Rate limits are applied per API key for authenticated endpoints.
+
+External MCP limits use Redis token buckets evaluated by a Lua script, one
+round trip for all dimensions of a request, with per-process token leases
+absorbing bursts between round trips.
 """
 
 import logging
+import math
+import threading
 import time
+from dataclasses import dataclass
 from enum import Enum
 from hashlib import sha256
 from typing import Optional
@@ -100,6 +107,245 @@ def _build_external_mcp_rate_limit_keys(request: Request) -> list[str]:
     return keys
 
 
+@dataclass(frozen=True)
+class RateLimitRule:
+    """Token bucket for one rate-limit dimension.
+
+    The bucket refills ``limit`` tokens per ``window_seconds`` and holds at most
+    ``burst`` tokens (``limit`` when unset).
+    """
+
+    namespace: str
+    dimension: str
+    limit: int
+    window_seconds: int
+    burst: Optional[int] = None
+
+    @property
+    def capacity(self) -> int:
+        return self.burst or self.limit
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.limit / self.window_seconds
+
+    @property
+    def key(self) -> str:
+        return f"external_kb_mcp:bucket:{self.namespace}:{self.dimension}"
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    """Outcome of a rate-limit check and the budget left afterwards."""
+
+    status: ExternalMcpRateLimitStatus
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    retry_after_seconds: Optional[int] = None
+
+    def headers(self) -> dict[str, str]:
+        """Remaining-budget headers for the response."""
+        if self.limit is None or self.remaining is None:
+            return {}
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(max(self.remaining, 0)),
+        }
+        if self.retry_after_seconds:
+            headers["Retry-After"] = str(self.retry_after_seconds)
+        return headers
+
+
+ALLOWED_DECISION = RateLimitDecision(ExternalMcpRateLimitStatus.ALLOWED)
+
+# Refills every bucket, then takes the same number of tokens (up to ARGV[1])
+# from all of them, or none when any bucket is empty.
+# KEYS[i]: bucket of dimension i; ARGV[2i], ARGV[2i+1]: its capacity and
+# refill rate in tokens per second.
+# Returns {granted, tokens left in the emptiest bucket, retry after ms}.
+TOKEN_BUCKET_SCRIPT = """
+if redis.replicate_commands then
+    redis.replicate_commands()
+end
+local wanted = tonumber(ARGV[1])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local levels = {}
+local granted = wanted
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i])
+    local rate = tonumber(ARGV[2 * i + 1])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1])
+    local ts = tonumber(state[2])
+    if tokens == nil or ts == nil then
+        tokens = capacity
+    else
+        tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    end
+    levels[i] = tokens
+    granted = math.min(granted, math.floor(tokens))
+    if tokens < 1 then
+        retry_after = math.max(retry_after, (1 - tokens) / rate)
+    end
+end
+if granted < 1 then
+    granted = 0
+end
+local remaining = -1
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i])
+    local rate = tonumber(ARGV[2 * i + 1])
+    local tokens = levels[i] - granted
+    redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('PEXPIRE', key, math.ceil(capacity / rate * 1000) + 1000)
+    if remaining < 0 or math.floor(tokens) < remaining then
+        remaining = math.floor(tokens)
+    end
+end
+return {granted, remaining, math.ceil(retry_after * 1000)}
+"""
+
+
+@dataclass
+class _TokenLease:
+    size: int
+    tokens: int
+    expires_at: float
+    redis_remaining: int
+
+
+class _LocalTokenLeases:
+    """Tokens this process leased from Redis buckets and has not spent yet.
+
+    Leased tokens are already taken from Redis, so spending them locally never
+    admits more requests than the shared buckets allow. Lease sizes follow
+    demand: a lease spent before it expires doubles the next one, a lease that
+    expires shrinks the next one to what was used, so a steady client keeps
+    leasing one token and only bursts are served locally.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._leases: dict[tuple[str, ...], _TokenLease] = {}
+        self._sizes: dict[tuple[str, ...], int] = {}
+
+    def take(self, keys: tuple[str, ...]) -> Optional[int]:
+        """Spend one leased token; return the estimated remaining budget."""
+        with self._lock:
+            lease = self._leases.get(keys)
+            if lease is None:
+                return None
+            if lease.expires_at <= time.monotonic():
+                self._sizes[keys] = max(1, lease.size - lease.tokens)
+                del self._leases[keys]
+                return None
+            if lease.tokens <= 0:
+                self._sizes[keys] = lease.size * 2
+                del self._leases[keys]
+                return None
+            lease.tokens -= 1
+            return lease.redis_remaining + lease.tokens
+
+    def lease_size(self, keys: tuple[str, ...], rules: list[RateLimitRule]) -> int:
+        """Tokens to lease on the next round trip for ``keys``."""
+        if settings.RATE_LIMIT_LOCAL_LEASE_SECONDS <= 0:
+            return 1
+        # Never hoard more than a small share of the tightest bucket
+        smallest = min(rule.capacity for rule in rules)
+        limit = min(settings.RATE_LIMIT_LOCAL_LEASE_MAX_TOKENS, smallest // 20)
+        with self._lock:
+            return max(1, min(self._sizes.get(keys, 1), limit))
+
+    def store(self, keys: tuple[str, ...], granted: int, redis_remaining: int) -> None:
+        """Record ``granted`` tokens, one of which the caller already spent."""
+        if settings.RATE_LIMIT_LOCAL_LEASE_SECONDS <= 0:
+            return
+        with self._lock:
+            if len(self._leases) >= _MAX_LOCAL_LEASES:
+                self._leases.clear()
+            if len(self._sizes) >= _MAX_LOCAL_LEASES:
+                self._sizes.clear()
+            self._leases[keys] = _TokenLease(
+                size=granted,
+                tokens=granted - 1,
+                expires_at=time.monotonic() + settings.RATE_LIMIT_LOCAL_LEASE_SECONDS,
+                redis_remaining=redis_remaining,
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._leases.clear()
+            self._sizes.clear()
+
+
+_MAX_LOCAL_LEASES = 10000
+_local_token_leases = _LocalTokenLeases()
+_token_bucket_script = None
+
+
+def _get_token_bucket_script(client):
+    global _token_bucket_script
+    if (
+        _token_bucket_script is None
+        or _token_bucket_script.registered_client is not client
+    ):
+        _token_bucket_script = client.register_script(TOKEN_BUCKET_SCRIPT)
+    return _token_bucket_script
+
+
+def check_external_mcp_rate_limits(rules: list[RateLimitRule]) -> RateLimitDecision:
+    """Apply Redis-backed token-bucket rate limiting to several dimensions.
+
+    All buckets are refilled and charged in one script call; a request is
+    admitted only when every bucket has a token. Workers lease a few tokens
+    per call and admit following requests locally while the lease lasts.
+    """
+    rules = [rule for rule in rules if rule.limit > 0 and rule.window_seconds > 0]
+    if not rules:
+        return ALLOWED_DECISION
+
+    limit = min(rule.capacity for rule in rules)
+    keys = tuple(rule.key for rule in rules)
+    remaining = _local_token_leases.take(keys)
+    if remaining is not None:
+        return RateLimitDecision(
+            ExternalMcpRateLimitStatus.ALLOWED, limit=limit, remaining=remaining
+        )
+
+    client = _get_rate_limit_redis_client(require_global_enabled=False)
+    if client is None:
+        return RateLimitDecision(ExternalMcpRateLimitStatus.UNAVAILABLE)
+
+    args: list[float] = [_local_token_leases.lease_size(keys, rules)]
+    for rule in rules:
+        args.extend([rule.capacity, rule.refill_per_second])
+    try:
+        script = _get_token_bucket_script(client)
+        granted, redis_remaining, retry_after_ms = script(keys=list(keys), args=args)
+    except Exception as e:
+        logger.warning(f"External MCP rate limit check failed: {e}")
+        return RateLimitDecision(ExternalMcpRateLimitStatus.UNAVAILABLE)
+
+    granted = int(granted)
+    redis_remaining = int(redis_remaining)
+    if granted <= 0:
+        return RateLimitDecision(
+            ExternalMcpRateLimitStatus.LIMITED,
+            limit=limit,
+            remaining=0,
+            retry_after_seconds=max(1, math.ceil(int(retry_after_ms) / 1000)),
+        )
+
+    _local_token_leases.store(keys, granted, redis_remaining)
+    return RateLimitDecision(
+        ExternalMcpRateLimitStatus.ALLOWED,
+        limit=limit,
+        remaining=redis_remaining + granted - 1,
+    )
+
+
 def is_external_mcp_rate_limited(
     request: Request,
     *,
@@ -107,10 +353,10 @@ def is_external_mcp_rate_limited(
     limit: int,
     window_seconds: int,
 ) -> bool:
-    """Apply Redis-backed fixed-window rate limiting to external MCP requests.
+    """Apply Redis-backed token-bucket rate limiting to external MCP requests.
 
-    The limiter checks both IP and token dimensions. Any exceeded dimension blocks
-    the request. Raw tokens are never stored in Redis keys.
+    The limiter checks both IP and token dimensions. Any exhausted dimension
+    blocks the request. Raw tokens are never stored in Redis keys.
     """
     return (
         check_external_mcp_rate_limit(
@@ -118,7 +364,7 @@ def is_external_mcp_rate_limited(
             namespace=namespace,
             limit=limit,
             window_seconds=window_seconds,
-        )
+        ).status
         == ExternalMcpRateLimitStatus.LIMITED
     )
 
@@ -129,10 +375,10 @@ def check_external_mcp_rate_limit(
     namespace: str,
     limit: int,
     window_seconds: int,
-) -> ExternalMcpRateLimitStatus:
+) -> RateLimitDecision:
     """Apply external MCP rate limiting and report limiter availability."""
     if limit <= 0 or window_seconds <= 0:
-        return ExternalMcpRateLimitStatus.ALLOWED
+        return ALLOWED_DECISION
 
     return check_external_mcp_dimension_rate_limit(
         dimensions=_build_external_mcp_rate_limit_keys(request),
@@ -149,14 +395,14 @@ def is_external_mcp_dimension_rate_limited(
     limit: int,
     window_seconds: int,
 ) -> bool:
-    """Apply Redis-backed fixed-window rate limiting to explicit dimensions."""
+    """Apply Redis-backed token-bucket rate limiting to explicit dimensions."""
     return (
         check_external_mcp_dimension_rate_limit(
             dimensions=dimensions,
             namespace=namespace,
             limit=limit,
             window_seconds=window_seconds,
-        )
+        ).status
         == ExternalMcpRateLimitStatus.LIMITED
     )
 
@@ -167,35 +413,19 @@ def check_external_mcp_dimension_rate_limit(
     namespace: str,
     limit: int,
     window_seconds: int,
-) -> ExternalMcpRateLimitStatus:
-    """Apply Redis-backed fixed-window rate limiting to explicit dimensions."""
-    if not dimensions or limit <= 0 or window_seconds <= 0:
-        return ExternalMcpRateLimitStatus.ALLOWED
-
-    client = _get_rate_limit_redis_client(require_global_enabled=False)
-    if client is None:
-        return ExternalMcpRateLimitStatus.UNAVAILABLE
-
-    window = int(time.time() // window_seconds)
-    keys = [
-        f"external_kb_mcp:rate:{namespace}:{dimension}:{window}"
-        for dimension in dimensions
-    ]
-
-    try:
-        pipe = client.pipeline()
-        for key in keys:
-            pipe.incr(key)
-            pipe.expire(key, window_seconds + 1)
-        results = pipe.execute()
-    except Exception as e:
-        logger.warning(f"External MCP rate limit check failed: {e}")
-        return ExternalMcpRateLimitStatus.UNAVAILABLE
-
-    counts = results[::2]
-    if any(count > limit for count in counts):
-        return ExternalMcpRateLimitStatus.LIMITED
-    return ExternalMcpRateLimitStatus.ALLOWED
+) -> RateLimitDecision:
+    """Apply Redis-backed token-bucket rate limiting to explicit dimensions."""
+    return check_external_mcp_rate_limits(
+        [
+            RateLimitRule(
+                namespace=namespace,
+                dimension=dimension,
+                limit=limit,
+                window_seconds=window_seconds,
+            )
+            for dimension in dimensions
+        ]
+    )
 
 
 def get_api_key_from_request(request: Request) -> str:
@@ -0,0 +1,280 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Access logging and request telemetry as a pure ASGI middleware.
+
+Logs every request and response line, propagates the request ID and user into
+the logging context and, when OpenTelemetry is enabled, records request and
+response bodies on the current span.
+
+Bodies are teed while they stream through: at most ``max_body_size`` bytes are
+kept and the rest is only counted, so neither direction is buffered. Responses
+without a Content-Length, and SSE/NDJSON streams, pass through untouched.
+"""
+
+import json
+import logging
+import time
+import uuid
+from typing import Any, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.security import get_username_from_request
+from shared.telemetry.config import OtelConfig
+from shared.telemetry.context import (
+    set_request_context,
+    set_task_context,
+    set_user_context,
+)
+from shared.telemetry.context.large_data import log_json_body
+from shared.telemetry.core import is_telemetry_enabled
+
+logger = logging.getLogger(__name__)
+
+FORWARDED_LOG_HEADER_NAMES = (
+    "x-forwarded-for",
+    "x-forwarded-proto",
+    "x-forwarded-host",
+    "x-forwarded-port",
+    "x-forwarded-prefix",
+    "x-real-ip",
+    "forwarded",
+)
+MAX_LOGGED_HEADER_VALUE_LENGTH = 512
+HIGH_FREQUENCY_HTTP_PATHS = {
+    "/api/internal/callback",
+    "/api/internal/callback/batch",
+}
+BODY_CAPTURE_METHODS = {"POST", "PUT", "PATCH"}
+REDACTED_RESPONSE_HEADERS = {"authorization", "cookie", "set-cookie"}
+STREAMING_MEDIA_TYPES = ("text/event-stream", "application/x-ndjson")
+
+
+def _truncate_logged_header_value(value: str) -> str:
+    if len(value) <= MAX_LOGGED_HEADER_VALUE_LENGTH:
+        return value
+    return f"{value[:MAX_LOGGED_HEADER_VALUE_LENGTH]}... [truncated]"
+
+
+def _format_forwarded_headers_for_log(headers) -> str:
+    forwarded_headers = []
+    for header_name in FORWARDED_LOG_HEADER_NAMES:
+        header_value = headers.get(header_name)
+        if header_value:
+            forwarded_headers.append(
+                f"{header_name}={_truncate_logged_header_value(header_value)}"
+            )
+
+    if not forwarded_headers:
+        return ""
+
+    return f" headers={{{', '.join(forwarded_headers)}}}"
+
+
+def _request_context_fields(request_body: str) -> tuple[object, object, object]:
+    """Extract trace context only from JSON object request bodies."""
+
+    try:
+        body_json = json.loads(request_body)
+    except (json.JSONDecodeError, TypeError):
+        return None, None, None
+    if not isinstance(body_json, dict):
+        return None, None, None
+    return (
+        body_json.get("task_id"),
+        body_json.get("subtask_id"),
+        body_json.get("user_id"),
+    )
+
+
+def _is_streaming_response(headers: Headers) -> bool:
+    if "content-length" not in headers:
+        return True
+    content_type = headers.get("content-type", "")
+    return content_type.startswith(STREAMING_MEDIA_TYPES)
+
+
+class _BodyTee:
+    """Keep the first ``limit`` bytes of a streamed body and count the rest."""
+
+    __slots__ = ("limit", "chunks", "kept", "total")
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.chunks: list[bytes] = []
+        self.kept = 0
+        self.total = 0
+
+    def feed(self, chunk: bytes) -> None:
+        self.total += len(chunk)
+        room = self.limit - self.kept
+        if room > 0 and chunk:
+            part = chunk[:room]
+            self.chunks.append(part)
+            self.kept += len(part)
+
+    def text(self) -> Optional[str]:
+        if not self.total:
+            return None
+        body = b"".join(self.chunks).decode("utf-8", errors="replace")
+        if self.total > self.limit:
+            body += f"... [truncated, total size: {self.total} bytes]"
+        return body
+
+
+class RequestLoggingMiddleware:
+    """Log requests and capture request telemetry without buffering bodies."""
+
+    def __init__(self, app: ASGIApp, otel_config: OtelConfig) -> None:
+        self.app = app
+        self.otel_config = otel_config
+        self._trace: Any = None
+        if otel_config.enabled:
+            try:
+                from opentelemetry import trace
+
+                self._trace = trace
+            except ImportError:
+                logger.debug("opentelemetry not installed, request telemetry off")
+
+    def _telemetry_active(self) -> bool:
+        return self._trace is not None and is_telemetry_enabled()
+
+    def _recording_span(self) -> Any:
+        span = self._trace.get_current_span()
+        return span if span is not None and span.is_recording() else None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        path = request.url.path
+        # Skip logging for health check/probe requests (root path)
+        if path == "/":
+            await self.app(scope, receive, send)
+            return
+
+        # Reuse X-Request-ID from upstream if present, otherwise generate new one
+        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())[:8]
+        request.state.request_id = request_id
+        start_time = time.perf_counter()
+
+        username = get_username_from_request(request)
+        client_ip = request.client.host if request.client else "Unknown"
+        log_line = (
+            f"{request.method} {path} {request.query_params} "
+            f"{request_id} {client_ip} [{username}]"
+            f"{_format_forwarded_headers_for_log(request.headers)}"
+        )
+
+        # Always set request context for logging (works even without OTEL)
+        set_request_context(request_id)
+        if username:
+            set_user_context(user_name=username)
+
+        telemetry = self._telemetry_active()
+        if (
+            telemetry
+            and self.otel_config.capture_request_body
+            and request.method in BODY_CAPTURE_METHODS
+        ):
+            receive = self._tee_request_body(receive)
+
+        high_frequency_request = path in HIGH_FREQUENCY_HTTP_PATHS
+        if high_frequency_request:
+            logger.debug(f"request : {log_line}")
+        else:
+            logger.info(f"request : {log_line}")
+
+        response_tee: Optional[_BodyTee] = None
+        response_span: Any = None
+
+        async def send_with_logging(message: Message) -> None:
+            nonlocal response_tee, response_span
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                if telemetry:
+                    response_span = self._capture_response_start(headers)
+                    if response_span is not None:
+                        response_tee = _BodyTee(self.otel_config.max_body_size)
+
+                process_time = (time.perf_counter() - start_time) * 1000
+                response_log = (
+                    f"response: {log_line} {status_code} {process_time:.2f}ms"
+                )
+                if high_frequency_request and status_code < 400:
+                    logger.debug(response_log)
+                else:
+                    logger.info(response_log)
+
+                # Add request ID to response headers for client-side tracking
+                headers["X-Request-ID"] = request_id
+            elif message["type"] == "http.response.body" and response_tee is not None:
+                response_tee.feed(message.get("body", b""))
+                if not message.get("more_body", False):
+                    body = response_tee.text()
+                    response_tee = None
+                    if body:
+                        response_span.set_attribute("http.response.body", body)
+            await send(message)
+
+        await self.app(scope, receive, send_with_logging)
+
+    def _tee_request_body(self, receive: Receive) -> Receive:
+        tee: Optional[_BodyTee] = _BodyTee(self.otel_config.max_body_size)
+
+        async def receive_with_tee() -> Message:
+            nonlocal tee
+            message = await receive()
+            if tee is not None and message["type"] == "http.request":
+                tee.feed(message.get("body", b""))
+                if not message.get("more_body", False):
+                    body, tee = tee.text(), None
+                    if body:
+                        self._record_request_body(body)
+            return message
+
+        return receive_with_tee
+
+    def _record_request_body(self, body: str) -> None:
+        try:
+            # Extract task_id and subtask_id from request body for tracing
+            task_id, subtask_id, user_id = _request_context_fields(body)
+            if task_id is not None or subtask_id is not None:
+                set_task_context(task_id=task_id, subtask_id=subtask_id)
+            if user_id is not None:
+                set_user_context(user_id=str(user_id))
+            if self._recording_span() is not None:
+                log_json_body("http.request.body", body)
+        except Exception as e:
+            logger.debug(f"Failed to capture request body: {e}")
+
+    def _capture_response_start(self, headers: MutableHeaders) -> Any:
+        """Record response headers; return the span if the body should be teed."""
+        try:
+            span = self._recording_span()
+            if span is None:
+                return None
+            if self.otel_config.capture_response_headers:
+                for header_name, header_value in headers.items():
+                    # Skip sensitive headers
+                    if header_name.lower() in REDACTED_RESPONSE_HEADERS:
+                        header_value = "[REDACTED]"
+                    span.set_attribute(
+                        f"http.response.header.{header_name}", header_value
+                    )
+            if self.otel_config.capture_response_body and not _is_streaming_response(
+                headers
+            ):
+                return span
+        except Exception as e:
+            logger.debug(f"Failed to capture response telemetry: {e}")
+        return None
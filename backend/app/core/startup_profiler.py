@@ -0,0 +1,128 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Wall-clock tracing of backend startup.
+
+The tracer records how long each lifespan phase and each heavy module import
+takes, relative to the moment this module was first imported (which happens
+at the top of ``app.main``). Phases that run after the server started
+accepting traffic are marked ``deferred``. The summary is logged when startup
+completes and served by the admin startup profile endpoint.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Number of slowest entries listed in the startup summary log line
+SUMMARY_TOP_N = 8
+
+
+class StartupTracer:
+    """Collect per-phase and per-import startup timings."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self._origin = clock()
+        self._lock = threading.Lock()
+        self._phases: List[Dict[str, Any]] = []
+        self._imports: List[Dict[str, Any]] = []
+        self._ready_at: Optional[float] = None
+        self._completed_at: Optional[float] = None
+
+    def _offset(self, at: float) -> float:
+        return round((at - self._origin) * 1000, 2)
+
+    @contextmanager
+    def _timed(self, entries: List[Dict[str, Any]], entry: Dict[str, Any]):
+        started = self._clock()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            finished = self._clock()
+            entry.update(
+                started_ms=self._offset(started),
+                duration_ms=round((finished - started) * 1000, 2),
+                status=status,
+            )
+            with self._lock:
+                entries.append(entry)
+
+    @contextmanager
+    def phase(self, name: str, *, deferred: bool = False) -> Iterator[None]:
+        """Time a startup phase; works in sync and async code alike."""
+        with self._timed(self._phases, {"name": name, "deferred": deferred}):
+            yield
+
+    @contextmanager
+    def timed_import(self, module: str) -> Iterator[None]:
+        """Time the ``import`` statement(s) of a heavy module."""
+        with self._timed(self._imports, {"module": module}):
+            yield
+
+    def mark_ready(self) -> None:
+        """Record that startup finished and log the slowest entries."""
+        self._ready_at = self._clock()
+        logger.info("Startup profile: %s", self.summary())
+
+    def mark_completed(self) -> None:
+        """Record that the deferred phases finished."""
+        self._completed_at = self._clock()
+        deferred = [phase for phase in self._phases if phase["deferred"]]
+        logger.info(
+            "Deferred startup phases completed at %.0fms: %s",
+            self._offset(self._completed_at),
+            ", ".join(self._format(entry, "name") for entry in deferred) or "none",
+        )
+
+    @staticmethod
+    def _format(entry: Dict[str, Any], key: str) -> str:
+        suffix = "" if entry["status"] == "ok" else f" ({entry['status']})"
+        return f"{entry[key]}={entry['duration_ms']:.0f}ms{suffix}"
+
+    def summary(self) -> str:
+        """Return a one-line summary of the slowest phases and imports."""
+        ready = (
+            f"ready at {self._offset(self._ready_at):.0f}ms"
+            if self._ready_at is not None
+            else "not ready"
+        )
+        entries = [(entry, "name") for entry in self._phases] + [
+            (entry, "module") for entry in self._imports
+        ]
+        entries.sort(key=lambda item: item[0]["duration_ms"], reverse=True)
+        slowest = ", ".join(
+            self._format(entry, key) for entry, key in entries[:SUMMARY_TOP_N]
+        )
+        return f"{ready}; slowest: {slowest or 'none'}"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all recorded timings, in start order."""
+        with self._lock:
+            phases = sorted(self._phases, key=lambda entry: entry["started_ms"])
+            imports = sorted(self._imports, key=lambda entry: entry["started_ms"])
+        return {
+            "ready_ms": (
+                self._offset(self._ready_at) if self._ready_at is not None else None
+            ),
+            "completed_ms": (
+                self._offset(self._completed_at)
+                if self._completed_at is not None
+                else None
+            ),
+            "phases": [dict(entry) for entry in phases],
+            "imports": [dict(entry) for entry in imports],
+        }
+
+
+startup_tracer = StartupTracer()
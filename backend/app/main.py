@@ -2,6 +2,9 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+# Imported first so that the startup profile covers the module imports below
+from app.core.startup_profiler import startup_tracer
+
 # Redis instrumentation must be set up BEFORE importing redis module
 from shared.telemetry.config import get_otel_config as _get_otel_config_early
 
@@ -14,20 +17,19 @@ if _get_otel_config_early("wegent-backend").enabled:
         pass
 
 import asyncio
-import json
 import logging
 import signal
 import sys
-import time
-import uuid
 from contextlib import asynccontextmanager
 
 import redis
 import socketio
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.api import api_router
+with startup_tracer.timed_import("app.api.api"):
+    from app.api.api import api_router
+
 from app.core.config import settings
 from app.core.exceptions import (
     CustomHTTPException,
@@ -37,6 +39,7 @@ from app.core.exceptions import (
     validation_exception_handler,
 )
 from app.core.logging import setup_logging
+from app.core.request_logging import RequestLoggingMiddleware
 from app.core.shutdown import shutdown_manager
 from app.core.yaml_init import run_yaml_initialization
 from app.db.base import Base
@@ -46,69 +49,17 @@ from app.services.auth.internal_service_token import (
     require_internal_service_token_configured,
 )
 from app.services.jobs import start_background_jobs, stop_background_jobs
-from shared.telemetry.context.large_data import log_json_body
 
 # Redis lock key for startup operations (migrations + YAML init)
 # Only used to prevent concurrent initialization, not to skip initialization
 STARTUP_LOCK_KEY = "wegent:startup_lock"
 STARTUP_LOCK_TIMEOUT = 120  # 120 seconds timeout for migrations + YAML init
-FORWARDED_LOG_HEADER_NAMES = (
-    "x-forwarded-for",
-    "x-forwarded-proto",
-    "x-forwarded-host",
-    "x-forwarded-port",
-    "x-forwarded-prefix",
-    "x-real-ip",
-    "forwarded",
-)
-MAX_LOGGED_HEADER_VALUE_LENGTH = 512
-HIGH_FREQUENCY_HTTP_PATHS = {
-    "/api/internal/callback",
-    "/api/internal/callback/batch",
-}
 
 # Initialize logging at module level for use in lifespan
 setup_logging()
 _logger = logging.getLogger(__name__)
 
 
-def _truncate_logged_header_value(value: str) -> str:
-    if len(value) <= MAX_LOGGED_HEADER_VALUE_LENGTH:
-        return value
-    return f"{value[:MAX_LOGGED_HEADER_VALUE_LENGTH]}... [truncated]"
-
-
-def _format_forwarded_headers_for_log(headers) -> str:
-    forwarded_headers = []
-    for header_name in FORWARDED_LOG_HEADER_NAMES:
-        header_value = headers.get(header_name)
-        if header_value:
-            forwarded_headers.append(
-                f"{header_name}={_truncate_logged_header_value(header_value)}"
-            )
-
-    if not forwarded_headers:
-        return ""
-
-    return f" headers={{{', '.join(forwarded_headers)}}}"
-
-
-def _request_context_fields(request_body: str) -> tuple[object, object, object]:
-    """Extract trace context only from JSON object request bodies."""
-
-    try:
-        body_json = json.loads(request_body)
-    except (json.JSONDecodeError, TypeError):
-        return None, None, None
-    if not isinstance(body_json, dict):
-        return None, None, None
-    return (
-        body_json.get("task_id"),
-        body_json.get("subtask_id"),
-        body_json.get("user_id"),
-    )
-
-
 def _load_system_initialization_state(logger: logging.Logger) -> None:
     from app.services.admin_password_bootstrap import (
         load_admin_password_setup_state,
@@ -135,6 +86,197 @@ def _load_system_initialization_state(logger: logging.Logger) -> None:
         db.close()
 
 
+def _run_database_migrations(logger: logging.Logger) -> None:
+    if settings.ENVIRONMENT == "development" and settings.DB_AUTO_MIGRATE:
+        logger.info("Running database migrations automatically (development mode)...")
+        try:
+            import os
+            import subprocess
+
+            # Get the alembic.ini path
+            backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+            logger.info("Executing Alembic upgrade to head...")
+
+            # Run Alembic as subprocess to avoid output buffering issues
+            result = subprocess.run(
+                ["alembic", "upgrade", "head"],
+                cwd=backend_dir,
+                capture_output=False,  # Let output go directly to stdout/stderr
+                text=True,
+                check=True,
+            )
+
+            logger.info("✓ Alembic migrations completed successfully")
+        except subprocess.CalledProcessError as e:
+            logger.error(f"✗ Error running Alembic migrations: {e}")
+        except Exception as e:
+            logger.error(f"✗ Unexpected error running Alembic migrations: {e}")
+            raise
+    elif settings.ENVIRONMENT == "production":
+        logger.warning(
+            "Running in production mode. Database migrations must be run manually. "
+            "Please execute 'alembic upgrade head' to apply pending migrations."
+        )
+        # Check migration status
+        try:
+            import os
+
+            from alembic import command
+            from alembic.config import Config as AlembicConfig
+            from alembic.runtime.migration import MigrationContext
+            from alembic.script import ScriptDirectory
+
+            backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            alembic_ini_path = os.path.join(backend_dir, "alembic.ini")
+
+            alembic_cfg = AlembicConfig(alembic_ini_path)
+            script = ScriptDirectory.from_config(alembic_cfg)
+
+            # Get current revision from database
+            with engine.connect() as connection:
+                context = MigrationContext.configure(connection)
+                current_rev = context.get_current_revision()
+                head_rev = script.get_current_head()
+
+                if current_rev != head_rev:
+                    logger.warning(
+                        f"Database migration pending: current={current_rev}, latest={head_rev}. "
+                        "Run 'alembic upgrade head' manually in production."
+                    )
+                else:
+                    logger.info("Database schema is up to date")
+        except Exception as e:
+            logger.warning(f"Could not check migration status: {e}")
+    else:
+        logger.info("Alembic auto-upgrade is disabled")
+
+
+def _register_event_handlers(logger: logging.Logger) -> None:
+    from app.core.events import init_event_bus
+    from app.services.pet.event_handlers import register_pet_event_handlers
+    from app.services.subscription.task_completion_handler import (
+        TaskCompletedEvent,
+        handle_task_completed,
+    )
+
+    event_bus = init_event_bus()
+    register_pet_event_handlers()
+
+    # Register subscription task completion handler
+    event_bus.subscribe(TaskCompletedEvent, handle_task_completed)
+    logger.info("✓ Subscription task completion handler registered")
+
+    # Register IM channel task completion handler
+    # This sends task results back to IM channels (DingTalk, Feishu, etc.)
+    from app.services.channels import handle_channel_task_completed
+
+    event_bus.subscribe(TaskCompletedEvent, handle_channel_task_completed)
+    logger.info("✓ IM channel task completion handler registered")
+
+    # Register the durable Wework board-automation projection handler.
+    from app.services.project_automation_completion import (
+        register_project_automation_task_completion_handler,
+    )
+
+    register_project_automation_task_completion_handler(event_bus)
+    from app.services.board_team_completion import (
+        register_board_team_completion_handler,
+    )
+
+    register_board_team_completion_handler(event_bus)
+    logger.info("✓ Project automation task completion handler registered")
+
+    # Register code wiki run completion handler. A version's outcome is normally
+    # reported by the agent itself; this covers the agent never getting to speak,
+    # where the version would otherwise stay RUNNING until the staleness sweep looks
+    # at it — which only happens when the next run starts.
+    from app.services.knowledge.code_wiki.task_completion import conclude_code_wiki_run
+
+    event_bus.subscribe(TaskCompletedEvent, conclude_code_wiki_run)
+    logger.info("✓ Code wiki run completion handler registered")
+
+    # Register inbox auto-process handler
+    from app.core.events import QueueMessageCreatedEvent
+    from app.services.inbox.auto_process_handler import handle_inbox_message_created
+
+    event_bus.subscribe(QueueMessageCreatedEvent, handle_inbox_message_created)
+    logger.info("✓ Inbox auto-process handler registered")
+
+
+async def _init_pending_request_registry(logger: logging.Logger) -> None:
+    # Starts the Redis Pub/Sub listener for cross-worker skill interactions
+    with startup_tracer.phase("pending_request_registry"):
+        logger.info("Initializing PendingRequestRegistry...")
+        with startup_tracer.timed_import("chat_shell.tools"):
+            from chat_shell.tools import get_pending_request_registry
+
+        await get_pending_request_registry()
+        logger.info("✓ PendingRequestRegistry initialized")
+
+
+async def _load_system_initialization_state_in_thread(
+    logger: logging.Logger,
+) -> None:
+    with startup_tracer.phase("system_initialization_state"):
+        await asyncio.to_thread(_load_system_initialization_state, logger)
+
+
+async def _start_im_channels(logger: logging.Logger) -> None:
+    # Enables DingTalk, Feishu, WeChat bot integrations
+    with startup_tracer.phase("im_channels", deferred=True):
+        logger.info("Initializing IM Channel Manager...")
+        from app.services.channels import get_channel_manager
+
+        channel_manager = get_channel_manager()
+        db = SessionLocal()
+        try:
+            started_count = await channel_manager.start_all_enabled(db)
+            logger.info(
+                f"✓ IM Channel Manager initialized, {started_count} channels started"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to start IM channels: {e}")
+        finally:
+            db.close()
+
+
+async def _recover_video_jobs(app: FastAPI, logger: logging.Logger) -> None:
+    with startup_tracer.phase("video_job_recovery", deferred=True):
+        logger.info("Recovering in-progress video jobs...")
+        try:
+            from app.services.execution.agents.video.recovery import (
+                recover_video_jobs,
+                recover_video_jobs_after_stale_delay,
+            )
+
+            recovered_count = await recover_video_jobs()
+            logger.info("✓ Recovered %d in-progress video job(s)", recovered_count)
+            app.state.video_recovery_task = asyncio.create_task(
+                recover_video_jobs_after_stale_delay()
+            )
+        except Exception as e:
+            logger.warning("Failed to recover video jobs: %s", e, exc_info=True)
+
+
+async def _run_deferred_startup_phases(app: FastAPI, logger: logging.Logger) -> None:
+    """Run non-critical startup phases once the server accepts traffic."""
+    # Uvicorn binds its sockets right after the lifespan startup completes
+    await asyncio.sleep(settings.STARTUP_DEFERRED_PHASES_DELAY)
+    await asyncio.gather(_start_im_channels(logger), _recover_video_jobs(app, logger))
+    startup_tracer.mark_completed()
+
+
+async def _cancel_app_task(app: FastAPI, name: str) -> None:
+    task = getattr(app.state, name, None)
+    if task and not task.done():
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -148,12 +290,13 @@ async def lifespan(app: FastAPI):
     logger = _logger
 
     # ==================== STARTUP ====================
-    require_internal_service_token_configured()
-    from app.services.builtin_plugin_service import builtin_plugin_service
+    with startup_tracer.phase("plugin_validation"):
+        require_internal_service_token_configured()
+        from app.services.builtin_plugin_service import builtin_plugin_service
 
-    # Every Backend process validates any plugins marked as required.
-    # Optional plugins may be absent and are published only when staged.
-    builtin_plugin_service.validate_required_plugins()
+        # Every Backend process validates any plugins marked as required.
+        # Optional plugins may be absent and are published only when staged.
+        builtin_plugin_service.validate_required_plugins()
 
     # Try to get Redis client for distributed locking
     redis_client = None
@@ -167,9 +310,10 @@ async def lifespan(app: FastAPI):
     # YAML initialization is idempotent (checks if resources exist before creating)
     acquired_lock = False
     if redis_client:
-        acquired_lock = redis_client.set(
-            STARTUP_LOCK_KEY, "locked", nx=True, ex=STARTUP_LOCK_TIMEOUT
-        )
+        with startup_tracer.phase("startup_lock"):
+            acquired_lock = redis_client.set(
+                STARTUP_LOCK_KEY, "locked", nx=True, ex=STARTUP_LOCK_TIMEOUT
+            )
         if acquired_lock:
             logger.info("Acquired startup initialization lock")
         else:
@@ -190,84 +334,18 @@ async def lifespan(app: FastAPI):
     if acquired_lock:
         try:
             # Step 1: Run database migrations
-            if settings.ENVIRONMENT == "development" and settings.DB_AUTO_MIGRATE:
-                logger.info(
-                    "Running database migrations automatically (development mode)..."
-                )
-                try:
-                    import os
-                    import subprocess
-
-                    # Get the alembic.ini path
-                    backend_dir = os.path.dirname(
-                        os.path.dirname(os.path.abspath(__file__))
-                    )
-
-                    logger.info("Executing Alembic upgrade to head...")
-
-                    # Run Alembic as subprocess to avoid output buffering issues
-                    result = subprocess.run(
-                        ["alembic", "upgrade", "head"],
-                        cwd=backend_dir,
-                        capture_output=False,  # Let output go directly to stdout/stderr
-                        text=True,
-                        check=True,
-                    )
-
-                    logger.info("✓ Alembic migrations completed successfully")
-                except subprocess.CalledProcessError as e:
-                    logger.error(f"✗ Error running Alembic migrations: {e}")
-                except Exception as e:
-                    logger.error(f"✗ Unexpected error running Alembic migrations: {e}")
-                    raise
-            elif settings.ENVIRONMENT == "production":
-                logger.warning(
-                    "Running in production mode. Database migrations must be run manually. "
-                    "Please execute 'alembic upgrade head' to apply pending migrations."
-                )
-                # Check migration status
-                try:
-                    import os
-
-                    from alembic import command
-                    from alembic.config import Config as AlembicConfig
-                    from alembic.runtime.migration import MigrationContext
-                    from alembic.script import ScriptDirectory
-
-                    backend_dir = os.path.dirname(
-                        os.path.dirname(os.path.abspath(__file__))
-                    )
-                    alembic_ini_path = os.path.join(backend_dir, "alembic.ini")
-
-                    alembic_cfg = AlembicConfig(alembic_ini_path)
-                    script = ScriptDirectory.from_config(alembic_cfg)
-
-                    # Get current revision from database
-                    with engine.connect() as connection:
-                        context = MigrationContext.configure(connection)
-                        current_rev = context.get_current_revision()
-                        head_rev = script.get_current_head()
-
-                        if current_rev != head_rev:
-                            logger.warning(
-                                f"Database migration pending: current={current_rev}, latest={head_rev}. "
-                                "Run 'alembic upgrade head' manually in production."
-                            )
-                        else:
-                            logger.info("Database schema is up to date")
-                except Exception as e:
-                    logger.warning(f"Could not check migration status: {e}")
-            else:
-                logger.info("Alembic auto-upgrade is disabled")
+            with startup_tracer.phase("database_migrations"):
+                _run_database_migrations(logger)
 
             # Step 2: Initialize database with YAML configuration
             # This is idempotent - existing resources are skipped
             logger.info("Starting YAML data initialization...")
             db = SessionLocal()
             try:
-                run_yaml_initialization(
-                    db, skip_lock=True
-                )  # Skip internal lock since we already have one
+                with startup_tracer.phase("yaml_initialization"):
+                    run_yaml_initialization(
+                        db, skip_lock=True
+                    )  # Skip internal lock since we already have one
                 logger.info("✓ YAML data initialization completed")
             except Exception as e:
                 logger.error(f"✗ Failed to initialize database from YAML: {e}")
@@ -278,7 +356,8 @@ async def lifespan(app: FastAPI):
             logger.info("Starting built-in plugin marketplace synchronization...")
             db = SessionLocal()
             try:
-                published = builtin_plugin_service.sync_marketplace_plugins(db)
+                with startup_tracer.phase("plugin_marketplace_sync"):
+                    published = builtin_plugin_service.sync_marketplace_plugins(db)
                 logger.info(
                     "✓ Built-in plugin marketplace synchronization completed: count=%s",
                     len(published),
@@ -303,17 +382,43 @@ async def lifespan(app: FastAPI):
             redis_client.delete(STARTUP_LOCK_KEY)
             logger.info("Released startup initialization lock")
 
-    # Load system initialization state once per process after startup data exists.
-    _load_system_initialization_state(logger)
+    # Independent I/O phases: the system initialization state (database, loaded
+    # once per process after startup data exists) and the PendingRequestRegistry
+    # (Redis) are loaded concurrently.
+    await asyncio.gather(
+        _load_system_initialization_state_in_thread(logger),
+        _init_pending_request_registry(logger),
+    )
+
+    with startup_tracer.phase("transaction_hooks"):
+        from app.services.task_run_metric_hooks import task_run_metric_hooks
+
+        task_run_metric_hooks.register()
+        logger.info("✓ Task run metric transaction hooks registered")
+
+        from app.services.work_queue_counter_hooks import work_queue_counter_hooks
+
+        work_queue_counter_hooks.register()
+        logger.info("✓ Work queue counter transaction hooks registered")
 
-    from app.services.task_run_metric_hooks import task_run_metric_hooks
+        from app.services.subtask_result_masking import (
+            subtask_result_masking_hooks,
+        )
+
+        subtask_result_masking_hooks.register()
+        logger.info("✓ Subtask result masking hooks registered")
+
+        from app.services.chat.access.decision_cache_hooks import (
+            task_access_cache_hooks,
+        )
 
-    task_run_metric_hooks.register()
-    logger.info("✓ Task run metric transaction hooks registered")
+        task_access_cache_hooks.register()
+        logger.info("✓ Task access cache invalidation hooks registered")
 
     # Start background jobs
     logger.info("Starting background jobs...")
-    start_background_jobs(app)
+    with startup_tracer.phase("background_jobs"):
+        start_background_jobs(app)
     logger.info("✓ Background jobs started")
 
     # Start scheduler backend (for Flow scheduling)
@@ -322,9 +427,11 @@ async def lifespan(app: FastAPI):
     # - "apscheduler": Uses APScheduler (lightweight, no Redis required)
     # - "xxljob": Uses XXL-JOB distributed scheduler
     logger.info(f"Starting scheduler backend: {settings.SCHEDULER_BACKEND}...")
-    from app.core.scheduler import start_scheduler
+    with startup_tracer.phase("scheduler"):
+        with startup_tracer.timed_import("app.core.scheduler"):
+            from app.core.scheduler import start_scheduler
 
-    scheduler = start_scheduler()
+        scheduler = start_scheduler()
     if scheduler:
         logger.info(f"✓ Scheduler backend '{scheduler.backend_type}' started")
     else:
@@ -335,124 +442,34 @@ async def lifespan(app: FastAPI):
     # Initialize Socket.IO WebSocket emitter
     # Note: Chat namespace is already registered in create_socketio_asgi_app()
     logger.info("Initializing Socket.IO...")
-    from app.core.socketio import get_sio
-    from app.services.chat.webpage_ws_chat_emitter import init_ws_emitter
-    from app.services.loop_item_executions.wake import bind_socketio_loop
+    with startup_tracer.phase("socketio"):
+        from app.core.socketio import get_sio
+        from app.services.chat.webpage_ws_chat_emitter import init_ws_emitter
+        from app.services.loop_item_executions.wake import bind_socketio_loop
 
-    sio = get_sio()
-    try:
-        import asyncio
-
-        bind_socketio_loop(asyncio.get_running_loop())
-    except RuntimeError:
-        pass
-    init_ws_emitter(sio)
+        sio = get_sio()
+        try:
+            bind_socketio_loop(asyncio.get_running_loop())
+        except RuntimeError:
+            pass
+        init_ws_emitter(sio)
     logger.info("✓ Socket.IO initialized")
 
     # Initialize event bus and register event handlers
     # This enables decoupled communication between modules (e.g., pet experience updates)
     logger.info("Initializing event bus and registering handlers...")
-    from app.core.events import init_event_bus
-    from app.services.pet.event_handlers import register_pet_event_handlers
-    from app.services.subscription.task_completion_handler import (
-        TaskCompletedEvent,
-        handle_task_completed,
-    )
-
-    event_bus = init_event_bus()
-    register_pet_event_handlers()
-
-    # Register subscription task completion handler
-    event_bus.subscribe(TaskCompletedEvent, handle_task_completed)
-    logger.info("✓ Subscription task completion handler registered")
-
-    # Register IM channel task completion handler
-    # This sends task results back to IM channels (DingTalk, Feishu, etc.)
-    from app.services.channels import handle_channel_task_completed
-
-    event_bus.subscribe(TaskCompletedEvent, handle_channel_task_completed)
-    logger.info("✓ IM channel task completion handler registered")
-
-    # Register the durable Wework board-automation projection handler.
-    from app.services.project_automation_completion import (
-        register_project_automation_task_completion_handler,
-    )
-
-    register_project_automation_task_completion_handler(event_bus)
-    from app.services.board_team_completion import (
-        register_board_team_completion_handler,
-    )
-
-    register_board_team_completion_handler(event_bus)
-    logger.info("✓ Project automation task completion handler registered")
-
-    # Register code wiki run completion handler. A version's outcome is normally
-    # reported by the agent itself; this covers the agent never getting to speak,
-    # where the version would otherwise stay RUNNING until the staleness sweep looks
-    # at it — which only happens when the next run starts.
-    from app.services.knowledge.code_wiki.task_completion import conclude_code_wiki_run
-
-    event_bus.subscribe(TaskCompletedEvent, conclude_code_wiki_run)
-    logger.info("✓ Code wiki run completion handler registered")
-
-    # Register inbox auto-process handler
-    from app.core.events import QueueMessageCreatedEvent
-    from app.services.inbox.auto_process_handler import handle_inbox_message_created
-
-    event_bus.subscribe(QueueMessageCreatedEvent, handle_inbox_message_created)
-    logger.info("✓ Inbox auto-process handler registered")
-
+    with startup_tracer.phase("event_bus"):
+        _register_event_handlers(logger)
     logger.info("✓ Event bus initialized and handlers registered")
 
-    # Initialize PendingRequestRegistry for skill frontend interactions
-    # This starts the Redis Pub/Sub listener for cross-worker communication
-    logger.info("Initializing PendingRequestRegistry...")
-    from chat_shell.tools import (
-        get_pending_request_registry,
-    )
-
-    await get_pending_request_registry()
-    logger.info("✓ PendingRequestRegistry initialized")
-
     # Start device heartbeat monitor for local device support
     logger.info("Starting device heartbeat monitor...")
-    from app.services.device_monitor import start_device_monitor
+    with startup_tracer.phase("device_monitor"):
+        from app.services.device_monitor import start_device_monitor
 
-    start_device_monitor()
+        start_device_monitor()
     logger.info("✓ Device heartbeat monitor started")
 
-    # Initialize IM Channel Manager and start enabled channels
-    # This enables DingTalk, Feishu, WeChat bot integrations
-    logger.info("Initializing IM Channel Manager...")
-    from app.services.channels import get_channel_manager
-
-    channel_manager = get_channel_manager()
-    db = SessionLocal()
-    try:
-        started_count = await channel_manager.start_all_enabled(db)
-        logger.info(
-            f"✓ IM Channel Manager initialized, {started_count} channels started"
-        )
-    except Exception as e:
-        logger.warning(f"Failed to start IM channels: {e}")
-    finally:
-        db.close()
-
-    logger.info("Recovering in-progress video jobs...")
-    try:
-        from app.services.execution.agents.video.recovery import (
-            recover_video_jobs,
-            recover_video_jobs_after_stale_delay,
-        )
-
-        recovered_count = await recover_video_jobs()
-        logger.info("✓ Recovered %d in-progress video job(s)", recovered_count)
-        app.state.video_recovery_task = asyncio.create_task(
-            recover_video_jobs_after_stale_delay()
-        )
-    except Exception as e:
-        logger.warning("Failed to recover video jobs: %s", e, exc_info=True)
-
     logger.info("=" * 60)
     logger.info("Application startup completed successfully!")
     logger.info("=" * 60)
@@ -460,9 +477,15 @@ async def lifespan(app: FastAPI):
     # ==================== YIELD (app is running) ====================
     # Mounted ASGI applications do not receive parent lifespan events, so the
     # backend lifespan explicitly owns every mounted MCP session manager.
-    from app.mcp_server.server import mcp_session_managers_lifespan
+    with startup_tracer.timed_import("app.mcp_server.server"):
+        from app.mcp_server.server import mcp_session_managers_lifespan
 
     async with mcp_session_managers_lifespan():
+        startup_tracer.mark_ready()
+        # IM channels and video job recovery are not needed to serve requests
+        app.state.deferred_startup_task = asyncio.create_task(
+            _run_deferred_startup_phases(app, logger)
+        )
         yield
 
         # ==================== SHUTDOWN ====================
@@ -470,14 +493,8 @@ async def lifespan(app: FastAPI):
         logger.info("Graceful shutdown initiated...")
         logger.info("=" * 60)
 
-        video_recovery_task = getattr(app.state, "video_recovery_task", None)
-        if video_recovery_task and not video_recovery_task.done():
-            video_recovery_task.cancel()
-            try:
-                await video_recovery_task
-            except asyncio.CancelledError:
-                pass
-
+        await _cancel_app_task(app, "deferred_startup_task")
+        await _cancel_app_task(app, "video_recovery_task")
         # Step 1: Initiate graceful shutdown (mark as shutting down)
         await shutdown_manager.initiate_shutdown()
         logger.info(
@@ -521,8 +538,19 @@ async def lifespan(app: FastAPI):
         # Step 4: Stop background jobs
         await stop_background_jobs(app)
         task_run_metric_hooks.unregister()
+        work_queue_counter_hooks.unregister()
+        subtask_result_masking_hooks.unregister()
+        task_access_cache_hooks.unregister()
         logger.info("✓ Background jobs stopped")
 
+        from app.services.attachment.pdf_page_pool import pdf_page_pool
+
+        pdf_page_pool.shutdown()
+
+        from app.services.chat.storage.event_bus import subtask_event_bus
+
+        await subtask_event_bus.close()
+
         # Step 5: Stop scheduler backend
         from app.core.scheduler import get_active_scheduler, stop_scheduler
 
@@ -545,6 +573,11 @@ async def lifespan(app: FastAPI):
         await stop_device_monitor_async()
         logger.info("✓ Device heartbeat monitor stopped")
 
+        from app.core.http_clients import http_clients
+
+        await http_clients.aclose()
+        logger.info("✓ Outbound HTTP clients closed")
+
         # Step 7: Shutdown OpenTelemetry
         from shared.telemetry.config import get_otel_config
         from shared.telemetry.core import is_telemetry_enabled, shutdown_telemetry
@@ -619,177 +652,8 @@ def create_app():
     else:
         logger.debug("OpenTelemetry is disabled")
 
-    @app.middleware("http")
-    async def log_requests(request: Request, call_next):
-        from starlette.responses import StreamingResponse
-
-        # Skip logging for health check/probe requests (root path)
-        if request.url.path == "/":
-            return await call_next(request)
-
-        # Reuse X-Request-ID from upstream if present, otherwise generate new one
-        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())[:8]
-        request.state.request_id = request_id
-
-        start_time = time.time()
-
-        # Extract username from Authorization header
-        from app.core.security import get_username_from_request
-
-        username = get_username_from_request(request)
-
-        client_ip = request.client.host if request.client else "Unknown"
-        forwarded_headers_log = _format_forwarded_headers_for_log(request.headers)
-
-        # Always set request context for logging (works even without OTEL)
-        from shared.telemetry.context import (
-            set_request_context,
-            set_task_context,
-            set_user_context,
-        )
-
-        set_request_context(request_id)
-        if username:
-            set_user_context(user_name=username)
-
-        # Capture request body if OTEL is enabled and body capture is configured
-        request_body = None
-        if (
-            otel_config.enabled
-            and otel_config.capture_request_body
-            and request.method in ("POST", "PUT", "PATCH")
-        ):
-            try:
-                # Read the body
-                body_bytes = await request.body()
-                if body_bytes:
-                    # Limit body size to avoid huge spans
-                    max_body_size = otel_config.max_body_size
-                    if len(body_bytes) <= max_body_size:
-                        request_body = body_bytes.decode("utf-8", errors="replace")
-                    else:
-                        request_body = (
-                            body_bytes[:max_body_size].decode("utf-8", errors="replace")
-                            + f"... [truncated, total size: {len(body_bytes)} bytes]"
-                        )
-            except Exception as e:
-                logger.debug(f"Failed to capture request body: {e}")
-
-        # Add OpenTelemetry span attributes if enabled
-        if otel_config.enabled:
-            from opentelemetry import trace
-
-            from shared.telemetry.core import is_telemetry_enabled
-
-            if is_telemetry_enabled():
-                # Extract task_id and subtask_id from request body for tracing
-                if request_body:
-                    task_id, subtask_id, user_id = _request_context_fields(request_body)
-                    if task_id is not None or subtask_id is not None:
-                        set_task_context(task_id=task_id, subtask_id=subtask_id)
-                    if user_id is not None:
-                        set_user_context(user_id=str(user_id))
-
-                # Add request body to current span
-                if request_body:
-                    current_span = trace.get_current_span()
-                    if current_span and current_span.is_recording():
-                        log_json_body("http.request.body", request_body)
-
-        # Pre-request logging with request ID
-        request_log_message = (
-            f"request : {request.method} {request.url.path} {request.query_params} "
-            f"{request_id} {client_ip} [{username}]{forwarded_headers_log}"
-        )
-        high_frequency_request = request.url.path in HIGH_FREQUENCY_HTTP_PATHS
-        if high_frequency_request:
-            logger.debug(request_log_message)
-        else:
-            logger.info(request_log_message)
-
-        # Process request
-        response = await call_next(request)
-        process_time = (time.time() - start_time) * 1000
-
-        # Capture response headers and body if OTEL is enabled
-        if otel_config.enabled:
-            from opentelemetry import trace
-
-            from shared.telemetry.core import is_telemetry_enabled
-
-            if is_telemetry_enabled():
-                current_span = trace.get_current_span()
-                if current_span and current_span.is_recording():
-                    # Capture response headers
-                    if otel_config.capture_response_headers:
-                        for header_name, header_value in response.headers.items():
-                            # Skip sensitive headers
-                            if header_name.lower() in (
-                                "authorization",
-                                "cookie",
-                                "set-cookie",
-                            ):
-                                header_value = "[REDACTED]"
-                            current_span.set_attribute(
-                                f"http.response.header.{header_name}", header_value
-                            )
-
-                    # Capture response body (only for non-streaming responses)
-                    if otel_config.capture_response_body:
-                        if not isinstance(response, StreamingResponse):
-                            try:
-                                # For regular responses, we need to read and reconstruct the body
-                                response_body_chunks = []
-                                async for chunk in response.body_iterator:
-                                    response_body_chunks.append(chunk)
-
-                                response_body = b"".join(response_body_chunks)
-
-                                # Limit body size
-                                max_body_size = otel_config.max_body_size
-                                if response_body:
-                                    if len(response_body) <= max_body_size:
-                                        body_str = response_body.decode(
-                                            "utf-8", errors="replace"
-                                        )
-                                    else:
-                                        body_str = (
-                                            response_body[:max_body_size].decode(
-                                                "utf-8", errors="replace"
-                                            )
-                                            + f"... [truncated, total size: {len(response_body)} bytes]"
-                                        )
-                                    current_span.set_attribute(
-                                        "http.response.body", body_str
-                                    )
-
-                                # Reconstruct the response with the body
-                                from starlette.responses import Response
-
-                                response = Response(
-                                    content=response_body,
-                                    status_code=response.status_code,
-                                    headers=dict(response.headers),
-                                    media_type=response.media_type,
-                                )
-                            except Exception as e:
-                                logger.debug(f"Failed to capture response body: {e}")
-
-        # Post-request logging with request ID
-        response_log_message = (
-            f"response: {request.method} {request.url.path} {request.query_params} "
-            f"{request_id} {client_ip} [{username}]{forwarded_headers_log} "
-            f"{response.status_code} {process_time:.2f}ms"
-        )
-        if high_frequency_request and response.status_code < 400:
-            logger.debug(response_log_message)
-        else:
-            logger.info(response_log_message)
-
-        # Add request ID to response headers for client-side tracking
-        response.headers["X-Request-ID"] = request_id
-
-        return response
+    # Access logging and request telemetry (pure ASGI, bodies are not buffered)
+    app.add_middleware(RequestLoggingMiddleware, otel_config=otel_config)
 
     # Setup CORS
     app.add_middleware(
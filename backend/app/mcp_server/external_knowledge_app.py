@@ -19,8 +19,11 @@ from starlette.types import ASGIApp, Receive, Scope, Send
 from app.core.config import settings
 from app.core.rate_limit import (
     ExternalMcpRateLimitStatus,
+    RateLimitDecision,
+    RateLimitRule,
     check_external_mcp_dimension_rate_limit,
     check_external_mcp_rate_limit,
+    check_external_mcp_rate_limits,
     hash_rate_limit_value,
 )
 from app.mcp_server.server import (
@@ -176,35 +179,30 @@ async def _check_download_preauth_rate_limit(
 
     client_ip = request.client.host if request.client else "unknown"
     ip_hash = hash_rate_limit_value(client_ip)
-    ip_status = await run_in_threadpool(
-        partial(
-            check_external_mcp_dimension_rate_limit,
-            dimensions=[f"ip:{ip_hash}"],
-            namespace="download_preauth_ip",
-            limit=settings.EXTERNAL_KNOWLEDGE_MCP_DOWNLOAD_PREAUTH_IP_RATE_LIMIT_REQUESTS,
-            window_seconds=(
-                settings.EXTERNAL_KNOWLEDGE_MCP_DOWNLOAD_PREAUTH_IP_RATE_LIMIT_WINDOW_SECONDS
-            ),
-        )
-    )
-    rate_limit_response = _download_rate_limit_response(ip_status)
-    if rate_limit_response is not None:
-        return rate_limit_response
-
-    document_status = await run_in_threadpool(
-        partial(
-            check_external_mcp_dimension_rate_limit,
-            dimensions=[f"ip:{ip_hash}:document:{document_id}"],
-            namespace="download_preauth_document",
-            limit=(
-                settings.EXTERNAL_KNOWLEDGE_MCP_DOWNLOAD_PREAUTH_DOCUMENT_RATE_LIMIT_REQUESTS
+    decision = await run_in_threadpool(
+        check_external_mcp_rate_limits,
+        [
+            RateLimitRule(
+                namespace="download_preauth_ip",
+                dimension=f"ip:{ip_hash}",
+                limit=settings.EXTERNAL_KNOWLEDGE_MCP_DOWNLOAD_PREAUTH_IP_RATE_LIMIT_REQUESTS,
+                window_seconds=(
+                    settings.EXTERNAL_KNOWLEDGE_MCP_DOWNLOAD_PREAUTH_IP_RATE_LIMIT_WINDOW_SECONDS
+                ),
             ),
-            window_seconds=(
-                settings.EXTERNAL_KNOWLEDGE_MCP_DOWNLOAD_PREAUTH_DOCUMENT_RATE_LIMIT_WINDOW_SECONDS
+            RateLimitRule(
+                namespace="download_preauth_document",
+                dimension=f"ip:{ip_hash}:document:{document_id}",
+                limit=(
+                    settings.EXTERNAL_KNOWLEDGE_MCP_DOWNLOAD_PREAUTH_DOCUMENT_RATE_LIMIT_REQUESTS
+                ),
+                window_seconds=(
+                    settings.EXTERNAL_KNOWLEDGE_MCP_DOWNLOAD_PREAUTH_DOCUMENT_RATE_LIMIT_WINDOW_SECONDS
+                ),
             ),
-        )
+        ],
     )
-    return _download_rate_limit_response(document_status)
+    return _download_rate_limit_response(decision)
 
 
 async def _check_download_rate_limit(
@@ -215,7 +213,7 @@ async def _check_download_rate_limit(
     if not settings.EXTERNAL_KNOWLEDGE_MCP_DOWNLOAD_RATE_LIMIT_ENABLED:
         return None
 
-    rate_limit_status = await run_in_threadpool(
+    decision = await run_in_threadpool(
         partial(
             check_external_mcp_dimension_rate_limit,
             dimensions=[f"user:{user_id}:document:{document_id}"],
@@ -226,18 +224,19 @@ async def _check_download_rate_limit(
             ),
         )
     )
-    return _download_rate_limit_response(rate_limit_status)
+    return _download_rate_limit_response(decision)
 
 
 def _download_rate_limit_response(
-    status: ExternalMcpRateLimitStatus,
+    decision: RateLimitDecision,
 ) -> JSONResponse | None:
-    if status == ExternalMcpRateLimitStatus.LIMITED:
+    if decision.status == ExternalMcpRateLimitStatus.LIMITED:
         return JSONResponse(
             {"error": "Rate limit exceeded", "code": "rate_limited"},
             status_code=429,
+            headers=decision.headers(),
         )
-    if status == ExternalMcpRateLimitStatus.UNAVAILABLE:
+    if decision.status == ExternalMcpRateLimitStatus.UNAVAILABLE:
         return JSONResponse(
             {
                 "error": "Rate limit service unavailable",
@@ -333,7 +332,7 @@ async def _authenticate_external_user(
 
 
 class _ExternalKnowledgeRateLimitMiddleware:
-    """Redis-backed fixed-window rate limiter for external MCP transport."""
+    """Redis-backed token-bucket rate limiter for external MCP transport."""
 
     def __init__(self, app: ASGIApp) -> None:
         self.app = app
@@ -350,7 +349,7 @@ class _ExternalKnowledgeRateLimitMiddleware:
             return
 
         request = Request(scope)
-        rate_limit_status = await run_in_threadpool(
+        decision = await run_in_threadpool(
             partial(
                 check_external_mcp_rate_limit,
                 request,
@@ -361,7 +360,7 @@ class _ExternalKnowledgeRateLimitMiddleware:
                 ),
             )
         )
-        if rate_limit_status == ExternalMcpRateLimitStatus.LIMITED:
+        if decision.status == ExternalMcpRateLimitStatus.LIMITED:
             await _send_json_error(
                 scope,
                 receive,
@@ -369,9 +368,10 @@ class _ExternalKnowledgeRateLimitMiddleware:
                 error="Rate limit exceeded",
                 code="rate_limited",
                 status_code=429,
+                headers=decision.headers(),
             )
             return
-        if rate_limit_status == ExternalMcpRateLimitStatus.UNAVAILABLE:
+        if decision.status == ExternalMcpRateLimitStatus.UNAVAILABLE:
             await _send_json_error(
                 scope,
                 receive,
@@ -382,7 +382,27 @@ class _ExternalKnowledgeRateLimitMiddleware:
             )
             return
 
-        await self.app(scope, receive, send)
+        await self.app(scope, receive, _with_headers(send, decision.headers()))
+
+
+def _with_headers(send: Send, headers: dict[str, str]) -> Send:
+    """Wrap ``send`` to add ``headers`` to the response start message."""
+    if not headers:
+        return send
+    encoded = [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in headers.items()
+    ]
+
+    async def send_with_headers(message) -> None:
+        if message["type"] == "http.response.start":
+            message = {
+                **message,
+                "headers": [*message.get("headers", []), *encoded],
+            }
+        await send(message)
+
+    return send_with_headers
 
 
 async def _send_json_error(
@@ -393,8 +413,11 @@ async def _send_json_error(
     error: str,
     code: str,
     status_code: int,
+    headers: dict[str, str] | None = None,
 ) -> None:
-    response = JSONResponse({"error": error, "code": code}, status_code=status_code)
+    response = JSONResponse(
+        {"error": error, "code": code}, status_code=status_code, headers=headers
+    )
     await response(scope, receive, send)
 
 
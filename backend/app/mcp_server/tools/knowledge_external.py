@@ -254,7 +254,7 @@ def _search_rate_limit_status(user_id: int) -> ExternalMcpRateLimitStatus:
         namespace="search",
         limit=settings.EXTERNAL_KNOWLEDGE_MCP_SEARCH_RATE_LIMIT_REQUESTS,
         window_seconds=settings.EXTERNAL_KNOWLEDGE_MCP_SEARCH_RATE_LIMIT_WINDOW_SECONDS,
-    )
+    ).status
 
 
 def _resolve_external_namespace_fields(
@@ -21,6 +21,7 @@ from app.core.cache import cache_manager
 from app.core.config import settings
 from app.models.user import User
 from app.repository.interfaces.repository_provider import RepositoryProvider
+from app.repository.repository_cache import repository_list_cache
 from app.schemas.github import Branch, Repository
 from shared.utils.sensitive_data_masker import mask_string
 from shared.utils.url_util import build_url
@@ -328,9 +329,8 @@ class GerritProvider(RepositoryProvider):
                 repos.sort(key=lambda x: x["full_name"])
 
                 # Cache if all projects are retrieved (Gerrit returns all in one call)
-                cache_key = cache_manager.generate_full_cache_key(user.id, git_domain)
-                await cache_manager.set(
-                    cache_key, repos, expire=settings.REPO_CACHE_EXPIRED_TIME
+                await repository_list_cache.set_user_repositories(
+                    user.id, git_domain, repos
                 )
 
                 # Apply pagination
@@ -584,9 +584,6 @@ class GerritProvider(RepositoryProvider):
         Raises:
             HTTPException: Raised when search fails
         """
-        # Normalize query, case-insensitive
-        query_lower = query.lower()
-
         # Iterate all gerrit entries for this user (may be multiple domains)
         entries = self._get_git_infos(user)
         all_results: List[Dict[str, Any]] = []
@@ -601,108 +598,35 @@ class GerritProvider(RepositoryProvider):
                 # Skip empty token/user_name entries
                 continue
 
-            # 1) Try to get from full cache first (per domain)
-            full_cached = await self._get_all_repositories_from_cache(user, git_domain)
-            if full_cached:
-                if fullmatch:
-                    filtered_repos = [
-                        repo
-                        for repo in full_cached
-                        if query_lower == repo["name"].lower()
-                        or query_lower == repo["full_name"].lower()
-                    ]
-                else:
-                    filtered_repos = [
-                        repo
-                        for repo in full_cached
-                        if query_lower in repo["name"].lower()
-                        or query_lower in repo["full_name"].lower()
-                    ]
-                all_results.extend(
-                    [
-                        Repository(
-                            id=repo["id"],
-                            name=repo["name"],
-                            full_name=repo["full_name"],
-                            clone_url=repo["clone_url"],
-                            git_domain=git_domain,
-                            type="gerrit",
-                            private=repo["private"],
-                        ).model_dump()
-                        for repo in filtered_repos
-                    ]
+            # 1) Search the indexed full cache first (per domain)
+            matched = await repository_list_cache.search_user_repositories(
+                user.id, git_domain, query, fullmatch=fullmatch
+            )
+
+            # 2) If cache is being built for this domain, wait for the build to
+            # finish (woken by pub/sub, with timeout) and search again
+            if matched is None and await cache_manager.is_building(user.id, git_domain):
+                if not await cache_manager.wait_for_build(user.id, git_domain, timeout):
+                    raise HTTPException(
+                        status_code=408,
+                        detail="Timeout waiting for repository data to be ready",
+                    )
+                matched = await repository_list_cache.search_user_repositories(
+                    user.id, git_domain, query, fullmatch=fullmatch
                 )
-                continue
 
-            # 2) If cache is being built for this domain, wait (with timeout)
-            is_building = await cache_manager.is_building(user.id, git_domain)
-            if is_building:
-                start_time = asyncio.get_event_loop().time()
-                while await cache_manager.is_building(user.id, git_domain):
-                    if asyncio.get_event_loop().time() - start_time > timeout:
-                        raise HTTPException(
-                            status_code=408,
-                            detail="Timeout waiting for repository data to be ready",
-                        )
-                    await asyncio.sleep(1)
-
-                # Try cache again
-                full_cached = await self._get_all_repositories_from_cache(
-                    user, git_domain
+            # 3) No cache and not building (or build finished but still no cache), trigger domain-level full retrieval
+            if matched is None:
+                await self._fetch_all_repositories_async(
+                    user, git_token, user_name, git_domain, auth_type
                 )
-                if full_cached:
-                    if fullmatch:
-                        filtered_repos = [
-                            repo
-                            for repo in full_cached
-                            if query_lower == repo["name"].lower()
-                            or query_lower == repo["full_name"].lower()
-                        ]
-                    else:
-                        filtered_repos = [
-                            repo
-                            for repo in full_cached
-                            if query_lower in repo["name"].lower()
-                            or query_lower in repo["full_name"].lower()
-                        ]
-                    all_results.extend(
-                        [
-                            Repository(
-                                id=repo["id"],
-                                name=repo["name"],
-                                full_name=repo["full_name"],
-                                clone_url=repo["clone_url"],
-                                git_domain=git_domain,
-                                type="gerrit",
-                                private=repo["private"],
-                            ).model_dump()
-                            for repo in filtered_repos
-                        ]
-                    )
-                    continue
 
-            # 3) No cache and not building, trigger domain-level full retrieval
-            await self._fetch_all_repositories_async(
-                user, git_token, user_name, git_domain, auth_type
-            )
+                # 4) Search cache after building
+                matched = await repository_list_cache.search_user_repositories(
+                    user.id, git_domain, query, fullmatch=fullmatch
+                )
 
-            # 4) Try cache after building
-            full_cached = await self._get_all_repositories_from_cache(user, git_domain)
-            if full_cached:
-                if fullmatch:
-                    filtered_repos = [
-                        repo
-                        for repo in full_cached
-                        if query_lower == repo["name"].lower()
-                        or query_lower == repo["full_name"].lower()
-                    ]
-                else:
-                    filtered_repos = [
-                        repo
-                        for repo in full_cached
-                        if query_lower in repo["name"].lower()
-                        or query_lower in repo["full_name"].lower()
-                    ]
+            if matched is not None:
                 all_results.extend(
                     [
                         Repository(
@@ -714,7 +638,7 @@ class GerritProvider(RepositoryProvider):
                             type="gerrit",
                             private=repo["private"],
                         ).model_dump()
-                        for repo in filtered_repos
+                        for repo in matched
                     ]
                 )
 
@@ -790,9 +714,8 @@ class GerritProvider(RepositoryProvider):
             all_repos.sort(key=lambda x: x["full_name"])
 
             # Cache complete repository list
-            cache_key = cache_manager.generate_full_cache_key(user.id, git_domain)
-            await cache_manager.set(
-                cache_key, all_repos, expire=settings.REPO_CACHE_EXPIRED_TIME
+            await repository_list_cache.set_user_repositories(
+                user.id, git_domain, all_repos
             )
             self.logger.info(
                 f"Cache complete repository list for user gerrit {user.user_name}"
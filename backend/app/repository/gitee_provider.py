@@ -18,6 +18,8 @@ from app.core.cache import cache_manager
 from app.core.config import settings
 from app.models.user import User
 from app.repository.interfaces.repository_provider import RepositoryProvider
+from app.repository.repository_cache import repository_list_cache
+from app.repository.search_index import RepositorySearchIndex
 from app.schemas.github import Branch, Repository
 from shared.utils.sensitive_data_masker import mask_string
 from shared.utils.url_util import build_url
@@ -171,11 +173,8 @@ class GiteeProvider(RepositoryProvider):
                 repos = response.json()
 
                 if len(repos) < limit:
-                    cache_key = cache_manager.generate_full_cache_key(
-                        user.id, git_domain
-                    )
-                    await cache_manager.set(
-                        cache_key, repos, expire=settings.REPO_CACHE_EXPIRED_TIME
+                    await repository_list_cache.set_user_repositories(
+                        user.id, git_domain, repos
                     )
                 else:
                     asyncio.create_task(
@@ -385,9 +384,6 @@ class GiteeProvider(RepositoryProvider):
         Raises:
             HTTPException: Raised when search fails
         """
-        # Normalize query, case-insensitive
-        query_lower = query.lower()
-
         # Iterate all gitee entries for this user (may be multiple domains)
         entries = self._get_git_infos(user)
         all_results: List[Dict[str, Any]] = []
@@ -399,106 +395,33 @@ class GiteeProvider(RepositoryProvider):
                 # skip empty token entries
                 continue
 
-            # 1) Try to get from full cache first (per domain)
-            full_cached = await self._get_all_repositories_from_cache(user, git_domain)
-            if full_cached:
-                if fullmatch:
-                    filtered_repos = [
-                        repo
-                        for repo in full_cached
-                        if query_lower == repo["name"].lower()
-                        or query_lower == repo["full_name"].lower()
-                    ]
-                else:
-                    filtered_repos = [
-                        repo
-                        for repo in full_cached
-                        if query_lower in repo["name"].lower()
-                        or query_lower in repo["full_name"].lower()
-                    ]
-                all_results.extend(
-                    [
-                        Repository(
-                            id=repo["id"],
-                            name=repo["name"],
-                            full_name=repo["full_name"],
-                            clone_url=repo["clone_url"],
-                            git_domain=git_domain,
-                            type="gitee",
-                            private=repo["private"],
-                        ).model_dump()
-                        for repo in filtered_repos
-                    ]
-                )
-                continue
+            # 1) Search the indexed full cache first (per domain)
+            matched = await repository_list_cache.search_user_repositories(
+                user.id, git_domain, query, fullmatch=fullmatch
+            )
 
-            # 2) If cache is being built for this domain, wait (with timeout)
-            is_building = await cache_manager.is_building(user.id, git_domain)
-            if is_building:
-                start_time = asyncio.get_event_loop().time()
-                while await cache_manager.is_building(user.id, git_domain):
-                    if asyncio.get_event_loop().time() - start_time > timeout:
-                        raise HTTPException(
-                            status_code=408,
-                            detail="Timeout waiting for repository data to be ready",
-                        )
-                    await asyncio.sleep(1)
-
-                # try cache again
-                full_cached = await self._get_all_repositories_from_cache(
-                    user, git_domain
-                )
-                if full_cached:
-                    if fullmatch:
-                        filtered_repos = [
-                            repo
-                            for repo in full_cached
-                            if query_lower == repo["name"].lower()
-                            or query_lower == repo["full_name"].lower()
-                        ]
-                    else:
-                        filtered_repos = [
-                            repo
-                            for repo in full_cached
-                            if query_lower in repo["name"].lower()
-                            or query_lower in repo["full_name"].lower()
-                        ]
-                    all_results.extend(
-                        [
-                            Repository(
-                                id=repo["id"],
-                                name=repo["name"],
-                                full_name=repo["full_name"],
-                                clone_url=repo["clone_url"],
-                                git_domain=git_domain,
-                                type="gitee",
-                                private=repo["private"],
-                            ).model_dump()
-                            for repo in filtered_repos
-                        ]
+            # 2) If cache is being built for this domain, wait for the build to
+            # finish (woken by pub/sub, with timeout) and search again
+            if matched is None and await cache_manager.is_building(user.id, git_domain):
+                if not await cache_manager.wait_for_build(user.id, git_domain, timeout):
+                    raise HTTPException(
+                        status_code=408,
+                        detail="Timeout waiting for repository data to be ready",
                     )
-                    continue
+                matched = await repository_list_cache.search_user_repositories(
+                    user.id, git_domain, query, fullmatch=fullmatch
+                )
 
             # 3) No cache and not building (or build finished but still no cache), trigger domain-level full retrieval
-            await self._fetch_all_repositories_async(user, git_token, git_domain)
+            if matched is None:
+                await self._fetch_all_repositories_async(user, git_token, git_domain)
 
-            # 4) Try cache after building
-            full_cached = await self._get_all_repositories_from_cache(user, git_domain)
-            if full_cached:
-                if fullmatch:
-                    filtered_repos = [
-                        repo
-                        for repo in full_cached
-                        if query_lower == repo["name"].lower()
-                        or query_lower == repo["full_name"].lower()
-                    ]
-                else:
-                    filtered_repos = [
-                        repo
-                        for repo in full_cached
-                        if query_lower in repo["name"].lower()
-                        or query_lower in repo["full_name"].lower()
-                    ]
+                # 4) Search cache after building
+                matched = await repository_list_cache.search_user_repositories(
+                    user.id, git_domain, query, fullmatch=fullmatch
+                )
+
+            if matched is not None:
                 all_results.extend(
                     [
                         Repository(
@@ -510,7 +433,7 @@ class GiteeProvider(RepositoryProvider):
                             type="gitee",
                             private=repo["private"],
                         ).model_dump()
-                        for repo in filtered_repos
+                        for repo in matched
                     ]
                 )
                 continue
@@ -543,20 +466,9 @@ class GiteeProvider(RepositoryProvider):
                     }
                     for repo in repos
                 ]
-                if fullmatch:
-                    filtered_repos = [
-                        r
-                        for r in mapped
-                        if query_lower == r["name"].lower()
-                        or query_lower == r["full_name"].lower()
-                    ]
-                else:
-                    filtered_repos = [
-                        r
-                        for r in mapped
-                        if query_lower in r["name"].lower()
-                        or query_lower in r["full_name"].lower()
-                    ]
+                filtered_repos = RepositorySearchIndex(mapped).search(
+                    query, fullmatch=fullmatch
+                )
                 all_results.extend(
                     [
                         Repository(
@@ -655,9 +567,8 @@ class GiteeProvider(RepositoryProvider):
                     break
 
             # Cache complete repository list
-            cache_key = cache_manager.generate_full_cache_key(user.id, git_domain)
-            await cache_manager.set(
-                cache_key, all_repos, expire=settings.REPO_CACHE_EXPIRED_TIME
+            await repository_list_cache.set_user_repositories(
+                user.id, git_domain, all_repos
             )
             self.logger.info(
                 f"Cache complete repository list for user gitee {user.user_name}"
@@ -0,0 +1,153 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Cached repository lists and their search indexes.
+
+A user's full repository list is stored in Redis together with its
+RepositorySearchIndex payload and a version stamp, all written in one
+transaction with the same TTL. Each process keeps recently used indexes in
+memory and only re-reads the small stamp per search.
+"""
+
+import logging
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from app.core.cache import cache_manager
+from app.core.config import settings
+from app.repository.search_index import RepositorySearchIndex
+
+logger = logging.getLogger(__name__)
+
+# Number of repository search indexes kept in process memory
+_SEARCH_INDEX_LOCAL_CAPACITY = 128
+
+
+class RepositoryListCache:
+    """Repository list cache with a per-process search index layer"""
+
+    def __init__(self):
+        # (user_id, git_domain) -> (stamp, index), most recently used last
+        self._search_indexes: OrderedDict = OrderedDict()
+
+    @staticmethod
+    def generate_index_cache_key(user_id: int, git_domain: str) -> str:
+        """Generate cache key for the search index of the full repositories list"""
+        return f"git_repos_index:{user_id}:{git_domain}"
+
+    @staticmethod
+    def generate_stamp_cache_key(user_id: int, git_domain: str) -> str:
+        """Generate cache key for the version stamp of the full repositories list"""
+        return f"git_repos_stamp:{user_id}:{git_domain}"
+
+    async def set_user_repositories(
+        self,
+        user_id: int,
+        git_domain: str,
+        repos: List[Dict[str, Any]],
+        expire: int = settings.REPO_CACHE_EXPIRED_TIME,
+    ) -> bool:
+        """Cache a user's full repository list together with its search index.
+
+        The list, the index payload and a fresh version stamp are written in
+        one transaction with the same TTL, so readers never pair a list with
+        an index built for a different list.
+        """
+        index = RepositorySearchIndex(repos)
+        stamp = uuid.uuid4().hex
+        results = await cache_manager.set_many(
+            {
+                cache_manager.generate_full_cache_key(user_id, git_domain): repos,
+                self.generate_index_cache_key(user_id, git_domain): index.to_payload(),
+                self.generate_stamp_cache_key(user_id, git_domain): stamp,
+            },
+            expire=expire,
+            transaction=True,
+        )
+        if not all(results.values()):
+            logger.error(
+                f"Error caching repositories for user {user_id}, domain {git_domain}"
+            )
+            return False
+        self._remember_search_index(user_id, git_domain, stamp, index)
+        return True
+
+    async def delete_user_repositories(self, user_id: int, git_domain: str) -> bool:
+        """Delete a user's cached repository list and its search index"""
+        self._search_indexes.pop((user_id, git_domain), None)
+        return await cache_manager.delete(
+            cache_manager.generate_full_cache_key(user_id, git_domain),
+            self.generate_index_cache_key(user_id, git_domain),
+            self.generate_stamp_cache_key(user_id, git_domain),
+        )
+
+    async def get_repository_search_index(
+        self, user_id: int, git_domain: str
+    ) -> Optional[RepositorySearchIndex]:
+        """Return the search index of a user's cached repository list.
+
+        Only the small version stamp is read from Redis when the index for the
+        current stamp is already held in process memory. Returns None when no
+        (non-empty) repository list is cached.
+        """
+        local_key = (user_id, git_domain)
+        stamp = await cache_manager.get(
+            self.generate_stamp_cache_key(user_id, git_domain)
+        )
+        cached = self._search_indexes.get(local_key)
+        if stamp is not None and cached is not None and cached[0] == stamp:
+            self._search_indexes.move_to_end(local_key)
+            return cached[1]
+
+        full_key = cache_manager.generate_full_cache_key(user_id, git_domain)
+        index_key = self.generate_index_cache_key(user_id, git_domain)
+        values = await cache_manager.mget([full_key, index_key])
+        repos = values.get(full_key)
+        if repos is None:
+            self._search_indexes.pop(local_key, None)
+            return None
+        if not repos:
+            return None
+
+        if stamp is None:
+            # List cached without an index (e.g. written before indexing
+            # existed); index it now so later searches hit the fast path
+            await self.set_user_repositories(user_id, git_domain, repos)
+            cached = self._search_indexes.get(local_key)
+            return cached[1] if cached else RepositorySearchIndex(repos)
+
+        index = RepositorySearchIndex.from_payload(repos, values.get(index_key))
+        self._remember_search_index(user_id, git_domain, stamp, index)
+        return index
+
+    async def search_user_repositories(
+        self, user_id: int, git_domain: str, query: str, fullmatch: bool = False
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Search a user's cached repositories, ranked by relevance.
+
+        Returns None when the repository list is not cached.
+        """
+        index = await self.get_repository_search_index(user_id, git_domain)
+        if index is None:
+            return None
+        return index.search(query, fullmatch=fullmatch)
+
+    def _remember_search_index(
+        self,
+        user_id: int,
+        git_domain: str,
+        stamp: str,
+        index: RepositorySearchIndex,
+    ) -> None:
+        local_key = (user_id, git_domain)
+        self._search_indexes[local_key] = (stamp, index)
+        self._search_indexes.move_to_end(local_key)
+        while len(self._search_indexes) > _SEARCH_INDEX_LOCAL_CAPACITY:
+            self._search_indexes.popitem(last=False)
+
+
+# Global repository list cache instance
+repository_list_cache = RepositoryListCache()
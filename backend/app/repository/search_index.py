@@ -0,0 +1,139 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+In-memory search index over a user's cached repository list.
+
+The index is built once when the full repository list of a user/domain is
+cached and is stored next to it, so autocomplete queries no longer rescan
+every repository on each keystroke:
+
+- Queries of three or more characters are answered from a trigram posting
+  index (candidates are intersected, then verified with a substring check).
+- Shorter queries scan precomputed lower-case keys.
+- Full-match queries use an exact-name lookup table.
+
+Results are ranked: exact name, exact full name, name prefix, full name or
+path segment prefix, substring in name, substring in full name. Ties keep
+shorter names first, then the original (provider) order.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+# Bump when the payload layout changes so stale payloads are rebuilt
+INDEX_FORMAT_VERSION = 1
+
+_NGRAM = 3
+
+_RANK_EXACT_NAME = 0
+_RANK_EXACT_FULL_NAME = 1
+_RANK_NAME_PREFIX = 2
+_RANK_SEGMENT_PREFIX = 3
+_RANK_NAME_SUBSTRING = 4
+_RANK_FULL_NAME_SUBSTRING = 5
+
+
+def _trigrams(text: str) -> Iterable[str]:
+    return {text[i : i + _NGRAM] for i in range(len(text) - _NGRAM + 1)}
+
+
+class RepositorySearchIndex:
+    """Trigram index with prefix-aware ranking over a list of repository dicts.
+
+    Each repository must provide ``name`` and ``full_name``; the original
+    dicts are returned unchanged by :meth:`search`.
+    """
+
+    def __init__(
+        self,
+        repos: List[Dict[str, Any]],
+        trigrams: Optional[Dict[str, List[int]]] = None,
+    ):
+        self.repos = repos
+        self._names = [str(repo.get("name") or "").lower() for repo in repos]
+        self._full_names = [str(repo.get("full_name") or "").lower() for repo in repos]
+        self._exact: Dict[str, List[int]] = defaultdict(list)
+        for idx, (name, full_name) in enumerate(zip(self._names, self._full_names)):
+            self._exact[name].append(idx)
+            if full_name != name:
+                self._exact[full_name].append(idx)
+        self._trigrams = trigrams if trigrams is not None else self._build_trigrams()
+
+    def _build_trigrams(self) -> Dict[str, List[int]]:
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for idx, (name, full_name) in enumerate(zip(self._names, self._full_names)):
+            for gram in _trigrams(name) | _trigrams(full_name):
+                postings[gram].append(idx)
+        return dict(postings)
+
+    def to_payload(self) -> Dict[str, Any]:
+        """Serialize the derived index (not the repositories) for storage."""
+        return {"format": INDEX_FORMAT_VERSION, "trigrams": self._trigrams}
+
+    @classmethod
+    def from_payload(
+        cls, repos: List[Dict[str, Any]], payload: Optional[Dict[str, Any]]
+    ) -> "RepositorySearchIndex":
+        """Restore an index for ``repos``, rebuilding it if the payload is unusable."""
+        if (
+            isinstance(payload, dict)
+            and payload.get("format") == INDEX_FORMAT_VERSION
+            and isinstance(payload.get("trigrams"), dict)
+        ):
+            return cls(repos, trigrams=payload["trigrams"])
+        return cls(repos)
+
+    def search(self, query: str, fullmatch: bool = False) -> List[Dict[str, Any]]:
+        """Return repositories matching ``query`` (case-insensitive), ranked."""
+        query_lower = query.lower()
+        if fullmatch:
+            return [self.repos[idx] for idx in self._exact.get(query_lower, [])]
+
+        if len(query_lower) >= _NGRAM:
+            candidates: Iterable[int] = self._trigram_candidates(query_lower)
+        else:
+            candidates = range(len(self.repos))
+
+        ranked = []
+        for idx in candidates:
+            rank = self._rank(idx, query_lower)
+            if rank is not None:
+                ranked.append((rank, len(self._names[idx]), idx))
+        ranked.sort()
+        return [self.repos[idx] for _, _, idx in ranked]
+
+    def _trigram_candidates(self, query_lower: str) -> List[int]:
+        postings = []
+        for gram in _trigrams(query_lower):
+            posting = self._trigrams.get(gram)
+            if not posting:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        return list(candidates)
+
+    def _rank(self, idx: int, query_lower: str) -> Optional[int]:
+        name = self._names[idx]
+        full_name = self._full_names[idx]
+        if name == query_lower:
+            return _RANK_EXACT_NAME
+        if full_name == query_lower:
+            return _RANK_EXACT_FULL_NAME
+        if name.startswith(query_lower):
+            return _RANK_NAME_PREFIX
+        if full_name.startswith(query_lower) or any(
+            segment.startswith(query_lower) for segment in full_name.split("/")
+        ):
+            return _RANK_SEGMENT_PREFIX
+        if query_lower in name:
+            return _RANK_NAME_SUBSTRING
+        if query_lower in full_name:
+            return _RANK_FULL_NAME_SUBSTRING
+        return None
@@ -315,6 +315,9 @@ class RuntimeWorkListResponse(BaseModel):
         alias="chats",
     )
     total_tasks: int = Field(..., alias="totalTasks")
+    # Snapshot versions of the listed devices; changes whenever their runtime
+    # work changes. None when a device was listed without a snapshot.
+    version: Optional[str] = None
 
 
 class ArchivedConversationsListRequest(BaseModel):
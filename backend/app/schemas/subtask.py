@@ -2,10 +2,13 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import copy
 import os
 
 # Import the masking utility - using relative import from backend
 import sys
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from enum import Enum
 from typing import Any, List, Optional
@@ -21,7 +24,43 @@ project_root = os.path.dirname(
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from shared.utils.sensitive_data_masker import mask_sensitive_data
+from shared.utils.sensitive_data_masker import (
+    MASKING_RULES_VERSION,
+    mask_sensitive_data,
+)
+
+# Masked subtask results, keyed by (subtask id, updated_at). Serializing a task
+# page masks every result again, which dominates for large tool transcripts.
+MAX_MASKED_RESULT_CACHE_ENTRIES = 256
+_masked_result_cache: OrderedDict[
+    tuple[int, datetime], tuple[dict[str, Any], dict[str, Any]]
+] = OrderedDict()
+_masked_result_cache_lock = threading.Lock()
+
+
+def mask_subtask_result(
+    subtask_id: int, updated_at: datetime, result: dict[str, Any]
+) -> dict[str, Any]:
+    """Mask a subtask result, reusing the masking of the same version.
+
+    updated_at only has second precision, so a cached entry is reused only
+    when the stored result is also unchanged.
+    """
+    key = (subtask_id, updated_at)
+    with _masked_result_cache_lock:
+        cached = _masked_result_cache.get(key)
+        if cached is not None:
+            _masked_result_cache.move_to_end(key)
+    if cached is not None and cached[0] == result:
+        return copy.deepcopy(cached[1])
+
+    masked = mask_sensitive_data(result)
+    with _masked_result_cache_lock:
+        _masked_result_cache[key] = (copy.deepcopy(result), masked)
+        _masked_result_cache.move_to_end(key)
+        while len(_masked_result_cache) > MAX_MASKED_RESULT_CACHE_ENTRIES:
+            _masked_result_cache.popitem(last=False)
+    return copy.deepcopy(masked)
 
 
 class SubtaskStatus(str, Enum):
@@ -202,6 +241,9 @@ class SubtaskInDB(SubtaskBase):
     sender_user_id: Optional[int] = None  # User ID when sender_type=USER
     sender_user_name: Optional[str] = None  # User name for display
     reply_to_subtask_id: Optional[int] = None  # Quoted message ID
+    # Stored masked projection of result (app.services.subtask_result_masking)
+    masked_result: Optional[Any] = Field(default=None, exclude=True)
+    result_mask_version: Optional[int] = Field(default=0, exclude=True)
 
     @field_validator("sender_type", mode="before")
     @classmethod
@@ -241,7 +283,11 @@ class SubtaskInDB(SubtaskBase):
         """Mask sensitive data in result field before serialization"""
         if value is None:
             return None
-        return mask_sensitive_data(value)
+        if self.result_mask_version == MASKING_RULES_VERSION:
+            return value if self.masked_result is None else self.masked_result
+        if not isinstance(value, dict):
+            return mask_sensitive_data(value)
+        return mask_subtask_result(self.id, self.updated_at, value)
 
     @field_serializer("error_message")
     def mask_error_message(self, value: Optional[str]) -> Optional[str]:
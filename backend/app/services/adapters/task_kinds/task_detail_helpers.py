@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 from app.schemas.kind import Bot, Shell
 from app.schemas.subtask_context import SubtaskContextBrief
 from app.schemas.task import SkillRef
+from app.services.subtask_result_masking import masked_subtask_result
 from app.services.task_fork_history import ForkHistoryItem
 from app.services.task_skill_selection import parse_requested_skill_refs_from_labels
 from app.utils.prompt_utils import extract_display_prompt
@@ -125,7 +126,7 @@ def convert_subtasks_to_dict(
                 "parent_id": subtask.parent_id,
                 "status": subtask.status,
                 "progress": subtask.progress,
-                "result": subtask.result,
+                "result": masked_subtask_result(subtask),
                 "error_message": subtask.error_message,
                 "user_id": subtask.user_id,
                 "created_at": (
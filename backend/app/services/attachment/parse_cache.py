@@ -0,0 +1,134 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Redis cache of attachment parse results keyed by content hash.
+
+Users frequently forward or re-attach the same file, and every upload or
+overwrite used to run the full document parser again. Parse results are
+cached under::
+
+    attachment-parse-cache:v1:{sha256(content hash, extension, parser
+                                       version, max text length,
+                                       truncation config)}
+
+so identical bytes parsed with the same parser settings skip parsing. The
+entry stores the extracted text, image payload and truncation info; parse
+failures are never cached. Cache errors are treated as misses.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import asdict
+from typing import Optional
+
+import orjson
+from prometheus_client import Counter
+from redis import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.services.attachment.parser import DocumentParser, ParseResult, TruncationInfo
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "attachment-parse-cache:v1"
+
+ATTACHMENT_PARSE_CACHE_TOTAL = Counter(
+    "attachment_parse_cache_total",
+    "Attachment parse cache lookups by result",
+    ["result"],  # result: hit, miss, error, skipped
+)
+
+
+class AttachmentParseCache:
+    """Content-addressed cache of ``DocumentParser`` results."""
+
+    def __init__(
+        self,
+        redis_url: str = settings.REDIS_URL,
+        *,
+        client: Optional[Redis] = None,
+    ) -> None:
+        self._client = client or Redis.from_url(
+            redis_url,
+            decode_responses=False,
+            socket_timeout=2.0,
+            socket_connect_timeout=0.5,
+            health_check_interval=30,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.ATTACHMENT_PARSE_CACHE_ENABLED)
+
+    def build_key(
+        self, binary_data: bytes, extension: str, parser: DocumentParser
+    ) -> str:
+        """Build the cache key for parsing ``binary_data`` with ``parser``."""
+        fingerprint = json.dumps(
+            {
+                "content": hashlib.sha256(binary_data).hexdigest(),
+                "extension": extension.lower(),
+                "parser": DocumentParser.PARSER_VERSION,
+                "max_length": parser.get_max_text_length(),
+                "truncation": asdict(parser.truncation_manager.config),
+            },
+            sort_keys=True,
+        )
+        digest = hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+        return f"{KEY_PREFIX}:{digest}"
+
+    def get(self, key: str) -> Optional[ParseResult]:
+        """Return the cached parse result for ``key``, or None on a miss."""
+        if not self.enabled:
+            return None
+        try:
+            data = self._client.get(key)
+        except RedisError as exc:
+            ATTACHMENT_PARSE_CACHE_TOTAL.labels(result="error").inc()
+            logger.warning("Attachment parse cache read failed: %s", exc)
+            return None
+        if data is None:
+            ATTACHMENT_PARSE_CACHE_TOTAL.labels(result="miss").inc()
+            return None
+
+        try:
+            payload = orjson.loads(data)
+            truncation = payload.get("truncation_info")
+            result = ParseResult(
+                text=payload["text"],
+                text_length=payload["text_length"],
+                image_base64=payload.get("image_base64"),
+                image_mime_type=payload.get("image_mime_type"),
+                truncation_info=TruncationInfo(**truncation) if truncation else None,
+            )
+        except Exception as exc:
+            ATTACHMENT_PARSE_CACHE_TOTAL.labels(result="error").inc()
+            logger.warning("Ignoring unreadable attachment parse cache entry: %s", exc)
+            return None
+
+        ATTACHMENT_PARSE_CACHE_TOTAL.labels(result="hit").inc()
+        return result
+
+    def put(self, key: str, result: ParseResult) -> bool:
+        """Cache ``result``. Returns True when the entry was written."""
+        if not self.enabled:
+            return False
+        payload = orjson.dumps(asdict(result))
+        if len(payload) > settings.ATTACHMENT_PARSE_CACHE_MAX_ENTRY_BYTES:
+            ATTACHMENT_PARSE_CACHE_TOTAL.labels(result="skipped").inc()
+            return False
+        try:
+            self._client.set(
+                key, payload, ex=settings.ATTACHMENT_PARSE_CACHE_TTL_SECONDS
+            )
+        except RedisError as exc:
+            ATTACHMENT_PARSE_CACHE_TOTAL.labels(result="error").inc()
+            logger.warning("Attachment parse cache write failed: %s", exc)
+            return False
+        return True
+
+
+attachment_parse_cache = AttachmentParseCache()
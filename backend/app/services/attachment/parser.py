@@ -36,6 +36,7 @@ import chardet
 import magic
 
 from app.core.config import settings
+from app.services.attachment.pdf_page_pool import pdf_page_pool
 from app.services.attachment.smart_truncation import (
     SmartTruncationConfig,
     SmartTruncationInfo,
@@ -47,6 +48,7 @@ from shared.utils.image_preprocessor import (
     prepare_image_bytes_for_model,
 )
 from shared.utils.mime_types import TEXT_READABLE_MIME_TYPES, is_text_readable_mime
+from shared.utils.pdf_pages import extract_text_range, ocr_range, select_ocr_language
 from shared.utils.xmind_parser import XMindParseError, parse_xmind_to_markdown
 
 MAX_IMAGE_LONG_EDGE = MAX_MODEL_IMAGE_LONG_EDGE
@@ -106,6 +108,7 @@ class DocumentParseError(Exception):
     FILE_TOO_LARGE = "file_too_large"
     PARSE_FAILED = "parse_failed"
     ENCRYPTED_PDF = "encrypted_pdf"
+    PARSE_TIMEOUT = "parse_timeout"
     LEGACY_DOC = "legacy_doc"
     LEGACY_PPT = "legacy_ppt"
     LEGACY_XLS = "legacy_xls"
@@ -215,6 +218,9 @@ class DocumentParser:
     # Known text format extensions (no MIME detection needed)
     KNOWN_TEXT_EXTENSIONS = {".txt", ".md"}
 
+    # Bump when extraction output changes so cached parse results are ignored
+    PARSER_VERSION = "1"
+
     def __init__(self, truncation_config: Optional[SmartTruncationConfig] = None):
         """
         Initialize DocumentParser with optional truncation configuration.
@@ -578,11 +584,15 @@ class DocumentParser:
                     DocumentParseError.ENCRYPTED_PDF,
                 )
 
-            text_parts = []
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
+            deadline = pdf_page_pool.new_deadline()
+            page_count = len(reader.pages)
+            text_parts = [
+                page_text
+                for page_text in self._extract_pdf_pages(
+                    reader, binary_data, page_count, deadline
+                )
+                if page_text
+            ]
 
             extracted_text = "\n\n".join(text_parts)
 
@@ -598,7 +608,7 @@ class DocumentParser:
                     f"PyPDF2 extracted only {len(meaningful_text)} meaningful characters, "
                     "attempting OCR for scanned PDF"
                 )
-                ocr_text = self._parse_pdf_with_ocr(binary_data)
+                ocr_text = self._parse_pdf_with_ocr(binary_data, page_count, deadline)
                 if ocr_text and len(ocr_text.strip()) > len(extracted_text.strip()):
                     return ocr_text
 
@@ -606,6 +616,12 @@ class DocumentParser:
 
         except DocumentParseError:
             raise
+        except TimeoutError as e:
+            raise DocumentParseError(
+                "PDF parsing exceeded the "
+                f"{settings.PDF_PARSE_DEADLINE_SECONDS}s time limit",
+                DocumentParseError.PARSE_TIMEOUT,
+            ) from e
         except Exception as e:
             logger.error(f"Error parsing PDF: {e}", exc_info=True)
             raise DocumentParseError(
@@ -613,7 +629,33 @@ class DocumentParser:
                 DocumentParseError.PARSE_FAILED,
             ) from e
 
-    def _parse_pdf_with_ocr(self, binary_data: bytes) -> Optional[str]:
+    def _extract_pdf_pages(
+        self,
+        reader: Any,
+        binary_data: bytes,
+        page_count: int,
+        deadline: float,
+    ) -> List[str]:
+        """Extract the raw text of every PDF page, in page order.
+
+        Large PDFs are extracted in the shared parse pool when it is enabled;
+        empty pages yield "".
+        """
+        if pdf_page_pool.should_parallelize(page_count):
+            logger.info(f"Extracting text of {page_count} PDF pages in the parse pool")
+            pages_text = pdf_page_pool.map_pages(
+                extract_text_range, binary_data, page_count, deadline=deadline
+            )
+            if pages_text is not None:
+                return pages_text
+        return [page.extract_text() or "" for page in reader.pages]
+
+    def _parse_pdf_with_ocr(
+        self,
+        binary_data: bytes,
+        page_count: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> Optional[str]:
         """Parse PDF using OCR for scanned/image-based PDFs.
 
         Converts PDF pages to images and uses pytesseract for text extraction.
@@ -621,71 +663,16 @@ class DocumentParser:
 
         Args:
             binary_data: PDF file binary data
+            page_count: Number of pages, enables parallel OCR for large PDFs
+            deadline: Monotonic deadline for parallel OCR
 
         Returns:
             Extracted text from OCR, or None if OCR fails
         """
-        try:
-            import pytesseract
-            from pdf2image import convert_from_bytes
-
-            # Convert PDF to images
-            # Use lower DPI for faster processing, 150 is usually sufficient for OCR
-            images = convert_from_bytes(binary_data, dpi=150)
-
-            if not images:
-                logger.warning("No images extracted from PDF for OCR")
-                return None
-
-            logger.info(f"Converting {len(images)} PDF pages to images for OCR")
-
-            # Check available languages
-            available_langs = pytesseract.get_languages()
-            # Prefer Chinese + English for better results with mixed content
-            if "chi_sim" in available_langs:
-                lang = "chi_sim+eng"
-            elif "eng" in available_langs:
-                lang = "eng"
-            else:
-                lang = available_langs[0] if available_langs else "eng"
-
-            logger.info(f"Using OCR language: {lang}")
-
-            text_parts = []
-            for i, image in enumerate(images):
-                try:
-                    # Use PSM 3 (fully automatic page segmentation) for document pages
-                    page_text = pytesseract.image_to_string(
-                        image, lang=lang, config="--psm 3"
-                    )
-                    if page_text and page_text.strip():
-                        text_parts.append(page_text.strip())
-                        logger.debug(
-                            f"OCR extracted {len(page_text)} chars from page {i + 1}"
-                        )
-                except Exception as e:
-                    logger.warning(f"OCR failed for page {i + 1}: {e}")
-                    continue
-
-            if text_parts:
-                result = "\n\n".join(text_parts)
-                logger.info(
-                    f"OCR successfully extracted {len(result)} characters "
-                    f"from {len(text_parts)} pages"
-                )
-                return result
-
-            return None
-
-        except ImportError as e:
-            logger.warning(
-                f"OCR dependencies not available: {e}. "
-                "Install pytesseract and pdf2image for OCR support."
-            )
-            return None
-        except Exception as e:
-            logger.warning(f"OCR processing failed: {e}")
+        pages_text = self._parse_pdf_with_ocr_pages(binary_data, page_count, deadline)
+        if not pages_text:
             return None
+        return "\n\n".join(page_text for page_text in pages_text if page_text)
 
     def _parse_word(self, binary_data: bytes, extension: str) -> str:
         """Parse Word document and extract text."""
@@ -1081,11 +1068,15 @@ class DocumentParser:
                 )
 
             # Extract text per page
-            pages_text = []
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    pages_text.append(page_text)
+            deadline = pdf_page_pool.new_deadline()
+            page_count = len(reader.pages)
+            pages_text = [
+                page_text
+                for page_text in self._extract_pdf_pages(
+                    reader, binary_data, page_count, deadline
+                )
+                if page_text
+            ]
 
             # Check if extracted text is meaningful
             all_text = "\n".join(pages_text)
@@ -1099,7 +1090,9 @@ class DocumentParser:
                     f"PyPDF2 extracted only {len(meaningful_text)} meaningful characters, "
                     "attempting OCR for scanned PDF (smart mode)"
                 )
-                ocr_pages = self._parse_pdf_with_ocr_pages(binary_data)
+                ocr_pages = self._parse_pdf_with_ocr_pages(
+                    binary_data, page_count, deadline
+                )
                 if ocr_pages and len(ocr_pages) > 0:
                     # Check if OCR result is better
                     ocr_all_text = "\n".join(ocr_pages)
@@ -1120,6 +1113,12 @@ class DocumentParser:
 
         except DocumentParseError:
             raise
+        except TimeoutError as e:
+            raise DocumentParseError(
+                "PDF parsing exceeded the "
+                f"{settings.PDF_PARSE_DEADLINE_SECONDS}s time limit",
+                DocumentParseError.PARSE_TIMEOUT,
+            ) from e
         except Exception as e:
             logger.error(f"Error parsing PDF with smart truncation: {e}", exc_info=True)
             raise DocumentParseError(
@@ -1127,57 +1126,46 @@ class DocumentParser:
                 DocumentParseError.PARSE_FAILED,
             ) from e
 
-    def _parse_pdf_with_ocr_pages(self, binary_data: bytes) -> Optional[List[str]]:
+    def _parse_pdf_with_ocr_pages(
+        self,
+        binary_data: bytes,
+        page_count: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> Optional[List[str]]:
         """Parse PDF using OCR and return text per page.
 
-        Similar to _parse_pdf_with_ocr but returns a list of page texts
-        for smart truncation support.
+        Returns a list of page texts for smart truncation support. When the
+        page count is known and the parse pool is enabled, page ranges are
+        OCR'd in parallel and merged in page order.
 
         Args:
             binary_data: PDF file binary data
+            page_count: Number of pages, enables parallel OCR for large PDFs
+            deadline: Monotonic deadline for parallel OCR
 
         Returns:
             List of extracted text per page, or None if OCR fails
+
+        Raises:
+            TimeoutError: If parallel OCR does not finish before the deadline
         """
         try:
-            import pytesseract
-            from pdf2image import convert_from_bytes
-
-            # Convert PDF to images
-            images = convert_from_bytes(binary_data, dpi=150)
-
-            if not images:
-                logger.warning("No images extracted from PDF for OCR")
-                return None
-
-            logger.info(f"Converting {len(images)} PDF pages to images for OCR")
-
-            # Check available languages
-            available_langs = pytesseract.get_languages()
-            if "chi_sim" in available_langs:
-                lang = "chi_sim+eng"
-            elif "eng" in available_langs:
-                lang = "eng"
-            else:
-                lang = available_langs[0] if available_langs else "eng"
-
+            lang = select_ocr_language()
             logger.info(f"Using OCR language: {lang}")
 
-            pages_text = []
-            for i, image in enumerate(images):
-                try:
-                    page_text = pytesseract.image_to_string(
-                        image, lang=lang, config="--psm 3"
-                    )
-                    # Always append, even if empty, to maintain page count
-                    pages_text.append(page_text.strip() if page_text else "")
-                    if page_text and page_text.strip():
-                        logger.debug(
-                            f"OCR extracted {len(page_text)} chars from page {i + 1}"
-                        )
-                except Exception as e:
-                    logger.warning(f"OCR failed for page {i + 1}: {e}")
-                    pages_text.append("")  # Maintain page count
+            pages_text = None
+            if page_count is not None and pdf_page_pool.should_parallelize(page_count):
+                logger.info(f"Running OCR on {page_count} PDF pages in the parse pool")
+                pages_text = pdf_page_pool.map_pages(
+                    ocr_range,
+                    binary_data,
+                    page_count,
+                    lang,
+                    deadline=deadline or pdf_page_pool.new_deadline(),
+                )
+            if pages_text is None:
+                # Serial OCR keeps one entry per page, even when a page fails
+                pages_text = ocr_range(binary_data, 0, None, lang)
 
             # Filter out empty pages for the result
             non_empty_pages = [p for p in pages_text if p.strip()]
@@ -1188,8 +1176,11 @@ class DocumentParser:
                 )
                 return pages_text
 
+            logger.warning("No text extracted from PDF by OCR")
             return None
 
+        except TimeoutError:
+            raise
         except ImportError as e:
             logger.warning(
                 f"OCR dependencies not available: {e}. "
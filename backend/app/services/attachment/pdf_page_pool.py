@@ -0,0 +1,132 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Shared process pool for parallel per-page PDF parsing.
+
+Text extraction (PyPDF2) and OCR (pdf2image + pytesseract) are CPU-bound and
+hold the GIL for the whole document when run on the request or worker
+thread. When ``PDF_PARSE_POOL_WORKERS`` is set, large PDFs are split into
+contiguous page ranges that are parsed in a process pool shared by all
+requests of this process. Page texts are returned in document order so the
+caller can apply smart truncation to the merged stream.
+
+The per-range worker functions live in ``shared.utils.pdf_pages`` so the
+spawned workers only import that light module, not the backend app.
+"""
+
+import logging
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Ranges submitted per worker; more than one evens out pages of uneven cost
+_RANGES_PER_WORKER = 2
+
+
+class PdfPagePool:
+    """Lazily created process pool shared by all PDF parse requests."""
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def workers(self) -> int:
+        return max(0, settings.PDF_PARSE_POOL_WORKERS)
+
+    def should_parallelize(self, page_count: int) -> bool:
+        """Whether a document of ``page_count`` pages goes through the pool."""
+        return self.workers > 0 and page_count >= settings.PDF_PARSE_PARALLEL_MIN_PAGES
+
+    def new_deadline(self) -> float:
+        """Return the monotonic deadline for a document starting to parse now."""
+        return time.monotonic() + settings.PDF_PARSE_DEADLINE_SECONDS
+
+    def page_ranges(self, page_count: int) -> List[Tuple[int, int]]:
+        """Split ``page_count`` pages into contiguous ``[start, end)`` ranges."""
+        chunk = max(1, math.ceil(page_count / (self.workers * _RANGES_PER_WORKER)))
+        return [
+            (start, min(start + chunk, page_count))
+            for start in range(0, page_count, chunk)
+        ]
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a multi-threaded server process is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                logger.info(f"Started PDF parse pool with {self.workers} workers")
+            return self._executor
+
+    def map_pages(
+        self,
+        fn: Callable[..., List[str]],
+        binary_data: bytes,
+        page_count: int,
+        *args,
+        deadline: float,
+    ) -> Optional[List[str]]:
+        """Run ``fn`` over page ranges in parallel and merge results in order.
+
+        Returns:
+            Per-page texts in document order, or None if the pool broke (the
+            caller should then parse serially).
+
+        Raises:
+            TimeoutError: If the document did not finish before ``deadline``.
+                Pending ranges are cancelled; ranges already running finish in
+                the background and their results are discarded.
+        """
+        executor = self._get_executor()
+        futures = [
+            executor.submit(fn, binary_data, start, end, *args)
+            for start, end in self.page_ranges(page_count)
+        ]
+        pages: List[str] = []
+        try:
+            for future in futures:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("PDF parse deadline exceeded")
+                pages.extend(future.result(timeout=remaining))
+            return pages
+        except FutureTimeoutError as e:
+            # Distinct from the builtin TimeoutError before Python 3.11
+            raise TimeoutError("PDF parse deadline exceeded") from e
+        except BrokenProcessPool as e:
+            logger.warning(f"PDF parse pool broke, falling back to serial: {e}")
+            self._reset(executor)
+            return None
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _reset(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """Stop the pool workers (called on application shutdown)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+pdf_page_pool = PdfPagePool()
@@ -0,0 +1,267 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Cache of task access decisions for chat namespace events.
+
+Every task:join, history:sync, chat:send, chat:cancel, ... handler checks
+``can_access_task(user_id, task_id)``, which is a database query, although a
+socket keeps asking about the same task. Positive decisions are cached in two
+tiers:
+
+- per socket, in process memory, for TASK_ACCESS_SOCKET_CACHE_TTL_SECONDS;
+- per (user, task), in a Redis hash per task, for TASK_ACCESS_CACHE_TTL_SECONDS,
+  shared by all backend processes.
+
+Denials are never cached, so a newly granted member is let in immediately.
+Revocations (membership and share changes, task deletion) drop the Redis hash
+of the task and this process's socket entries after commit; see
+``decision_cache_hooks``. Sockets served by other processes may keep a
+revoked decision for at most the socket TTL.
+
+A check that started before a revocation must not store its result after it.
+Each task has a generation counter in Redis that invalidation bumps, and a
+decision is only stored if the generation read before the check is current.
+The socket tier does the same with one counter per process.
+"""
+
+import logging
+import threading
+import time
+import weakref
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from prometheus_client import Counter
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "chat:task_access"
+
+# Generation counters outlive the decisions they guard by far, so a check
+# never sees one expire and restart at a value it has already read
+GENERATION_TTL_SECONDS = 24 * 3600
+
+# KEYS[1]: decisions hash, KEYS[2]: generation
+# ARGV: generation read before the check, user id, expiry, ttl
+_REMEMBER_SCRIPT = """
+if tonumber(redis.call('GET', KEYS[2]) or '0') ~= tonumber(ARGV[1]) then
+  return 0
+end
+redis.call('HSET', KEYS[1], ARGV[2], ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+
+# source: socket, redis, database. The hit rate is (socket + redis) / total,
+# and socket + redis is the number of database checks avoided.
+CHAT_TASK_ACCESS_CHECKS_TOTAL = Counter(
+    "chat_task_access_checks_total",
+    "Task access checks of chat namespace events by the tier that answered",
+    ["source"],
+)
+
+AccessCheck = Callable[[int, int], Awaitable[bool]]
+
+
+class TaskAccessDecisionStore:
+    """Positive task access decisions shared through Redis.
+
+    All operations are best effort: Redis failures are logged and reported as
+    cache misses so callers fall back to checking the database.
+    """
+
+    def __init__(
+        self,
+        redis_url: str = settings.REDIS_URL,
+        *,
+        ttl_seconds: int = settings.TASK_ACCESS_CACHE_TTL_SECONDS,
+        key_prefix: str = KEY_PREFIX,
+        client: Optional[Redis] = None,
+        async_client: Optional[AsyncRedis] = None,
+    ) -> None:
+        self._redis_url = redis_url
+        self._ttl_seconds = ttl_seconds
+        self._key_prefix = key_prefix
+        self._client = client
+        self._async_client = async_client
+        # Socket caches of this process, dropped together with Redis entries
+        self._socket_caches: "weakref.WeakSet[TaskAccessDecisionCache]" = (
+            weakref.WeakSet()
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl_seconds > 0
+
+    def _key(self, task_id: int) -> str:
+        return f"{self._key_prefix}:{task_id}"
+
+    def _generation_key(self, task_id: int) -> str:
+        return f"{self._key_prefix}:{task_id}:generation"
+
+    def _sync_client(self) -> Redis:
+        if self._client is None:
+            self._client = Redis.from_url(
+                self._redis_url,
+                decode_responses=True,
+                socket_timeout=1.0,
+                socket_connect_timeout=0.5,
+            )
+        return self._client
+
+    def _async_redis(self) -> AsyncRedis:
+        if self._async_client is None:
+            self._async_client = AsyncRedis.from_url(
+                self._redis_url,
+                decode_responses=True,
+                socket_timeout=1.0,
+                socket_connect_timeout=0.5,
+            )
+        return self._async_client
+
+    def attach(self, cache: "TaskAccessDecisionCache") -> None:
+        """Drop the socket entries of ``cache`` on every invalidation."""
+        self._socket_caches.add(cache)
+
+    async def lookup(self, user_id: int, task_id: int) -> Tuple[bool, Optional[int]]:
+        """Return whether an unexpired positive decision is stored.
+
+        Also returns the task's current generation, to be passed to
+        :meth:`remember`, or None if the decision cannot be stored.
+        """
+        if not self.enabled:
+            return False, None
+        try:
+            pipeline = self._async_redis().pipeline(transaction=False)
+            pipeline.hget(self._key(task_id), str(user_id))
+            pipeline.get(self._generation_key(task_id))
+            expires_at, generation = await pipeline.execute()
+        except Exception:
+            logger.debug("Failed to read task access decision", exc_info=True)
+            return False, None
+        allowed = expires_at is not None and float(expires_at) > time.time()
+        return allowed, int(generation or 0)
+
+    async def remember(
+        self, user_id: int, task_id: int, generation: Optional[int]
+    ) -> None:
+        """Store a positive decision for the TTL.
+
+        Skipped if the task was invalidated since ``generation`` was read.
+        """
+        if not self.enabled or generation is None:
+            return
+        try:
+            await self._async_redis().eval(
+                _REMEMBER_SCRIPT,
+                2,
+                self._key(task_id),
+                self._generation_key(task_id),
+                generation,
+                str(user_id),
+                time.time() + self._ttl_seconds,
+                self._ttl_seconds,
+            )
+        except Exception:
+            logger.debug("Failed to store task access decision", exc_info=True)
+
+    def invalidate(self, task_ids: Iterable[int]) -> None:
+        """Forget every decision about ``task_ids``, in Redis and in process."""
+        task_ids = set(task_ids)
+        if not task_ids:
+            return
+        for cache in list(self._socket_caches):
+            cache.drop_tasks(task_ids)
+        if not self.enabled:
+            return
+        try:
+            pipeline = self._sync_client().pipeline(transaction=True)
+            for task_id in task_ids:
+                generation_key = self._generation_key(task_id)
+                pipeline.incr(generation_key)
+                pipeline.expire(generation_key, GENERATION_TTL_SECONDS)
+                pipeline.delete(self._key(task_id))
+            pipeline.execute()
+        except RedisError:
+            logger.warning("Failed to invalidate task access decisions", exc_info=True)
+
+
+class TaskAccessDecisionCache:
+    """Per-socket cache of positive task access decisions for one namespace."""
+
+    def __init__(
+        self,
+        store: Optional[TaskAccessDecisionStore] = None,
+        *,
+        ttl_seconds: int = settings.TASK_ACCESS_SOCKET_CACHE_TTL_SECONDS,
+    ) -> None:
+        self._store = store or task_access_decision_store
+        self._ttl_seconds = ttl_seconds
+        # sid -> task_id -> (user_id, monotonic expiry)
+        self._sockets: Dict[str, Dict[int, Tuple[int, float]]] = {}
+        # Bumped by every drop; decisions read before a drop are not stored
+        self._generation = 0
+        # Invalidations run in after_commit, possibly on executor threads
+        self._lock = threading.Lock()
+        self._store.attach(self)
+
+    def _get(self, sid: str, user_id: int, task_id: int) -> bool:
+        with self._lock:
+            entry = self._sockets.get(sid, {}).get(task_id)
+        return entry is not None and entry[0] == user_id and entry[1] > time.monotonic()
+
+    def _put(self, sid: str, user_id: int, task_id: int, generation: int) -> None:
+        if self._ttl_seconds <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if generation != self._generation:
+                return
+            decisions = self._sockets.setdefault(sid, {})
+            for expired in [tid for tid, (_, exp) in decisions.items() if exp <= now]:
+                del decisions[expired]
+            decisions[task_id] = (user_id, now + self._ttl_seconds)
+
+    async def can_access(
+        self, sid: str, user_id: int, task_id: int, check: AccessCheck
+    ) -> bool:
+        """Answer from the socket or Redis tier, else run ``check``."""
+        if self._get(sid, user_id, task_id):
+            CHAT_TASK_ACCESS_CHECKS_TOTAL.labels(source="socket").inc()
+            return True
+        generation = self._generation
+        allowed, store_generation = await self._store.lookup(user_id, task_id)
+        if allowed:
+            CHAT_TASK_ACCESS_CHECKS_TOTAL.labels(source="redis").inc()
+            self._put(sid, user_id, task_id, generation)
+            return True
+
+        CHAT_TASK_ACCESS_CHECKS_TOTAL.labels(source="database").inc()
+        allowed = await check(user_id, task_id)
+        if allowed:
+            self._put(sid, user_id, task_id, generation)
+            await self._store.remember(user_id, task_id, store_generation)
+        return allowed
+
+    def forget_socket(self, sid: str) -> None:
+        """Drop all decisions of a disconnected socket."""
+        with self._lock:
+            self._sockets.pop(sid, None)
+
+    def drop_tasks(self, task_ids: Iterable[int]) -> None:
+        """Drop every socket's decisions about ``task_ids``."""
+        task_ids = set(task_ids)
+        with self._lock:
+            self._generation += 1
+            for decisions in self._sockets.values():
+                for task_id in task_ids:
+                    decisions.pop(task_id, None)
+
+
+task_access_decision_store = TaskAccessDecisionStore()
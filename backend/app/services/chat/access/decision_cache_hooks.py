@@ -0,0 +1,133 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""SQLAlchemy transaction hooks invalidating cached task access decisions.
+
+Membership and share changes (``ResourceMember`` rows of tasks updated or
+deleted by the group chat and share services) and task deletion or ownership
+changes are collected during flush. The affected tasks' decisions are dropped
+only after the transaction commits.
+
+New members are not collected: only positive decisions are cached, so a grant
+never makes a cached decision wrong.
+"""
+
+import logging
+from typing import Any, Set
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.resource_member import ResourceMember
+from app.models.share_link import ResourceType
+from app.models.task import TaskResource
+from app.services.chat.access.decision_cache import (
+    TaskAccessDecisionStore,
+    task_access_decision_store,
+)
+
+logger = logging.getLogger(__name__)
+
+_PENDING_TASK_IDS_KEY = "task_access_cache_pending_task_ids"
+
+_TASK_ACCESS_ATTRS = ("is_active", "user_id", "kind")
+
+
+class TaskAccessCacheHooks:
+    """Drop cached task access decisions when committed changes may revoke them."""
+
+    def __init__(self, session_factory: Any, store: TaskAccessDecisionStore) -> None:
+        self._session_factory = session_factory
+        self._store = store
+        self._registered = False
+        self._before_flush_listener = self._before_flush
+        self._after_commit_listener = self._after_commit
+        self._after_rollback_listener = self._after_rollback
+
+    def register(self) -> None:
+        """Register listeners once for the configured session factory."""
+        if self._registered:
+            return
+        event.listen(self._session_factory, "before_flush", self._before_flush_listener)
+        event.listen(self._session_factory, "after_commit", self._after_commit_listener)
+        event.listen(
+            self._session_factory, "after_rollback", self._after_rollback_listener
+        )
+        self._registered = True
+
+    def unregister(self) -> None:
+        """Remove listeners, primarily for tests and graceful shutdown."""
+        if not self._registered:
+            return
+        event.remove(self._session_factory, "before_flush", self._before_flush_listener)
+        event.remove(self._session_factory, "after_commit", self._after_commit_listener)
+        event.remove(
+            self._session_factory, "after_rollback", self._after_rollback_listener
+        )
+        self._registered = False
+
+    def _before_flush(
+        self, session: Session, flush_context: Any, instances: Any
+    ) -> None:
+        task_ids: Set[int] = session.info.setdefault(_PENDING_TASK_IDS_KEY, set())
+
+        for obj in session.dirty:
+            if isinstance(obj, ResourceMember):
+                state = inspect(obj)
+                if state.attrs.resource_type.history.has_changes() or (
+                    state.attrs.resource_id.history.has_changes()
+                ):
+                    task_ids.update(_previous_task_ids(state))
+                if _is_task_member(obj.resource_type):
+                    task_ids.add(obj.resource_id)
+            elif isinstance(obj, TaskResource):
+                state = inspect(obj)
+                if any(
+                    state.attrs[attr].history.has_changes()
+                    for attr in _TASK_ACCESS_ATTRS
+                ):
+                    task_ids.add(obj.id)
+
+        for obj in session.deleted:
+            if isinstance(obj, ResourceMember):
+                if _is_task_member(obj.resource_type):
+                    task_ids.add(obj.resource_id)
+            elif isinstance(obj, TaskResource):
+                task_ids.add(obj.id)
+
+    def _after_commit(self, session: Session) -> None:
+        task_ids = session.info.pop(_PENDING_TASK_IDS_KEY, None)
+        if not task_ids:
+            return
+        try:
+            self._store.invalidate(tid for tid in task_ids if tid is not None)
+        except Exception:
+            logger.exception(
+                "Failed to invalidate task access decisions; "
+                "they expire with the cache TTL"
+            )
+
+    @staticmethod
+    def _after_rollback(session: Session) -> None:
+        session.info.pop(_PENDING_TASK_IDS_KEY, None)
+
+
+def _is_task_member(resource_type: Any) -> bool:
+    return getattr(resource_type, "value", resource_type) == ResourceType.TASK.value
+
+
+def _previous_task_ids(state: Any) -> Set[int]:
+    """Return the task a member row belonged to before the pending change."""
+    resource_types = state.attrs.resource_type.history.deleted or [
+        state.attrs.resource_type.value
+    ]
+    if not any(_is_task_member(value) for value in resource_types):
+        return set()
+    return set(
+        state.attrs.resource_id.history.deleted or [state.attrs.resource_id.value]
+    )
+
+
+task_access_cache_hooks = TaskAccessCacheHooks(SessionLocal, task_access_decision_store)
@@ -0,0 +1,531 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Multiplexed, replayable per-subtask event channels.
+
+Streaming chunks and executor callback events used to be delivered through a
+dedicated Redis client and pubsub connection per consumer, so the number of
+Redis connections grew with the number of concurrent streams, and events
+published before a consumer subscribed were lost.
+
+``SubtaskEventBus`` keeps one pooled Redis client and one pubsub connection
+per event loop (i.e. per worker process) and fans incoming messages out to
+bounded local asyncio queues.
+
+Recorded events are appended to a capped Redis Stream before they are
+published, and the pubsub message carries the stream entry id. Events
+published to one stream while the previous write is in flight or within
+``SUBTASK_EVENT_BATCH_INTERVAL_MS`` of it share one entry and one message, so
+a token stream costs one XADD and one PUBLISH per batch instead of per token:
+
+    XADD {stream_key} MAXLEN ~ N * data {event}             (one event)
+    XADD {stream_key} MAXLEN ~ N * batch [{event}, ...]     (several events)
+    PUBLISH {channel} "{entry_id}\\n{event}"  or  "{entry_id}*\\n[...]"
+
+PUBLISH is a separate command rather than part of a script, so the stream and
+the channel may live in different Redis Cluster slots. Subscribers drop events
+with ids they have already seen, so an event that is both replayed and
+received live is delivered once.
+
+Event ids are the entry id for a single-event entry and ``{entry_id}.{n}``
+for the n-th event of a batch. A consumer can subscribe with ``after_id`` to
+replay everything after a known event (or from the start with ``"0"``) before
+receiving live events, without gaps or duplicates. After a pubsub reconnect,
+and when a slow consumer's queue overflows, subscriptions that have seen an
+event are re-synchronized from the stream.
+
+Events published with ``record=False`` are plain PUBLISHes without an id:
+they cost no stream writes, but are dropped if a subscriber's queue is full.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import threading
+import weakref
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_ENTRY_ID_RE = re.compile(r"^\d+-\d+$")
+_EVENT_ID_RE = re.compile(r"^\d+-\d+(\.\d+)?$")
+# Appended to the entry id of pubsub messages carrying a batch of events
+_BATCH_MARKER = "*"
+
+# The shared listener wakes up at this interval when no messages arrive
+_LISTEN_TIMEOUT_SECONDS = 10.0
+# Delay before the listener retries after a pubsub connection error
+_RECONNECT_DELAY_SECONDS = 1.0
+# Maximum time to wait for Redis to confirm a channel subscription
+_SUBSCRIBE_TIMEOUT_SECONDS = 5.0
+# Stream entries fetched per XRANGE call while replaying
+_REPLAY_BATCH_SIZE = 500
+
+
+class StreamEvent(NamedTuple):
+    """An event delivered to a subscription.
+
+    ``id`` is the event id, usable as ``after_id`` to resume; it is None for
+    events that were not recorded.
+    """
+
+    id: Optional[str]
+    data: str
+
+
+def _event_position(event_id: str) -> Tuple[int, int, int]:
+    entry_id, _, index = event_id.partition(".")
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0), int(index or 0)
+
+
+def _entry_events(entry_id: str, fields: Dict[str, str]) -> List[StreamEvent]:
+    if "batch" in fields:
+        return [
+            StreamEvent(f"{entry_id}.{index}", data)
+            for index, data in enumerate(json.loads(fields["batch"]))
+        ]
+    return [StreamEvent(entry_id, fields.get("data", ""))]
+
+
+def _decode_message(payload: str) -> List[StreamEvent]:
+    header, sep, body = payload.partition("\n")
+    if sep:
+        if _ENTRY_ID_RE.match(header):
+            return [StreamEvent(header, body)]
+        entry_id = header[: -len(_BATCH_MARKER)]
+        if header.endswith(_BATCH_MARKER) and _ENTRY_ID_RE.match(entry_id):
+            try:
+                return _entry_events(entry_id, {"batch": body})
+            except ValueError:
+                pass
+    return [StreamEvent(None, payload)]
+
+
+class SubtaskEventSubscription:
+    """A consumer's view of one channel, backed by a bounded asyncio queue."""
+
+    def __init__(
+        self,
+        bus: "SubtaskEventBus",
+        state: "_LoopState",
+        channel: str,
+        stream_key: Optional[str],
+    ):
+        self.channel = channel
+        self.stream_key = stream_key
+        self.last_id: Optional[str] = None
+        self._bus = bus
+        self._state = state
+        self._queue: asyncio.Queue = asyncio.Queue(
+            maxsize=settings.SUBTASK_EVENT_QUEUE_MAXSIZE
+        )
+        # Live events received while a replay is in progress
+        self._buffer: Optional[List[StreamEvent]] = None
+        # Set when the queue overflowed; recorded events are then read from
+        # the stream once the consumer has drained the queue
+        self._lagging = False
+        self._closed = False
+
+    def _offer(self, event: StreamEvent) -> None:
+        if self._buffer is not None:
+            self._buffer.append(event)
+            return
+        if event.id is not None:
+            if self._lagging:
+                return
+            if self.last_id is not None and _event_position(
+                event.id
+            ) <= _event_position(self.last_id):
+                return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            if event.id is not None and self.last_id is not None:
+                self._lagging = True
+            else:
+                logger.warning(
+                    f"[SubtaskEventBus] subscriber queue of {self.channel} is "
+                    f"full, dropping an unrecorded event"
+                )
+            return
+        if event.id is not None:
+            self.last_id = event.id
+
+    def _begin_replay(self) -> None:
+        if self._buffer is None:
+            self._buffer = []
+
+    def _end_replay(self, replayed: List[StreamEvent]) -> None:
+        buffered, self._buffer = self._buffer or [], None
+        for event in replayed:
+            self._offer(event)
+        for event in buffered:
+            self._offer(event)
+
+    async def _catch_up(self) -> None:
+        self._lagging = False
+        self._begin_replay()
+        try:
+            replayed = await self._bus._read_stream(
+                self._state, self.stream_key, self.last_id
+            )
+        except Exception as e:
+            logger.warning(
+                f"[SubtaskEventBus] catch-up of {self.stream_key} failed: {e}"
+            )
+            replayed = []
+        self._end_replay(replayed)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[StreamEvent]:
+        """Return the next event, or None if ``timeout`` elapsed first."""
+        if self._lagging and self._queue.empty():
+            await self._catch_up()
+        if timeout is None:
+            return await self._queue.get()
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            await self._bus._unsubscribe(self)
+
+    async def __aenter__(self) -> "SubtaskEventSubscription":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+
+class _PendingEvents:
+    """Recorded events of one stream waiting for the next write."""
+
+    def __init__(self, channel: str, ttl_seconds: int):
+        self.channel = channel
+        self.ttl_seconds = ttl_seconds
+        self.events: List[str] = []
+        self.writer: Optional[asyncio.Task] = None
+
+
+class _LoopState:
+    """Redis client, pubsub connection and subscriptions of one event loop."""
+
+    def __init__(self, client: Redis):
+        self.client = client
+        self.pubsub = client.pubsub()
+        self.listener: Optional[asyncio.Task] = None
+        self.subscriptions: Dict[str, Set[SubtaskEventSubscription]] = {}
+        self.confirmations: Dict[str, asyncio.Future] = {}
+        self.pending: Dict[str, _PendingEvents] = {}
+        self.lock = asyncio.Lock()
+
+
+class SubtaskEventBus:
+    """Per-process multiplexer for subtask event channels."""
+
+    def __init__(self, redis_url: str = settings.REDIS_URL, *, client_factory=None):
+        self._redis_url = redis_url
+        self._client_factory = client_factory or self._create_client
+        # Redis asyncio clients are bound to the loop they were created on
+        self._states: (
+            "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]"
+        ) = weakref.WeakKeyDictionary()
+        self._states_lock = threading.Lock()
+
+    def _create_client(self) -> Redis:
+        # No socket_timeout: the shared pubsub connection blocks on reads
+        return Redis.from_url(
+            self._redis_url,
+            encoding="utf-8",
+            decode_responses=True,
+            socket_connect_timeout=2.0,
+            health_check_interval=30,
+        )
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        with self._states_lock:
+            state = self._states.get(loop)
+            if state is None:
+                state = _LoopState(self._client_factory())
+                self._states[loop] = state
+            return state
+
+    async def publish(
+        self,
+        channel: str,
+        stream_key: Optional[str],
+        data: str,
+        ttl_seconds: int,
+        *,
+        record: bool = True,
+    ) -> None:
+        """Publish ``data`` on ``channel``.
+
+        Recorded events are queued for ``stream_key`` and written in the
+        background, batched with other events of the same stream; use
+        ``flush`` to wait for them. Unrecorded events are published
+        immediately and cannot be replayed.
+        """
+        state = self._state()
+        if not record:
+            await state.client.publish(channel, data)
+            return
+        pending = state.pending.get(stream_key)
+        if pending is None:
+            pending = _PendingEvents(channel, ttl_seconds)
+            state.pending[stream_key] = pending
+            pending.writer = asyncio.create_task(
+                self._write_pending(state, stream_key, pending)
+            )
+        pending.ttl_seconds = ttl_seconds
+        pending.events.append(data)
+
+    async def flush(self) -> None:
+        """Wait until recorded events published on this loop are written."""
+        state = self._state()
+        while state.pending:
+            await asyncio.gather(
+                *(pending.writer for pending in list(state.pending.values())),
+                return_exceptions=True,
+            )
+
+    async def _write_pending(
+        self, state: _LoopState, stream_key: str, pending: _PendingEvents
+    ) -> None:
+        interval = settings.SUBTASK_EVENT_BATCH_INTERVAL_MS / 1000
+        try:
+            while pending.events:
+                events, pending.events = pending.events, []
+                try:
+                    await self._write_entry(
+                        state, stream_key, pending.channel, events, pending.ttl_seconds
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"[SubtaskEventBus] failed to write {len(events)} events "
+                        f"to {stream_key}: {e}"
+                    )
+                # Events published meanwhile go out together in the next write
+                await asyncio.sleep(interval)
+        finally:
+            state.pending.pop(stream_key, None)
+
+    async def _write_entry(
+        self,
+        state: _LoopState,
+        stream_key: str,
+        channel: str,
+        events: List[str],
+        ttl_seconds: int,
+    ) -> None:
+        if len(events) == 1:
+            body, fields, marker = events[0], {"data": events[0]}, ""
+        else:
+            body = json.dumps(events)
+            fields, marker = {"batch": body}, _BATCH_MARKER
+        async with state.client.pipeline(transaction=False) as pipe:
+            pipe.xadd(
+                stream_key,
+                fields,
+                maxlen=settings.SUBTASK_EVENT_STREAM_MAXLEN,
+                approximate=True,
+            )
+            pipe.expire(stream_key, ttl_seconds)
+            entry_id, _ = await pipe.execute()
+        # Published after the entry exists, so a subscriber replaying the
+        # stream sees the event there or receives it live (or both)
+        await state.client.publish(channel, f"{entry_id}{marker}\n{body}")
+
+    async def subscribe(
+        self,
+        channel: str,
+        stream_key: Optional[str] = None,
+        after_id: Optional[str] = None,
+    ) -> SubtaskEventSubscription:
+        """Subscribe to ``channel``.
+
+        Args:
+            channel: Pubsub channel the events are published on
+            stream_key: Stream the events are recorded in (None for channels
+                whose events are not recorded)
+            after_id: Replay recorded events after this event id before live
+                ones ("0" replays from the start); None receives live events
+                only
+
+        Returns:
+            The subscription; the caller must close it when done.
+        """
+        if after_id is not None:
+            if stream_key is None:
+                raise ValueError("Replaying events requires a stream key")
+            if after_id != "0" and not _EVENT_ID_RE.match(after_id):
+                raise ValueError(f"Invalid stream event id: {after_id!r}")
+        state = self._state()
+        subscription = SubtaskEventSubscription(self, state, channel, stream_key)
+        if after_id is not None:
+            subscription.last_id = after_id
+            subscription._begin_replay()
+
+        async with state.lock:
+            subscribers = state.subscriptions.setdefault(channel, set())
+            subscribers.add(subscription)
+            if len(subscribers) == 1:
+                try:
+                    await self._subscribe_channel(state, channel)
+                except BaseException:
+                    del state.subscriptions[channel]
+                    await self._unsubscribe_channel(state, channel)
+                    raise
+
+        if after_id is not None:
+            try:
+                replayed = await self._read_stream(state, stream_key, after_id)
+            except BaseException:
+                await subscription.close()
+                raise
+            subscription._end_replay(replayed)
+        return subscription
+
+    async def _subscribe_channel(self, state: _LoopState, channel: str) -> None:
+        confirmation = asyncio.get_running_loop().create_future()
+        state.confirmations[channel] = confirmation
+        try:
+            await state.pubsub.subscribe(channel)
+            if state.listener is None or state.listener.done():
+                state.listener = asyncio.create_task(self._listen(state))
+            await asyncio.wait_for(confirmation, _SUBSCRIBE_TIMEOUT_SECONDS)
+        finally:
+            state.confirmations.pop(channel, None)
+
+    async def _unsubscribe(self, subscription: SubtaskEventSubscription) -> None:
+        state = subscription._state
+        async with state.lock:
+            subscribers = state.subscriptions.get(subscription.channel)
+            if not subscribers or subscription not in subscribers:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del state.subscriptions[subscription.channel]
+                await self._unsubscribe_channel(state, subscription.channel)
+
+    async def _unsubscribe_channel(self, state: _LoopState, channel: str) -> None:
+        try:
+            await state.pubsub.unsubscribe(channel)
+        except Exception as e:
+            logger.warning(f"[SubtaskEventBus] unsubscribe {channel} failed: {e}")
+
+    async def _read_stream(
+        self, state: _LoopState, stream_key: str, after_id: str
+    ) -> List[StreamEvent]:
+        """Read recorded events after ``after_id``.
+
+        The entry holding ``after_id`` is read again when it is a batch; the
+        subscription drops the events it has already seen.
+        """
+        events: List[StreamEvent] = []
+        start = "-" if after_id == "0" else after_id.partition(".")[0]
+        while True:
+            entries = await state.client.xrange(
+                stream_key, min=start, max="+", count=_REPLAY_BATCH_SIZE
+            )
+            for entry_id, fields in entries:
+                events.extend(_entry_events(entry_id, fields))
+            if len(entries) < _REPLAY_BATCH_SIZE:
+                return events
+            start = f"({entries[-1][0]}"
+
+    async def _listen(self, state: _LoopState) -> None:
+        """Single reader of the shared pubsub connection."""
+        while True:
+            try:
+                message = await state.pubsub.get_message(
+                    ignore_subscribe_messages=False,
+                    timeout=_LISTEN_TIMEOUT_SECONDS,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[SubtaskEventBus] pubsub connection error: {e}")
+                await asyncio.sleep(_RECONNECT_DELAY_SECONDS)
+                await self._resync(state)
+                continue
+            if message is not None:
+                self._dispatch(state, message)
+
+    def _dispatch(self, state: _LoopState, message: dict) -> None:
+        channel = message.get("channel")
+        if message.get("type") == "subscribe":
+            confirmation = state.confirmations.get(channel)
+            if confirmation is not None and not confirmation.done():
+                confirmation.set_result(True)
+            return
+        if message.get("type") != "message":
+            return
+        events = _decode_message(message["data"])
+        for subscription in list(state.subscriptions.get(channel, ())):
+            for event in events:
+                subscription._offer(event)
+
+    async def _resync(self, state: _LoopState) -> None:
+        """Re-subscribe after a connection error and replay missed events."""
+        try:
+            # Reconnects the pubsub connection, which re-subscribes channels
+            await state.pubsub.ping()
+        except Exception as e:
+            logger.warning(f"[SubtaskEventBus] pubsub reconnect failed: {e}")
+            return
+        for subscribers in list(state.subscriptions.values()):
+            for subscription in list(subscribers):
+                if subscription.last_id is None or subscription._lagging:
+                    # Lagging subscriptions catch up once their queue drains
+                    continue
+                subscription._begin_replay()
+                try:
+                    replayed = await self._read_stream(
+                        state, subscription.stream_key, subscription.last_id
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"[SubtaskEventBus] replay of {subscription.stream_key} "
+                        f"failed: {e}"
+                    )
+                    replayed = []
+                subscription._end_replay(replayed)
+
+    async def close(self) -> None:
+        """Write pending events and close the current loop's connections.
+
+        Called on shutdown.
+        """
+        loop = asyncio.get_running_loop()
+        with self._states_lock:
+            state = self._states.get(loop)
+        if state is None:
+            return
+        await self.flush()
+        with self._states_lock:
+            self._states.pop(loop, None)
+        if state.listener is not None:
+            state.listener.cancel()
+            try:
+                await state.listener
+            except (asyncio.CancelledError, Exception):
+                pass
+        try:
+            await state.pubsub.aclose()
+        finally:
+            await state.client.aclose()
+
+
+subtask_event_bus = SubtaskEventBus()
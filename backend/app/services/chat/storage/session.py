@@ -24,6 +24,10 @@ from typing import Any, Dict, List, Optional
 
 from app.core.cache import cache_manager
 from app.core.config import settings
+from app.services.chat.storage.event_bus import (
+    SubtaskEventSubscription,
+    subtask_event_bus,
+)
 from shared.models.blocks import BlockStatus, create_text_block, create_tool_block
 
 logger = logging.getLogger(__name__)
@@ -37,6 +41,8 @@ CANCEL_FLAG_TTL = 300
 STREAMING_KEY_PREFIX = "chat:streaming:"
 # Redis Pub/Sub channel prefix for streaming updates
 STREAMING_CHANNEL_PREFIX = "chat:stream_channel:"
+# Redis Stream key prefix recording streaming updates for replay
+STREAMING_EVENTS_KEY_PREFIX = "chat:stream_events:"
 # Redis key prefix for task-level streaming status (for group chat)
 TASK_STREAMING_KEY_PREFIX = "chat:task_streaming:"
 # Redis key prefix for latest context metrics snapshot
@@ -528,29 +534,34 @@ class SessionManager:
         """Generate Redis Pub/Sub channel key for streaming updates."""
         return f"{STREAMING_CHANNEL_PREFIX}{subtask_id}"
 
+    def _get_channel_events_key(self, subtask_id: int) -> str:
+        """Generate Redis Stream key recording streaming updates for replay."""
+        return f"{STREAMING_EVENTS_KEY_PREFIX}{subtask_id}"
+
     async def publish_streaming_chunk(self, subtask_id: int, chunk: str) -> bool:
         """
-        Publish a streaming chunk to Redis Pub/Sub.
+        Publish a streaming chunk to the subtask's streaming channel.
 
         This allows other clients (e.g., reconnected browsers) to receive
-        real-time updates for an ongoing stream.
+        real-time updates for an ongoing stream. The chunk is also recorded
+        in a capped Redis Stream so late subscribers can replay it; chunks
+        published in quick succession are written and published as one batch.
 
         Args:
             subtask_id: Subtask ID
             chunk: Content chunk to publish
 
         Returns:
-            bool: True if publish was successful
+            bool: True if the chunk was queued for publishing
         """
         try:
-            channel = self._get_channel_key(subtask_id)
-            # Get a Redis client for pub/sub
-            redis_client = await self._cache._get_client()
-            try:
-                await redis_client.publish(channel, chunk)
-                return True
-            finally:
-                await redis_client.aclose()
+            await subtask_event_bus.publish(
+                self._get_channel_key(subtask_id),
+                self._get_channel_events_key(subtask_id),
+                chunk,
+                STREAMING_TTL,
+            )
+            return True
         except Exception as e:
             logger.error(
                 f"Error publishing streaming chunk for subtask {subtask_id}: {e}"
@@ -561,7 +572,7 @@ class SessionManager:
         self, subtask_id: int, result: Optional[Dict[str, Any]] = None
     ) -> bool:
         """
-        Publish a "done" signal to Redis Pub/Sub with optional result data.
+        Publish a "done" signal to the streaming channel with optional result data.
 
         The done signal is JSON-encoded and contains:
         - __type__: "STREAM_DONE" (marker to identify this as a done signal)
@@ -575,42 +586,47 @@ class SessionManager:
             bool: True if publish was successful
         """
         try:
-            channel = self._get_channel_key(subtask_id)
-            redis_client = await self._cache._get_client()
-            try:
-                # Encode done signal with result data
-                done_message = json.dumps({"__type__": "STREAM_DONE", "result": result})
-                await redis_client.publish(channel, done_message)
-                return True
-            finally:
-                await redis_client.aclose()
+            # Encode done signal with result data
+            done_message = json.dumps({"__type__": "STREAM_DONE", "result": result})
+            await subtask_event_bus.publish(
+                self._get_channel_key(subtask_id),
+                self._get_channel_events_key(subtask_id),
+                done_message,
+                STREAMING_TTL,
+            )
+            return True
         except Exception as e:
             logger.error(f"Error publishing stream done for subtask {subtask_id}: {e}")
             return False
 
-    async def subscribe_streaming_channel(self, subtask_id: int):
+    async def subscribe_streaming_channel(
+        self, subtask_id: int, after_id: Optional[str] = None
+    ) -> Optional[SubtaskEventSubscription]:
         """
         Subscribe to a streaming channel for real-time updates.
 
+        The subscription shares this process's Redis pubsub connection.
+
         Args:
             subtask_id: Subtask ID
+            after_id: Replay recorded updates after this event id first
+                ("0" for all recorded updates); None for live updates only
 
         Returns:
-            Tuple of (Redis client, PubSub object) or (None, None)
-            Caller is responsible for closing the client when done.
+            The subscription, or None on failure.
+            Caller is responsible for closing the subscription when done.
         """
         try:
-            channel = self._get_channel_key(subtask_id)
-            redis_client = await self._cache._get_client()
-            pubsub = redis_client.pubsub()
-            await pubsub.subscribe(channel)
-            # Return both client and pubsub so caller can close client when done
-            return redis_client, pubsub
+            return await subtask_event_bus.subscribe(
+                self._get_channel_key(subtask_id),
+                self._get_channel_events_key(subtask_id),
+                after_id=after_id,
+            )
         except Exception as e:
             logger.error(
                 f"Error subscribing to streaming channel for subtask {subtask_id}: {e}"
             )
-            return None, None
+            return None
 
     # ==================== Callback Event Pub/Sub (ClaudeCode/Agno streaming) ====================
 
@@ -623,6 +639,8 @@ class SessionManager:
 
         Used by the /internal/callback handler to forward executor events to
         any SSE consumers that are streaming a ClaudeCode/Agno/Dify task.
+        Consumers subscribe before the task is dispatched, so the events are
+        only published, not recorded for replay.
 
         Args:
             subtask_id: Subtask ID
@@ -632,43 +650,43 @@ class SessionManager:
             bool: True if publish was successful
         """
         try:
-            channel = self._get_callback_channel_key(subtask_id)
-            event_json = json.dumps(event.to_dict())
-            redis_client = await self._cache._get_client()
-            try:
-                await redis_client.publish(channel, event_json)
-                return True
-            finally:
-                await redis_client.aclose()
+            await subtask_event_bus.publish(
+                self._get_callback_channel_key(subtask_id),
+                None,
+                json.dumps(event.to_dict()),
+                STREAMING_TTL,
+                record=False,
+            )
+            return True
         except Exception as e:
             logger.error(
                 f"[SessionManager] publish_callback_event failed for subtask {subtask_id}: {e}"
             )
             return False
 
-    async def subscribe_callback_channel(self, subtask_id: int):
+    async def subscribe_callback_channel(
+        self, subtask_id: int
+    ) -> Optional[SubtaskEventSubscription]:
         """Subscribe to the callback event channel for a subtask.
 
-        Returns (redis_client, pubsub) so the caller can poll with
-        pubsub.get_message() and close the client when done.
+        The subscription shares this process's Redis pubsub connection; the
+        caller reads events with ``subscription.get()`` and closes it when done.
 
         Args:
             subtask_id: Subtask ID
 
         Returns:
-            Tuple of (redis_client, pubsub) or (None, None) on failure.
+            The subscription, or None on failure.
         """
         try:
-            channel = self._get_callback_channel_key(subtask_id)
-            redis_client = await self._cache._get_client()
-            pubsub = redis_client.pubsub()
-            await pubsub.subscribe(channel)
-            return redis_client, pubsub
+            return await subtask_event_bus.subscribe(
+                self._get_callback_channel_key(subtask_id)
+            )
         except Exception as e:
             logger.error(
                 f"[SessionManager] subscribe_callback_channel failed for subtask {subtask_id}: {e}"
             )
-            return None, None
+            return None
 
     # ==================== Task-Level Streaming Status (Group Chat) ====================
 
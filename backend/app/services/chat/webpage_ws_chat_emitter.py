@@ -19,6 +19,8 @@ from typing import Any, Callable, Dict, Optional
 import socketio
 
 from app.api.ws.events import ServerEvents
+from app.core.config import settings
+from app.services.chat.ws_emit_batcher import RoomEmitBatcher
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +63,33 @@ class WebPageSocketEmitter:
         """
         self.sio = sio
         self.namespace = namespace
+        self._batcher = RoomEmitBatcher(
+            self._publish,
+            window_ms=settings.WS_EMIT_BATCH_WINDOW_MS,
+            max_events=settings.WS_EMIT_BATCH_MAX_EVENTS,
+        )
+
+    async def _publish(self, event: str, data: Dict[str, Any], **kwargs: Any) -> None:
+        await self.sio.emit(event, data, **kwargs)
+
+    async def _emit(
+        self,
+        event: str,
+        data: Dict[str, Any],
+        *,
+        room: str,
+        namespace: str,
+        skip_sid: Optional[str] = None,
+    ) -> None:
+        """Emit through the room batcher when running on the main event loop."""
+        if _is_main_event_loop():
+            await self._batcher.emit(
+                event, data, room=room, namespace=namespace, skip_sid=skip_sid
+            )
+            return
+        await self._batcher.emit_now(
+            event, data, room=room, namespace=namespace, skip_sid=skip_sid
+        )
 
     # ============================================================
     # Chat Streaming Events (to task room)
@@ -84,7 +113,7 @@ class WebPageSocketEmitter:
             shell_type: Shell type for frontend display logic (default: "Chat")
             message_id: Optional message ID for ordering
         """
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.CHAT_START,
             {
                 "task_id": task_id,
@@ -144,7 +173,7 @@ class WebPageSocketEmitter:
         if result is not None:
             payload["result"] = result
 
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.CHAT_CHUNK,
             payload,
             room=f"task:{task_id}",
@@ -169,7 +198,7 @@ class WebPageSocketEmitter:
             result: Optional result data
             message_id: Message ID for ordering (primary sort key)
         """
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.CHAT_DONE,
             {
                 "task_id": task_id,
@@ -213,7 +242,7 @@ class WebPageSocketEmitter:
         if message_id is not None:
             payload["message_id"] = message_id
 
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.CHAT_ERROR,
             payload,
             room=f"task:{task_id}",
@@ -235,7 +264,7 @@ class WebPageSocketEmitter:
             task_id: Task ID
             subtask_id: Subtask ID
         """
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.CHAT_CANCELLED,
             {
                 "task_id": task_id,
@@ -263,7 +292,7 @@ class WebPageSocketEmitter:
         }
         if context_compaction is not None:
             payload["context_compaction"] = context_compaction
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.CHAT_STATUS_UPDATED,
             payload,
             room=f"task:{task_id}",
@@ -296,7 +325,7 @@ class WebPageSocketEmitter:
             subtask_id: Subtask ID
             block: Block data containing id, type, tool_name, tool_input, status, etc.
         """
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.CHAT_BLOCK_CREATED,
             {
                 "task_id": task_id,
@@ -365,7 +394,7 @@ class WebPageSocketEmitter:
         if status is not None:
             payload["status"] = status
 
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.CHAT_BLOCK_UPDATED,
             payload,
             room=f"task:{task_id}",
@@ -404,7 +433,7 @@ class WebPageSocketEmitter:
             created_at: Message creation time
             skip_sid: Socket ID to exclude (sender)
         """
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.CHAT_MESSAGE,
             {
                 "subtask_id": subtask_id,
@@ -442,7 +471,7 @@ class WebPageSocketEmitter:
             content: Full response content
             result: Result data
         """
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.CHAT_BOT_COMPLETE,
             {
                 "task_id": task_id,
@@ -472,7 +501,7 @@ class WebPageSocketEmitter:
             content: Message content
             data: Optional additional data
         """
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.CHAT_SYSTEM,
             {
                 "task_id": task_id,
@@ -493,7 +522,7 @@ class WebPageSocketEmitter:
         applied_at: str,
     ) -> None:
         """Emit chat:guidance_applied event to task room."""
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.CHAT_GUIDANCE_APPLIED,
             {
                 "task_id": task_id,
@@ -512,7 +541,7 @@ class WebPageSocketEmitter:
         guidance_ids: list[str],
     ) -> None:
         """Emit chat:guidance_expired event to task room."""
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.CHAT_GUIDANCE_EXPIRED,
             {
                 "task_id": task_id,
@@ -547,7 +576,7 @@ class WebPageSocketEmitter:
             team_name: Team name
             is_group_chat: Whether this is a group chat task
         """
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.TASK_CREATED,
             {
                 "task_id": task_id,
@@ -570,7 +599,7 @@ class WebPageSocketEmitter:
             user_id: User ID
             task_id: Task ID
         """
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.TASK_DELETED,
             {"task_id": task_id},
             room=f"user:{user_id}",
@@ -587,7 +616,7 @@ class WebPageSocketEmitter:
             task_id: Task ID
             title: New title
         """
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.TASK_RENAMED,
             {"task_id": task_id, "title": title},
             room=f"user:{user_id}",
@@ -625,7 +654,7 @@ class WebPageSocketEmitter:
             # Auto-generate completed_at for terminal states if not provided
             payload["completed_at"] = datetime.now().isoformat()
 
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.TASK_STATUS,
             payload,
             room=f"user:{user_id}",
@@ -651,7 +680,7 @@ class WebPageSocketEmitter:
             title: Task title
             shared_by: Info about who shared the task
         """
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.TASK_SHARED,
             {
                 "task_id": task_id,
@@ -683,7 +712,7 @@ class WebPageSocketEmitter:
             team_name: Team name
             invited_by: Info about who invited the user
         """
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.TASK_INVITED,
             {
                 "task_id": task_id,
@@ -707,7 +736,7 @@ class WebPageSocketEmitter:
             user_id: User ID
             count: Unread count
         """
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.UNREAD_COUNT,
             {"count": count},
             room=f"user:{user_id}",
@@ -743,7 +772,7 @@ class WebPageSocketEmitter:
             priority: Message priority
             created_at: Creation timestamp
         """
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.QUEUE_MESSAGE_RECEIVED,
             {
                 "message_id": message_id,
@@ -777,7 +806,7 @@ class WebPageSocketEmitter:
             task_id: Task ID
             app: App data (name, address, previewUrl)
         """
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.TASK_APP_UPDATE,
             {
                 "task_id": task_id,
@@ -819,7 +848,7 @@ class WebPageSocketEmitter:
             data=data,
         )
 
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.SKILL_REQUEST,
             payload.to_dict(),
             room=f"task:{task_id}",
@@ -848,7 +877,7 @@ class WebPageSocketEmitter:
             subtask_id: Subtask ID (AI message being corrected)
             correction_model: Model ID used for correction
         """
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.CORRECTION_START,
             {
                 "task_id": task_id,
@@ -878,7 +907,7 @@ class WebPageSocketEmitter:
             stage: Current stage (verifying_facts, evaluating, generating_improvement)
             tool_name: Optional tool name being used
         """
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.CORRECTION_PROGRESS,
             {
                 "task_id": task_id,
@@ -911,7 +940,7 @@ class WebPageSocketEmitter:
             content: Content chunk
             offset: Current offset
         """
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.CORRECTION_CHUNK,
             {
                 "task_id": task_id,
@@ -938,7 +967,7 @@ class WebPageSocketEmitter:
             subtask_id: Subtask ID
             result: Correction result data
         """
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.CORRECTION_DONE,
             {
                 "task_id": task_id,
@@ -964,7 +993,7 @@ class WebPageSocketEmitter:
             subtask_id: Subtask ID
             error: Error message
         """
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.CORRECTION_ERROR,
             {
                 "task_id": task_id,
@@ -1050,7 +1079,7 @@ class WebPageSocketEmitter:
             f"[WS] emit_flow_execution_update called: user={user_id} execution={execution_id} status={status} room=user:{user_id}"
         )
 
-        await self.sio.emit(
+        await self._emit(
             ServerEvents.FLOW_EXECUTION_UPDATE,
             payload,
             room=f"user:{user_id}",
@@ -1084,7 +1113,7 @@ class WebPageSocketEmitter:
             data: Event payload data
             skip_sid: Optional socket ID to exclude
         """
-        await self.sio.emit(
+        await self._emit(
             event_type,
             data,
             room=f"task:{task_id}",
@@ -1100,6 +1129,15 @@ _ws_emitter: Optional[WebPageSocketEmitter] = None
 _main_event_loop: Optional[asyncio.AbstractEventLoop] = None
 
 
+def _is_main_event_loop() -> bool:
+    """Whether the running loop is the one batched frames are flushed on."""
+    try:
+        current_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return _main_event_loop is None or current_loop is _main_event_loop
+
+
 def _get_ws_emitter() -> Optional[WebPageSocketEmitter]:
     """
     Get the global WebSocket emitter instance.
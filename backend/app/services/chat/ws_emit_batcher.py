@@ -0,0 +1,210 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Per-room coalescing of Socket.IO emits.
+
+Every ``sio.emit`` through ``AsyncRedisManager`` is one JSON encode and one
+Redis publish. Group chats and batch status updates emit bursts of small
+events to the same room within milliseconds, so batchable events are held for
+a short window and delivered as a single ``events:batch`` frame; the client
+unpacks the frame and dispatches each event to its regular handlers in order.
+
+- Only events in ``BATCHABLE_EVENTS`` are held; everything else (chat
+  lifecycle, streaming chunks, skill requests, ...) is sent immediately, after
+  flushing anything pending for the same room so ordering is preserved.
+- Snapshot events (``unread:count``, ``task:status`` per task) supersede an
+  older pending copy instead of being sent twice.
+- A window holding a single event sends it as the original event, unwrapped.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from prometheus_client import Counter
+
+from app.api.ws.events import ServerEvents
+
+logger = logging.getLogger(__name__)
+
+# Events that tolerate a few milliseconds of delay and may share a frame
+BATCHABLE_EVENTS = frozenset(
+    {
+        ServerEvents.TASK_STATUS,
+        ServerEvents.TASK_RENAMED,
+        ServerEvents.UNREAD_COUNT,
+        ServerEvents.CHAT_BLOCK_CREATED,
+        ServerEvents.CHAT_BLOCK_UPDATED,
+    }
+)
+
+# Events whose newer payload replaces a pending one with the same key
+_SUPERSEDE_KEYS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    ServerEvents.UNREAD_COUNT: lambda data: None,
+    ServerEvents.TASK_STATUS: lambda data: data.get("task_id"),
+}
+
+# mode: direct, single, batch
+WS_EMIT_PUBLISHES_TOTAL = Counter(
+    "ws_emit_publishes_total",
+    "Socket.IO emits published to the client manager",
+    ["mode"],
+)
+# outcome: direct, batched, superseded
+WS_EMIT_EVENTS_TOTAL = Counter(
+    "ws_emit_events_total",
+    "Socket.IO events handed to the emitter",
+    ["outcome"],
+)
+
+EmitFunc = Callable[..., Awaitable[Any]]
+_RoomKey = Tuple[str, str, Optional[str]]
+
+
+def _emit_target(room: str, namespace: str, skip_sid: Optional[str]) -> Dict[str, Any]:
+    """Keyword arguments addressing ``sio.emit`` at a room."""
+    target: Dict[str, Any] = {"room": room, "namespace": namespace}
+    if skip_sid is not None:
+        target["skip_sid"] = skip_sid
+    return target
+
+
+class _PendingRoom:
+    __slots__ = ("events", "timer")
+
+    def __init__(self) -> None:
+        self.events: List[Tuple[str, Dict[str, Any]]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class RoomEmitBatcher:
+    """Coalesce batchable events per room over a short window."""
+
+    def __init__(
+        self,
+        emit: EmitFunc,
+        *,
+        window_ms: int,
+        max_events: int,
+    ) -> None:
+        self._emit = emit
+        self._window = window_ms / 1000
+        self._max_events = max(1, max_events)
+        self._pending: Dict[_RoomKey, _PendingRoom] = {}
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self._window > 0
+
+    async def emit(
+        self,
+        event: str,
+        data: Dict[str, Any],
+        *,
+        room: str,
+        namespace: str,
+        skip_sid: Optional[str] = None,
+    ) -> None:
+        """Send ``event`` now, or hold it for the room's next frame."""
+        if not self.enabled or event not in BATCHABLE_EVENTS:
+            await self.flush_room(room, namespace)
+            await self.emit_now(
+                event, data, room=room, namespace=namespace, skip_sid=skip_sid
+            )
+            return
+
+        key = (namespace, room, skip_sid)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _PendingRoom()
+            pending.timer = asyncio.get_running_loop().call_later(
+                self._window, self._schedule_flush, key
+            )
+
+        supersede_key = _SUPERSEDE_KEYS.get(event)
+        if supersede_key is not None:
+            marker = supersede_key(data)
+            before = len(pending.events)
+            pending.events = [
+                (queued_event, queued_data)
+                for queued_event, queued_data in pending.events
+                if queued_event != event or supersede_key(queued_data) != marker
+            ]
+            superseded = before - len(pending.events)
+            if superseded:
+                WS_EMIT_EVENTS_TOTAL.labels(outcome="superseded").inc(superseded)
+
+        pending.events.append((event, data))
+        WS_EMIT_EVENTS_TOTAL.labels(outcome="batched").inc()
+        if len(pending.events) >= self._max_events:
+            await self._flush(key)
+
+    async def emit_now(
+        self,
+        event: str,
+        data: Dict[str, Any],
+        *,
+        room: str,
+        namespace: str,
+        skip_sid: Optional[str] = None,
+    ) -> None:
+        """Send ``event`` immediately, bypassing the window."""
+        WS_EMIT_EVENTS_TOTAL.labels(outcome="direct").inc()
+        WS_EMIT_PUBLISHES_TOTAL.labels(mode="direct").inc()
+        await self._emit(event, data, **_emit_target(room, namespace, skip_sid))
+
+    async def flush_room(self, room: str, namespace: str) -> None:
+        """Send everything pending for ``room`` before a direct emit."""
+        for key in [
+            key for key in self._pending if key[0] == namespace and key[1] == room
+        ]:
+            await self._flush(key)
+
+    async def flush_all(self) -> None:
+        """Send every pending frame (used on shutdown and in tests)."""
+        for key in list(self._pending):
+            await self._flush(key)
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+
+    def _schedule_flush(self, key: _RoomKey) -> None:
+        task = asyncio.get_running_loop().create_task(self._flush(key))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self, key: _RoomKey) -> None:
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        if pending.timer is not None:
+            pending.timer.cancel()
+        if not pending.events:
+            return
+
+        namespace, room, skip_sid = key
+        if len(pending.events) == 1:
+            event, data = pending.events[0]
+            mode = "single"
+        else:
+            event = ServerEvents.EVENTS_BATCH
+            data = {
+                "events": [
+                    {"event": queued_event, "data": queued_data}
+                    for queued_event, queued_data in pending.events
+                ]
+            }
+            mode = "batch"
+
+        WS_EMIT_PUBLISHES_TOTAL.labels(mode=mode).inc()
+        try:
+            await self._emit(event, data, **_emit_target(room, namespace, skip_sid))
+        except Exception as e:
+            logger.warning(
+                "[WS] Failed to emit %d batched event(s) to %s: %s",
+                len(pending.events),
+                room,
+                e,
+            )
@@ -30,6 +30,7 @@ from app.schemas.subtask_context import (
 from app.services.attachment.external_storage import (
     find_external_attachment_storage_adapter,
 )
+from app.services.attachment.parse_cache import attachment_parse_cache
 from app.services.attachment.parser import (
     DocumentParseError,
     DocumentParser,
@@ -284,7 +285,7 @@ class ContextService:
 
         truncation_info = None
         try:
-            parse_result: ParseResult = self.parser.parse(binary_data, extension)
+            parse_result = self._parse_with_cache(context, binary_data, extension)
 
             context.extracted_text = parse_result.text if parse_result.text else ""
             context.text_length = (
@@ -330,6 +331,30 @@ class ContextService:
 
         return truncation_info
 
+    def _parse_with_cache(
+        self,
+        context: SubtaskContext,
+        binary_data: bytes,
+        extension: str,
+    ) -> ParseResult:
+        """Parse attachment data, reusing the result of identical earlier bytes."""
+        cache_key = attachment_parse_cache.build_key(
+            binary_data, extension, self.parser
+        )
+        cached = attachment_parse_cache.get(cache_key)
+        if cached is not None:
+            logger.info(
+                "Attachment parse cache hit: context=%s ext=%s text_length=%s",
+                context.id,
+                extension,
+                cached.text_length,
+            )
+            return cached
+
+        parse_result = self.parser.parse(binary_data, extension)
+        attachment_parse_cache.put(cache_key, parse_result)
+        return parse_result
+
     def upload_attachment(
         self,
         db: Session,
@@ -0,0 +1,240 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Batched processing of device heartbeats.
+
+Each connected device heartbeats every few seconds. Handling every heartbeat
+on its own costs a Redis GET for the stale-socket check, a GET+SET for the
+refresh and a database query plus an emit for the slot broadcast. The
+aggregator instead:
+
+- validates heartbeats against an in-memory map of the socket that owns each
+  device, falling back to Redis only for devices it has not seen yet or whose
+  owner looks different;
+- keeps the latest heartbeat per device and writes all of them every flush
+  interval with one MGET and one pipelined SET (the socket ownership is
+  re-checked against Redis at that point, so a late batch never overwrites a
+  newer connection on another replica);
+- reports slot changes only when the running tasks or the runtime capacity
+  actually changed.
+
+A socket that disconnects is dropped from the pending heartbeats and from the
+batch being written, so a flush that races the disconnect neither recreates
+the online key for the dead socket nor re-learns it as the device owner.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from prometheus_client import Counter, Histogram
+
+from app.services.device_service import device_service
+
+logger = logging.getLogger(__name__)
+
+# result: accepted, coalesced, refreshed, stale, missing, failed
+DEVICE_HEARTBEATS_TOTAL = Counter(
+    "device_heartbeats_total",
+    "Device heartbeats handled by the heartbeat aggregator",
+    ["result"],
+)
+DEVICE_HEARTBEAT_BATCH_SIZE = Histogram(
+    "device_heartbeat_batch_size",
+    "Devices refreshed per heartbeat flush",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+)
+DEVICE_HEARTBEAT_COST_PER_DEVICE = Histogram(
+    "device_heartbeat_cost_per_device_seconds",
+    "Heartbeat flush wall time divided by the number of devices in the batch",
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05),
+)
+
+_DeviceKey = Tuple[int, str]
+
+
+@dataclass
+class DeviceHeartbeat:
+    """The latest heartbeat reported by one device socket."""
+
+    user_id: int
+    device_id: str
+    socket_id: str
+    running_task_ids: Optional[List[int]] = None
+    executor_version: Optional[str] = None
+    runtime_transfer_host: Optional[str] = None
+    runtime_instance_id: Optional[str] = None
+    runtime_capacity: Optional[Dict[str, Any]] = None
+    runtime_features: Optional[Dict[str, Any]] = None
+    # Used to recreate the online key when it expired
+    device_name: Optional[str] = None
+    client_ip: Optional[str] = None
+
+
+def slot_signature(online_info: Optional[Dict[str, Any]]) -> Tuple[Any, ...]:
+    """Return the online info fields the device slot broadcast depends on."""
+    if not online_info:
+        return ((), None)
+    return (
+        tuple(sorted(online_info.get("running_task_ids") or ())),
+        online_info.get("runtime_capacity"),
+    )
+
+
+def _slot_changed(previous: Dict[str, Any], heartbeat: DeviceHeartbeat) -> bool:
+    running_task_ids = heartbeat.running_task_ids
+    if running_task_ids is None:
+        running_task_ids = previous.get("running_task_ids")
+    current = {
+        "running_task_ids": running_task_ids,
+        "runtime_capacity": heartbeat.runtime_capacity,
+    }
+    return slot_signature(previous) != slot_signature(current)
+
+
+class HeartbeatAggregator:
+    """Coalesce device heartbeats and refresh them in periodic batches."""
+
+    def __init__(
+        self,
+        *,
+        interval_ms: int,
+        recover: Callable[[DeviceHeartbeat], Awaitable[None]],
+        on_slot_change: Callable[[int, str], Awaitable[None]],
+    ) -> None:
+        self._interval = interval_ms / 1000
+        self._recover = recover
+        self._on_slot_change = on_slot_change
+        self._owners: Dict[_DeviceKey, str] = {}
+        self._pending: Dict[_DeviceKey, DeviceHeartbeat] = {}
+        # Heartbeats of the batch currently being written
+        self._in_flight: Dict[_DeviceKey, DeviceHeartbeat] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def owner(self, user_id: int, device_id: str) -> Optional[str]:
+        """Return the socket last known to own the device, if any."""
+        return self._owners.get((user_id, device_id))
+
+    def remember_owner(self, user_id: int, device_id: str, socket_id: str) -> None:
+        self._owners[(user_id, device_id)] = socket_id
+
+    def discard(self, user_id: int, device_id: str, socket_id: str) -> None:
+        """Forget a disconnected socket and drop its pending heartbeats."""
+        key = (user_id, device_id)
+        for heartbeats in (self._pending, self._in_flight):
+            heartbeat = heartbeats.get(key)
+            if heartbeat is not None and heartbeat.socket_id == socket_id:
+                del heartbeats[key]
+        # A reconnect on this process re-learns the owner from Redis
+        self._owners.pop(key, None)
+
+    async def submit(self, heartbeat: DeviceHeartbeat) -> None:
+        """Queue a heartbeat; a newer one replaces a pending one per device."""
+        key = (heartbeat.user_id, heartbeat.device_id)
+        if key in self._pending:
+            DEVICE_HEARTBEATS_TOTAL.labels(result="coalesced").inc()
+        else:
+            DEVICE_HEARTBEATS_TOTAL.labels(result="accepted").inc()
+        self._pending[key] = heartbeat
+
+        if self._interval <= 0:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        try:
+            while self._pending:
+                await asyncio.sleep(self._interval)
+                try:
+                    await self.flush()
+                except Exception:
+                    logger.exception("[DeviceHeartbeat] Heartbeat flush failed")
+        finally:
+            self._flush_task = None
+
+    async def flush(self) -> None:
+        """Write every pending heartbeat to Redis in one batch."""
+        if not self._pending:
+            return
+        batch = list(self._pending.values())
+        self._pending = {}
+        for heartbeat in batch:
+            self._in_flight[(heartbeat.user_id, heartbeat.device_id)] = heartbeat
+        started = time.perf_counter()
+
+        try:
+            outcomes = await device_service.refresh_device_heartbeats(
+                [asdict(heartbeat) for heartbeat in batch]
+            )
+        except BaseException:
+            for heartbeat in batch:
+                self._take_in_flight(heartbeat)
+            raise
+
+        changed: List[DeviceHeartbeat] = []
+        for heartbeat, (outcome, previous) in zip(batch, outcomes):
+            DEVICE_HEARTBEATS_TOTAL.labels(result=outcome).inc()
+            key = (heartbeat.user_id, heartbeat.device_id)
+            if not self._take_in_flight(heartbeat):
+                # The socket disconnected while the batch was being written
+                continue
+            if outcome == "stale":
+                self._owners[key] = previous.get("socket_id")
+                logger.info(
+                    "[DeviceHeartbeat] Dropped stale heartbeat: user=%s, "
+                    "device=%s, sid=%s, current_sid=%s",
+                    heartbeat.user_id,
+                    heartbeat.device_id,
+                    heartbeat.socket_id,
+                    previous.get("socket_id"),
+                )
+                continue
+            self._owners[key] = heartbeat.socket_id
+            if outcome == "missing":
+                await self._recover_device(heartbeat)
+                changed.append(heartbeat)
+            elif outcome == "refreshed" and _slot_changed(previous, heartbeat):
+                changed.append(heartbeat)
+
+        elapsed = time.perf_counter() - started
+        DEVICE_HEARTBEAT_BATCH_SIZE.observe(len(batch))
+        DEVICE_HEARTBEAT_COST_PER_DEVICE.observe(elapsed / len(batch))
+        logger.debug(
+            "[DeviceHeartbeat] Flushed %d heartbeat(s) in %.2fms, %d slot change(s)",
+            len(batch),
+            elapsed * 1000,
+            len(changed),
+        )
+
+        for heartbeat in changed:
+            try:
+                await self._on_slot_change(heartbeat.user_id, heartbeat.device_id)
+            except Exception:
+                logger.exception(
+                    "[DeviceHeartbeat] Slot update failed: user=%s, device=%s",
+                    heartbeat.user_id,
+                    heartbeat.device_id,
+                )
+
+    def _take_in_flight(self, heartbeat: DeviceHeartbeat) -> bool:
+        """Remove an in-flight heartbeat; False if it was discarded meanwhile."""
+        key = (heartbeat.user_id, heartbeat.device_id)
+        if self._in_flight.get(key) is not heartbeat:
+            return False
+        del self._in_flight[key]
+        return True
+
+    async def _recover_device(self, heartbeat: DeviceHeartbeat) -> None:
+        try:
+            await self._recover(heartbeat)
+        except Exception:
+            logger.exception(
+                "[DeviceHeartbeat] Heartbeat recovery failed: user=%s, device=%s",
+                heartbeat.user_id,
+                heartbeat.device_id,
+            )
@@ -14,7 +14,7 @@ Handles local devices that connect via WebSocket. This provider manages:
 
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from packaging import version as pkg_version
 from sqlalchemy import and_
@@ -65,6 +65,43 @@ def runtime_capacity_slot_values(online_info: Any) -> tuple[int, int]:
     return active, limit
 
 
+# Heartbeat fields merged into the online info on every refresh
+HEARTBEAT_REFRESH_FIELDS = (
+    "running_task_ids",
+    "executor_version",
+    "runtime_transfer_host",
+    "runtime_instance_id",
+    "runtime_capacity",
+    "runtime_features",
+)
+
+
+def _apply_heartbeat(
+    data: Dict[str, Any],
+    *,
+    running_task_ids: Optional[List[int]],
+    executor_version: Optional[str],
+    runtime_transfer_host: Optional[str],
+    runtime_instance_id: Optional[str],
+    runtime_capacity: Optional[Dict[str, Any]],
+    runtime_features: Optional[Dict[str, Any]],
+) -> None:
+    """Merge one heartbeat into a device's online info in place."""
+    data["last_heartbeat"] = datetime.now().isoformat()
+    if running_task_ids is not None:
+        data["running_task_ids"] = running_task_ids
+    if executor_version is not None:
+        data["executor_version"] = executor_version
+    if runtime_transfer_host is not None:
+        data["runtime_transfer_host"] = runtime_transfer_host
+    # Every heartbeat replaces the capacity observation. A missing
+    # snapshot must clear the previous value instead of extending a
+    # stale capacity truth with the online TTL.
+    data["runtime_instance_id"] = runtime_instance_id
+    data["runtime_capacity"] = runtime_capacity
+    data["runtime_features"] = runtime_features
+
+
 class LocalDeviceProvider(BaseDeviceProvider):
     """Provider for local devices connected via WebSocket.
 
@@ -508,19 +545,15 @@ class LocalDeviceProvider(BaseDeviceProvider):
         key = self.generate_online_key(user_id, device_id)
         data = await cache_manager.get(key)
         if data:
-            data["last_heartbeat"] = datetime.now().isoformat()
-            if running_task_ids is not None:
-                data["running_task_ids"] = running_task_ids
-            if executor_version is not None:
-                data["executor_version"] = executor_version
-            if runtime_transfer_host is not None:
-                data["runtime_transfer_host"] = runtime_transfer_host
-            # Every heartbeat replaces the capacity observation. A missing
-            # snapshot must clear the previous value instead of extending a
-            # stale capacity truth with the online TTL.
-            data["runtime_instance_id"] = runtime_instance_id
-            data["runtime_capacity"] = runtime_capacity
-            data["runtime_features"] = runtime_features
+            _apply_heartbeat(
+                data,
+                running_task_ids=running_task_ids,
+                executor_version=executor_version,
+                runtime_transfer_host=runtime_transfer_host,
+                runtime_instance_id=runtime_instance_id,
+                runtime_capacity=runtime_capacity,
+                runtime_features=runtime_features,
+            )
             result = await cache_manager.set(key, data, expire=DEVICE_ONLINE_TTL)
             logger.debug(
                 f"[LocalDeviceProvider] refresh_heartbeat: key={key}, "
@@ -532,6 +565,56 @@ class LocalDeviceProvider(BaseDeviceProvider):
         )
         return False
 
+    async def refresh_heartbeats(
+        self, heartbeats: List[Dict[str, Any]]
+    ) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+        """Refresh many device heartbeats with one MGET and one pipelined SET.
+
+        Each heartbeat is a dict with ``user_id``, ``device_id`` and
+        ``socket_id`` plus the keyword arguments of ``refresh_heartbeat``.
+        A heartbeat is only applied while the online key still belongs to
+        its socket, so a late batch cannot overwrite a newer connection.
+
+        Returns:
+            One ``(outcome, previous)`` pair per heartbeat, in order, where
+            outcome is ``refreshed``, ``stale``, ``missing`` or ``failed`` and
+            previous is the online info read before the refresh
+        """
+        keys = [
+            self.generate_online_key(heartbeat["user_id"], heartbeat["device_id"])
+            for heartbeat in heartbeats
+        ]
+        current = await cache_manager.mget(keys)
+
+        outcomes: List[Tuple[str, Optional[Dict[str, Any]]]] = []
+        updates: Dict[str, Dict[str, Any]] = {}
+        for key, heartbeat in zip(keys, heartbeats):
+            previous = current.get(key)
+            if not isinstance(previous, dict):
+                outcomes.append(("missing", None))
+                continue
+            online_socket_id = previous.get("socket_id")
+            if online_socket_id and online_socket_id != heartbeat["socket_id"]:
+                outcomes.append(("stale", previous))
+                continue
+            data = dict(previous)
+            _apply_heartbeat(
+                data,
+                **{field: heartbeat.get(field) for field in HEARTBEAT_REFRESH_FIELDS},
+            )
+            updates[key] = data
+            outcomes.append(("refreshed", previous))
+
+        written = await cache_manager.set_many(updates, expire=DEVICE_ONLINE_TTL)
+        return [
+            (
+                ("failed", previous)
+                if outcome == "refreshed" and not written.get(key, False)
+                else (outcome, previous)
+            )
+            for key, (outcome, previous) in zip(keys, outcomes)
+        ]
+
     async def is_online(
         self,
         user_id: int,
@@ -19,6 +19,10 @@ from app.services.device.runtime_route import (
     RuntimeRouteError,
     runtime_route_resolver,
 )
+from app.services.runtime_work_snapshot import (
+    LISTING_PRESERVING_RPC_METHODS,
+    runtime_work_snapshot_store,
+)
 from shared.telemetry.decorators import trace_async
 
 logger = logging.getLogger(__name__)
@@ -170,6 +174,10 @@ class RuntimeRpcService:
             elapsed_ms,
             sorted(result.keys()),
         )
+        if method not in LISTING_PRESERVING_RPC_METHODS:
+            await runtime_work_snapshot_store.invalidate(
+                user_id, route.logical_device_id
+            )
         return result
 
     @classmethod
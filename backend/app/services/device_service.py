@@ -172,6 +172,22 @@ class DeviceService:
             runtime_features=runtime_features,
         )
 
+    @staticmethod
+    async def refresh_device_heartbeats(
+        heartbeats: List[Dict[str, Any]],
+    ) -> List[tuple[str, Optional[Dict[str, Any]]]]:
+        """Refresh a batch of device heartbeats in one Redis round trip.
+
+        Args:
+            heartbeats: Dicts with user_id, device_id, socket_id and the
+                refresh_device_heartbeat keyword arguments
+
+        Returns:
+            One (outcome, previous online info) pair per heartbeat
+        """
+        provider = DeviceService._get_provider(DeviceType.LOCAL)
+        return await provider.refresh_heartbeats(heartbeats)
+
     @staticmethod
     async def set_device_offline(user_id: int, device_id: str) -> bool:
         """Remove device online status from Redis.
@@ -29,6 +29,7 @@ from typing import Any, Optional
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.http_clients import http_clients
 from app.db.session import SessionLocal
 from app.models.kind import Kind
 from app.models.subtask_context import ContextType, SubtaskContext
@@ -456,6 +457,7 @@ def _run_indexing_gateway_calls(
         )
         return result
     finally:
+        loop.run_until_complete(http_clients.aclose())
         loop.run_until_complete(loop.shutdown_asyncgens())
         loop.close()
 
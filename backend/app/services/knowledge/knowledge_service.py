@@ -16,6 +16,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import flag_modified
 
 from app.core.exceptions import ValidationException
+from app.core.http_clients import http_clients
 from app.models.kind import Kind
 from app.models.knowledge import (
     ContentOrigin,
@@ -146,6 +147,7 @@ def _run_async_in_new_loop(coro):
                 loop.run_until_complete(
                     asyncio.gather(*pending, return_exceptions=True)
                 )
+            loop.run_until_complete(http_clients.aclose())
             loop.run_until_complete(loop.shutdown_asyncgens())
     finally:
         asyncio.set_event_loop(None)
@@ -21,7 +21,8 @@ Architecture:
 
 import base64
 import logging
-from typing import Any, Dict, List, Literal, Optional
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional
 
 from sqlalchemy.orm import Session
 
@@ -55,6 +56,9 @@ from app.services.knowledge.retrieval_profile import (
 from app.stores.tasks import task_store
 from shared.models import SearchHints
 
+if TYPE_CHECKING:
+    from app.services.web_scraper import ScrapePriority
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_TEXT_FILE_EXTENSION = "txt"
@@ -98,6 +102,21 @@ def _build_filename(name: str, file_extension: str) -> str:
     return f"{name}.{ext}"
 
 
+def _web_source_metadata(result: Any) -> Dict[str, Any]:
+    """Build the source_config fields of a web document from a scrape."""
+    scraped_at = result.scraped_at.isoformat()
+    return {
+        "url": result.url,
+        "scraped_at": scraped_at,
+        "checked_at": scraped_at,
+        "title": result.title,
+        "description": result.description,
+        "etag": result.etag,
+        "last_modified": result.last_modified,
+        "content_hash": result.content_hash,
+    }
+
+
 def _validate_document_read_paging(offset: int, limit: int) -> None:
     """Validate raw document read paging arguments."""
     if offset < 0:
@@ -2403,6 +2422,7 @@ class KnowledgeOrchestrator:
         folder_id: int = 0,
         trigger_indexing: bool = True,
         trigger_summary: bool = True,
+        priority: Optional["ScrapePriority"] = None,
     ) -> Dict[str, Any]:
         """
         Create a document from a web page by scraping the URL.
@@ -2421,6 +2441,7 @@ class KnowledgeOrchestrator:
             name: Optional document name (uses page title if not provided)
             trigger_indexing: Whether to trigger RAG indexing
             trigger_summary: Whether to trigger summary generation
+            priority: Scrape queue priority (defaults to interactive)
 
         Returns:
             Dict with success status and document info
@@ -2432,7 +2453,7 @@ class KnowledgeOrchestrator:
 
         from app.schemas.knowledge import DocumentSourceType, KnowledgeDocumentCreate
         from app.services.context import context_service
-        from app.services.web_scraper import get_web_scraper_service
+        from app.services.web_scraper import ScrapePriority, get_web_scraper_service
 
         logger.info(
             f"[Orchestrator] Creating web document from URL: {url} "
@@ -2458,7 +2479,9 @@ class KnowledgeOrchestrator:
 
         # Scrape the web page (async)
         service = get_web_scraper_service()
-        result = await service.scrape_url(url)
+        result = await service.scrape_url(
+            url, priority=priority or ScrapePriority.INTERACTIVE
+        )
 
         if not result.success:
             logger.warning(
@@ -2504,12 +2527,7 @@ class KnowledgeOrchestrator:
                 file_size=content_size,
                 folder_id=folder_id,
                 source_type=DocumentSourceType.WEB,
-                source_config={
-                    "url": result.url,
-                    "scraped_at": result.scraped_at.isoformat(),
-                    "title": result.title,
-                    "description": result.description,
-                },
+                source_config=_web_source_metadata(result),
             )
 
             document = KnowledgeService.create_document(
@@ -2560,6 +2578,7 @@ class KnowledgeOrchestrator:
         document_id: int,
         trigger_indexing: bool = True,
         trigger_summary: bool = False,
+        priority: Optional["ScrapePriority"] = None,
     ) -> Dict[str, Any]:
         """
         Refresh a web document by re-scraping its URL.
@@ -2577,6 +2596,7 @@ class KnowledgeOrchestrator:
             document_id: Document ID to refresh
             trigger_indexing: Whether to trigger RAG re-indexing
             trigger_summary: Whether to trigger summary generation
+            priority: Scrape queue priority (defaults to interactive)
 
         Returns:
             Dict with success status and document info
@@ -2588,7 +2608,8 @@ class KnowledgeOrchestrator:
         from app.models.subtask_context import SubtaskContext
         from app.schemas.knowledge import DocumentSourceType
         from app.services.context import context_service
-        from app.services.web_scraper import get_web_scraper_service
+        from app.services.web_scraper import ScrapePriority, get_web_scraper_service
+        from app.services.web_scraper.freshness import FreshnessStatus, PageValidators
 
         logger.info(f"[Orchestrator] Refreshing web document {document_id}")
 
@@ -2648,9 +2669,34 @@ class KnowledgeOrchestrator:
                 "error_message": "Document has no source URL",
             }
 
-        # Re-scrape the web page (async)
         service = get_web_scraper_service()
-        result = await service.scrape_url(url)
+        # Content and index can only be kept when both are in place
+        indexed = bool(document.attachment_id) and (
+            document.index_status == DocumentIndexStatus.SUCCESS
+        )
+
+        # Ask the server first; a 304 avoids the browser scrape entirely
+        if indexed:
+            freshness = await service.check_for_changes(
+                url,
+                PageValidators(
+                    etag=source_config.get("etag"),
+                    last_modified=source_config.get("last_modified"),
+                ),
+            )
+            if freshness.status == FreshnessStatus.NOT_MODIFIED:
+                logger.info(
+                    f"[Orchestrator] Web document {document.id} not modified upstream"
+                )
+                updates = {"checked_at": datetime.utcnow().isoformat()}
+                # A 304 may repeat only some validators; keep the others
+                updates.update(freshness.validators.model_dump(exclude_none=True))
+                return self._keep_unchanged_web_document(db, document, updates)
+
+        # Re-scrape the web page (async)
+        result = await service.scrape_url(
+            url, priority=priority or ScrapePriority.INTERACTIVE
+        )
 
         if not result.success:
             logger.warning(
@@ -2663,6 +2709,20 @@ class KnowledgeOrchestrator:
                 "error_message": result.error_message,
             }
 
+        # Identical content keeps the current attachment and index
+        if (
+            indexed
+            and result.content_hash
+            and result.content_hash == source_config.get("content_hash")
+        ):
+            logger.info(
+                f"[Orchestrator] Web document {document.id} content unchanged, "
+                f"skipping re-indexing"
+            )
+            return self._keep_unchanged_web_document(
+                db, document, _web_source_metadata(result)
+            )
+
         # Update or create attachment using context_service
         content_bytes = result.content.encode("utf-8")
         content_size = len(content_bytes)
@@ -2714,14 +2774,7 @@ class KnowledgeOrchestrator:
         # Update document metadata
         document.file_size = content_size
         source_config = dict(document.source_config or {})
-        source_config.update(
-            {
-                "url": result.url,
-                "scraped_at": result.scraped_at.isoformat(),
-                "title": result.title,
-                "description": result.description,
-            }
-        )
+        source_config.update(_web_source_metadata(result))
         document.source_config = source_config
         document.clear_processing_error_payload()
         # Reset is_active to False, will be set to True after re-indexing
@@ -2767,6 +2820,36 @@ class KnowledgeOrchestrator:
                 "error_message": str(e),
             }
 
+    def _keep_unchanged_web_document(
+        self,
+        db: Session,
+        document: Any,
+        source_updates: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Record a refresh that found no changes without re-indexing."""
+        source_config = dict(document.source_config or {})
+        source_config.update(source_updates)
+        document.source_config = source_config
+        try:
+            db.commit()
+            db.refresh(document)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[Orchestrator] Failed to refresh web document: {e}")
+            return {
+                "success": False,
+                "document": None,
+                "error_code": "REFRESH_FAILED",
+                "error_message": str(e),
+            }
+        return {
+            "success": True,
+            "document": KnowledgeDocumentResponse.model_validate(document),
+            "error_code": None,
+            "error_message": None,
+            "unchanged": True,
+        }
+
     async def retrieve_knowledge(
         self,
         *,
@@ -0,0 +1,429 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""In-memory scheduling index for device-scoped execution claims.
+
+`claim_next_for_device` used to load every queued row of a device, scan all
+capacity-holding rows for occupied scopes and per-robot activity, and pick a
+candidate in Python, so every claim read the whole queue. The index keeps,
+per claim pool (owner, device, environment), one FIFO heap per (priority,
+robot) so a claim only looks at the head of each robot queue in the highest
+priority that has work. A claim still runs a few grouped count queries over
+capacity-holding rows, sized by the robots and scopes at those heads rather
+than by the queue length.
+
+The database stays authoritative:
+
+- rows queued since the last claim are merged incrementally (every transition
+  into `queued` stamps `queued_at`), and each pool is reloaded in full every
+  `LOOP_EXECUTION_SCHEDULER_RECONCILE_SECONDS`;
+- the active-robot and occupied-scope counters are maintained on claims and
+  transitions made by this process, and refreshed with grouped count queries
+  for exactly the robots and scopes a claim decides on, so transitions made by
+  other workers never let a claim exceed a robot limit or reuse a scope;
+- transitions whose commit is owned by the caller reach the index only once
+  that session commits and are dropped on rollback;
+- the claim itself remains a compare-and-set on the row; a lost race just
+  drops the entry and picks again.
+"""
+
+import heapq
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.loop_item_execution import LoopItemExecution
+
+# Rows whose `queued_at` is at most this much older than the previous sync are
+# re-read, covering transactions that committed after a concurrent sync
+SYNC_OVERLAP_SECONDS = 10
+
+# Session.info keys of index updates waiting for the caller's commit
+_PENDING_UPDATES_KEY = "loop_execution_scheduler_pending_updates"
+_LISTENING_KEY = "loop_execution_scheduler_listening"
+
+PoolKey = tuple[int, str, str]
+# Heap entry: FIFO order first, then the identity needed to claim it
+_Entry = tuple[datetime, int, str, str]
+# Key of the shared FIFO for runs without a robot (managers, teams)
+_NO_AGENT = ""
+
+
+def _apply_pending_updates(session: Session) -> None:
+    for update in session.info.pop(_PENDING_UPDATES_KEY, []):
+        update()
+
+
+def _drop_pending_updates(session: Session) -> None:
+    session.info.pop(_PENDING_UPDATES_KEY, None)
+
+
+@dataclass
+class _ClaimPool:
+    """Queued runs of one (owner, device, environment)."""
+
+    queues: dict[int, dict[str, list[_Entry]]] = field(default_factory=dict)
+    members: dict[int, tuple[int, str]] = field(default_factory=dict)
+    synced_at: Optional[datetime] = None
+    reconciled_at: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def add(self, priority: int, entry: _Entry) -> None:
+        execution_id, agent_id = entry[1], entry[2]
+        if execution_id in self.members:
+            return
+        self.members[execution_id] = (priority, agent_id)
+        heapq.heappush(
+            self.queues.setdefault(priority, {}).setdefault(agent_id, []), entry
+        )
+
+    def remove(self, execution_id: int) -> None:
+        # Heaps drop removed entries lazily when they reach the head
+        self.members.pop(execution_id, None)
+
+    def head(self, priority: int, agent_id: str) -> Optional[_Entry]:
+        agents = self.queues.get(priority, {})
+        queue = agents.get(agent_id, [])
+        while queue and queue[0][1] not in self.members:
+            heapq.heappop(queue)
+        if queue:
+            return queue[0]
+        agents.pop(agent_id, None)
+        if not agents:
+            self.queues.pop(priority, None)
+        return None
+
+
+class ExecutionSchedulerIndex:
+    """Per-process fair-share index over queued executions."""
+
+    def __init__(
+        self,
+        *,
+        queued_status: str,
+        capacity_statuses: Iterable[str],
+        agent_limits: Callable[[Session, set[str]], dict[str, int]],
+        utcnow: Callable[[], datetime],
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._queued_status = queued_status
+        self._capacity_statuses = tuple(capacity_statuses)
+        self._agent_limits = agent_limits
+        self._utcnow = utcnow
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pools: dict[PoolKey, _ClaimPool] = {}
+        self._active_agents: Counter[str] = Counter()
+        self._occupied_scopes: Counter[str] = Counter()
+
+    def clear(self) -> None:
+        """Forget every pool and counter; the next claim reloads from the DB."""
+
+        with self._lock:
+            self._pools.clear()
+            self._active_agents.clear()
+            self._occupied_scopes.clear()
+
+    def _pool(self, key: PoolKey) -> _ClaimPool:
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = _ClaimPool()
+            return pool
+
+    def queued_count(self, key: PoolKey) -> int:
+        pool = self._pools.get(key)
+        return len(pool.members) if pool is not None else 0
+
+    # ------------------------------------------------------------------
+    # Transition hooks
+    # ------------------------------------------------------------------
+
+    def note_queued(
+        self, execution: LoopItemExecution, *, db: Optional[Session] = None
+    ) -> None:
+        """Add a run that entered `queued` to its pool, if that pool is loaded.
+
+        Pass ``db`` when the transition's commit is owned by the caller: the
+        run is then added once that session commits, and never on rollback.
+        """
+
+        key = self._pool_key(execution)
+        priority = execution.priority_weight
+        entry = self._entry(execution)
+
+        def add() -> None:
+            pool = self._pools.get(key)
+            if pool is None:
+                return
+            with pool.lock:
+                pool.add(priority, entry)
+
+        self._after_commit(db, add)
+
+    def note_claimed(self, key: PoolKey, entry: _Entry) -> None:
+        pool = self._pool(key)
+        with pool.lock:
+            pool.remove(entry[1])
+        with self._lock:
+            if entry[2]:
+                self._active_agents[entry[2]] += 1
+            if entry[3]:
+                self._occupied_scopes[entry[3]] += 1
+
+    def note_released(self, execution: LoopItemExecution) -> None:
+        """Release the counters of a run that left a capacity status."""
+
+        self._release(execution.agent_id, execution.execution_scope)
+
+    def note_terminal(
+        self,
+        execution: LoopItemExecution,
+        *,
+        held_capacity: bool,
+        db: Optional[Session] = None,
+    ) -> None:
+        """Drop a run that reached a terminal status from its pool.
+
+        ``db`` defers the update to the caller's commit, as in `note_queued`.
+        """
+
+        key = self._pool_key(execution)
+        execution_id = execution.id
+        agent_id, scope = execution.agent_id, execution.execution_scope
+
+        def drop() -> None:
+            self.discard(key, execution_id)
+            if held_capacity:
+                self._release(agent_id, scope)
+
+        self._after_commit(db, drop)
+
+    def invalidate(self, key: PoolKey) -> None:
+        """Reload a pool from the database on its next claim."""
+
+        pool = self._pools.get(key)
+        if pool is not None:
+            with pool.lock:
+                pool.synced_at = None
+
+    def discard(self, key: PoolKey, execution_id: int) -> None:
+        """Drop a run that is no longer queued (e.g. it lost a claim race)."""
+
+        pool = self._pools.get(key)
+        if pool is not None:
+            with pool.lock:
+                pool.remove(execution_id)
+
+    def _release(self, agent_id: Optional[str], scope: Optional[str]) -> None:
+        with self._lock:
+            for counter, name in (
+                (self._active_agents, agent_id),
+                (self._occupied_scopes, scope),
+            ):
+                if name and counter[name] > 0:
+                    counter[name] -= 1
+
+    def _after_commit(self, db: Optional[Session], update: Callable[[], None]) -> None:
+        if db is None:
+            update()
+            return
+        if not db.info.get(_LISTENING_KEY):
+            event.listen(db, "after_commit", _apply_pending_updates)
+            event.listen(db, "after_rollback", _drop_pending_updates)
+            db.info[_LISTENING_KEY] = True
+        db.info.setdefault(_PENDING_UPDATES_KEY, []).append(update)
+
+    # ------------------------------------------------------------------
+    # Candidate selection
+    # ------------------------------------------------------------------
+
+    def candidate(self, db: Session, key: PoolKey) -> Optional[_Entry]:
+        """Return the next fair run of a pool without claiming it.
+
+        FIFO per robot, the least-active robot within the highest priority
+        that has an eligible run, and runs without a robot in plain FIFO.
+        """
+
+        pool = self._pool(key)
+        with pool.lock:
+            self._sync(db, key, pool)
+            for priority in sorted(pool.queues, reverse=True):
+                selected = self._select(db, pool, priority)
+                if selected is not None:
+                    return selected
+        return None
+
+    def _select(self, db: Session, pool: _ClaimPool, priority: int) -> Optional[_Entry]:
+        if priority not in pool.queues:
+            return None
+        agent_ids = {agent_id for agent_id in pool.queues[priority] if agent_id}
+        self._refresh_active_agents(db, agent_ids)
+        limits = self._agent_limits(db, agent_ids)
+        heads = [
+            pool.head(priority, agent_id)
+            for agent_id in list(pool.queues.get(priority, ()))
+        ]
+        checked_scopes = {entry[3] for entry in heads if entry and entry[3]}
+        self._refresh_scopes(db, checked_scopes)
+        best: Optional[tuple[tuple[int, datetime, int], _Entry]] = None
+        for agent_id in list(pool.queues.get(priority, ())):
+            active = self._active_agents.get(agent_id, 0) if agent_id else 0
+            if agent_id and active >= limits.get(agent_id, 1):
+                continue
+            entry = self._first_free(db, pool, priority, agent_id, checked_scopes)
+            if entry is None:
+                continue
+            rank = (active, entry[0], entry[1])
+            if best is None or rank < best[0]:
+                best = (rank, entry)
+        return best[1] if best is not None else None
+
+    def _first_free(
+        self,
+        db: Session,
+        pool: _ClaimPool,
+        priority: int,
+        agent_id: str,
+        checked_scopes: set[str],
+    ) -> Optional[_Entry]:
+        """Return the oldest run of one robot queue whose scope is free."""
+
+        skipped: list[_Entry] = []
+        try:
+            while True:
+                entry = pool.head(priority, agent_id)
+                if entry is None:
+                    return None
+                scope = entry[3]
+                if scope and scope not in checked_scopes:
+                    self._refresh_scopes(db, {scope})
+                    checked_scopes.add(scope)
+                if not scope or not self._occupied_scopes.get(scope):
+                    return entry
+                skipped.append(heapq.heappop(pool.queues[priority][agent_id]))
+        finally:
+            for entry in skipped:
+                heapq.heappush(
+                    pool.queues.setdefault(priority, {}).setdefault(agent_id, []),
+                    entry,
+                )
+
+    # ------------------------------------------------------------------
+    # Database synchronization
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _pool_key(execution: LoopItemExecution) -> PoolKey:
+        return (
+            execution.executor_owner_user_id,
+            execution.execution_device_id or "",
+            execution.execution_environment or "",
+        )
+
+    @staticmethod
+    def _entry(execution: LoopItemExecution) -> _Entry:
+        return (
+            execution.queued_at,
+            execution.id,
+            execution.agent_id or _NO_AGENT,
+            execution.execution_scope or "",
+        )
+
+    def _sync(self, db: Session, key: PoolKey, pool: _ClaimPool) -> None:
+        now = self._utcnow()
+        reconcile = (
+            pool.synced_at is None
+            or self._clock() - pool.reconciled_at
+            >= settings.LOOP_EXECUTION_SCHEDULER_RECONCILE_SECONDS
+        )
+        owner_user_id, device_id, environment = key
+        query = db.query(
+            LoopItemExecution.id,
+            LoopItemExecution.agent_id,
+            LoopItemExecution.execution_scope,
+            LoopItemExecution.priority_weight,
+            LoopItemExecution.queued_at,
+        ).filter(
+            LoopItemExecution.executor_owner_user_id == owner_user_id,
+            LoopItemExecution.execution_device_id == device_id,
+            LoopItemExecution.execution_environment == environment,
+            LoopItemExecution.status == self._queued_status,
+        )
+        if reconcile:
+            pool.queues.clear()
+            pool.members.clear()
+            pool.reconciled_at = self._clock()
+            self._refresh_all_counters(db)
+        else:
+            query = query.filter(
+                LoopItemExecution.queued_at
+                >= pool.synced_at - timedelta(seconds=SYNC_OVERLAP_SECONDS)
+            )
+        for execution_id, agent_id, scope, priority, queued_at in query.all():
+            pool.add(priority, (queued_at, execution_id, agent_id or _NO_AGENT, scope))
+        pool.synced_at = now
+
+    def _capacity_rows(self, db: Session):
+        return db.query(LoopItemExecution).filter(
+            LoopItemExecution.status.in_(self._capacity_statuses)
+        )
+
+    def _refresh_all_counters(self, db: Session) -> None:
+        agents = dict(
+            self._capacity_rows(db)
+            .with_entities(LoopItemExecution.agent_id, func.count(LoopItemExecution.id))
+            .filter(LoopItemExecution.agent_id != "")
+            .group_by(LoopItemExecution.agent_id)
+            .all()
+        )
+        scopes = dict(
+            self._capacity_rows(db)
+            .with_entities(
+                LoopItemExecution.execution_scope, func.count(LoopItemExecution.id)
+            )
+            .filter(LoopItemExecution.execution_scope != "")
+            .group_by(LoopItemExecution.execution_scope)
+            .all()
+        )
+        with self._lock:
+            self._active_agents = Counter(agents)
+            self._occupied_scopes = Counter(scopes)
+
+    def _refresh_active_agents(self, db: Session, agent_ids: set[str]) -> None:
+        if not agent_ids:
+            return
+        counts = dict(
+            self._capacity_rows(db)
+            .with_entities(LoopItemExecution.agent_id, func.count(LoopItemExecution.id))
+            .filter(LoopItemExecution.agent_id.in_(agent_ids))
+            .group_by(LoopItemExecution.agent_id)
+            .all()
+        )
+        with self._lock:
+            for agent_id in agent_ids:
+                self._active_agents[agent_id] = int(counts.get(agent_id, 0))
+
+    def _refresh_scopes(self, db: Session, scopes: set[str]) -> None:
+        if not scopes:
+            return
+        counts = dict(
+            self._capacity_rows(db)
+            .with_entities(
+                LoopItemExecution.execution_scope, func.count(LoopItemExecution.id)
+            )
+            .filter(LoopItemExecution.execution_scope.in_(scopes))
+            .group_by(LoopItemExecution.execution_scope)
+            .all()
+        )
+        with self._lock:
+            for scope in scopes:
+                self._occupied_scopes[scope] = int(counts.get(scope, 0))
@@ -37,6 +37,7 @@ from app.services.loop_item_executions.profile import (
     WeworkExecutionProfileError,
     validate_wework_execution_target,
 )
+from app.services.loop_item_executions.scheduler_index import ExecutionSchedulerIndex
 from app.services.project_automation_domain import (
     TERMINAL_RUN_STATUSES,
     assignment_mode,
@@ -380,6 +381,18 @@ def utcnow() -> datetime:
     return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
+# Device-scoped claims pick candidates from this per-process index instead of
+# loading the whole device queue on every claim
+execution_scheduler_index = ExecutionSchedulerIndex(
+    queued_status=STATUS_QUEUED,
+    capacity_statuses=CAPACITY_STATUSES,
+    agent_limits=_agent_limits,
+    utcnow=utcnow,
+)
+# A device claim tries this many candidates after losing compare-and-set races
+MAX_DEVICE_CLAIM_ATTEMPTS = 5
+
+
 class LoopItemExecutionService:
     """Lifecycle, profile compilation, and claiming for Wework executions."""
 
@@ -584,6 +597,8 @@ class LoopItemExecutionService:
             db, row, "pending" if requires_approval else "queued"
         )
         db.flush()
+        if row.status == STATUS_QUEUED:
+            execution_scheduler_index.note_queued(row, db=db)
         return row
 
     @staticmethod
@@ -623,6 +638,7 @@ class LoopItemExecutionService:
         # rolls the approval back instead of half-applying it.
         db.flush()
         db.refresh(row)
+        execution_scheduler_index.note_queued(row, db=db)
         return row
 
     def mark_managed_running(
@@ -937,6 +953,9 @@ class LoopItemExecutionService:
         if claimed != 1:
             return None
         db.refresh(candidate)
+        execution_scheduler_index.discard(
+            (owner_user_id, execution_device_id, environment), candidate.id
+        )
         return candidate
 
     def claim_next_for_device(
@@ -956,7 +975,9 @@ class LoopItemExecutionService:
 
         Used by the cloud dispatcher after acquiring the per-device Redis lock.
         The caller loops until this returns None to drain the device up to its
-        capacity (each robot still runs one task at a time).
+        capacity (each robot still runs one task at a time). Candidates come
+        from `execution_scheduler_index`, so a claim does not reload the
+        device's whole queue.
         """
 
         running_count = _runtime_capacity_used(
@@ -968,57 +989,49 @@ class LoopItemExecutionService:
         )
         if running_count is None or running_count >= device_capacity:
             return None
-        query = (
-            db.query(LoopItemExecution)
-            .filter(
-                LoopItemExecution.execution_device_id == execution_device_id,
-                LoopItemExecution.execution_environment == environment,
-                LoopItemExecution.status == STATUS_QUEUED,
-            )
-            .order_by(
-                LoopItemExecution.priority_weight.desc(),
-                LoopItemExecution.queued_at.asc(),
-                LoopItemExecution.id.asc(),
-            )
-        )
-        query = query.filter(LoopItemExecution.executor_owner_user_id == owner_user_id)
-        occupied_scopes = _occupied_execution_scopes(db)
-        active_counts = _active_agent_counts(db)
-        rows = query.all()
-        limits = _agent_limits(db, {row.agent_id for row in rows if row.agent_id})
-        candidate = _fair_single_candidate(
-            rows,
-            occupied_scopes=occupied_scopes,
-            active_counts=active_counts,
-            limits=limits,
-        )
-        if candidate is None:
-            return None
-        now = utcnow()
-        claimed = (
-            db.query(LoopItemExecution)
-            .filter(
-                LoopItemExecution.id == candidate.id,
-                LoopItemExecution.status == STATUS_QUEUED,
-            )
-            .update(
-                {
-                    "status": STATUS_CLAIMED,
-                    "claimed_at": now,
-                    "heartbeat_at": now,
-                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
-                    "runtime_device_id": execution_device_id,
-                    "runtime_instance_id": runtime_instance_id,
-                    "runtime_task_id": runtime_task_id_for(candidate.id),
-                    "version": LoopItemExecution.version + 1,
-                }
+        pool = (owner_user_id, execution_device_id, environment)
+        for attempt in range(MAX_DEVICE_CLAIM_ATTEMPTS):
+            candidate = execution_scheduler_index.candidate(db, pool)
+            if candidate is None:
+                return None
+            execution_id = candidate[1]
+            now = utcnow()
+            claimed = (
+                db.query(LoopItemExecution)
+                .filter(
+                    LoopItemExecution.id == execution_id,
+                    LoopItemExecution.executor_owner_user_id == owner_user_id,
+                    LoopItemExecution.execution_device_id == execution_device_id,
+                    LoopItemExecution.execution_environment == environment,
+                    LoopItemExecution.status == STATUS_QUEUED,
+                )
+                .update(
+                    {
+                        "status": STATUS_CLAIMED,
+                        "claimed_at": now,
+                        "heartbeat_at": now,
+                        "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                        "runtime_device_id": execution_device_id,
+                        "runtime_instance_id": runtime_instance_id,
+                        "runtime_task_id": runtime_task_id_for(execution_id),
+                        "version": LoopItemExecution.version + 1,
+                    },
+                    synchronize_session=False,
+                )
             )
-        )
-        db.commit()
-        if claimed != 1:
-            return None
-        db.refresh(candidate)
-        return candidate
+            db.commit()
+            if claimed != 1:
+                # Claimed or cancelled by another worker since the last sync;
+                # repeated misses mean the pool is stale, so reload it
+                execution_scheduler_index.discard(pool, execution_id)
+                if attempt:
+                    execution_scheduler_index.invalidate(pool)
+                continue
+            execution_scheduler_index.note_claimed(pool, candidate)
+            row = db.get(LoopItemExecution, execution_id)
+            db.refresh(row)
+            return row
+        return None
 
     def claim_batch_for_device(
         self,
@@ -1164,6 +1177,9 @@ class LoopItemExecutionService:
         db.commit()
         for row in rows:
             db.refresh(row)
+            execution_scheduler_index.discard(
+                (owner_user_id, execution_device_id, environment), row.id
+            )
         by_id = {row.id: row for row in rows}
         return [
             by_id[execution_id] for execution_id in claimable if execution_id in by_id
@@ -1880,6 +1896,7 @@ class LoopItemExecutionService:
             self._set_automation_run_status(db, retry, "queued")
             db.commit()
             db.refresh(retry)
+            execution_scheduler_index.note_queued(retry)
             self.publish_terminal_projection(db, previous)
             return retry
 
@@ -1932,6 +1949,8 @@ class LoopItemExecutionService:
             db.rollback()
             raise
         db.refresh(row)
+        execution_scheduler_index.note_released(row)
+        execution_scheduler_index.note_queued(row)
         self._push_activity_after_commit(db, activity)
         return row
 
@@ -2112,6 +2131,11 @@ class LoopItemExecutionService:
         if commit:
             db.refresh(execution)
             self._push_activity_after_commit(db, activity)
+        execution_scheduler_index.note_terminal(
+            execution,
+            held_capacity=_optional_datetime(execution.claimed_at) is not None,
+            db=None if commit else db,
+        )
         return execution
 
     def publish_terminal_projection(
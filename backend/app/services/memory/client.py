@@ -21,10 +21,11 @@ Usage:
 
 import asyncio
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
 import aiohttp
+from prometheus_client import Counter
 
 from app.core.async_utils import AsyncSessionManager
 from app.core.config import settings
@@ -37,6 +38,17 @@ from shared.telemetry.decorators import trace_async
 
 logger = logging.getLogger(__name__)
 
+# mem0 accepts at most this many memory IDs per batch delete request
+BATCH_DELETE_MAX_IDS = 1000
+# Backoff before retrying failed deletes (multiplied by the attempt number)
+BULK_DELETE_RETRY_BACKOFF_SECONDS = 0.5
+
+MEMORY_BULK_DELETE_TOTAL = Counter(
+    "memory_bulk_delete_total",
+    "Memories processed by bulk deletes by outcome",
+    ["result"],  # result: batch_deleted, deleted, retried, failed
+)
+
 
 @dataclass
 class HttpResponse:
@@ -48,6 +60,14 @@ class HttpResponse:
     status_code: Optional[int] = None
 
 
+@dataclass
+class BulkDeleteResult:
+    """Outcome of a bulk memory delete."""
+
+    deleted: int = 0
+    failed: List[str] = field(default_factory=list)
+
+
 class LongTermMemoryClient:
     """Async HTTP client for mem0 service.
 
@@ -92,6 +112,8 @@ class LongTermMemoryClient:
         self.timeout = (
             timeout if timeout is not None else settings.MEMORY_TIMEOUT_SECONDS
         )
+        # Whether the service has a batch delete endpoint; None until probed
+        self._batch_delete_supported: Optional[bool] = None
 
     def _get_headers(self) -> Dict[str, str]:
         """Build HTTP headers for mem0 API requests.
@@ -114,6 +136,7 @@ class LongTermMemoryClient:
         operation: str = "request",
         context: str = "",
         parse_response: bool = True,
+        session: Optional[aiohttp.ClientSession] = None,
     ) -> HttpResponse:
         """Execute an HTTP request with unified error handling.
 
@@ -131,6 +154,8 @@ class LongTermMemoryClient:
             operation: Operation name for logging (e.g., 'store memory')
             context: Additional context for logging (e.g., 'user_id=123')
             parse_response: Whether to parse JSON response (False for DELETE)
+            session: Existing session to send the request on (a new session is
+                created for the request if None)
 
         Returns:
             HttpResponse with success status and data/error
@@ -139,30 +164,20 @@ class LongTermMemoryClient:
         request_timeout = timeout if timeout is not None else self.timeout
 
         try:
-            async with AsyncSessionManager(timeout=request_timeout) as session:
-                http_method = getattr(session, method)
-                kwargs: Dict[str, Any] = {"headers": self._get_headers()}
-                if json_data is not None:
-                    kwargs["json"] = json_data
-
-                async with http_method(url, **kwargs) as resp:
-                    if resp.status == 200:
-                        data = await resp.json() if parse_response else None
-                        return HttpResponse(success=True, data=data)
-                    else:
-                        error_text = await resp.text()
-                        logger.error(
-                            "Failed to %s (HTTP %d): %s%s",
-                            operation,
-                            resp.status,
-                            error_text,
-                            f" [{context}]" if context else "",
-                        )
-                        return HttpResponse(
-                            success=False,
-                            error_text=error_text,
-                            status_code=resp.status,
-                        )
+            if session is not None:
+                return await self._send_request(
+                    session, method, url, json_data, operation, context, parse_response
+                )
+            async with AsyncSessionManager(timeout=request_timeout) as new_session:
+                return await self._send_request(
+                    new_session,
+                    method,
+                    url,
+                    json_data,
+                    operation,
+                    context,
+                    parse_response,
+                )
 
         except asyncio.TimeoutError:
             logger.warning(
@@ -190,6 +205,40 @@ class LongTermMemoryClient:
             )
             return HttpResponse(success=False, error_text=str(e))
 
+    async def _send_request(
+        self,
+        session: aiohttp.ClientSession,
+        method: str,
+        url: str,
+        json_data: Optional[Dict[str, Any]],
+        operation: str,
+        context: str,
+        parse_response: bool,
+    ) -> HttpResponse:
+        http_method = getattr(session, method)
+        kwargs: Dict[str, Any] = {"headers": self._get_headers()}
+        if json_data is not None:
+            kwargs["json"] = json_data
+
+        async with http_method(url, **kwargs) as resp:
+            if resp.status == 200:
+                data = await resp.json() if parse_response else None
+                return HttpResponse(success=True, data=data)
+            else:
+                error_text = await resp.text()
+                logger.error(
+                    "Failed to %s (HTTP %d): %s%s",
+                    operation,
+                    resp.status,
+                    error_text,
+                    f" [{context}]" if context else "",
+                )
+                return HttpResponse(
+                    success=False,
+                    error_text=error_text,
+                    status_code=resp.status,
+                )
+
     @trace_async("mem0.client.add_memory")
     async def add_memory(
         self,
@@ -332,6 +381,132 @@ class LongTermMemoryClient:
             logger.info("Successfully deleted memory %s", memory_id)
         return response.success
 
+    @trace_async("mem0.client.delete_memories")
+    async def delete_memories(self, memory_ids: List[str]) -> BulkDeleteResult:
+        """Delete many memories over one pooled session.
+
+        Uses the batch delete endpoint when the service supports it (probed on
+        first use and remembered), otherwise deletes memories concurrently,
+        at most ``MEMORY_DELETE_CONCURRENCY`` at a time. Memories whose delete
+        failed are retried up to ``MEMORY_DELETE_RETRIES`` times.
+
+        Args:
+            memory_ids: Memory IDs to delete
+
+        Returns:
+            BulkDeleteResult with the deleted count and the IDs that failed
+        """
+        result = BulkDeleteResult()
+        if not memory_ids:
+            return result
+
+        concurrency = max(1, settings.MEMORY_DELETE_CONCURRENCY)
+        pending = list(memory_ids)
+        async with AsyncSessionManager(
+            timeout=settings.MEMORY_WRITE_TIMEOUT_SECONDS,
+            connector=aiohttp.TCPConnector(limit=concurrency),
+        ) as session:
+            for attempt in range(max(0, settings.MEMORY_DELETE_RETRIES) + 1):
+                if attempt:
+                    MEMORY_BULK_DELETE_TOTAL.labels(result="retried").inc(len(pending))
+                    logger.info(
+                        "Retrying %d failed memory deletes (attempt %d)",
+                        len(pending),
+                        attempt,
+                    )
+                    await asyncio.sleep(BULK_DELETE_RETRY_BACKOFF_SECONDS * attempt)
+                pending = await self._delete_memories_once(
+                    session, pending, concurrency, result
+                )
+                if not pending:
+                    break
+
+        result.failed = pending
+        MEMORY_BULK_DELETE_TOTAL.labels(result="failed").inc(len(pending))
+        logger.info(
+            "Bulk deleted %d of %d memories (%d failed)",
+            result.deleted,
+            len(memory_ids),
+            len(pending),
+        )
+        return result
+
+    async def _delete_memories_once(
+        self,
+        session: aiohttp.ClientSession,
+        memory_ids: List[str],
+        concurrency: int,
+        result: BulkDeleteResult,
+    ) -> List[str]:
+        """Try to delete ``memory_ids`` once. Returns the IDs that failed."""
+        failed: List[str] = []
+        single_ids = memory_ids
+        if settings.MEMORY_BATCH_DELETE_ENABLED and self._batch_delete_supported in (
+            None,
+            True,
+        ):
+            single_ids = []
+            for start in range(0, len(memory_ids), BATCH_DELETE_MAX_IDS):
+                chunk = memory_ids[start : start + BATCH_DELETE_MAX_IDS]
+                response = await self._execute_request(
+                    method="delete",
+                    endpoint="/batch",
+                    json_data={"memories": [{"memory_id": i} for i in chunk]},
+                    operation="batch delete memories",
+                    context=f"count={len(chunk)}",
+                    parse_response=False,
+                    session=session,
+                )
+                if response.success:
+                    self._batch_delete_supported = True
+                    result.deleted += len(chunk)
+                    MEMORY_BULK_DELETE_TOTAL.labels(result="batch_deleted").inc(
+                        len(chunk)
+                    )
+                elif self._batch_delete_supported is None and response.status_code in (
+                    404,
+                    405,
+                ):
+                    logger.info(
+                        "Memory service has no batch delete endpoint; "
+                        "deleting memories one by one"
+                    )
+                    self._batch_delete_supported = False
+                    single_ids = memory_ids[start:]
+                    break
+                else:
+                    failed.extend(chunk)
+
+        if not single_ids:
+            return failed
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def delete_one(memory_id: str) -> HttpResponse:
+            async with semaphore:
+                return await self._execute_request(
+                    method="delete",
+                    endpoint=f"/memories/{memory_id}",
+                    operation="delete memory",
+                    context=f"memory_id={memory_id}",
+                    parse_response=False,
+                    session=session,
+                )
+
+        responses = await asyncio.gather(
+            *(delete_one(memory_id) for memory_id in single_ids)
+        )
+        deleted = 0
+        for memory_id, response in zip(single_ids, responses):
+            # 404: already gone, e.g. deleted by a concurrent cleanup
+            if response.success or response.status_code == 404:
+                deleted += 1
+            else:
+                failed.append(memory_id)
+        result.deleted += deleted
+        MEMORY_BULK_DELETE_TOTAL.labels(result="deleted").inc(deleted)
+        return failed
+
     @trace_async("mem0.client.get_memory")
     async def get_memory(self, memory_id: str) -> Optional[Dict[str, Any]]:
         """Get a single memory by ID.
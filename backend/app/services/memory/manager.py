@@ -352,8 +352,8 @@ class MemoryManager:
         """Delete all memories associated with a task.
 
         This method is called when a task is deleted.
-        Uses metadata search to find all related memories, then deletes them.
-        Implements pagination to handle large numbers of memories.
+        Uses metadata search to find all related memories, then deletes each
+        batch in bulk. Implements pagination to handle large numbers of memories.
 
         Args:
             user_id: User ID
@@ -396,26 +396,19 @@ class MemoryManager:
                     # No more memories to cleanup
                     break
 
-                # Step 2: Delete each memory in this batch
-                batch_delete_count = 0
-                batch_error_count = 0
-
-                for memory in memories:
-                    memory_id = memory.id
-                    try:
-                        success = await self._client.delete_memory(memory_id)
-                        if success:
-                            batch_delete_count += 1
-                        else:
-                            batch_error_count += 1
-                    except Exception as e:
-                        logger.error(
-                            "Failed to delete memory %s: %s",
-                            memory_id,
-                            e,
-                            exc_info=True,
-                        )
-                        batch_error_count += 1
+                # Step 2: Delete this batch in bulk
+                delete_result = await self._client.delete_memories(
+                    [memory.id for memory in memories]
+                )
+                batch_delete_count = delete_result.deleted
+                batch_error_count = len(delete_result.failed)
+                if delete_result.failed:
+                    logger.error(
+                        "Failed to delete %d memories of task %s: %s",
+                        batch_error_count,
+                        task_id,
+                        ", ".join(delete_result.failed[:10]),
+                    )
 
                 total_delete_count += batch_delete_count
                 total_error_count += batch_error_count
@@ -0,0 +1,252 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Precomputed direct-injection bundles for small knowledge bases.
+
+Direct injection used to read every original document of the selected
+knowledge bases, re-estimate its tokens and rebuild the records on every chat
+turn, and auto routing ran a SUM join over document text lengths per request.
+
+A bundle stores, per knowledge base (or per document scope), the ordered
+document records ready for injection together with the routing token estimate
+and the direct-injection token estimate. The latter uses the same chars/token
+heuristic as the unbundled path, so routing decides the same either way; the
+backend has no tokenizer of the chat model. Bundles live in a Redis hash::
+
+    rag-direct-injection-bundle:v1:kb:{kb_id}
+    rag-direct-injection-bundle:v1:docs:{sha256(kb ids, document ids)}
+        meta    -> token totals, truncation flag, generation
+        records -> zlib-compressed document records
+
+and are keyed by the scope's index generation: a fingerprint of the active
+documents' count, summed ``index_generation``, latest ``updated_at`` and
+highest id, read with a single-table aggregate. Re-indexing, enabling,
+disabling, adding or deleting a document changes the generation, so stale
+bundles are rebuilt on next use. Finished indexing schedules one debounced
+warm-up per knowledge base (claimed with ``{KEY_PREFIX}:warm:{kb_id}``), so a
+bulk import rebuilds the bundle once per window rather than once per document.
+"""
+
+import hashlib
+import json
+import logging
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import orjson
+from redis import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.knowledge import KnowledgeDocument
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "rag-direct-injection-bundle:v1"
+
+
+@dataclass
+class DirectInjectionBundle:
+    """Direct-injection data of one knowledge base or document scope."""
+
+    key: str
+    generation: str
+    routing_tokens: int
+    # RetrievalService._estimate_direct_injection_tokens of the records
+    injection_tokens: int = 0
+    truncated: bool = False
+    record_count: int = 0
+    # Only scopes small enough to be injected directly store their records
+    records_stored: bool = False
+    # Loaded on demand; None until then
+    records: Optional[List[Dict[str, Any]]] = None
+
+    def meta(self) -> Dict[str, Any]:
+        return {
+            "generation": self.generation,
+            "routing_tokens": self.routing_tokens,
+            "injection_tokens": self.injection_tokens,
+            "truncated": self.truncated,
+            "record_count": self.record_count,
+            "records_stored": self.records_stored,
+        }
+
+
+def _generation(row: Any) -> str:
+    count, generation_sum, max_updated_at, max_id = row
+    updated = max_updated_at.isoformat() if max_updated_at else ""
+    return f"{int(count or 0)}:{int(generation_sum or 0)}:{updated}:{max_id or 0}"
+
+
+class DirectInjectionBundleStore:
+    """Redis store of direct-injection bundles keyed by index generation."""
+
+    def __init__(
+        self,
+        redis_url: str = settings.REDIS_URL,
+        *,
+        client: Optional[Redis] = None,
+    ) -> None:
+        self._client = client or Redis.from_url(
+            redis_url,
+            decode_responses=False,
+            socket_timeout=2.0,
+            socket_connect_timeout=0.5,
+            health_check_interval=30,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.RAG_DIRECT_INJECTION_BUNDLE_ENABLED)
+
+    @staticmethod
+    def kb_key(knowledge_base_id: int) -> str:
+        return f"{KEY_PREFIX}:kb:{knowledge_base_id}"
+
+    @staticmethod
+    def warm_claim_key(knowledge_base_id: int) -> str:
+        return f"{KEY_PREFIX}:warm:{knowledge_base_id}"
+
+    def claim_warm(self, knowledge_base_id: int, ttl_seconds: int) -> bool:
+        """Claim the pending warm-up of a knowledge base.
+
+        Returns False if a warm-up is already scheduled or Redis is unavailable.
+        """
+        try:
+            return bool(
+                self._client.set(
+                    self.warm_claim_key(knowledge_base_id),
+                    b"1",
+                    nx=True,
+                    ex=ttl_seconds,
+                )
+            )
+        except RedisError as e:
+            logger.warning("[RAG] direct injection bundle warm claim failed: %s", e)
+            return False
+
+    def release_warm(self, knowledge_base_id: int) -> None:
+        """Release the claim so documents finishing from now on schedule again."""
+        try:
+            self._client.delete(self.warm_claim_key(knowledge_base_id))
+        except RedisError as e:
+            logger.warning("[RAG] direct injection bundle warm release failed: %s", e)
+
+    @staticmethod
+    def document_scope_key(
+        knowledge_base_ids: List[int], document_ids: List[int]
+    ) -> str:
+        scope = json.dumps([list(knowledge_base_ids), sorted(set(document_ids))])
+        return f"{KEY_PREFIX}:docs:{hashlib.sha256(scope.encode()).hexdigest()}"
+
+    @staticmethod
+    def kb_generations(db: Session, knowledge_base_ids: List[int]) -> Dict[int, str]:
+        """Return the index generation of each knowledge base with active documents."""
+        rows = (
+            db.query(
+                KnowledgeDocument.kind_id,
+                func.count(KnowledgeDocument.id),
+                func.coalesce(func.sum(KnowledgeDocument.index_generation), 0),
+                func.max(KnowledgeDocument.updated_at),
+                func.max(KnowledgeDocument.id),
+            )
+            .filter(
+                KnowledgeDocument.kind_id.in_(knowledge_base_ids),
+                KnowledgeDocument.is_active.is_(True),
+            )
+            .group_by(KnowledgeDocument.kind_id)
+            .all()
+        )
+        return {row[0]: _generation(row[1:]) for row in rows}
+
+    @staticmethod
+    def document_scope_generation(
+        db: Session, knowledge_base_ids: List[int], document_ids: List[int]
+    ) -> str:
+        """Return the index generation of the active documents in a scope."""
+        row = (
+            db.query(
+                func.count(KnowledgeDocument.id),
+                func.coalesce(func.sum(KnowledgeDocument.index_generation), 0),
+                func.max(KnowledgeDocument.updated_at),
+                func.max(KnowledgeDocument.id),
+            )
+            .filter(
+                KnowledgeDocument.kind_id.in_(knowledge_base_ids),
+                KnowledgeDocument.id.in_(document_ids),
+                KnowledgeDocument.is_active.is_(True),
+            )
+            .one()
+        )
+        return _generation(row)
+
+    def get(self, key: str, generation: str) -> Optional[DirectInjectionBundle]:
+        """Return the bundle totals (without records) if built for ``generation``."""
+        try:
+            data = self._client.hget(key, "meta")
+        except RedisError as e:
+            logger.warning("[RAG] direct injection bundle read failed: %s", e)
+            return None
+        if data is None:
+            return None
+        try:
+            meta = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return None
+        if meta.get("generation") != generation:
+            return None
+        return DirectInjectionBundle(
+            key=key,
+            generation=generation,
+            routing_tokens=int(meta.get("routing_tokens", 0)),
+            injection_tokens=int(meta.get("injection_tokens", 0)),
+            truncated=bool(meta.get("truncated")),
+            record_count=int(meta.get("record_count", 0)),
+            records_stored=bool(meta.get("records_stored")),
+        )
+
+    def load_records(self, bundle: DirectInjectionBundle) -> bool:
+        """Load ``bundle.records``. Returns False if they are unavailable."""
+        if bundle.records is not None:
+            return True
+        if not bundle.records_stored:
+            return False
+        try:
+            meta_data, records_data = self._client.hmget(
+                bundle.key, ["meta", "records"]
+            )
+        except RedisError as e:
+            logger.warning("[RAG] direct injection bundle read failed: %s", e)
+            return False
+        if meta_data is None or records_data is None:
+            return False
+        try:
+            if orjson.loads(meta_data).get("generation") != bundle.generation:
+                # Rebuilt for another generation since the totals were read
+                return False
+            bundle.records = orjson.loads(zlib.decompress(records_data))
+        except (orjson.JSONDecodeError, zlib.error):
+            return False
+        return True
+
+    def put(self, bundle: DirectInjectionBundle) -> None:
+        """Store ``bundle``, replacing any bundle built for another generation."""
+        mapping = {"meta": orjson.dumps(bundle.meta())}
+        if bundle.records_stored and bundle.records is not None:
+            mapping["records"] = zlib.compress(orjson.dumps(bundle.records))
+        try:
+            pipe = self._client.pipeline(transaction=True)
+            pipe.delete(bundle.key)
+            pipe.hset(bundle.key, mapping=mapping)
+            pipe.expire(bundle.key, settings.RAG_DIRECT_INJECTION_BUNDLE_TTL_SECONDS)
+            pipe.execute()
+        except RedisError as e:
+            logger.warning("[RAG] direct injection bundle write failed: %s", e)
+
+
+direct_injection_bundle_store = DirectInjectionBundleStore()
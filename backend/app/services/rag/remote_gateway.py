@@ -10,7 +10,9 @@ import httpx
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
+from app.core.circuit_breaker import CircuitBreakerOpenError
 from app.core.config import settings
+from app.core.http_clients import KNOWLEDGE_RUNTIME, http_clients
 from app.db.session import SessionLocal
 from app.models.subtask_context import ContextType
 from app.services.context import context_service
@@ -82,12 +84,21 @@ class RemoteRagGateway:
             headers["Authorization"] = f"Bearer {self._auth_token}"
 
         try:
-            async with httpx.AsyncClient(timeout=self._timeout) as client:
-                response = await client.post(
-                    f"{self._base_url}{path}",
-                    json=payload.model_dump(mode="json", exclude_none=True),
-                    headers=headers,
-                )
+            response = await http_clients.request(
+                KNOWLEDGE_RUNTIME,
+                "POST",
+                f"{self._base_url}{path}",
+                json=payload.model_dump(mode="json", exclude_none=True),
+                headers=headers,
+                timeout=self._timeout,
+            )
+        except CircuitBreakerOpenError as exc:
+            raise RemoteRagGatewayError(
+                f"knowledge_runtime unavailable: {exc}",
+                code="remote_circuit_open",
+                retryable=True,
+                details={"path": path},
+            ) from exc
         except httpx.RequestError as exc:
             raise RemoteRagGatewayError(
                 f"knowledge_runtime transport error: {exc}",
@@ -15,6 +15,10 @@ from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.models.kind import Kind
+from app.services.rag.direct_injection_bundle import (
+    DirectInjectionBundle,
+    direct_injection_bundle_store,
+)
 from app.services.rag.document_id_utils import extract_document_id
 from app.services.rag.runtime_resolver import RagRuntimeResolver
 from knowledge_engine.embedding import create_embedding_model_from_runtime_config
@@ -92,6 +96,176 @@ class RetrievalService:
         # combinations, so normalize to int before applying the heuristic.
         return int(normalized_text_length * 1.5)
 
+    def _load_direct_injection_bundles(
+        self,
+        db: Session,
+        knowledge_base_ids: list[int],
+        document_ids: Optional[list[int]] = None,
+    ) -> Optional[list[DirectInjectionBundle]]:
+        """Load (building stale ones) the direct-injection bundles of a scope.
+
+        Whole knowledge bases use one bundle per KB, in request order; a
+        document scope uses a single bundle. Records are not loaded.
+
+        Returns:
+            The bundles, or None if bundles are disabled or unavailable and the
+            caller should compute the result directly.
+        """
+        if not direct_injection_bundle_store.enabled or not knowledge_base_ids:
+            return None
+        if document_ids is not None and not document_ids:
+            return None
+
+        try:
+            if document_ids:
+                scopes = [
+                    (
+                        direct_injection_bundle_store.document_scope_key(
+                            knowledge_base_ids, document_ids
+                        ),
+                        direct_injection_bundle_store.document_scope_generation(
+                            db, knowledge_base_ids, document_ids
+                        ),
+                        knowledge_base_ids,
+                    )
+                ]
+            else:
+                generations = direct_injection_bundle_store.kb_generations(
+                    db, knowledge_base_ids
+                )
+                # KBs without active documents contribute nothing
+                scopes = [
+                    (
+                        direct_injection_bundle_store.kb_key(kb_id),
+                        generations[kb_id],
+                        [kb_id],
+                    )
+                    for kb_id in dict.fromkeys(knowledge_base_ids)
+                    if kb_id in generations
+                ]
+
+            bundles = []
+            for key, generation, scope_kb_ids in scopes:
+                bundle = direct_injection_bundle_store.get(key, generation)
+                if bundle is None:
+                    bundle = self._build_direct_injection_bundle(
+                        db, key, generation, scope_kb_ids, document_ids
+                    )
+                    direct_injection_bundle_store.put(bundle)
+                bundles.append(bundle)
+            return bundles
+        except Exception as e:
+            logger.warning("[RAG] direct injection bundles unavailable: %s", e)
+            return None
+
+    def _build_direct_injection_bundle(
+        self,
+        db: Session,
+        key: str,
+        generation: str,
+        knowledge_base_ids: list[int],
+        document_ids: Optional[list[int]],
+    ) -> DirectInjectionBundle:
+        """Compute the direct-injection bundle of one scope."""
+        routing_tokens = self._estimate_total_tokens_for_knowledge_bases(
+            db=db,
+            knowledge_base_ids=knowledge_base_ids,
+            document_ids=document_ids,
+        )
+        bundle = DirectInjectionBundle(
+            key=key, generation=generation, routing_tokens=routing_tokens
+        )
+        if routing_tokens > settings.RAG_DIRECT_INJECTION_BUNDLE_MAX_TOKENS:
+            return bundle
+
+        records = self._read_original_documents(
+            knowledge_base_ids=knowledge_base_ids,
+            db=db,
+            document_ids=document_ids,
+        )
+        if records is None:
+            bundle.truncated = True
+        else:
+            bundle.records = records
+            bundle.record_count = len(records)
+            bundle.injection_tokens = self._estimate_direct_injection_tokens(records)
+        bundle.records_stored = True
+        logger.info(
+            "[RAG] built direct injection bundle: kb_ids=%s, document_scope=%s, "
+            "record_count=%d, routing_tokens=%d, injection_tokens=%d, truncated=%s",
+            knowledge_base_ids,
+            bool(document_ids),
+            bundle.record_count,
+            bundle.routing_tokens,
+            bundle.injection_tokens,
+            bundle.truncated,
+        )
+        return bundle
+
+    def warm_direct_injection_bundles(
+        self, db: Session, knowledge_base_ids: list[int]
+    ) -> None:
+        """Build the bundles of whole knowledge bases ahead of the next chat turn.
+
+        Knowledge bases too large to ever be injected directly are skipped.
+        """
+        if self._should_disable_auto_direct_injection():
+            return
+        small_kb_ids = [
+            kb_id
+            for kb_id in knowledge_base_ids
+            if self._estimate_total_tokens_for_knowledge_bases(
+                db=db, knowledge_base_ids=[kb_id]
+            )
+            <= settings.RAG_DIRECT_INJECTION_BUNDLE_MAX_TOKENS
+        ]
+        if small_kb_ids:
+            self._load_direct_injection_bundles(db, small_kb_ids)
+
+    def _estimate_routing_tokens(
+        self,
+        db: Session,
+        knowledge_base_ids: list[int],
+        document_ids: Optional[list[int]] = None,
+    ) -> tuple[int, Optional[list[DirectInjectionBundle]]]:
+        """Return the routing token estimate and the bundles it was read from."""
+        # An empty document filter estimates whole knowledge bases
+        bundles = self._load_direct_injection_bundles(
+            db, knowledge_base_ids, document_ids or None
+        )
+        if bundles is not None:
+            return sum(bundle.routing_tokens for bundle in bundles), bundles
+        return (
+            self._estimate_total_tokens_for_knowledge_bases(
+                db=db,
+                knowledge_base_ids=knowledge_base_ids,
+                document_ids=document_ids,
+            ),
+            None,
+        )
+
+    @staticmethod
+    def _bundled_direct_records(
+        bundles: list[DirectInjectionBundle],
+    ) -> Optional[tuple[Optional[list[Dict[str, Any]]], int]]:
+        """Assemble direct-injection records from bundles.
+
+        Returns:
+            - None: Records are not available from the bundles
+            - (None, 0): Documents are truncated, should fallback to RAG
+            - (records, estimated_tokens): Records ready for injection
+        """
+        if any(bundle.truncated for bundle in bundles):
+            return None, 0
+        records: list[Dict[str, Any]] = []
+        estimated_tokens = 0
+        for bundle in bundles:
+            if not direct_injection_bundle_store.load_records(bundle):
+                return None
+            records.extend(bundle.records)
+            estimated_tokens += bundle.injection_tokens
+        return records, estimated_tokens
+
     @staticmethod
     def _should_disable_auto_direct_injection() -> bool:
         """Return whether automatic direct injection routing is globally disabled."""
@@ -196,29 +370,42 @@ class RetrievalService:
         route_mode: Literal["auto", "direct_injection", "rag_retrieval"],
         available_injection_tokens: Optional[int],
         max_direct_chunks: int,
+        bundles: Optional[list[DirectInjectionBundle]] = None,
     ) -> Optional[Dict[str, Any]]:
         """Try direct injection, return None if should fallback to RAG.
 
         This method encapsulates the direct injection logic including:
-        - Fetching original documents
+        - Fetching original documents (from precomputed bundles when possible)
         - Checking for truncated documents
         - Validating against token/chunk limits
         """
-        # Fetch original documents - returns None if truncated, [] if no docs, [records] if success
-        direct_records = await self.get_original_documents_from_knowledge_base(
-            knowledge_base_ids=knowledge_base_ids,
-            db=db,
-            document_ids=scope.document_ids if scope else None,
-        )
+        document_ids = scope.document_ids if scope else None
+        if bundles is None:
+            bundles = self._load_direct_injection_bundles(
+                db, knowledge_base_ids, document_ids
+            )
+        bundled = self._bundled_direct_records(bundles) if bundles is not None else None
+
+        if bundled is not None:
+            direct_records, direct_injection_estimated_tokens = bundled
+        else:
+            # Fetch original documents - returns None if truncated, [] if no docs, [records] if success
+            direct_records = await self.get_original_documents_from_knowledge_base(
+                knowledge_base_ids=knowledge_base_ids,
+                db=db,
+                document_ids=document_ids,
+            )
+            direct_injection_estimated_tokens = (
+                self._estimate_direct_injection_tokens(direct_records)
+                if direct_records is not None
+                else 0
+            )
 
         # None means truncated documents detected, fallback to RAG
         if direct_records is None:
             return None
 
         # Validate against token/chunk limits
-        direct_injection_estimated_tokens = self._estimate_direct_injection_tokens(
-            direct_records
-        )
         rejection_reason = self._get_direct_injection_rejection_reason(
             route_mode=route_mode,
             direct_records=direct_records,
@@ -361,7 +548,7 @@ class RetrievalService:
 
         total_estimated_tokens = 0
         if route_mode == "auto":
-            total_estimated_tokens = self._estimate_total_tokens_for_knowledge_bases(
+            total_estimated_tokens, _ = self._estimate_routing_tokens(
                 db=db,
                 knowledge_base_ids=knowledge_base_ids,
                 document_ids=scope.document_ids if scope else None,
@@ -503,12 +690,17 @@ class RetrievalService:
 
         # === Estimate tokens and decide if direct injection should be attempted ===
         total_estimated_tokens = 0
+        routing_bundles = None
+        document_ids = scope.document_ids if scope else None
         if route_mode == "auto" and not auto_direct_injection_disabled:
-            total_estimated_tokens = self._estimate_total_tokens_for_knowledge_bases(
+            total_estimated_tokens, routing_bundles = self._estimate_routing_tokens(
                 db=db,
                 knowledge_base_ids=knowledge_base_ids,
-                document_ids=scope.document_ids if scope else None,
+                document_ids=document_ids,
             )
+            if document_ids is not None and not document_ids:
+                # Routing estimated whole KBs; direct injection reads nothing
+                routing_bundles = None
 
         use_direct_injection = (
             False
@@ -553,6 +745,7 @@ class RetrievalService:
                 route_mode=route_mode,
                 available_injection_tokens=available_injection_tokens,
                 max_direct_chunks=max_direct_chunks,
+                bundles=routing_bundles,
             )
             if result:
                 return result
@@ -851,6 +1044,19 @@ class RetrievalService:
             - []: No documents found
             - [records]: List of document dicts with content, score, title, metadata
         """
+        return self._read_original_documents(
+            knowledge_base_ids=knowledge_base_ids,
+            db=db,
+            document_ids=document_ids,
+        )
+
+    def _read_original_documents(
+        self,
+        knowledge_base_ids: list[int],
+        db: Session,
+        document_ids: Optional[list[int]] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Synchronous body of :meth:`get_original_documents_from_knowledge_base`."""
         from app.models.knowledge import KnowledgeDocument
         from app.models.subtask_context import SubtaskContext
         from app.services.knowledge.document_read_service import document_read_service
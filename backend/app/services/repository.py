@@ -289,7 +289,7 @@ class RepositoryService:
         Returns:
             List of git domains whose caches were cleared
         """
-        from app.core.cache import cache_manager
+        from app.repository.repository_cache import repository_list_cache
 
         cleared_domains = []
 
@@ -299,8 +299,9 @@ class RepositoryService:
         for git_info in user.git_info:
             git_domain = git_info.get("git_domain", "")
             if git_domain:
-                cache_key = cache_manager.generate_full_cache_key(user.id, git_domain)
-                deleted = await cache_manager.delete(cache_key)
+                deleted = await repository_list_cache.delete_user_repositories(
+                    user.id, git_domain
+                )
                 if deleted:
                     cleared_domains.append(git_domain)
                     self.logger.info(
@@ -28,6 +28,7 @@ from app.models.kind import Kind
 from app.models.project import Project
 from app.models.subtask_context import ContextStatus, ContextType, SubtaskContext
 from app.models.user import User
+from app.schemas.device import DeviceType
 from app.schemas.project import ProjectConfig
 from app.schemas.runtime_work import (
     ArchivedConversationItem,
@@ -107,6 +108,10 @@ from app.services.runtime_work_kind_store import (
     touch_device_workspace_kind,
     upsert_device_workspace_kind,
 )
+from app.services.runtime_work_snapshot import (
+    RuntimeWorkSnapshot,
+    runtime_work_snapshot_store,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -355,7 +360,7 @@ async def list_runtime_work(
 
     devices = await device_service.get_all_devices(db, user_id)
     devices_by_id = {str(device.get("device_id")): device for device in devices}
-    runtime_workspaces = await _list_online_runtime_workspaces(
+    runtime_workspaces, device_versions = await _list_online_runtime_workspaces(
         user_id=user_id,
         devices=devices,
     )
@@ -410,6 +415,18 @@ async def list_runtime_work(
         projects=projects,
         chats=conversations,
         totalTasks=total_tasks,
+        version=_runtime_work_version(device_versions),
+    )
+
+
+def _runtime_work_version(device_versions: dict[str, Optional[int]]) -> Optional[str]:
+    """Stamp a listing with the snapshot versions it was built from."""
+
+    if any(version is None for version in device_versions.values()):
+        return None
+    return ",".join(
+        f"{device_id}:{version}"
+        for device_id, version in sorted(device_versions.items())
     )
 
 
@@ -2781,7 +2798,7 @@ async def _list_online_runtime_workspaces(
     *,
     user_id: int,
     devices: list[dict[str, Any]],
-) -> dict[tuple[str, str], RuntimeWorkspaceListing]:
+) -> tuple[dict[tuple[str, str], RuntimeWorkspaceListing], dict[str, Optional[int]]]:
     started_at = time.perf_counter()
     online_devices = [
         device
@@ -2798,15 +2815,19 @@ async def _list_online_runtime_workspaces(
     )
 
     grouped: dict[tuple[str, str], RuntimeWorkspaceListing] = {}
-    for result in results:
+    versions: dict[str, Optional[int]] = {}
+    for device, result in zip(online_devices, results):
         if isinstance(result, Exception):
             logger.warning(
                 "[RuntimeWork] Failed to list runtime workspaces from device: user_id=%s error_type=%s",
                 user_id,
                 result.__class__.__name__,
             )
+            versions[str(device.get("device_id"))] = None
             continue
-        grouped.update(result)
+        listings, version = result
+        grouped.update(listings)
+        versions[str(device.get("device_id"))] = version
 
     logger.info(
         "[RuntimeWork] Listed runtime workspaces: user_id=%s online_devices=%s workspace_count=%s task_count=%s elapsed_ms=%s",
@@ -2816,19 +2837,45 @@ async def _list_online_runtime_workspaces(
         sum(len(listing.local_tasks) for listing in grouped.values()),
         int((time.perf_counter() - started_at) * 1000),
     )
-    return grouped
+    return grouped, versions
 
 
 async def _list_runtime_workspaces_for_device(
     *,
     user_id: int,
     device: dict[str, Any],
-) -> dict[tuple[str, str], RuntimeWorkspaceListing]:
-    started_at = time.perf_counter()
+) -> tuple[dict[tuple[str, str], RuntimeWorkspaceListing], Optional[int]]:
     device_id = str(device.get("device_id") or "")
     if not device_id:
-        return {}
+        return {}, None
+
+    snapshot = None
+    # Cloud Runtimes report task events under their Runtime device id, so
+    # their snapshots could not be kept current
+    if device.get("device_type") != DeviceType.CLOUD.value:
+        snapshot = await runtime_work_snapshot_store.get(user_id, device_id)
+    if snapshot is None:
+        snapshot = await refresh_runtime_work_snapshot(
+            user_id=user_id,
+            device_id=device_id,
+        )
+    if snapshot is None:
+        return {}, None
+    return (
+        _runtime_workspace_listings(device_id, snapshot.workspaces),
+        snapshot.version,
+    )
+
+
+async def refresh_runtime_work_snapshot(
+    *,
+    user_id: int,
+    device_id: str,
+) -> Optional[RuntimeWorkSnapshot]:
+    """List one device's runtime work over RPC and store it as its snapshot."""
 
+    started_at = time.perf_counter()
+    base_version = await runtime_work_snapshot_store.begin_refresh(user_id, device_id)
     try:
         result = await runtime_rpc_service.call(
             user_id=user_id,
@@ -2845,10 +2892,32 @@ async def _list_runtime_workspaces_for_device(
             int((time.perf_counter() - started_at) * 1000),
             str(exc),
         )
-        return {}
+        return None
+
+    workspaces = _iter_runtime_workspaces(result)
+    version = None
+    if base_version is not None:
+        version = await runtime_work_snapshot_store.put(
+            user_id, device_id, workspaces, base_version
+        )
+    logger.info(
+        "[RuntimeWork] Runtime workspace list completed: user_id=%s device_id=%s workspace_count=%s task_count=%s version=%s elapsed_ms=%s",
+        user_id,
+        device_id,
+        len(workspaces),
+        sum(len(workspace["tasks"]) for workspace in workspaces),
+        version,
+        int((time.perf_counter() - started_at) * 1000),
+    )
+    return RuntimeWorkSnapshot(version=version, workspaces=workspaces)
+
 
+def _runtime_workspace_listings(
+    device_id: str,
+    workspaces: list[dict[str, Any]],
+) -> dict[tuple[str, str], RuntimeWorkspaceListing]:
     grouped: dict[tuple[str, str], RuntimeWorkspaceListing] = {}
-    for order_index, workspace in enumerate(_iter_runtime_workspaces(result)):
+    for order_index, workspace in enumerate(workspaces):
         workspace_path = normalize_workspace_path(workspace["workspacePath"])
         tasks = [
             LocalTaskSummary.model_validate(
@@ -2875,15 +2944,6 @@ async def _list_runtime_workspaces_for_device(
             workspace_source=_runtime_workspace_source(workspace),
             remote_host_id=_runtime_workspace_remote_host_id(workspace),
         )
-
-    logger.info(
-        "[RuntimeWork] Runtime workspace list completed: user_id=%s device_id=%s workspace_count=%s task_count=%s elapsed_ms=%s",
-        user_id,
-        device_id,
-        len(grouped),
-        sum(len(listing.local_tasks) for listing in grouped.values()),
-        int((time.perf_counter() - started_at) * 1000),
-    )
     return grouped
 
 
@@ -0,0 +1,315 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Server-side snapshots of the runtime work listed by each user device.
+
+Listing runtime work used to send ``runtime.tasks.list`` to every online
+device of the user on every page load. A snapshot keeps the last listing of
+one device in Redis together with the task updates the device has reported
+since, so list calls are served without an RPC::
+
+    runtime-work-snapshot:v1:{user_id}:{device_id}         (hash)
+        listing -> normalized workspaces of the last runtime.tasks.list
+        base    -> version the listing was taken at
+        version -> incremented on every update
+        stale   -> version at which the listing was invalidated
+    runtime-work-snapshot:v1:{user_id}:{device_id}:events  (list)
+        "{version}\\n{patch}" task patches newer than the listing
+
+Device task events append patches; changes the patches cannot describe (a
+finished turn, a task the listing does not know, workspace operations, too
+many pending patches, a reconnect) invalidate the listing, and the next list
+call refreshes that device alone over RPC.
+"""
+
+import asyncio
+import logging
+import weakref
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "runtime-work-snapshot:v1"
+# Pending patches kept per device; beyond this the listing is refreshed
+MAX_PENDING_PATCHES = 500
+# Runtime RPC methods that never change the device's task listing, or whose
+# effects are reported back as task events
+LISTING_PRESERVING_RPC_METHODS = frozenset(
+    {
+        "runtime.archived_conversations.list",
+        "runtime.capacity.get",
+        "runtime.tasks.cancel",
+        "runtime.tasks.force_start",
+        "runtime.tasks.guidance",
+        "runtime.tasks.interrupt_and_send",
+        "runtime.tasks.list",
+        "runtime.tasks.search",
+        "runtime.tasks.send",
+        "runtime.tasks.transcript",
+        "runtime.workspace.search",
+        "runtime.worktrees.capabilities",
+        "runtime.worktrees.list",
+        "runtime.worktrees.preflight",
+        "runtime.worktrees.settings.get",
+    }
+)
+
+# KEYS[1]: snapshot hash; ARGV[1]: ttl seconds
+_BEGIN_REFRESH_SCRIPT = """
+local version = redis.call('HINCRBY', KEYS[1], 'version', 0)
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return version
+"""
+
+# KEYS[1]: snapshot hash, KEYS[2]: events; ARGV: listing, base version, ttl
+_PUT_SCRIPT = """
+local base = tonumber(ARGV[2])
+redis.call('HSET', KEYS[1], 'listing', ARGV[1], 'base', base)
+if redis.call('HEXISTS', KEYS[1], 'version') == 0 then
+  redis.call('HSET', KEYS[1], 'version', base)
+end
+local stale = tonumber(redis.call('HGET', KEYS[1], 'stale') or '0')
+if stale <= base then
+  redis.call('HDEL', KEYS[1], 'stale')
+end
+while true do
+  local entry = redis.call('LINDEX', KEYS[2], 0)
+  if not entry or tonumber(string.match(entry, '^%d+')) > base then
+    break
+  end
+  redis.call('LPOP', KEYS[2])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return tonumber(redis.call('HGET', KEYS[1], 'version'))
+"""
+
+# KEYS[1]: snapshot hash, KEYS[2]: events; ARGV: patch, max patches, ttl
+_APPEND_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  return 0
+end
+local version = redis.call('HINCRBY', KEYS[1], 'version', 1)
+redis.call('RPUSH', KEYS[2], version .. '\\n' .. ARGV[1])
+if redis.call('LLEN', KEYS[2]) > tonumber(ARGV[2]) then
+  redis.call('LTRIM', KEYS[2], -tonumber(ARGV[2]), -1)
+  redis.call('HSET', KEYS[1], 'stale', version)
+end
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return version
+"""
+
+# KEYS[1]: snapshot hash
+_INVALIDATE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  return 0
+end
+local version = redis.call('HINCRBY', KEYS[1], 'version', 1)
+redis.call('HSET', KEYS[1], 'stale', version)
+return version
+"""
+
+
+@dataclass(frozen=True)
+class RuntimeWorkSnapshot:
+    """Current runtime work of one device."""
+
+    # None when snapshots are disabled
+    version: Optional[int]
+    workspaces: list[dict[str, Any]]
+
+
+def _task_id(task: dict[str, Any]) -> Optional[str]:
+    value = task.get("taskId") or task.get("localTaskId") or task.get("local_task_id")
+    return str(value) if value else None
+
+
+def _apply_patches(
+    workspaces: list[dict[str, Any]], patches: list[dict[str, Any]]
+) -> bool:
+    """Apply task patches in place. Returns False if a task is unknown."""
+    tasks = {
+        _task_id(task): task
+        for workspace in workspaces
+        for task in workspace.get("tasks", ())
+        if isinstance(task, dict)
+    }
+    for patch in patches:
+        task = tasks.get(patch.get("taskId"))
+        if task is None:
+            return False
+        task.update(patch.get("fields") or {})
+    return True
+
+
+class RuntimeWorkSnapshotStore:
+    """Redis store of per-device runtime work snapshots."""
+
+    def __init__(
+        self,
+        redis_url: str = settings.REDIS_URL,
+        *,
+        client: Optional[Redis] = None,
+    ) -> None:
+        self._redis_url = redis_url
+        self._client = client
+        # Redis asyncio clients are bound to the loop they were created on
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Redis]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.RUNTIME_WORK_SNAPSHOT_ENABLED)
+
+    @staticmethod
+    def key(user_id: int, device_id: str) -> str:
+        return f"{KEY_PREFIX}:{user_id}:{device_id}"
+
+    @classmethod
+    def events_key(cls, user_id: int, device_id: str) -> str:
+        return f"{cls.key(user_id, device_id)}:events"
+
+    def _get_client(self) -> Redis:
+        if self._client is not None:
+            return self._client
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = Redis.from_url(
+                self._redis_url,
+                encoding="utf-8",
+                decode_responses=True,
+                socket_timeout=2.0,
+                socket_connect_timeout=0.5,
+                health_check_interval=30,
+            )
+            self._clients[loop] = client
+        return client
+
+    async def get(self, user_id: int, device_id: str) -> Optional[RuntimeWorkSnapshot]:
+        """Return the device's current runtime work, or None if it must be refreshed."""
+        if not self.enabled:
+            return None
+        try:
+            pipe = self._get_client().pipeline(transaction=True)
+            pipe.hmget(
+                self.key(user_id, device_id), ["listing", "base", "version", "stale"]
+            )
+            pipe.lrange(self.events_key(user_id, device_id), 0, -1)
+            (listing, base, version, stale), entries = await pipe.execute()
+        except RedisError as e:
+            logger.warning("[RuntimeWork] snapshot read failed: %s", e)
+            return None
+        if listing is None or base is None or version is None:
+            return None
+        base = int(base)
+        if stale is not None and int(stale) > base:
+            return None
+        try:
+            workspaces = orjson.loads(listing)
+            patches = []
+            for entry in entries:
+                patch_version, _, patch = entry.partition("\n")
+                if int(patch_version) > base:
+                    patches.append(orjson.loads(patch))
+        except (orjson.JSONDecodeError, ValueError):
+            return None
+        if not _apply_patches(workspaces, patches):
+            return None
+        return RuntimeWorkSnapshot(version=int(version), workspaces=workspaces)
+
+    async def begin_refresh(self, user_id: int, device_id: str) -> Optional[int]:
+        """Return the version a listing fetched from now on is taken at.
+
+        Task patches recorded after this version are kept and re-applied on
+        top of the refreshed listing.
+        """
+        if not self.enabled:
+            return None
+        try:
+            client = self._get_client()
+            return int(
+                await client.eval(
+                    _BEGIN_REFRESH_SCRIPT,
+                    1,
+                    self.key(user_id, device_id),
+                    settings.RUNTIME_WORK_SNAPSHOT_TTL_SECONDS,
+                )
+            )
+        except RedisError as e:
+            logger.warning("[RuntimeWork] snapshot refresh start failed: %s", e)
+            return None
+
+    async def put(
+        self,
+        user_id: int,
+        device_id: str,
+        workspaces: list[dict[str, Any]],
+        base_version: int,
+    ) -> Optional[int]:
+        """Store a listing taken at ``base_version``. Returns the current version."""
+        try:
+            client = self._get_client()
+            return int(
+                await client.eval(
+                    _PUT_SCRIPT,
+                    2,
+                    self.key(user_id, device_id),
+                    self.events_key(user_id, device_id),
+                    orjson.dumps(workspaces).decode(),
+                    base_version,
+                    settings.RUNTIME_WORK_SNAPSHOT_TTL_SECONDS,
+                )
+            )
+        except RedisError as e:
+            logger.warning("[RuntimeWork] snapshot write failed: %s", e)
+            return None
+
+    async def apply_task_patch(
+        self,
+        user_id: int,
+        device_id: str,
+        local_task_id: str,
+        fields: dict[str, Any],
+    ) -> None:
+        """Record a change to one task's summary fields."""
+        if not self.enabled or not fields:
+            return
+        patch = orjson.dumps({"taskId": local_task_id, "fields": fields}).decode()
+        try:
+            await self._get_client().eval(
+                _APPEND_SCRIPT,
+                2,
+                self.key(user_id, device_id),
+                self.events_key(user_id, device_id),
+                patch,
+                MAX_PENDING_PATCHES,
+                settings.RUNTIME_WORK_SNAPSHOT_TTL_SECONDS,
+            )
+        except RedisError as e:
+            logger.warning("[RuntimeWork] snapshot patch failed: %s", e)
+
+    async def invalidate(self, user_id: int, device_id: str) -> None:
+        """Force the next list call to refresh the device's listing."""
+        if not self.enabled:
+            return
+        try:
+            await self._get_client().eval(
+                _INVALIDATE_SCRIPT, 1, self.key(user_id, device_id)
+            )
+        except RedisError as e:
+            logger.warning("[RuntimeWork] snapshot invalidation failed: %s", e)
+
+
+runtime_work_snapshot_store = RuntimeWorkSnapshotStore()
@@ -15,6 +15,8 @@ from typing import Any
 
 import httpx
 
+from app.core.http_clients import WEB_SEARCH, http_clients
+
 from .base import SearchServiceBase
 
 logger = logging.getLogger(__name__)
@@ -115,14 +117,16 @@ class HttpSearchService(SearchServiceBase):
                 params[self.limit_param] = limit
 
             # Make HTTP request
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    self.base_url,
-                    params=params,
-                    headers=self.auth_header,
-                )
-                response.raise_for_status()
-                data = response.json()
+            response = await http_clients.request(
+                WEB_SEARCH,
+                "GET",
+                self.base_url,
+                params=params,
+                headers=self.auth_header,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            data = response.json()
 
             # Extract results array
             raw_results = self._extract_results(data)
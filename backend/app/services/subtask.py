@@ -232,6 +232,8 @@ class SubtaskService(BaseService[Subtask, SubtaskCreate, SubtaskUpdate]):
                 "status": subtask.status.value if subtask.status else None,
                 "progress": subtask.progress,
                 "result": subtask.result,
+                "masked_result": subtask.masked_result,
+                "result_mask_version": subtask.result_mask_version,
                 "error_message": subtask.error_message,
                 "sender_type": subtask.sender_type,  # Already a string value, not enum
                 "sender_user_id": subtask.sender_user_id,
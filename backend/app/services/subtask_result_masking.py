@@ -0,0 +1,147 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Masked projection of subtask results, computed when a result is finalized.
+
+Subtask results are returned to clients with sensitive data masked. Instead
+of masking on every list, join and history sync, the projection is stored on
+the subtask when it reaches a terminal status:
+
+- ``masked_result`` holds the masked result, or NULL when masking leaves the
+  result unchanged (the common case), so clean results are not stored twice;
+- ``result_mask_version`` is the MASKING_RULES_VERSION it was computed with,
+  0 when no projection is stored.
+
+Read paths use :func:`masked_subtask_result`, which masks on read for
+running subtasks and for rows without a current projection. Those rows are
+picked up by :func:`backfill_masked_results`.
+"""
+
+from typing import Any, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.models.subtask import Subtask, SubtaskStatus
+from app.schemas.subtask import mask_subtask_result
+from app.stores.tasks import subtask_store
+from shared.utils.sensitive_data_masker import (
+    MASKING_RULES_VERSION,
+    mask_sensitive_data,
+)
+
+FINALIZED_SUBTASK_STATUSES = frozenset(
+    {SubtaskStatus.COMPLETED, SubtaskStatus.FAILED, SubtaskStatus.CANCELLED}
+)
+
+
+def compute_masked_result(result: Any) -> Any:
+    """Return the stored projection for a result: masked, or None if unchanged."""
+    if result is None:
+        return None
+    masked = mask_sensitive_data(result)
+    return None if masked == result else masked
+
+
+def masked_subtask_result(subtask: Any) -> Any:
+    """Return the subtask result with sensitive data masked.
+
+    Serves the stored projection when it is current and masks on read
+    otherwise.
+    """
+    result = subtask.result
+    if result is None:
+        return None
+    if getattr(subtask, "result_mask_version", 0) == MASKING_RULES_VERSION:
+        masked = subtask.masked_result
+        return result if masked is None else masked
+    if isinstance(result, dict):
+        return mask_subtask_result(subtask.id, subtask.updated_at, result)
+    return mask_sensitive_data(result)
+
+
+def _status_value(status: Any) -> Optional[SubtaskStatus]:
+    if status is None or isinstance(status, SubtaskStatus):
+        return status
+    return SubtaskStatus(status)
+
+
+def _sync_masked_result(_mapper: Any, _connection: Any, target: Subtask) -> None:
+    """Store the projection of finalized results and drop it for live ones."""
+    state = inspect(target)
+    result_changed = state.attrs.result.history.has_changes()
+    if _status_value(target.status) in FINALIZED_SUBTASK_STATUSES:
+        if (
+            result_changed
+            or state.attrs.status.history.has_changes()
+            or target.result_mask_version != MASKING_RULES_VERSION
+        ):
+            target.masked_result = compute_masked_result(target.result)
+            target.result_mask_version = MASKING_RULES_VERSION
+    elif result_changed or target.result_mask_version:
+        target.masked_result = None
+        target.result_mask_version = 0
+
+
+class SubtaskResultMaskingHooks:
+    """Keep the masked projection in step with every ORM write of a subtask.
+
+    Bulk status updates bypass these hooks; the subtasks they finalize keep
+    result_mask_version 0 until the backfill task stores their projection.
+    """
+
+    def __init__(self) -> None:
+        self._registered = False
+
+    def register(self) -> None:
+        """Register the mapper listeners once."""
+        if self._registered:
+            return
+        event.listen(Subtask, "before_insert", _sync_masked_result)
+        event.listen(Subtask, "before_update", _sync_masked_result)
+        self._registered = True
+
+    def unregister(self) -> None:
+        """Remove the listeners, primarily for tests and graceful shutdown."""
+        if not self._registered:
+            return
+        event.remove(Subtask, "before_insert", _sync_masked_result)
+        event.remove(Subtask, "before_update", _sync_masked_result)
+        self._registered = False
+
+
+def backfill_masked_results(db: Session, *, batch_size: int, max_batches: int) -> int:
+    """Store current projections for finalized subtasks that lack one.
+
+    Rows are updated without touching updated_at, so clients do not see them
+    as changed. Returns the number of subtasks updated.
+    """
+    updated = 0
+    statuses = list(FINALIZED_SUBTASK_STATUSES)
+    for _ in range(max_batches):
+        rows = subtask_store.list_results_missing_mask(
+            db,
+            statuses=statuses,
+            mask_version=MASKING_RULES_VERSION,
+            limit=batch_size,
+        )
+        if not rows:
+            break
+        for subtask_id, result in rows:
+            subtask_store.store_masked_result(
+                db,
+                subtask_id=subtask_id,
+                statuses=statuses,
+                mask_version=MASKING_RULES_VERSION,
+                masked_result=compute_masked_result(result),
+            )
+        db.commit()
+        updated += len(rows)
+        if len(rows) < batch_size:
+            break
+    return updated
+
+
+subtask_result_masking_hooks = SubtaskResultMaskingHooks()
@@ -36,6 +36,23 @@ class ForkLineageNode:
     inherited_cutoff: Optional[int]
 
 
+def trim_to_message_groups(
+    items: list[ForkHistoryItem], limit: int
+) -> list[ForkHistoryItem]:
+    """Keep the newest ``limit`` items without splitting a message_id.
+
+    Items must be sorted oldest first. The result can exceed ``limit`` when
+    the oldest kept message has several subtasks.
+    """
+    if len(items) <= limit:
+        return items
+    start = len(items) - limit
+    boundary_message_id = items[start].subtask.message_id
+    while start > 0 and items[start - 1].subtask.message_id == boundary_message_id:
+        start -= 1
+    return items[start:]
+
+
 class TaskForkHistoryResolver:
     """Resolve task history across task-level fork chains."""
 
@@ -62,11 +79,25 @@ class TaskForkHistoryResolver:
         for node in lineage:
             if node.task.id is None:
                 continue
-            subtasks = subtask_store.list_by_task_ordered(
-                db,
-                task_id=node.task.id,
-                owner_user_id=node.task.user_id,
-            )
+            if limit is not None and limit > 0:
+                # Each node contributes at most `limit` of the newest messages
+                # (plus the rest of the oldest message), so only those need
+                # to be loaded.
+                subtasks = subtask_store.list_message_window(
+                    db,
+                    task_id=node.task.id,
+                    limit=limit,
+                    before_message_id=before_message_id,
+                    after_message_id=after_message_id,
+                    max_message_id=node.inherited_cutoff,
+                    owner_user_id=node.task.user_id,
+                )
+            else:
+                subtasks = subtask_store.list_by_task_ordered(
+                    db,
+                    task_id=node.task.id,
+                    owner_user_id=node.task.user_id,
+                )
             for subtask in subtasks:
                 if (
                     node.inherited_cutoff is not None
@@ -100,7 +131,7 @@ class TaskForkHistoryResolver:
             )
         )
         if limit is not None and limit > 0:
-            return items[-limit:]
+            return trim_to_message_groups(items, limit)
         return items
 
     def resolve_lineage(
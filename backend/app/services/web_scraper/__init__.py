@@ -6,6 +6,7 @@
 
 from app.services.web_scraper.scraper_service import (
     ScrapedContent,
+    ScrapePriority,
     WebScraperService,
     get_web_scraper_service,
 )
@@ -13,5 +14,6 @@ from app.services.web_scraper.scraper_service import (
 __all__ = [
     "WebScraperService",
     "ScrapedContent",
+    "ScrapePriority",
     "get_web_scraper_service",
 ]
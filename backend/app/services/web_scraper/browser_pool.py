@@ -0,0 +1,340 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Pool of headless browsers shared by concurrent scrapes.
+
+The scraper used to keep a single Crawl4AI crawler that every scrape shared
+without any limit, so bulk imports either queued behind one browser or opened
+tabs until it ran out of memory. The pool runs up to ``browsers`` crawlers with
+``pages_per_browser`` page slots each:
+
+- a scrape leases one slot for its browser work; crawlers start on first use
+- at most ``per_domain_limit`` scrapes of the same host run at once
+- waiting scrapes are served by priority (interactive before bulk), then FIFO;
+  a waiter blocked by its domain limit does not hold back other domains
+- a browser is recycled (closed and restarted on next use) after serving
+  ``recycle_after_pages`` pages or once its processes exceed ``max_rss_mb``
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+from urllib.parse import urlparse
+
+from prometheus_client import Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+WEB_SCRAPER_POOL_PAGES_IN_USE = Gauge(
+    "web_scraper_pool_pages_in_use",
+    "Browser page slots currently leased by scrapes",
+)
+WEB_SCRAPER_POOL_BROWSERS_RUNNING = Gauge(
+    "web_scraper_pool_browsers_running",
+    "Browsers currently started in the scraper pool",
+)
+WEB_SCRAPER_POOL_WAITING = Gauge(
+    "web_scraper_pool_waiting",
+    "Scrapes waiting for a browser page slot",
+    ["priority"],
+)
+WEB_SCRAPER_POOL_WAIT_SECONDS = Histogram(
+    "web_scraper_pool_wait_seconds",
+    "Time scrapes waited for a browser page slot",
+    ["priority"],
+    buckets=(0.01, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+# reason: pages, memory, error
+WEB_SCRAPER_POOL_RECYCLES_TOTAL = Counter(
+    "web_scraper_pool_recycles_total",
+    "Browsers recycled by the scraper pool",
+    ["reason"],
+)
+
+
+class ScrapePriority(IntEnum):
+    """Queue priority of a scrape; lower values are served first."""
+
+    INTERACTIVE = 0
+    BULK = 1
+
+
+def _browser_rss_bytes(crawler: Any) -> Optional[int]:
+    """Return the memory of a managed Crawl4AI browser and its renderers."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    browser_manager = getattr(
+        getattr(crawler, "crawler_strategy", None), "browser_manager", None
+    )
+    process = getattr(
+        getattr(browser_manager, "managed_browser", None), "browser_process", None
+    )
+    pid = getattr(process, "pid", None)
+    if not pid:
+        return None
+    try:
+        root = psutil.Process(pid)
+        processes = [root, *root.children(recursive=True)]
+        total = 0
+        for proc in processes:
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+    except psutil.Error:
+        return None
+
+
+@dataclass
+class _PooledBrowser:
+    index: int
+    crawler: Any = None
+    active: int = 0
+    pages_served: int = 0
+    retiring: bool = False
+    start_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    host: str = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class BrowserLease:
+    """One page slot of a pooled browser held by a scrape."""
+
+    def __init__(self, pool: "BrowserPool", browser: _PooledBrowser) -> None:
+        self._pool = pool
+        self._browser = browser
+        self.used = False
+
+    async def crawler(self) -> Any:
+        """Return the leased browser's crawler, starting it if needed."""
+        self.used = True
+        return await self._pool._ensure_started(self._browser)
+
+
+_current_lease: ContextVar[Optional[BrowserLease]] = ContextVar(
+    "web_scraper_browser_lease", default=None
+)
+
+
+class BrowserPool:
+    """Bounded, prioritized access to a set of pooled browsers."""
+
+    def __init__(
+        self,
+        crawler_factory: Callable[[], Awaitable[Any]],
+        *,
+        browsers: int,
+        pages_per_browser: int,
+        per_domain_limit: int,
+        recycle_after_pages: int,
+        max_rss_mb: int = 0,
+        memory_probe: Callable[[Any], Optional[int]] = _browser_rss_bytes,
+    ) -> None:
+        self._crawler_factory = crawler_factory
+        self._browsers = [_PooledBrowser(index) for index in range(max(1, browsers))]
+        self._pages_per_browser = max(1, pages_per_browser)
+        self._per_domain_limit = max(1, per_domain_limit)
+        self._recycle_after_pages = recycle_after_pages
+        self._max_rss_bytes = max_rss_mb * 1024 * 1024
+        self._memory_probe = memory_probe
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._domain_active: dict[str, int] = {}
+        self._recycle_tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return (urlparse(url).hostname or "").lower()
+
+    @asynccontextmanager
+    async def lease(
+        self, url: str, priority: ScrapePriority = ScrapePriority.INTERACTIVE
+    ) -> AsyncIterator[BrowserLease]:
+        """Hold a page slot for ``url`` while the block runs."""
+        host = self._host(url)
+        browser = await self._acquire(host, priority)
+        lease = BrowserLease(self, browser)
+        token = _current_lease.set(lease)
+        failed = False
+        try:
+            yield lease
+        except Exception:
+            failed = True
+            raise
+        finally:
+            _current_lease.reset(token)
+            self._release(browser, host, lease.used, failed)
+
+    async def leased_crawler(self) -> Any:
+        """Return the crawler of the lease held by the current scrape."""
+        lease = _current_lease.get()
+        if lease is None:
+            raise RuntimeError("No browser lease is held by the current scrape")
+        return await lease.crawler()
+
+    async def close(self) -> None:
+        """Close every started browser."""
+        if self._recycle_tasks:
+            await asyncio.gather(*self._recycle_tasks, return_exceptions=True)
+        for browser in self._browsers:
+            if browser.crawler is not None:
+                await self._close_crawler(browser.crawler)
+                browser.crawler = None
+        WEB_SCRAPER_POOL_BROWSERS_RUNNING.set(0)
+
+    async def _acquire(self, host: str, priority: ScrapePriority) -> _PooledBrowser:
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(int(priority), next(self._seq), host, loop.create_future())
+        heapq.heappush(self._waiters, waiter)
+        self._dispatch()
+        label = ScrapePriority(priority).name.lower()
+        if waiter.future.done():
+            WEB_SCRAPER_POOL_WAIT_SECONDS.labels(priority=label).observe(0)
+            return waiter.future.result()
+
+        WEB_SCRAPER_POOL_WAITING.labels(priority=label).inc()
+        started = loop.time()
+        try:
+            return await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just as the caller gave up; hand the slot back
+                self._release(waiter.future.result(), host, False, False)
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+            raise
+        finally:
+            WEB_SCRAPER_POOL_WAITING.labels(priority=label).dec()
+            WEB_SCRAPER_POOL_WAIT_SECONDS.labels(priority=label).observe(
+                loop.time() - started
+            )
+
+    def _pick_browser(self) -> Optional[_PooledBrowser]:
+        available = [
+            browser
+            for browser in self._browsers
+            if not browser.retiring and browser.active < self._pages_per_browser
+        ]
+        if not available:
+            return None
+        # Fill started browsers before starting another one
+        return min(
+            available,
+            key=lambda browser: (browser.crawler is None, browser.active),
+        )
+
+    def _dispatch(self) -> None:
+        """Grant free slots to waiters in priority order."""
+        blocked: list[_Waiter] = []
+        while self._waiters:
+            waiter = heapq.heappop(self._waiters)
+            if waiter.future.done():
+                continue
+            if self._domain_active.get(waiter.host, 0) >= self._per_domain_limit:
+                blocked.append(waiter)
+                continue
+            browser = self._pick_browser()
+            if browser is None:
+                heapq.heappush(self._waiters, waiter)
+                break
+            browser.active += 1
+            self._domain_active[waiter.host] = (
+                self._domain_active.get(waiter.host, 0) + 1
+            )
+            WEB_SCRAPER_POOL_PAGES_IN_USE.inc()
+            waiter.future.set_result(browser)
+        for waiter in blocked:
+            heapq.heappush(self._waiters, waiter)
+
+    def _release(
+        self, browser: _PooledBrowser, host: str, used: bool, failed: bool
+    ) -> None:
+        browser.active -= 1
+        remaining = self._domain_active.get(host, 0) - 1
+        if remaining > 0:
+            self._domain_active[host] = remaining
+        else:
+            self._domain_active.pop(host, None)
+        WEB_SCRAPER_POOL_PAGES_IN_USE.dec()
+
+        if used and browser.crawler is not None and not browser.retiring:
+            browser.pages_served += 1
+            reason = self._recycle_reason(browser, failed)
+            if reason:
+                logger.info(
+                    "Recycling scraper browser %s after %s pages (%s)",
+                    browser.index,
+                    browser.pages_served,
+                    reason,
+                )
+                WEB_SCRAPER_POOL_RECYCLES_TOTAL.labels(reason=reason).inc()
+                browser.retiring = True
+
+        if browser.retiring and browser.active == 0:
+            task = asyncio.get_running_loop().create_task(self._recycle(browser))
+            self._recycle_tasks.add(task)
+            task.add_done_callback(self._recycle_tasks.discard)
+        self._dispatch()
+
+    def _recycle_reason(self, browser: _PooledBrowser, failed: bool) -> Optional[str]:
+        if failed:
+            return "error"
+        if (
+            self._recycle_after_pages > 0
+            and browser.pages_served >= self._recycle_after_pages
+        ):
+            return "pages"
+        if self._max_rss_bytes > 0:
+            rss = self._memory_probe(browser.crawler)
+            if rss is not None and rss > self._max_rss_bytes:
+                return "memory"
+        return None
+
+    async def _recycle(self, browser: _PooledBrowser) -> None:
+        crawler, browser.crawler = browser.crawler, None
+        try:
+            if crawler is not None:
+                await self._close_crawler(crawler)
+                WEB_SCRAPER_POOL_BROWSERS_RUNNING.dec()
+        finally:
+            browser.pages_served = 0
+            browser.retiring = False
+            self._dispatch()
+
+    async def _ensure_started(self, browser: _PooledBrowser) -> Any:
+        if browser.crawler is not None:
+            return browser.crawler
+        async with browser.start_lock:
+            if browser.crawler is None:
+                browser.crawler = await self._crawler_factory()
+                WEB_SCRAPER_POOL_BROWSERS_RUNNING.inc()
+        return browser.crawler
+
+    @staticmethod
+    async def _close_crawler(crawler: Any) -> None:
+        close = getattr(crawler, "close", None)
+        if close is None:
+            return
+        try:
+            result = close()
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as exc:
+            logger.warning("Failed to close scraper browser: %s", exc)
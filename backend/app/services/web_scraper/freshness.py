@@ -0,0 +1,172 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Change detection for previously scraped web pages.
+
+Refreshing a web document used to launch a full browser scrape and re-index
+the page even when nothing had changed. Documents now keep the page's HTTP
+validators (``ETag``/``Last-Modified``) and a fingerprint of the normalized
+markdown, so a refresh can first ask the server with a conditional GET and,
+when the page has to be scraped anyway, skip re-indexing identical content.
+"""
+
+import hashlib
+import logging
+import re
+from enum import Enum
+from typing import Mapping, Optional
+
+import httpx
+from pydantic import BaseModel
+
+from app.services.web_scraper.proxy import ProxyPlan
+from app.services.web_scraper.security import (
+    WebScraperSecurityError,
+    WebScraperUrlGuard,
+    redact_url_for_logging,
+)
+
+logger = logging.getLogger(__name__)
+
+CONDITIONAL_REQUEST_TIMEOUT = 10
+CONDITIONAL_MAX_REDIRECTS = 10
+REDIRECT_STATUS_CODES = {301, 302, 303, 307, 308}
+
+_TRAILING_SPACE_RE = re.compile(r"[ \t]+$", re.MULTILINE)
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+class FreshnessStatus(str, Enum):
+    """Outcome of a conditional request."""
+
+    NOT_MODIFIED = "not_modified"
+    MODIFIED = "modified"
+    # No validators to send, or the server could not be asked
+    UNKNOWN = "unknown"
+
+
+class PageValidators(BaseModel):
+    """HTTP cache validators of a fetched page."""
+
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str]) -> "PageValidators":
+        """Read validators from response headers (case-insensitive)."""
+        values = {key.lower(): value for key, value in headers.items()}
+        return cls(
+            etag=values.get("etag") or None,
+            last_modified=values.get("last-modified") or None,
+        )
+
+    @property
+    def present(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def request_headers(self) -> dict[str, str]:
+        """Return the conditional request headers for these validators."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class FreshnessCheck(BaseModel):
+    """Result of asking the server whether a page changed."""
+
+    status: FreshnessStatus
+    # Validators returned by the server; kept for the next refresh
+    validators: PageValidators = PageValidators()
+
+
+def content_fingerprint(markdown: str) -> str:
+    """Return a hash of markdown that ignores whitespace-only differences."""
+    normalized = markdown.replace("\r\n", "\n").replace("\r", "\n")
+    normalized = _TRAILING_SPACE_RE.sub("", normalized)
+    normalized = _BLANK_LINES_RE.sub("\n\n", normalized).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class ConditionalFetcher:
+    """Ask a server whether a page changed since it was last scraped."""
+
+    async def check(
+        self,
+        url: str,
+        validators: PageValidators,
+        proxy_plan: ProxyPlan,
+        guard: WebScraperUrlGuard,
+    ) -> FreshnessCheck:
+        """Send a conditional GET for ``url`` without downloading the body."""
+        if not validators.present:
+            return FreshnessCheck(status=FreshnessStatus.UNKNOWN)
+        try:
+            guard.validate_initial_url(url)
+            return await self._check_once(url, validators, proxy_plan, guard)
+        except WebScraperSecurityError as exc:
+            logger.info(
+                "Conditional request blocked for %s: %s",
+                redact_url_for_logging(url),
+                exc.message,
+            )
+        except Exception as exc:
+            logger.info(
+                "Conditional request failed for %s: %s",
+                redact_url_for_logging(url),
+                exc,
+            )
+        return FreshnessCheck(status=FreshnessStatus.UNKNOWN)
+
+    async def _check_once(
+        self,
+        url: str,
+        validators: PageValidators,
+        proxy_plan: ProxyPlan,
+        guard: WebScraperUrlGuard,
+    ) -> FreshnessCheck:
+        async with httpx.AsyncClient(
+            timeout=CONDITIONAL_REQUEST_TIMEOUT,
+            follow_redirects=False,
+            **proxy_plan.httpx_client_kwargs(),
+        ) as client:
+            current_url = url
+            for _ in range(CONDITIONAL_MAX_REDIRECTS + 1):
+                async with client.stream(
+                    "GET", current_url, headers=validators.request_headers()
+                ) as response:
+                    location = response.headers.get("location")
+                    if response.status_code in REDIRECT_STATUS_CODES and location:
+                        current_url = guard.validate_redirect_target(
+                            url, str(response.url), location
+                        )
+                        continue
+
+                    guard.validate_final_url(url, str(response.url))
+                    received = PageValidators.from_headers(response.headers)
+                    return FreshnessCheck(
+                        status=self._classify(
+                            response.status_code, validators, received
+                        ),
+                        validators=received,
+                    )
+
+            return FreshnessCheck(status=FreshnessStatus.UNKNOWN)
+
+    def _classify(
+        self,
+        status_code: int,
+        sent: PageValidators,
+        received: PageValidators,
+    ) -> FreshnessStatus:
+        if status_code == 304:
+            return FreshnessStatus.NOT_MODIFIED
+        if not 200 <= status_code < 300:
+            return FreshnessStatus.UNKNOWN
+        # Some servers ignore If-None-Match but still send a strong ETag
+        if sent.etag and not sent.etag.startswith("W/") and received.etag == sent.etag:
+            return FreshnessStatus.NOT_MODIFIED
+        return FreshnessStatus.MODIFIED
@@ -56,6 +56,7 @@ class PdfExtractor:
                 content_type=response.headers.get("content-type"),
                 status_code=response.status_code,
                 success=True,
+                response_headers=dict(response.headers),
                 error_message=None,
                 extraction_method="pdf",
                 quality_level="degraded",
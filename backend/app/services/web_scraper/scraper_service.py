@@ -13,7 +13,15 @@ from urllib.parse import urlparse
 from pydantic import BaseModel, Field
 
 from app.core.config import settings
+from app.services.web_scraper.browser_pool import BrowserPool, ScrapePriority
 from app.services.web_scraper.classifier import ScrapeResultClassifier
+from app.services.web_scraper.freshness import (
+    ConditionalFetcher,
+    FreshnessCheck,
+    FreshnessStatus,
+    PageValidators,
+    content_fingerprint,
+)
 from app.services.web_scraper.models import (
     ERROR_AUTH_REQUIRED,
     ERROR_CRAWL4AI_NOT_INSTALLED,
@@ -36,7 +44,7 @@ from app.services.web_scraper.policy import (
     ScrapePolicy,
     SitePolicyResolver,
 )
-from app.services.web_scraper.profiles import BrowserProfileFactory
+from app.services.web_scraper.profiles import BrowserProfile, BrowserProfileFactory
 from app.services.web_scraper.proxy import ProxyPlan, ProxyResolver
 from app.services.web_scraper.quality import MarkdownQualityEvaluator
 from app.services.web_scraper.security import (
@@ -65,6 +73,7 @@ __all__ = [
     "ERROR_SSRF_BLOCKED",
     "ScrapedContent",
     "ScrapeError",
+    "ScrapePriority",
     "WebScraperService",
     "get_web_scraper_service",
 ]
@@ -84,6 +93,13 @@ class ScrapedContent(BaseModel):
     success: bool = Field(True, description="Whether scraping succeeded")
     error_code: Optional[str] = Field(None, description="Error code if failed")
     error_message: Optional[str] = Field(None, description="Error message if failed")
+    etag: Optional[str] = Field(None, description="ETag of the fetched page")
+    last_modified: Optional[str] = Field(
+        None, description="Last-Modified of the fetched page"
+    )
+    content_hash: Optional[str] = Field(
+        None, description="Fingerprint of the normalized markdown"
+    )
 
 
 class ScrapeError(BaseModel):
@@ -100,9 +116,15 @@ class WebScraperService:
 
     def __init__(self) -> None:
         """Initialize the web scraper service."""
-        self._crawler = None
-        self._crawler_lock = asyncio.Lock()
         self._crawl4ai_available = None
+        self._browser_pool = BrowserPool(
+            self._start_crawler,
+            browsers=settings.WEBSCRAPER_BROWSER_POOL_SIZE,
+            pages_per_browser=settings.WEBSCRAPER_BROWSER_PAGES_PER_BROWSER,
+            per_domain_limit=settings.WEBSCRAPER_PER_DOMAIN_CONCURRENCY,
+            recycle_after_pages=settings.WEBSCRAPER_BROWSER_RECYCLE_PAGES,
+            max_rss_mb=settings.WEBSCRAPER_BROWSER_MAX_RSS_MB,
+        )
         self._guard = WebScraperUrlGuard()
         self._policy_resolver = SitePolicyResolver()
         self._profile_factory = BrowserProfileFactory()
@@ -110,6 +132,7 @@ class WebScraperService:
         self._classifier = ScrapeResultClassifier()
         self._quality_evaluator = MarkdownQualityEvaluator()
         self._pdf_extractor = PdfExtractor()
+        self._conditional_fetcher = ConditionalFetcher()
         self._playwright_strategy = PlaywrightFrameExtractionStrategy(
             quality_evaluator=self._quality_evaluator
         )
@@ -136,47 +159,52 @@ class WebScraperService:
         return self._crawl4ai_available
 
     async def _get_crawler(self) -> Any:
-        """Get or create the AsyncWebCrawler instance."""
-        if self._crawler is not None:
-            return self._crawler
-
-        async with self._crawler_lock:
-            if self._crawler is not None:
-                return self._crawler
-
-            from crawl4ai import AsyncWebCrawler, BrowserConfig
-
-            browser_config = BrowserConfig(
-                headless=True,
-                browser_type="chromium",
-                user_agent_mode="random",
-                use_managed_browser=True,
-                extra_args=["--no-sandbox", "--disable-dev-shm-usage"],
-            )
-            crawler = AsyncWebCrawler(config=browser_config)
-            try:
-                await crawler.start()
-            except Exception:
-                close = getattr(crawler, "close", None)
-                if close is not None:
-                    close_result = close()
-                    if asyncio.iscoroutine(close_result):
-                        await close_result
-                raise
-
-            self._crawler = crawler
-        return self._crawler
+        """Get the crawler of the browser leased by the current scrape."""
+        return await self._browser_pool.leased_crawler()
+
+    async def _start_crawler(self) -> Any:
+        """Start a new AsyncWebCrawler for the browser pool."""
+        from crawl4ai import AsyncWebCrawler, BrowserConfig
+
+        browser_config = BrowserConfig(
+            headless=True,
+            browser_type="chromium",
+            user_agent_mode="random",
+            use_managed_browser=True,
+            extra_args=["--no-sandbox", "--disable-dev-shm-usage"],
+        )
+        crawler = AsyncWebCrawler(config=browser_config)
+        try:
+            await crawler.start()
+        except Exception:
+            close = getattr(crawler, "close", None)
+            if close is not None:
+                close_result = close()
+                if asyncio.iscoroutine(close_result):
+                    await close_result
+            raise
+        return crawler
 
     @trace_async(
         span_name="web_scraper.scrape_url",
         tracer_name="web_scraper",
-        extract_attributes=lambda self, url: {"url": redact_url_for_logging(url)},
+        extract_attributes=lambda self, url, *args, **kwargs: {
+            "url": redact_url_for_logging(url)
+        },
     )
-    async def scrape_url(self, url: str) -> ScrapedContent:
-        """Scrape a web page and convert to Markdown."""
+    async def scrape_url(
+        self,
+        url: str,
+        priority: ScrapePriority = ScrapePriority.INTERACTIVE,
+    ) -> ScrapedContent:
+        """Scrape a web page and convert to Markdown.
+
+        Browser work waits for a pooled browser slot; ``BULK`` scrapes yield to
+        ``INTERACTIVE`` ones. The total timeout includes the wait.
+        """
         try:
             return await asyncio.wait_for(
-                self._scrape_url_impl(url),
+                self._scrape_url_impl(url, priority),
                 timeout=self._resolve_total_timeout(url),
             )
         except asyncio.TimeoutError:
@@ -189,7 +217,29 @@ class WebScraperService:
                 url, ERROR_FETCH_FAILED, f"Failed to scrape page: {str(exc)}"
             )
 
-    async def _scrape_url_impl(self, url: str) -> ScrapedContent:
+    async def check_for_changes(
+        self, url: str, validators: PageValidators
+    ) -> FreshnessCheck:
+        """Ask the server whether a previously scraped page changed.
+
+        Returns ``UNKNOWN`` whenever the answer is not conclusive; callers
+        then fall back to a full scrape.
+        """
+        if not settings.WEBSCRAPER_CONDITIONAL_REFRESH_ENABLED:
+            return FreshnessCheck(status=FreshnessStatus.UNKNOWN)
+        proxy_plan = self._proxy_resolver.resolve(
+            mode=settings.WEBSCRAPER_PROXY_MODE,
+            raw_url=settings.WEBSCRAPER_PROXY,
+        )
+        return await self._conditional_fetcher.check(
+            url, validators, proxy_plan, self._guard
+        )
+
+    async def _scrape_url_impl(
+        self,
+        url: str,
+        priority: ScrapePriority = ScrapePriority.INTERACTIVE,
+    ) -> ScrapedContent:
         self._guard.validate_initial_url(url)
 
         policy = self._policy_resolver.resolve(url)
@@ -210,6 +260,16 @@ class WebScraperService:
             )
 
         profile = self._profile_factory.create(policy.profile)
+        async with self._browser_pool.lease(url, priority):
+            return await self._scrape_with_browser(url, policy, profile, proxy_plan)
+
+    async def _scrape_with_browser(
+        self,
+        url: str,
+        policy: ScrapePolicy,
+        profile: BrowserProfile,
+        proxy_plan: ProxyPlan,
+    ) -> ScrapedContent:
         primary = await self._crawl4ai_strategy.scrape(
             url=url,
             policy=policy,
@@ -280,6 +340,7 @@ class WebScraperService:
 
     def _build_success(self, result: InternalScrapeResult) -> ScrapedContent:
         final_url = result.final_url or result.url
+        validators = PageValidators.from_headers(result.response_headers)
         return ScrapedContent(
             title=result.title or None,
             content=result.markdown,
@@ -288,6 +349,9 @@ class WebScraperService:
             content_length=len(result.markdown),
             description=result.description or None,
             success=True,
+            etag=validators.etag,
+            last_modified=validators.last_modified,
+            content_hash=content_fingerprint(result.markdown),
         )
 
     def _build_result(
@@ -321,11 +385,8 @@ class WebScraperService:
         )
 
     async def close(self) -> None:
-        """Close the crawler and release resources."""
-        async with self._crawler_lock:
-            if self._crawler is not None:
-                await self._crawler.close()
-                self._crawler = None
+        """Close the pooled browsers and release resources."""
+        await self._browser_pool.close()
 
 
 _service: Optional[WebScraperService] = None
@@ -0,0 +1,190 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""SQLAlchemy transaction hooks for materialized work queue counters.
+
+Every ORM insert, status change and delete of a ``QueueMessage`` (from
+``QueueMessageService.create_message``/``update_status``/``batch_update_status``/
+``delete_message``, ingestion, retries, auto-processing and result writeback)
+is turned into a counter delta during flush. The deltas are published to
+Redis only after the transaction commits and discarded on rollback.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.work_queue import QueueMessage
+from app.services.work_queue_counters import (
+    CounterDelta,
+    WorkQueueCounterStore,
+    counts_toward_total,
+    counts_toward_unread,
+    work_queue_counter_store,
+)
+
+logger = logging.getLogger(__name__)
+
+_PENDING_DELTAS_KEY = "work_queue_counter_pending_deltas"
+_PENDING_INVALIDATIONS_KEY = "work_queue_counter_pending_invalidations"
+
+_DeltaKey = Tuple[int, int]
+
+
+class WorkQueueCounterHooks:
+    """Capture queue message changes and publish counter deltas after commit."""
+
+    def __init__(self, session_factory: Any, store: WorkQueueCounterStore) -> None:
+        self._session_factory = session_factory
+        self._store = store
+        self._registered = False
+        self._before_flush_listener = self._before_flush
+        self._after_commit_listener = self._after_commit
+        self._after_rollback_listener = self._after_rollback
+
+    def register(self) -> None:
+        """Register listeners once for the configured session factory."""
+        if self._registered:
+            return
+        event.listen(self._session_factory, "before_flush", self._before_flush_listener)
+        event.listen(self._session_factory, "after_commit", self._after_commit_listener)
+        event.listen(
+            self._session_factory, "after_rollback", self._after_rollback_listener
+        )
+        self._registered = True
+
+    def unregister(self) -> None:
+        """Remove listeners, primarily for tests and graceful shutdown."""
+        if not self._registered:
+            return
+        event.remove(self._session_factory, "before_flush", self._before_flush_listener)
+        event.remove(self._session_factory, "after_commit", self._after_commit_listener)
+        event.remove(
+            self._session_factory, "after_rollback", self._after_rollback_listener
+        )
+        self._registered = False
+
+    def _before_flush(
+        self, session: Session, flush_context: Any, instances: Any
+    ) -> None:
+        deltas: Dict[_DeltaKey, list] = session.info.setdefault(
+            _PENDING_DELTAS_KEY, defaultdict(lambda: [0, 0])
+        )
+        invalidations: dict = session.info.setdefault(
+            _PENDING_INVALIDATIONS_KEY, {"queues": set(), "users": set()}
+        )
+
+        for message in session.new:
+            if not isinstance(message, QueueMessage):
+                continue
+            _add_status(
+                deltas, message.queue_id, message.recipient_user_id, message.status, 1
+            )
+
+        for message in session.dirty:
+            if not isinstance(message, QueueMessage):
+                continue
+            state = inspect(message)
+            status_history = state.attrs.status.history
+            if not (
+                status_history.has_changes()
+                or state.attrs.queue_id.history.has_changes()
+                or state.attrs.recipient_user_id.history.has_changes()
+            ):
+                continue
+            old_queue_id = _previous_value(state, "queue_id")
+            old_recipient_id = _previous_value(state, "recipient_user_id")
+            old_status = _previous_value(state, "status")
+            if (
+                old_queue_id is None
+                or old_recipient_id is None
+                or (status_history.has_changes() and not status_history.deleted)
+            ):
+                # The previous value was never loaded; the delta is unknown
+                invalidations["queues"].update({old_queue_id, message.queue_id})
+                invalidations["users"].update(
+                    {old_recipient_id, message.recipient_user_id}
+                )
+                continue
+            _add_status(deltas, old_queue_id, old_recipient_id, old_status, -1)
+            _add_status(
+                deltas, message.queue_id, message.recipient_user_id, message.status, 1
+            )
+
+        for message in session.deleted:
+            if not isinstance(message, QueueMessage):
+                continue
+            state = inspect(message)
+            _add_status(
+                deltas,
+                _previous_value(state, "queue_id"),
+                _previous_value(state, "recipient_user_id"),
+                _previous_value(state, "status"),
+                -1,
+            )
+
+    def _after_commit(self, session: Session) -> None:
+        deltas: Dict[_DeltaKey, list] = session.info.pop(_PENDING_DELTAS_KEY, {})
+        invalidations = session.info.pop(_PENDING_INVALIDATIONS_KEY, None)
+        try:
+            if invalidations:
+                self._store.invalidate(
+                    queue_ids={q for q in invalidations["queues"] if q is not None},
+                    user_ids={u for u in invalidations["users"] if u is not None},
+                )
+            if deltas:
+                self._store.apply_deltas(
+                    CounterDelta(
+                        queue_id=queue_id,
+                        recipient_user_id=recipient_user_id,
+                        total=total,
+                        unread=unread,
+                    )
+                    for (queue_id, recipient_user_id), (total, unread) in deltas.items()
+                )
+        except Exception:
+            logger.exception(
+                "Failed to publish committed work queue counter deltas; "
+                "counters will be repaired by reconciliation"
+            )
+
+    @staticmethod
+    def _after_rollback(session: Session) -> None:
+        session.info.pop(_PENDING_DELTAS_KEY, None)
+        session.info.pop(_PENDING_INVALIDATIONS_KEY, None)
+
+
+def _previous_value(state: Any, attr: str) -> Any:
+    """Return the committed value of ``attr`` before the pending change."""
+    history = state.attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    if not history.has_changes():
+        return state.attrs[attr].value
+    return None
+
+
+def _add_status(
+    deltas: Dict[_DeltaKey, list],
+    queue_id: Any,
+    recipient_user_id: Any,
+    status: Any,
+    sign: int,
+) -> None:
+    if queue_id is None or recipient_user_id is None:
+        return
+    entry = deltas[(queue_id, recipient_user_id)]
+    if counts_toward_total(status):
+        entry[0] += sign
+    if counts_toward_unread(status):
+        entry[1] += sign
+
+
+work_queue_counter_hooks = WorkQueueCounterHooks(SessionLocal, work_queue_counter_store)
@@ -0,0 +1,406 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Redis-backed materialized message counters for work queues and the inbox.
+
+Queue lists and inbox badges need per-queue total (non-archived) and unread
+message counts. Instead of running ``COUNT(*) ... GROUP BY queue_id`` over
+``queue_messages`` on every refresh, committed status transitions are applied
+as deltas to two kinds of Redis hashes:
+
+- ``work-queue-counters:v1:queue:{queue_id}`` -> ``{total, unread}``
+- ``work-queue-counters:v1:user:{user_id}``   -> ``{queue_id: unread, _seeded}``
+
+Deltas are only applied to hashes that already exist, so a counter is always
+seeded from the database first (lazily on read). Seeded hashes expire after
+``WORK_QUEUE_COUNTER_TTL_SECONDS`` and a periodic reconciliation compares
+them with the true counts, overwriting drifted values and exporting the drift.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from prometheus_client import Counter, Gauge
+from redis import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.work_queue import QueueMessage, QueueMessageStatus
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "work-queue-counters:v1"
+_SEEDED_FIELD = "_seeded"
+_RECONCILE_BATCH_SIZE = 500
+
+WORK_QUEUE_COUNTER_DRIFT_TOTAL = Counter(
+    "work_queue_counter_drift_total",
+    "Absolute drift between materialized work queue counters and true counts",
+    ["scope"],  # scope: queue_total, queue_unread, user_unread
+)
+WORK_QUEUE_COUNTER_DRIFT_LAST = Gauge(
+    "work_queue_counter_drift_last",
+    "Absolute drift found by the last work queue counter reconciliation",
+    ["scope"],
+)
+WORK_QUEUE_COUNTER_READS_TOTAL = Counter(
+    "work_queue_counter_reads_total",
+    "Work queue counter reads by result",
+    ["scope", "result"],  # result: hit, miss
+)
+
+_APPLY_DELTA_SCRIPT = """
+local function change_count(key, field, amount)
+    local value = redis.call('HINCRBY', key, field, amount)
+    if value < 0 then
+        redis.call('HSET', key, field, 0)
+    end
+end
+
+local total_delta = tonumber(ARGV[1])
+local unread_delta = tonumber(ARGV[2])
+
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    if total_delta ~= 0 then
+        change_count(KEYS[1], 'total', total_delta)
+    end
+    if unread_delta ~= 0 then
+        change_count(KEYS[1], 'unread', unread_delta)
+    end
+end
+
+if unread_delta ~= 0 and redis.call('EXISTS', KEYS[2]) == 1 then
+    change_count(KEYS[2], ARGV[3], unread_delta)
+end
+
+return 1
+"""
+
+
+@dataclass(frozen=True)
+class CounterDelta:
+    """Committed change to the counters of one (queue, recipient) pair."""
+
+    queue_id: int
+    recipient_user_id: int
+    total: int = 0
+    unread: int = 0
+
+
+def counts_toward_total(status: Optional[QueueMessageStatus]) -> bool:
+    """Whether a message with ``status`` is included in the queue total."""
+    return _status_value(status) != QueueMessageStatus.ARCHIVED
+
+
+def counts_toward_unread(status: Optional[QueueMessageStatus]) -> bool:
+    """Whether a message with ``status`` is included in the unread count."""
+    return _status_value(status) == QueueMessageStatus.UNREAD
+
+
+def _status_value(status: Optional[QueueMessageStatus]) -> QueueMessageStatus:
+    if status is None:
+        return QueueMessageStatus.UNREAD
+    if isinstance(status, QueueMessageStatus):
+        return status
+    return QueueMessageStatus(status)
+
+
+def count_queue_messages(
+    db: Session, queue_ids: List[int]
+) -> Dict[int, Tuple[int, int]]:
+    """Count (total, unread) messages per queue directly from the database."""
+    if not queue_ids:
+        return {}
+
+    total_counts = (
+        db.query(QueueMessage.queue_id, func.count(QueueMessage.id))
+        .filter(
+            QueueMessage.queue_id.in_(queue_ids),
+            QueueMessage.status != QueueMessageStatus.ARCHIVED,
+        )
+        .group_by(QueueMessage.queue_id)
+        .all()
+    )
+    unread_counts = (
+        db.query(QueueMessage.queue_id, func.count(QueueMessage.id))
+        .filter(
+            QueueMessage.queue_id.in_(queue_ids),
+            QueueMessage.status == QueueMessageStatus.UNREAD,
+        )
+        .group_by(QueueMessage.queue_id)
+        .all()
+    )
+
+    total_map = {qid: count for qid, count in total_counts}
+    unread_map = {qid: count for qid, count in unread_counts}
+    return {qid: (total_map.get(qid, 0), unread_map.get(qid, 0)) for qid in queue_ids}
+
+
+def count_user_unread(db: Session, user_ids: List[int]) -> Dict[int, Dict[int, int]]:
+    """Count unread messages per queue for each recipient from the database."""
+    if not user_ids:
+        return {}
+
+    results = (
+        db.query(
+            QueueMessage.recipient_user_id,
+            QueueMessage.queue_id,
+            func.count(QueueMessage.id),
+        )
+        .filter(
+            QueueMessage.recipient_user_id.in_(user_ids),
+            QueueMessage.status == QueueMessageStatus.UNREAD,
+        )
+        .group_by(QueueMessage.recipient_user_id, QueueMessage.queue_id)
+        .all()
+    )
+    by_user: Dict[int, Dict[int, int]] = {uid: {} for uid in user_ids}
+    for user_id, queue_id, count in results:
+        by_user[user_id][queue_id] = count
+    return by_user
+
+
+class WorkQueueCounterStore:
+    """Materialized work queue message counters stored in Redis.
+
+    All operations are best effort: Redis failures are logged and reported as
+    cache misses so callers fall back to counting in the database.
+    """
+
+    def __init__(
+        self,
+        redis_url: str = settings.REDIS_URL,
+        *,
+        ttl_seconds: int = settings.WORK_QUEUE_COUNTER_TTL_SECONDS,
+        enabled: bool = settings.WORK_QUEUE_COUNTERS_ENABLED,
+        key_prefix: str = KEY_PREFIX,
+        client: Optional[Redis] = None,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._enabled = enabled
+        self._key_prefix = key_prefix
+        self._client = client or Redis.from_url(
+            redis_url,
+            encoding="utf-8",
+            decode_responses=True,
+            socket_timeout=1.0,
+            socket_connect_timeout=0.5,
+            health_check_interval=30,
+        )
+        self._apply_delta = self._client.register_script(_APPLY_DELTA_SCRIPT)
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def _queue_key(self, queue_id: int) -> str:
+        return f"{self._key_prefix}:queue:{queue_id}"
+
+    def _user_key(self, user_id: int) -> str:
+        return f"{self._key_prefix}:user:{user_id}"
+
+    # ---- Writes from committed transactions ----
+
+    def apply_deltas(self, deltas: Iterable[CounterDelta]) -> None:
+        """Apply committed message deltas to already-seeded counters."""
+        if not self._enabled:
+            return
+        delta_list = [d for d in deltas if d.total or d.unread]
+        if not delta_list:
+            return
+        try:
+            pipeline = self._client.pipeline(transaction=False)
+            for delta in delta_list:
+                self._apply_delta(
+                    keys=[
+                        self._queue_key(delta.queue_id),
+                        self._user_key(delta.recipient_user_id),
+                    ],
+                    args=[delta.total, delta.unread, str(delta.queue_id)],
+                    client=pipeline,
+                )
+            pipeline.execute()
+        except RedisError:
+            # The counters for these keys are now unreliable; drop them so
+            # the next read re-seeds from the database.
+            logger.warning(
+                "Failed to apply work queue counter deltas; invalidating",
+                exc_info=True,
+            )
+            self.invalidate(
+                queue_ids={d.queue_id for d in delta_list},
+                user_ids={d.recipient_user_id for d in delta_list},
+            )
+
+    def invalidate(
+        self, queue_ids: Iterable[int] = (), user_ids: Iterable[int] = ()
+    ) -> None:
+        """Drop counters so they are re-seeded from the database on next read."""
+        if not self._enabled:
+            return
+        keys = [self._queue_key(qid) for qid in queue_ids]
+        keys.extend(self._user_key(uid) for uid in user_ids)
+        if not keys:
+            return
+        try:
+            self._client.delete(*keys)
+        except RedisError:
+            logger.warning("Failed to invalidate work queue counters", exc_info=True)
+
+    # ---- Reads ----
+
+    def get_queue_counts(
+        self, queue_ids: List[int]
+    ) -> Tuple[Dict[int, Tuple[int, int]], List[int]]:
+        """Read (total, unread) per queue.
+
+        Returns:
+            Tuple of (counts for seeded queues, queue ids that must be counted
+            from the database).
+        """
+        if not self._enabled or not queue_ids:
+            return {}, list(queue_ids)
+        try:
+            pipeline = self._client.pipeline(transaction=False)
+            for queue_id in queue_ids:
+                pipeline.hmget(self._queue_key(queue_id), "total", "unread")
+            results = pipeline.execute()
+        except RedisError:
+            logger.warning("Failed to read work queue counters", exc_info=True)
+            return {}, list(queue_ids)
+
+        counts: Dict[int, Tuple[int, int]] = {}
+        missing: List[int] = []
+        for queue_id, (total, unread) in zip(queue_ids, results):
+            if total is None or unread is None:
+                missing.append(queue_id)
+            else:
+                counts[queue_id] = (int(total), int(unread))
+        WORK_QUEUE_COUNTER_READS_TOTAL.labels(scope="queue", result="hit").inc(
+            len(counts)
+        )
+        WORK_QUEUE_COUNTER_READS_TOTAL.labels(scope="queue", result="miss").inc(
+            len(missing)
+        )
+        return counts, missing
+
+    def get_user_unread(self, user_id: int) -> Optional[Dict[int, int]]:
+        """Read unread counts per queue for a recipient, or None if not seeded."""
+        if not self._enabled:
+            return None
+        try:
+            raw = self._client.hgetall(self._user_key(user_id))
+        except RedisError:
+            logger.warning("Failed to read inbox unread counters", exc_info=True)
+            return None
+        if not raw or _SEEDED_FIELD not in raw:
+            WORK_QUEUE_COUNTER_READS_TOTAL.labels(scope="user", result="miss").inc()
+            return None
+        WORK_QUEUE_COUNTER_READS_TOTAL.labels(scope="user", result="hit").inc()
+        return {
+            int(field): int(value)
+            for field, value in raw.items()
+            if field != _SEEDED_FIELD and int(value) > 0
+        }
+
+    # ---- Seeding ----
+
+    def set_queue_counts(self, counts: Dict[int, Tuple[int, int]]) -> None:
+        """Seed (or overwrite) queue counters with database counts."""
+        if not self._enabled or not counts:
+            return
+        try:
+            pipeline = self._client.pipeline(transaction=False)
+            for queue_id, (total, unread) in counts.items():
+                key = self._queue_key(queue_id)
+                pipeline.hset(key, mapping={"total": total, "unread": unread})
+                pipeline.expire(key, self._ttl_seconds)
+            pipeline.execute()
+        except RedisError:
+            logger.warning("Failed to seed work queue counters", exc_info=True)
+
+    def set_user_unread(self, user_id: int, by_queue: Dict[int, int]) -> None:
+        """Seed (or overwrite) a recipient's unread counters with database counts."""
+        if not self._enabled:
+            return
+        key = self._user_key(user_id)
+        mapping = {str(qid): count for qid, count in by_queue.items()}
+        mapping[_SEEDED_FIELD] = 1
+        try:
+            pipeline = self._client.pipeline(transaction=True)
+            pipeline.delete(key)
+            pipeline.hset(key, mapping=mapping)
+            pipeline.expire(key, self._ttl_seconds)
+            pipeline.execute()
+        except RedisError:
+            logger.warning("Failed to seed inbox unread counters", exc_info=True)
+
+    # ---- Reconciliation ----
+
+    def reconcile(self, db: Session) -> Dict[str, int]:
+        """Compare every seeded counter with the database and repair drift.
+
+        Returns:
+            Absolute drift per scope (queue_total, queue_unread, user_unread).
+        """
+        drift = {"queue_total": 0, "queue_unread": 0, "user_unread": 0}
+        if not self._enabled:
+            return drift
+
+        try:
+            queue_ids = self._scan_ids("queue")
+            user_ids = self._scan_ids("user")
+        except RedisError:
+            logger.warning("Failed to scan work queue counters", exc_info=True)
+            return drift
+
+        for start in range(0, len(queue_ids), _RECONCILE_BATCH_SIZE):
+            batch = queue_ids[start : start + _RECONCILE_BATCH_SIZE]
+            cached, _missing = self.get_queue_counts(batch)
+            truth = count_queue_messages(db, batch)
+            repaired: Dict[int, Tuple[int, int]] = {}
+            for queue_id, (total, unread) in cached.items():
+                true_total, true_unread = truth.get(queue_id, (0, 0))
+                if (total, unread) != (true_total, true_unread):
+                    drift["queue_total"] += abs(total - true_total)
+                    drift["queue_unread"] += abs(unread - true_unread)
+                    repaired[queue_id] = (true_total, true_unread)
+            self.set_queue_counts(repaired)
+
+        for start in range(0, len(user_ids), _RECONCILE_BATCH_SIZE):
+            batch = user_ids[start : start + _RECONCILE_BATCH_SIZE]
+            truth_by_user = count_user_unread(db, batch)
+            for user_id in batch:
+                cached_unread = self.get_user_unread(user_id)
+                if cached_unread is None:
+                    continue
+                true_unread = truth_by_user.get(user_id, {})
+                user_drift = sum(
+                    abs(cached_unread.get(qid, 0) - true_unread.get(qid, 0))
+                    for qid in set(cached_unread) | set(true_unread)
+                )
+                if user_drift:
+                    drift["user_unread"] += user_drift
+                    self.set_user_unread(user_id, true_unread)
+
+        for scope, value in drift.items():
+            WORK_QUEUE_COUNTER_DRIFT_LAST.labels(scope=scope).set(value)
+            if value:
+                WORK_QUEUE_COUNTER_DRIFT_TOTAL.labels(scope=scope).inc(value)
+        return drift
+
+    def _scan_ids(self, kind: str) -> List[int]:
+        prefix = f"{self._key_prefix}:{kind}:"
+        ids = []
+        for key in self._client.scan_iter(match=f"{prefix}*", count=1000):
+            suffix = key[len(prefix) :]
+            if suffix.isdigit():
+                ids.append(int(suffix))
+        return ids
+
+
+work_queue_counter_store = WorkQueueCounterStore()
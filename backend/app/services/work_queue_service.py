@@ -40,6 +40,11 @@ from app.schemas.work_queue import (
     WorkQueueUpdate,
 )
 from app.services.group_permission import check_user_group_permission
+from app.services.work_queue_counters import (
+    count_queue_messages,
+    count_user_unread,
+    work_queue_counter_store,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -143,64 +148,27 @@ class WorkQueueService:
 
     def _get_queue_message_counts(self, queue_id: int) -> Tuple[int, int]:
         """Get total and unread message counts for a queue."""
-        with self.get_db() as db:
-            total = (
-                db.query(func.count(QueueMessage.id))
-                .filter(
-                    QueueMessage.queue_id == queue_id,
-                    QueueMessage.status != QueueMessageStatus.ARCHIVED,
-                )
-                .scalar()
-                or 0
-            )
-            unread = (
-                db.query(func.count(QueueMessage.id))
-                .filter(
-                    QueueMessage.queue_id == queue_id,
-                    QueueMessage.status == QueueMessageStatus.UNREAD,
-                )
-                .scalar()
-                or 0
-            )
-            return total, unread
+        return self._get_batch_message_counts([queue_id]).get(queue_id, (0, 0))
 
     def _get_batch_message_counts(
         self, queue_ids: List[int]
     ) -> Dict[int, Tuple[int, int]]:
-        """Get message counts for multiple queues in batch."""
+        """Get message counts for multiple queues in batch.
+
+        Served from the materialized Redis counters; queues without a seeded
+        counter are counted in the database and seeded for later reads.
+        """
         if not queue_ids:
             return {}
 
-        with self.get_db() as db:
-            # Get total counts
-            total_counts = (
-                db.query(QueueMessage.queue_id, func.count(QueueMessage.id))
-                .filter(
-                    QueueMessage.queue_id.in_(queue_ids),
-                    QueueMessage.status != QueueMessageStatus.ARCHIVED,
-                )
-                .group_by(QueueMessage.queue_id)
-                .all()
-            )
-
-            # Get unread counts
-            unread_counts = (
-                db.query(QueueMessage.queue_id, func.count(QueueMessage.id))
-                .filter(
-                    QueueMessage.queue_id.in_(queue_ids),
-                    QueueMessage.status == QueueMessageStatus.UNREAD,
-                )
-                .group_by(QueueMessage.queue_id)
-                .all()
-            )
+        counts, missing = work_queue_counter_store.get_queue_counts(queue_ids)
+        if missing:
+            with self.get_db() as db:
+                db_counts = count_queue_messages(db, missing)
+            work_queue_counter_store.set_queue_counts(db_counts)
+            counts.update(db_counts)
 
-            total_map = {qid: count for qid, count in total_counts}
-            unread_map = {qid: count for qid, count in unread_counts}
-
-            return {
-                qid: (total_map.get(qid, 0), unread_map.get(qid, 0))
-                for qid in queue_ids
-            }
+        return {qid: counts.get(qid, (0, 0)) for qid in queue_ids}
 
     def list_queues(self, user_id: int) -> List[WorkQueueResponse]:
         """List all work queues for a user.
@@ -1208,25 +1176,15 @@ class QueueMessageService:
 
     def get_unread_counts(self, user_id: int) -> Tuple[int, Dict[int, int]]:
         """Get unread message counts for all queues."""
-        with self.get_db() as db:
-            # Get counts grouped by queue
-            results = (
-                db.query(
-                    QueueMessage.queue_id,
-                    func.count(QueueMessage.id).label("count"),
-                )
-                .filter(
-                    QueueMessage.recipient_user_id == user_id,
-                    QueueMessage.status == QueueMessageStatus.UNREAD,
-                )
-                .group_by(QueueMessage.queue_id)
-                .all()
-            )
+        by_queue = work_queue_counter_store.get_user_unread(user_id)
+        if by_queue is None:
+            with self.get_db() as db:
+                by_queue = count_user_unread(db, [user_id]).get(user_id, {})
+            work_queue_counter_store.set_user_unread(user_id, by_queue)
 
-            by_queue = {r.queue_id: r.count for r in results}
-            total = sum(by_queue.values())
+        total = sum(by_queue.values())
 
-            return total, by_queue
+        return total, by_queue
 
     def batch_update_status(
         self, user_id: int, message_ids: List[int], status: QueueMessageStatus
@@ -791,6 +791,18 @@ class SubtaskStore(Protocol):
         owner_user_id: Optional[int] = None,
     ) -> list[Subtask]: ...
 
+    def list_message_window(
+        self,
+        db: Session,
+        *,
+        task_id: int,
+        limit: int,
+        before_message_id: Optional[int] = None,
+        after_message_id: Optional[int] = None,
+        max_message_id: Optional[int] = None,
+        owner_user_id: Optional[int] = None,
+    ) -> list[Subtask]: ...
+
     def list_recent_by_task_ids(
         self,
         db: Session,
@@ -959,6 +971,25 @@ class SubtaskStore(Protocol):
         self, db: Session, *, executor_namespace: str, executor_name: str
     ) -> int: ...
 
+    def list_results_missing_mask(
+        self,
+        db: Session,
+        *,
+        statuses: Sequence[SubtaskStatus],
+        mask_version: int,
+        limit: int,
+    ) -> list[tuple[int, Any]]: ...
+
+    def store_masked_result(
+        self,
+        db: Session,
+        *,
+        subtask_id: int,
+        statuses: Sequence[SubtaskStatus],
+        mask_version: int,
+        masked_result: Any,
+    ) -> None: ...
+
     def mark_executor_deleted_by_ids(
         self, db: Session, *, subtask_ids: Sequence[int]
     ) -> int: ...
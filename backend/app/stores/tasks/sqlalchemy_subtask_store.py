@@ -5,7 +5,7 @@
 from datetime import datetime
 from typing import Any, Literal, Optional, Sequence
 
-from sqlalchemy import String, cast, func, or_, select
+from sqlalchemy import String, cast, func, or_, select, update
 from sqlalchemy.orm import Session, subqueryload, undefer
 from sqlalchemy.orm.attributes import flag_modified
 
@@ -733,6 +733,56 @@ class SqlAlchemySubtaskStore:
             return query.order_by(Subtask.created_at.asc(), Subtask.id.asc()).all()
         return query.order_by(Subtask.message_id.asc(), Subtask.created_at.asc()).all()
 
+    def list_message_window(
+        self,
+        db: Session,
+        *,
+        task_id: int,
+        limit: int,
+        before_message_id: Optional[int] = None,
+        after_message_id: Optional[int] = None,
+        max_message_id: Optional[int] = None,
+        owner_user_id: Optional[int] = None,
+    ) -> list[Subtask]:
+        query = db.query(Subtask.id).filter(Subtask.task_id == task_id)
+        query = self._filter_owner_user_id(query, owner_user_id=owner_user_id)
+        if before_message_id is not None:
+            query = query.filter(Subtask.message_id < before_message_id)
+        if after_message_id is not None:
+            query = query.filter(Subtask.message_id > after_message_id)
+        if max_message_id is not None:
+            query = query.filter(Subtask.message_id <= max_message_id)
+        rows = (
+            query.with_entities(Subtask.id, Subtask.message_id)
+            .order_by(
+                Subtask.message_id.desc(),
+                Subtask.created_at.desc(),
+                Subtask.id.desc(),
+            )
+            .limit(limit)
+            .all()
+        )
+        ids = [row[0] for row in rows][::-1]
+        if len(rows) == limit:
+            # Several subtasks can share a message_id. Finish the oldest
+            # message in the window so a message_id cursor never splits it.
+            boundary_query = db.query(Subtask.id).filter(
+                Subtask.task_id == task_id,
+                Subtask.message_id == rows[-1][1],
+                Subtask.id.notin_(ids),
+            )
+            boundary_query = self._filter_owner_user_id(
+                boundary_query, owner_user_id=owner_user_id
+            )
+            boundary_ids = [
+                row[0]
+                for row in boundary_query.order_by(
+                    Subtask.created_at.asc(), Subtask.id.asc()
+                ).all()
+            ]
+            ids = boundary_ids + ids
+        return self._load_ordered(db, ids)
+
     def list_recent_by_task_ids(
         self,
         db: Session,
@@ -1137,6 +1187,52 @@ class SqlAlchemySubtaskStore:
             )
         )
 
+    def list_results_missing_mask(
+        self,
+        db: Session,
+        *,
+        statuses: Sequence[SubtaskStatus],
+        mask_version: int,
+        limit: int,
+    ) -> list[tuple[int, Any]]:
+        rows = (
+            db.query(Subtask.id, Subtask.result)
+            .filter(
+                Subtask.status.in_(statuses),
+                Subtask.result_mask_version < mask_version,
+            )
+            .order_by(Subtask.id)
+            .limit(limit)
+            .all()
+        )
+        return [(row.id, row.result) for row in rows]
+
+    def store_masked_result(
+        self,
+        db: Session,
+        *,
+        subtask_id: int,
+        statuses: Sequence[SubtaskStatus],
+        mask_version: int,
+        masked_result: Any,
+    ) -> None:
+        # Leaves updated_at untouched and skips rows a concurrent write has
+        # changed since they were listed
+        db.execute(
+            update(Subtask)
+            .where(
+                Subtask.id == subtask_id,
+                Subtask.status.in_(statuses),
+                Subtask.result_mask_version < mask_version,
+            )
+            .values(
+                masked_result=masked_result,
+                result_mask_version=mask_version,
+                updated_at=Subtask.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
     def mark_executor_deleted_by_ids(
         self, db: Session, *, subtask_ids: Sequence[int]
     ) -> int:
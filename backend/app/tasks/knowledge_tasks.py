@@ -64,6 +64,36 @@ KNOWLEDGE_INDEX_LOCK_EXTEND_INTERVAL_SECONDS = (
 KNOWLEDGE_INDEX_LOCK_RETRY_DELAY_SECONDS = (
     settings.KNOWLEDGE_INDEX_LOCK_RETRY_DELAY_SECONDS
 )
+KNOWLEDGE_INDEX_LOCK_WAIT_SECONDS = settings.KNOWLEDGE_INDEX_LOCK_WAIT_SECONDS
+
+
+def _schedule_direct_injection_bundle_warm(knowledge_base_id: int) -> None:
+    """Schedule one delayed rebuild of the KB's direct-injection bundle.
+
+    Documents finishing while a warm-up is pending share it, so a bulk import
+    does not rebuild the whole bundle once per document.
+    """
+    if not settings.RAG_DIRECT_INJECTION_BUNDLE_ENABLED:
+        return
+
+    from app.services.rag.direct_injection_bundle import direct_injection_bundle_store
+
+    delay = settings.RAG_DIRECT_INJECTION_BUNDLE_WARM_DELAY_SECONDS
+    # The claim outlives the countdown in case the worker picks the task up late
+    if not direct_injection_bundle_store.claim_warm(
+        knowledge_base_id, ttl_seconds=delay * 2 + 60
+    ):
+        return
+    try:
+        warm_direct_injection_bundle_task.apply_async(
+            args=[knowledge_base_id], countdown=delay
+        )
+    except Exception as e:
+        direct_injection_bundle_store.release_warm(knowledge_base_id)
+        logger.warning(
+            f"[Celery RAG Indexing] Failed to schedule direct injection bundle "
+            f"warm-up for knowledge base {knowledge_base_id}: {e}"
+        )
 
 
 def _enqueue_document_summary_task(
@@ -180,6 +210,7 @@ def index_document_task(
         lock_name,
         expire_seconds=KNOWLEDGE_INDEX_LOCK_TIMEOUT_SECONDS,
         extend_interval_seconds=KNOWLEDGE_INDEX_LOCK_EXTEND_INTERVAL_SECONDS,
+        wait_seconds=KNOWLEDGE_INDEX_LOCK_WAIT_SECONDS,
     ) as acquired:
         if not acquired:
             if retry_count < self.max_retries:
@@ -321,6 +352,8 @@ def index_document_task(
                     "index_generation": index_generation,
                 }
 
+            _schedule_direct_injection_bundle_warm(int(knowledge_base_id))
+
             if trigger_summary:
                 try:
                     with SessionLocal() as summary_db:
@@ -532,6 +565,26 @@ def update_kb_summary_task(
         db.close()
 
 
+@celery_app.task(name="app.tasks.knowledge_tasks.warm_direct_injection_bundle")
+def warm_direct_injection_bundle_task(knowledge_base_id: int):
+    """Rebuild the direct-injection bundle of a knowledge base after indexing."""
+    from app.services.rag.direct_injection_bundle import direct_injection_bundle_store
+    from app.services.rag.retrieval_service import RetrievalService
+
+    # Documents finishing during the rebuild schedule the next warm-up
+    direct_injection_bundle_store.release_warm(knowledge_base_id)
+    try:
+        with SessionLocal() as db:
+            RetrievalService().warm_direct_injection_bundles(db, [knowledge_base_id])
+    except Exception as e:
+        logger.warning(
+            f"[Celery RAG Indexing] Failed to warm direct injection bundle "
+            f"for knowledge base {knowledge_base_id}: {e}"
+        )
+        return {"status": "failed", "knowledge_base_id": knowledge_base_id}
+    return {"status": "success", "knowledge_base_id": knowledge_base_id}
+
+
 @celery_app.task(name="app.tasks.knowledge_tasks.scan_stale_index_tasks")
 def scan_stale_index_tasks():
     """Scan all active indexing states and mark stale ones as FAILED.
@@ -0,0 +1,56 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Celery tasks for the stored masked projection of subtask results.
+
+The projection is written by SQLAlchemy mapper hooks, which also run in
+Celery workers. The periodic backfill stores it for finalized subtasks that
+have none yet: rows from before the projection existed, subtasks finalized by
+bulk status updates, and every row after MASKING_RULES_VERSION is bumped.
+"""
+
+import logging
+
+import celery.signals
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.distributed_lock import distributed_lock
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_LOCK_NAME = "subtask_result_masking:backfill"
+BACKFILL_LOCK_TIMEOUT = 30 * 60
+
+
+@celery.signals.worker_process_init.connect
+def _register_masking_hooks(**_kwargs) -> None:
+    from app.services.subtask_result_masking import subtask_result_masking_hooks
+
+    subtask_result_masking_hooks.register()
+
+
+@celery_app.task(name="app.tasks.subtask_result_tasks.backfill_masked_subtask_results")
+def backfill_masked_subtask_results():
+    """Store current masked projections for finalized subtasks lacking one."""
+    from app.services.subtask_result_masking import backfill_masked_results
+
+    if not distributed_lock.acquire(BACKFILL_LOCK_NAME, BACKFILL_LOCK_TIMEOUT):
+        logger.info("[SubtaskResultMasking] Backfill already running, skipping")
+        return {"status": "skipped"}
+
+    try:
+        with SessionLocal() as db:
+            updated = backfill_masked_results(
+                db,
+                batch_size=settings.SUBTASK_RESULT_MASK_BACKFILL_BATCH_SIZE,
+                max_batches=settings.SUBTASK_RESULT_MASK_BACKFILL_MAX_BATCHES,
+            )
+    finally:
+        distributed_lock.release(BACKFILL_LOCK_NAME)
+
+    if updated:
+        logger.info(f"[SubtaskResultMasking] Stored {updated} masked projection(s)")
+    return {"status": "ok", "updated": updated}
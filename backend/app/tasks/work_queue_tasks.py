@@ -0,0 +1,53 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Celery tasks for materialized work queue message counters.
+
+Counter deltas are published from SQLAlchemy commit hooks, which also run in
+Celery workers (inbox auto-processing and result writeback). The periodic
+reconciliation repairs any counter that drifted from the true database
+counts, e.g. after a Redis outage or a bulk update that bypassed the ORM.
+"""
+
+import logging
+
+import celery.signals
+
+from app.core.celery_app import celery_app
+from app.core.distributed_lock import distributed_lock
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_LOCK_NAME = "work_queue_counters:reconcile"
+RECONCILE_LOCK_TIMEOUT = 300
+
+
+@celery.signals.worker_process_init.connect
+def _register_counter_hooks(**_kwargs) -> None:
+    from app.services.work_queue_counter_hooks import work_queue_counter_hooks
+
+    work_queue_counter_hooks.register()
+
+
+@celery_app.task(name="app.tasks.work_queue_tasks.reconcile_work_queue_counters")
+def reconcile_work_queue_counters():
+    """Compare materialized queue/inbox counters with the database and repair drift."""
+    from app.services.work_queue_counters import work_queue_counter_store
+
+    if not distributed_lock.acquire(RECONCILE_LOCK_NAME, RECONCILE_LOCK_TIMEOUT):
+        logger.info("[WorkQueueCounters] Reconciliation already running, skipping")
+        return {"status": "skipped"}
+
+    try:
+        with SessionLocal() as db:
+            drift = work_queue_counter_store.reconcile(db)
+    finally:
+        distributed_lock.release(RECONCILE_LOCK_NAME)
+
+    if any(drift.values()):
+        logger.warning(f"[WorkQueueCounters] Repaired counter drift: {drift}")
+    else:
+        logger.info("[WorkQueueCounters] Reconciliation found no drift")
+    return {"status": "ok", "drift": drift}
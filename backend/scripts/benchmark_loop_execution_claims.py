@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark draining a device queue with claim_next_for_device.
+
+Seeds an in-memory SQLite database with queued executions for one device
+(spread over robots and priorities), then claims until the device capacity is
+full, once with the previous full-scan selection and once through the
+scheduler index. Prints the per-claim latency of both.
+
+Usage:
+    python scripts/benchmark_loop_execution_claims.py [--queued 50000] [--robots 200] [--capacity 100]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  (register every table on Base.metadata)
+from app.db.base import Base
+from app.models.loop_item_execution import LoopItemExecution
+from app.services.loop_item_executions import service as execution_service
+from app.services.loop_item_executions.service import (
+    PRIORITY_WEIGHTS,
+    STATUS_CLAIMED,
+    STATUS_QUEUED,
+    loop_item_execution_service,
+    runtime_task_id_for,
+    utcnow,
+)
+
+OWNER_USER_ID = 1
+DEVICE_ID = "bench-device"
+RUNTIME_INSTANCE_ID = "bench-runtime"
+
+
+def seed(queued: int, robots: int):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    weights = list(PRIORITY_WEIGHTS.values())
+    started = utcnow() - timedelta(days=1)
+    rows = [
+        {
+            "loop_item_id": f"item-{index}",
+            "executor_owner_user_id": OWNER_USER_ID,
+            "agent_id": f"robot-{index % robots}",
+            "execution_environment": "cloud",
+            "execution_device_id": DEVICE_ID,
+            "status": STATUS_QUEUED,
+            "priority_weight": weights[index % len(weights)],
+            "queued_at": started + timedelta(milliseconds=index),
+            "execution_scope": f"project_robot:item-{index}",
+            "error_message": "",
+            "execution_payload": "",
+        }
+        for index in range(queued)
+    ]
+    with engine.begin() as connection:
+        connection.execute(insert(LoopItemExecution), rows)
+    return sessionmaker(bind=engine)
+
+
+def legacy_claim(db, lease_seconds: int = 300):
+    """The selection claim_next_for_device used before the scheduler index."""
+
+    rows = (
+        db.query(LoopItemExecution)
+        .filter(
+            LoopItemExecution.execution_device_id == DEVICE_ID,
+            LoopItemExecution.execution_environment == "cloud",
+            LoopItemExecution.status == STATUS_QUEUED,
+            LoopItemExecution.executor_owner_user_id == OWNER_USER_ID,
+        )
+        .order_by(
+            LoopItemExecution.priority_weight.desc(),
+            LoopItemExecution.queued_at.asc(),
+            LoopItemExecution.id.asc(),
+        )
+        .all()
+    )
+    candidate = execution_service._fair_single_candidate(
+        rows,
+        occupied_scopes=execution_service._occupied_execution_scopes(db),
+        active_counts=execution_service._active_agent_counts(db),
+        limits=execution_service._agent_limits(
+            db, {row.agent_id for row in rows if row.agent_id}
+        ),
+    )
+    if candidate is None:
+        return None
+    now = utcnow()
+    db.query(LoopItemExecution).filter(
+        LoopItemExecution.id == candidate.id,
+        LoopItemExecution.status == STATUS_QUEUED,
+    ).update(
+        {
+            "status": STATUS_CLAIMED,
+            "claimed_at": now,
+            "lease_expires_at": now + timedelta(seconds=lease_seconds),
+            "runtime_instance_id": RUNTIME_INSTANCE_ID,
+            "runtime_task_id": runtime_task_id_for(candidate.id),
+        }
+    )
+    db.commit()
+    return candidate
+
+
+def indexed_claim(db):
+    return loop_item_execution_service.claim_next_for_device(
+        db,
+        execution_device_id=DEVICE_ID,
+        environment="cloud",
+        runtime_instance_id=RUNTIME_INSTANCE_ID,
+        device_capacity=10**9,
+        runtime_active=0,
+        runtime_active_task_ids=frozenset(),
+        owner_user_id=OWNER_USER_ID,
+    )
+
+
+def drain(session_factory, claim, capacity: int) -> tuple[list[int], float, float]:
+    """Claim `capacity` runs; return claimed ids, first claim and mean rest (ms)."""
+
+    claimed: list[int] = []
+    timings: list[float] = []
+    with session_factory() as db:
+        for _ in range(capacity):
+            started = time.perf_counter()
+            row = claim(db)
+            timings.append((time.perf_counter() - started) * 1000)
+            if row is None:
+                break
+            claimed.append(row.id)
+    rest = timings[1:] or timings
+    return claimed, timings[0], sum(rest) / len(rest)
+
+
+def main(queued: int, robots: int, capacity: int) -> None:
+    logging.disable(logging.WARNING)
+    print(f"{queued} queued runs, {robots} robots, draining {capacity} claims")
+    results = {}
+    for label, claim in (("full scan", legacy_claim), ("index", indexed_claim)):
+        execution_service.execution_scheduler_index.clear()
+        session_factory = seed(queued, robots)
+        claimed, first_ms, mean_ms = drain(session_factory, claim, capacity)
+        results[label] = claimed
+        print(
+            f"{label:<9}  claimed {len(claimed):>5}  first claim {first_ms:9.1f}ms"
+            f"  later claims {mean_ms:8.2f}ms each"
+        )
+    same = results["full scan"] == results["index"]
+    print(f"same claim order: {same}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queued", type=int, default=50000)
+    parser.add_argument("--robots", type=int, default=200)
+    parser.add_argument("--capacity", type=int, default=100)
+    args = parser.parse_args()
+    main(args.queued, args.robots, args.capacity)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark serial vs pooled text extraction of a long PDF.
+
+Builds a text-only PDF with the given number of pages, parses it once with
+the page pool disabled and once through a warmed PdfPagePool, and checks that
+both produce the same text.
+
+Usage:
+    python scripts/benchmark_pdf_page_pool.py [--pages 300] [--workers 4]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import settings
+from app.services.attachment import parser as parser_module
+from app.services.attachment.parser import DocumentParser
+from app.services.attachment.pdf_page_pool import PdfPagePool
+
+
+def build_text_pdf(page_count: int, lines_per_page: int = 40) -> bytes:
+    """Build a minimal multi-page PDF with extractable Helvetica text."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_refs = []
+    for page in range(page_count):
+        stream = "BT /F1 10 Tf 12 TL 40 800 Td " + " ".join(
+            f"(Page {page + 1} line {line + 1}: the quick brown fox jumps over) Tj T*"
+            for line in range(lines_per_page)
+        )
+        stream += " ET"
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream"
+            % (len(stream), stream.encode("latin-1"))
+        )
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        page_refs.append(len(objects))
+    kids = " ".join(f"{ref} 0 R" for ref in page_refs)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(out)
+
+
+def timed(fn):
+    started = time.perf_counter()
+    value = fn()
+    return value, time.perf_counter() - started
+
+
+def main(pages: int, workers: int) -> None:
+    pdf = build_text_pdf(pages)
+    parser = DocumentParser()
+    print(f"{pages}-page PDF, {len(pdf) / 1e6:.1f} MB")
+
+    settings.PDF_PARSE_POOL_WORKERS = 0
+    serial, serial_seconds = timed(lambda: parser.parse(pdf, ".pdf"))
+
+    settings.PDF_PARSE_POOL_WORKERS = workers
+    pool = PdfPagePool()
+    parser_module.pdf_page_pool = pool
+    try:
+        # Warm the pool so worker start-up is not counted per document
+        parser.parse(build_text_pdf(60, lines_per_page=1), ".pdf")
+        parallel, parallel_seconds = timed(lambda: parser.parse(pdf, ".pdf"))
+    finally:
+        pool.shutdown()
+
+    print(f"serial           {serial_seconds:9.2f}s")
+    print(f"pool({workers})          {parallel_seconds:9.2f}s")
+    print(f"speedup          {serial_seconds / parallel_seconds:9.1f}x")
+    print(f"identical output: {parallel.text == serial.text}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    main(args.pages, args.workers)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Measure the per-request overhead of the external MCP rate limiter.
+
+Replays a burst of transport checks (IP and token dimensions) against the
+Redis at REDIS_URL three ways: the previous fixed-window INCR/EXPIRE
+pipeline, the token-bucket script with one Redis call per check, and the
+token-bucket script with local token leases. Prints p50/p99 latency per
+check and the number of Redis round trips.
+
+Usage:
+    python scripts/benchmark_rate_limit.py [--requests 5000] [--limit 100000]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core import rate_limit
+from app.core.config import settings
+
+NAMESPACE = "benchmark"
+DIMENSIONS = ["ip:benchmark", "token:benchmark"]
+WINDOW_SECONDS = 60
+
+
+def legacy_fixed_window(client, limit: int) -> bool:
+    """The pipeline check_external_mcp_dimension_rate_limit used before."""
+
+    window = int(time.time() // WINDOW_SECONDS)
+    pipe = client.pipeline()
+    for dimension in DIMENSIONS:
+        key = f"external_kb_mcp:rate:{NAMESPACE}:{dimension}:{window}"
+        pipe.incr(key)
+        pipe.expire(key, WINDOW_SECONDS + 1)
+    counts = pipe.execute()[::2]
+    return all(count <= limit for count in counts)
+
+
+def token_bucket(limit: int) -> bool:
+    decision = rate_limit.check_external_mcp_dimension_rate_limit(
+        dimensions=DIMENSIONS,
+        namespace=NAMESPACE,
+        limit=limit,
+        window_seconds=WINDOW_SECONDS,
+    )
+    return decision.status == rate_limit.ExternalMcpRateLimitStatus.ALLOWED
+
+
+def measure(check: Callable[[], bool], requests: int) -> list[float]:
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        check()
+        latencies.append((time.perf_counter() - start) * 1_000_000)
+    return latencies
+
+
+def report(label: str, latencies: list[float], round_trips: int) -> None:
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    print(
+        f"{label:<28} p50 {statistics.median(latencies):8.1f}us"
+        f"  p99 {p99:8.1f}us  round trips {round_trips}"
+    )
+
+
+def count_round_trips(run: Callable[[], None]) -> int:
+    """Count the Redis calls the token-bucket limiter makes during ``run``."""
+
+    get_client = rate_limit._get_rate_limit_redis_client
+    calls = 0
+
+    def counting_get_client(**kwargs):
+        nonlocal calls
+        calls += 1
+        return get_client(**kwargs)
+
+    rate_limit._get_rate_limit_redis_client = counting_get_client
+    try:
+        run()
+    finally:
+        rate_limit._get_rate_limit_redis_client = get_client
+    return calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=100000)
+    args = parser.parse_args()
+
+    client = rate_limit._get_rate_limit_redis_client(require_global_enabled=False)
+    if client is None:
+        sys.exit(f"Redis at {settings.REDIS_URL} is not reachable")
+
+    def cleanup() -> None:
+        keys = list(client.scan_iter(f"external_kb_mcp:*:{NAMESPACE}:*"))
+        if keys:
+            client.delete(*keys)
+
+    cleanup()
+    results = {}
+
+    def run_bucket(label: str, lease_seconds: float) -> Callable[[], None]:
+        def run() -> None:
+            settings.RATE_LIMIT_LOCAL_LEASE_SECONDS = lease_seconds
+            rate_limit._local_token_leases.clear()
+            results[label] = measure(lambda: token_bucket(args.limit), args.requests)
+
+        return run
+
+    try:
+        print(f"{args.requests} checks of {len(DIMENSIONS)} dimensions each")
+        legacy = measure(lambda: legacy_fixed_window(client, args.limit), args.requests)
+        # One pipeline per check
+        report("fixed window pipeline", legacy, args.requests)
+        for label, lease_seconds in (
+            ("token bucket", 0.0),
+            ("token bucket + local lease", 1.0),
+        ):
+            round_trips = count_round_trips(run_bucket(label, lease_seconds))
+            report(label, results[label], round_trips)
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    main()
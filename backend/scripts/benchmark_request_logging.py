@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark RequestLoggingMiddleware throughput on a trivial endpoint.
+
+Runs in-process over an ASGI transport (no network, no database) and prints
+requests/sec with telemetry off and on. With telemetry on, spans are recorded
+by an SDK tracer provider without exporters and all body/header capture is
+enabled.
+
+Usage:
+    python scripts/benchmark_request_logging.py [--requests 5000] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx
+from fastapi import FastAPI
+
+from app.core import request_logging
+from app.core.request_logging import RequestLoggingMiddleware
+from shared.telemetry.config import get_otel_config
+
+
+def build_app(telemetry: bool):
+    app = FastAPI()
+
+    @app.get("/api/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.post("/api/echo")
+    async def echo(payload: dict):
+        return payload
+
+    otel_config = replace(
+        get_otel_config("wegent-backend-benchmark"),
+        enabled=telemetry,
+        capture_request_body=telemetry,
+        capture_response_headers=telemetry,
+        capture_response_body=telemetry,
+    )
+    app.add_middleware(RequestLoggingMiddleware, otel_config=otel_config)
+    if not telemetry:
+        return app
+
+    from opentelemetry.instrumentation.asgi import OpenTelemetryMiddleware
+    from opentelemetry.sdk.trace import TracerProvider
+
+    return OpenTelemetryMiddleware(app, tracer_provider=TracerProvider())
+
+
+async def run(app, method: str, path: str, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    body = {"task_id": 1, "subtask_id": 2, "message": "x" * 512}
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        remaining = iter(range(total))
+
+        async def worker():
+            for _ in remaining:
+                if method == "GET":
+                    response = await client.get(path)
+                else:
+                    response = await client.post(path, json=body)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - started)
+
+
+async def main(total: int, concurrency: int) -> None:
+    # Access log lines are not what is being measured
+    logging.getLogger(request_logging.__name__).setLevel(logging.WARNING)
+    for telemetry in (False, True):
+        request_logging.is_telemetry_enabled = lambda: telemetry
+        app = build_app(telemetry)
+        label = "on " if telemetry else "off"
+        for method, path in (("GET", "/api/ping"), ("POST", "/api/echo")):
+            await run(app, method, path, min(total, 200), concurrency)  # warm up
+            rate = await run(app, method, path, total, concurrency)
+            print(f"telemetry {label} {method:<4} {path:<10} {rate:10.1f} req/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark masking sensitive data in large subtask results.
+
+Builds a task page of subtasks whose results carry long tool transcripts (a
+few of them leaking a token), then serializes it three ways: running every
+masking pattern over every string, with the anchor prefilter, and a second
+time through the per-version memo of SubtaskInDB. Checks that the prefilter
+produces identical output.
+
+Usage:
+    python scripts/benchmark_sensitive_data_masking.py [--subtasks 50] [--blocks 40] [--lines 60]
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.schemas import subtask as subtask_schema
+from app.schemas.subtask import SubtaskInDB, SubtaskRole, SubtaskStatus
+from shared.utils.sensitive_data_masker import SensitiveDataMasker
+
+WORDS = (
+    "the build failed because import path src main test value result error "
+    "function return class self file module package version config token"
+).split()
+
+
+def transcript(rng: random.Random, lines: int, leak: bool) -> str:
+    text = "\n".join(
+        " ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(lines)
+    )
+    if leak:
+        text += "\nexport GH_TOKEN=ghp_" + "x" * 36
+    return text
+
+
+def build_results(subtasks: int, blocks: int, lines: int) -> list[dict]:
+    rng = random.Random(0)
+    return [
+        {
+            "value": transcript(rng, lines * 4, leak=False),
+            "blocks": [
+                {
+                    "type": "tool",
+                    "tool_name": "bash",
+                    "input": {"command": "pytest -q tests/"},
+                    "output": transcript(rng, lines, leak=index % 25 == 0),
+                }
+                for index in range(blocks)
+            ],
+        }
+        for _ in range(subtasks)
+    ]
+
+
+def page(results: list[dict]) -> list[SubtaskInDB]:
+    updated_at = datetime(2026, 1, 1, 12, 0, 0)
+    return [
+        SubtaskInDB(
+            id=index + 1,
+            user_id=1,
+            task_id=1,
+            team_id=1,
+            title="bench",
+            role=SubtaskRole.ASSISTANT,
+            status=SubtaskStatus.COMPLETED,
+            created_at=updated_at,
+            updated_at=updated_at,
+            result=result,
+        )
+        for index, result in enumerate(results)
+    ]
+
+
+def timed(fn):
+    started = time.perf_counter()
+    value = fn()
+    return value, (time.perf_counter() - started) * 1000
+
+
+def main(subtasks: int, blocks: int, lines: int) -> None:
+    results = build_results(subtasks, blocks, lines)
+    size = sum(len(block["output"]) for r in results for block in r["blocks"])
+    size += sum(len(r["value"]) for r in results)
+    print(f"{subtasks} subtasks, {blocks} tool blocks each, {size / 1e6:.1f} MB")
+
+    sequential = SensitiveDataMasker()
+    sequential._prefilter = None
+    prefiltered = SensitiveDataMasker()
+
+    expected, sequential_ms = timed(lambda: [sequential.mask_any(r) for r in results])
+    actual, prefilter_ms = timed(lambda: [prefiltered.mask_any(r) for r in results])
+    print(f"every pattern    {sequential_ms:9.1f}ms")
+    print(f"prefilter        {prefilter_ms:9.1f}ms")
+    print(f"identical output: {expected == actual}")
+
+    subtask_schema._masked_result_cache.clear()
+    _, cold_ms = timed(lambda: [s.model_dump() for s in page(results)])
+    _, warm_ms = timed(lambda: [s.model_dump() for s in page(results)])
+    print(f"page dump, cold  {cold_ms:9.1f}ms")
+    print(f"page dump, memo  {warm_ms:9.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subtasks", type=int, default=50)
+    parser.add_argument("--blocks", type=int, default=40)
+    parser.add_argument("--lines", type=int, default=60)
+    args = parser.parse_args()
+    main(args.subtasks, args.blocks, args.lines)
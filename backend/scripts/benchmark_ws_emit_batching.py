@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Count Socket.IO publishes for a group-chat burst with and without batching.
+
+Replays a burst typical of a group chat turn (tool block updates to the task
+room, task status and unread counts to each member's user room) through
+WebPageSocketEmitter against a recording server, so every ``sio.emit`` stands
+for one Redis publish through AsyncRedisManager.
+
+Usage:
+    python scripts/benchmark_ws_emit_batching.py [--members 8] [--blocks 20]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import settings
+from app.services.chat.webpage_ws_chat_emitter import WebPageSocketEmitter
+
+
+class RecordingServer:
+    def __init__(self) -> None:
+        self.publishes = 0
+
+    async def emit(self, *args, **kwargs) -> None:
+        self.publishes += 1
+
+
+async def replay(window_ms: int, members: int, blocks: int) -> tuple[int, int]:
+    settings.WS_EMIT_BATCH_WINDOW_MS = window_ms
+    server = RecordingServer()
+    emitter = WebPageSocketEmitter(server)
+    task_id = 1
+    events = 0
+
+    await emitter.emit_chat_start(task_id, subtask_id=10)
+    events += 1
+    for block in range(blocks):
+        await emitter.emit_block_updated(
+            task_id, subtask_id=10, block_id=f"tool-{block}", status="running"
+        )
+        await emitter.emit_block_updated(
+            task_id, subtask_id=10, block_id=f"tool-{block}", status="done"
+        )
+        events += 2
+    for user_id in range(members):
+        await emitter.emit_task_status(user_id, task_id, "RUNNING", progress=50)
+        await emitter.emit_unread_count(user_id, 1)
+        await emitter.emit_task_status(user_id, task_id, "COMPLETED", progress=100)
+        await emitter.emit_unread_count(user_id, 2)
+        events += 4
+    await emitter.emit_chat_done(task_id, subtask_id=10, offset=0)
+    events += 1
+
+    await emitter._batcher.flush_all()
+    return events, server.publishes
+
+
+async def main(members: int, blocks: int) -> None:
+    for label, window_ms in (("off", 0), ("on ", 20)):
+        events, publishes = await replay(window_ms, members, blocks)
+        print(f"batching {label} events={events:4d} publishes={publishes:4d}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=8)
+    parser.add_argument("--blocks", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.members, args.blocks))
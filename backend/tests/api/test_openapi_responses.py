@@ -30,31 +30,29 @@ from app.models.share_link import ResourceType
 from app.models.subtask import SenderType, Subtask, SubtaskRole, SubtaskStatus
 from app.models.task import TaskResource
 from app.models.user import User
+from app.services.chat.storage.event_bus import StreamEvent
 
 
 @pytest.mark.asyncio
 async def test_callback_event_stream_waits_for_executor_terminal_event():
     messages = [
         None,
-        {
-            "type": "message",
-            "data": json.dumps(
-                {"type": "block_created", "task_id": 1, "subtask_id": 2}
-            ),
-        },
+        StreamEvent(
+            "1-0",
+            json.dumps({"type": "block_created", "task_id": 1, "subtask_id": 2}),
+        ),
         None,
-        {
-            "type": "message",
-            "data": json.dumps({"type": "done", "task_id": 1, "subtask_id": 2}),
-        },
+        StreamEvent("2-0", json.dumps({"type": "done", "task_id": 1, "subtask_id": 2})),
     ]
-    pubsub = AsyncMock()
-    pubsub.get_message = AsyncMock(side_effect=messages)
+    subscription = AsyncMock()
+    subscription.get = AsyncMock(side_effect=messages)
 
-    events = [event async for event in _iter_callback_events(pubsub, asyncio.Event())]
+    events = [
+        event async for event in _iter_callback_events(subscription, asyncio.Event())
+    ]
 
     assert [event.type for event in events] == ["block_created", "done"]
-    assert pubsub.get_message.await_count == 4
+    assert subscription.get.await_count == 4
 
 
 @pytest.fixture
@@ -0,0 +1,205 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.api.ws import chat_namespace
+from app.api.ws.chat_namespace import ChatNamespace
+from app.models.subtask import SubtaskRole, SubtaskStatus
+from app.services.task_fork_history import (
+    ForkHistoryItem,
+    ForkLineageNode,
+    trim_to_message_groups,
+)
+
+
+@contextmanager
+def _db_session():
+    yield SimpleNamespace()
+
+
+def _subtask(
+    message_id: int,
+    *,
+    task_id: int = 2,
+    value: str = "world",
+    subtask_id: int | None = None,
+):
+    return SimpleNamespace(
+        id=subtask_id or 100 + message_id,
+        task_id=task_id,
+        user_id=7,
+        role=SubtaskRole.ASSISTANT,
+        status=SubtaskStatus.COMPLETED,
+        message_id=message_id,
+        prompt=None,
+        result={"value": value, "blocks": [{"output": value}]},
+        progress=100,
+        created_at=None,
+        updated_at=None,
+        completed_at=None,
+    )
+
+
+@pytest.fixture
+def history_stubs(monkeypatch):
+    monkeypatch.setattr(chat_namespace, "get_db_session", _db_session)
+    monkeypatch.setattr(
+        "app.services.context.context_service.get_briefs_by_subtask",
+        lambda db, subtask_id: [],
+    )
+    monkeypatch.setattr(chat_namespace.settings, "TASK_JOIN_WINDOW_MAX_MESSAGES", 3)
+    monkeypatch.setattr(chat_namespace.settings, "TASK_JOIN_RESULT_PREVIEW_CHARS", 8)
+
+
+def _resolver(monkeypatch, messages: list, calls: list):
+    def resolve_for_task(db, *, task_id, user_id, before_message_id=None, limit=None):
+        calls.append((before_message_id, limit))
+        items = [
+            ForkHistoryItem(
+                _subtask(message_id, subtask_id=index), False, task_id, index
+            )
+            for index, message_id in enumerate(messages, start=1)
+            if before_message_id is None or message_id < before_message_id
+        ]
+        return trim_to_message_groups(items, limit)
+
+    monkeypatch.setattr(
+        chat_namespace,
+        "task_fork_history_resolver",
+        SimpleNamespace(resolve_for_task=resolve_for_task),
+    )
+
+
+def test_subtask_window_returns_latest_messages_and_cursor(monkeypatch, history_stubs):
+    calls = []
+    _resolver(monkeypatch, list(range(1, 9)), calls)
+
+    window = chat_namespace._fetch_subtask_window(2, 7, 50, None)
+    page = chat_namespace._fetch_subtask_window(2, 7, 3, 3)
+
+    # The requested window is capped and one message below it probes for more
+    assert calls == [(None, 3), (6, 1), (3, 3), (1, 1)]
+    assert [subtask["message_id"] for subtask in window["subtasks"]] == [6, 7, 8]
+    assert window["history_cursor"] == 6
+    assert [subtask["message_id"] for subtask in page["subtasks"]] == [1, 2]
+    assert page["history_cursor"] is None
+
+
+def test_subtask_window_never_splits_a_message(monkeypatch, history_stubs):
+    _resolver(monkeypatch, [1, 2, 3, 3, 3, 4], [])
+
+    window = chat_namespace._fetch_subtask_window(2, 7, 2, None)
+    page = chat_namespace._fetch_subtask_window(2, 7, 2, window["history_cursor"])
+
+    # Message 3 has three subtasks; the page grows to hold all of them
+    assert [subtask["id"] for subtask in window["subtasks"]] == [3, 4, 5, 6]
+    assert window["history_cursor"] == 3
+    assert [subtask["id"] for subtask in page["subtasks"]] == [1, 2]
+    assert page["history_cursor"] is None
+
+
+def test_subtask_window_trims_large_results(monkeypatch, history_stubs):
+    monkeypatch.setattr(
+        chat_namespace,
+        "task_fork_history_resolver",
+        SimpleNamespace(
+            resolve_for_task=lambda db, **kwargs: [
+                ForkHistoryItem(_subtask(1, value="short"), False, 2, 101),
+                ForkHistoryItem(_subtask(2, value="a long tool log"), False, 2, 102),
+            ]
+        ),
+    )
+
+    short, long = chat_namespace._fetch_subtask_window(2, 7, 3, None)["subtasks"]
+
+    assert short["result"] == {"value": "short", "blocks": [{"output": "short"}]}
+    assert short["result_truncated"] is False
+    assert long["result"] == {"value": "a long t", "blocks": [{"output": "a long t"}]}
+    assert long["result_truncated"] is True
+
+
+def test_expanded_subtask_must_be_inside_fork_history(monkeypatch, history_stubs):
+    lineage = [
+        ForkLineageNode(task=SimpleNamespace(id=1), inherited_cutoff=4),
+        ForkLineageNode(task=SimpleNamespace(id=2), inherited_cutoff=None),
+    ]
+    subtasks = {
+        101: _subtask(3, task_id=1, value="a long tool log"),
+        102: _subtask(5, task_id=1),
+        103: _subtask(6, task_id=9),
+    }
+    monkeypatch.setattr(
+        chat_namespace,
+        "task_fork_history_resolver",
+        SimpleNamespace(resolve_lineage=lambda db, *, task_id, user_id: lineage),
+    )
+    monkeypatch.setattr(
+        chat_namespace.task_stores.subtask_store,
+        "get_by_id",
+        lambda db, *, subtask_id: subtasks.get(subtask_id),
+    )
+
+    expanded = chat_namespace._fetch_expanded_subtask(2, 7, 101)
+
+    assert expanded["result"]["value"] == "a long tool log"
+    assert "result_truncated" not in expanded
+    # Past the fork point, from an unrelated task, or missing
+    assert chat_namespace._fetch_expanded_subtask(2, 7, 102) is None
+    assert chat_namespace._fetch_expanded_subtask(2, 7, 103) is None
+    assert chat_namespace._fetch_expanded_subtask(2, 7, 104) is None
+
+
+@pytest.mark.asyncio
+async def test_task_join_with_window_returns_history_cursor() -> None:
+    namespace = ChatNamespace()
+    namespace.get_session = AsyncMock(return_value={"user_id": 1})
+    namespace._check_token_expiry = AsyncMock(return_value=False)
+    namespace.enter_room = AsyncMock()
+    run_sync = AsyncMock(return_value={"subtasks": [{"id": 1}], "history_cursor": 9})
+
+    with (
+        patch(
+            "app.api.ws.chat_namespace.can_access_task", AsyncMock(return_value=True)
+        ),
+        patch("app.api.ws.chat_namespace.run_sync_in_executor", run_sync),
+        patch(
+            "app.api.ws.chat_namespace.get_active_streaming",
+            AsyncMock(return_value=None),
+        ),
+    ):
+        result = await namespace.on_task_join("sid-1", {"task_id": 101, "window": 20})
+
+    run_sync.assert_awaited_once_with(
+        chat_namespace._fetch_subtask_window, 101, 1, 20, None
+    )
+    assert result == {
+        "streaming": None,
+        "subtasks": [{"id": 1}],
+        "history_cursor": 9,
+    }
+
+
+@pytest.mark.asyncio
+async def test_history_page_checks_task_access() -> None:
+    namespace = ChatNamespace()
+    namespace.get_session = AsyncMock(return_value={"user_id": 1})
+    run_sync = AsyncMock()
+
+    with (
+        patch(
+            "app.api.ws.chat_namespace.can_access_task", AsyncMock(return_value=False)
+        ),
+        patch("app.api.ws.chat_namespace.run_sync_in_executor", run_sync),
+    ):
+        result = await namespace.on_history_page(
+            "sid-1", {"task_id": 101, "before_message_id": 9}
+        )
+
+    assert result == {"error": "Access denied"}
+    run_sync.assert_not_awaited()
@@ -31,6 +31,13 @@ class _MemoryDeviceCache:
         self.values[key] = copy.deepcopy(value)
         return True
 
+    async def set_many(
+        self, items: dict[str, dict], expire: int | None = None
+    ) -> dict[str, bool]:
+        for key, value in items.items():
+            self.values[key] = copy.deepcopy(value)
+        return {key: True for key in items}
+
     async def mget(self, keys: list[str]) -> dict[str, dict]:
         return {
             key: copy.deepcopy(self.values[key]) for key in keys if key in self.values
@@ -107,6 +114,8 @@ def _patch_namespace(monkeypatch, namespace: DeviceNamespace, session: dict) ->
         "_sync_global_capabilities_to_registered_device",
         AsyncMock(),
     )
+    # Re-listing runtime work goes through the runtime RPC route
+    monkeypatch.setattr(namespace, "_refresh_runtime_work_snapshot", AsyncMock())
     monkeypatch.setattr(namespace, "_match_cloud_device", AsyncMock(return_value=None))
     monkeypatch.setattr(
         device_namespace,
@@ -210,6 +219,7 @@ async def test_remote_heartbeat_runtime_features_reach_provider_projection(
             "runtime_features": runtime_features,
         },
     )
+    await namespace._heartbeats.flush()
     devices = await RemoteDeviceProvider().list_devices(test_db, test_user.id)
 
     assert registered == {"success": True, "device_id": device_id}
@@ -257,6 +267,7 @@ async def test_malformed_runtime_features_do_not_block_registration_or_heartbeat
             "runtime_features": {"schemaVersion": "invalid"},
         },
     )
+    await namespace._heartbeats.flush()
     devices = await RemoteDeviceProvider().list_devices(test_db, test_user.id)
 
     assert registered == {"success": True, "device_id": device_id}
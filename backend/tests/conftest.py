@@ -120,6 +120,26 @@ def fake_im_session_cache(monkeypatch: pytest.MonkeyPatch) -> FakeIMSessionCache
     return cache
 
 
+@pytest.fixture(autouse=True)
+def reset_outbound_http_breakers() -> None:
+    """Keep failures recorded by one test from opening circuits for the next."""
+
+    from app.core.circuit_breaker import _dynamic_breakers
+
+    for breaker in _dynamic_breakers.values():
+        if breaker.current_state != "closed" or breaker.fail_counter:
+            breaker.close()
+
+
+@pytest.fixture(autouse=True)
+def reset_execution_scheduler_index() -> None:
+    """Keep indexed queue entries from leaking between rolled-back tests."""
+
+    from app.services.loop_item_executions.service import execution_scheduler_index
+
+    execution_scheduler_index.clear()
+
+
 @pytest.fixture(autouse=True)
 def test_sensitive_data_crypto_env(
     monkeypatch: pytest.MonkeyPatch,
@@ -0,0 +1,263 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for fenced distributed locks, release wakeups and shared renewal."""
+
+import queue
+import threading
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core import distributed_lock as lock_module
+from app.core.distributed_lock import (
+    ACQUIRE_SCRIPT,
+    EXTEND_SCRIPT,
+    RELEASE_SCRIPT,
+    DistributedLock,
+    _lock_metric_name,
+)
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class FakePubSub:
+    def __init__(self, redis: "FakeRedis"):
+        self._redis = redis
+        self._messages: queue.Queue = queue.Queue()
+        self._channels: list[str] = []
+
+    def subscribe(self, channel: str) -> None:
+        self._channels.append(channel)
+        self._redis.subscribers.setdefault(channel, []).append(self)
+
+    def get_message(self, timeout: float = 0):
+        try:
+            return self._messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        for channel in self._channels:
+            self._redis.subscribers[channel].remove(self)
+
+
+class FakeRedis:
+    """Emulates the lock scripts on an in-memory store with expiry."""
+
+    def __init__(self):
+        self.values: dict[str, str] = {}
+        self.expires_at: dict[str, float] = {}
+        self.fence = 0
+        self.subscribers: dict[str, list[FakePubSub]] = {}
+        self._lock = threading.Lock()
+
+    def register_script(self, text: str):
+        handlers = {
+            ACQUIRE_SCRIPT: self._acquire,
+            RELEASE_SCRIPT: self._release,
+            EXTEND_SCRIPT: self._extend,
+        }
+        handler = handlers[text]
+
+        def script(keys, args):
+            with self._lock:
+                self._expire()
+                return handler(keys, args)
+
+        return script
+
+    def pubsub(self, ignore_subscribe_messages: bool = False) -> FakePubSub:
+        return FakePubSub(self)
+
+    def exists(self, key: str) -> int:
+        self._expire()
+        return int(key in self.values)
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for key, expires_at in list(self.expires_at.items()):
+            if expires_at <= now:
+                self.values.pop(key, None)
+                self.expires_at.pop(key)
+
+    def _acquire(self, keys, args):
+        key, _ = keys
+        if key in self.values:
+            return [0, int((self.expires_at[key] - time.monotonic()) * 1000)]
+        self.fence += 1
+        self.values[key] = f"{self.fence}:{args[0]}"
+        self.expires_at[key] = time.monotonic() + int(args[1]) / 1000
+        return [self.fence, 0]
+
+    def _release(self, keys, args):
+        if self.values.get(keys[0]) != args[0]:
+            return 0
+        del self.values[keys[0]]
+        del self.expires_at[keys[0]]
+        for subscriber in self.subscribers.get(args[1], []):
+            subscriber._messages.put({"type": "message", "data": args[0]})
+        return 1
+
+    def _extend(self, keys, args):
+        if self.values.get(keys[0]) != args[0]:
+            return 0
+        self.expires_at[keys[0]] = time.monotonic() + int(args[1]) / 1000
+        return 1
+
+
+class FakeAsyncRedis:
+    """Async facade over FakeRedis, as used by the shared renewer."""
+
+    def __init__(self, redis: FakeRedis):
+        self._redis = redis
+
+    def register_script(self, text: str):
+        script = self._redis.register_script(text)
+
+        async def run(keys, args):
+            return script(keys=keys, args=args)
+
+        return run
+
+
+@pytest.fixture
+def fake_redis() -> FakeRedis:
+    return FakeRedis()
+
+
+@pytest.fixture
+def lock(fake_redis: FakeRedis) -> DistributedLock:
+    lock = DistributedLock()
+    lock._redis_client = fake_redis
+    lock._async_redis_client = FakeAsyncRedis(fake_redis)
+    return lock
+
+
+def test_leases_carry_increasing_fences_and_stale_owners_cannot_release(
+    lock: DistributedLock, fake_redis: FakeRedis
+) -> None:
+    first = lock.acquire_lease("fence_test", expire_seconds=30)
+    assert first is not None and first.fence == 1
+    assert lock.acquire_lease("fence_test", expire_seconds=30) is None
+
+    # The first holder's lock expires and someone else takes it over
+    fake_redis.expires_at[first.key] = time.monotonic()
+    second = lock.acquire_lease("fence_test", expire_seconds=30)
+    assert second is not None and second.fence > first.fence
+
+    assert lock.extend_lease(first, 30) is False
+    assert first.lost is True
+    assert lock.release_lease(first) is False
+    assert lock.is_locked("fence_test") is True
+    assert lock.release_lease(second) is True
+    assert lock.is_locked("fence_test") is False
+
+
+def test_acquire_and_release_by_name_use_the_owner_token(
+    lock: DistributedLock,
+) -> None:
+    assert lock.acquire("named_lock", expire_seconds=30) is True
+    assert lock.acquire("named_lock", expire_seconds=30) is False
+    assert lock.extend("named_lock", expire_seconds=60) is True
+    assert lock.release("named_lock") is True
+    assert lock.release("named_lock") is False
+
+    with lock.acquire_context("named_lock", expire_seconds=30) as acquired:
+        assert acquired is True
+        assert lock.extend("named_lock", expire_seconds=60) is True
+    assert lock.extend("named_lock", expire_seconds=60) is False
+
+
+def test_waiter_is_woken_by_release_and_metrics_are_recorded(
+    lock: DistributedLock,
+) -> None:
+    acquired_before = _sample(
+        "distributed_lock_acquire_total", lock="wake_test", result="acquired"
+    )
+    holder = lock.acquire_lease("wake_test", expire_seconds=60)
+    threading.Timer(0.1, lock.release_lease, args=[holder]).start()
+
+    started_at = time.monotonic()
+    with lock.acquire_lease_context("wake_test", 60, wait_seconds=10) as lease:
+        waited = time.monotonic() - started_at
+        assert lease is not None and lease.fence > holder.fence
+
+    # Woken by the release, not by the holder's 60s expiry or the wait timeout
+    assert waited < 5
+    assert (
+        _sample("distributed_lock_acquire_total", lock="wake_test", result="acquired")
+        == acquired_before + 2
+    )
+    assert _sample("distributed_lock_wait_seconds_sum", lock="wake_test") >= 0.1
+    assert _sample("distributed_lock_hold_seconds_count", lock="wake_test") >= 2
+
+
+def test_contended_acquire_gives_up_after_wait(lock: DistributedLock) -> None:
+    lock.acquire_lease("contended_test", expire_seconds=60)
+    contended_before = _sample(
+        "distributed_lock_acquire_total", lock="contended_test", result="contended"
+    )
+
+    with lock.acquire_context("contended_test", 60, wait_seconds=0.2) as acquired:
+        assert acquired is False
+
+    assert (
+        _sample(
+            "distributed_lock_acquire_total", lock="contended_test", result="contended"
+        )
+        == contended_before + 1
+    )
+
+
+def test_watchdog_renews_leases_and_marks_lost_ones(
+    lock: DistributedLock, fake_redis: FakeRedis, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(
+        lock_module.AsyncRedis,
+        "from_url",
+        lambda *args, **kwargs: FakeAsyncRedis(fake_redis),
+    )
+    lost_before = _sample("distributed_lock_lost_total", lock="renew_test")
+
+    lease = lock.acquire_lease("renew_test", expire_seconds=2)
+    lock._renewer.watch(lease, 0.05)
+    time.sleep(0.3)
+    # Renewed well past the original two-second expiry window
+    assert fake_redis.expires_at[lease.key] - time.monotonic() > 1.8
+    assert lease.lost is False
+
+    fake_redis.values[lease.key] = "9:someone-else"
+    deadline = time.monotonic() + 2
+    while not lease.lost and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    assert lease.lost is True
+    assert _sample("distributed_lock_lost_total", lock="renew_test") == lost_before + 1
+
+
+@pytest.mark.asyncio
+async def test_async_release_requires_ownership(lock: DistributedLock) -> None:
+    lease = await lock.acquire_lease_async("async_test", expire_seconds=30)
+    assert lease is not None
+    assert await lock.acquire_async("async_test", expire_seconds=30) is False
+
+    stale = type(lease)(name=lease.name, token="0:stale", fence=0, expire_seconds=30)
+    assert await lock.release_lease_async(stale) is False
+    assert await lock.release_lease_async(lease) is True
+
+
+def test_lock_without_redis_fails_open(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(lock_module, "_redis_url", lambda: None)
+
+    with DistributedLock().acquire_lease_context("no_redis", 30) as lease:
+        assert lease is not None and lease.fence is None
+
+
+def test_metric_names_collapse_ids() -> None:
+    assert _lock_metric_name("robot_exec:42:runtime:7") == "robot_exec:*:runtime:*"
+    assert _lock_metric_name("check_due_subscriptions") == "check_due_subscriptions"
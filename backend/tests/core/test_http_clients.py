@@ -0,0 +1,153 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the managed outbound HTTP client registry."""
+
+import asyncio
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+from pytest_httpx import HTTPXMock
+
+from app.core.circuit_breaker import CircuitBreakerOpenError
+from app.core.config import settings
+from app.core.http_clients import HttpClientRegistry, HttpTarget, _metric_hooks
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_targets_share_a_pooled_client_until_closed() -> None:
+    registry = HttpClientRegistry()
+    registry.register(HttpTarget(name="pool-a", timeout=12.0, connect_timeout=3.0))
+    registry.register(HttpTarget(name="pool-b"))
+
+    client = registry.client("pool-a")
+    assert registry.client("pool-a") is client
+    assert registry.client("pool-b") is not client
+    assert client.timeout.read == 12.0
+    assert client.timeout.connect == 3.0
+    with pytest.raises(ValueError, match="Unknown outbound HTTP target"):
+        registry.client("missing")
+
+    await registry.aclose()
+    assert client.is_closed
+    assert registry.client("pool-a") is not client
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_request_records_latency_and_requests(httpx_mock: HTTPXMock) -> None:
+    url = "http://runtime.test/internal/rag/query"
+    httpx_mock.add_response(url=url, json={"records": []})
+    registry = HttpClientRegistry()
+    registry.register(HttpTarget(name="metrics-target"))
+    requests_before = _sample("outbound_http_requests_total", target="metrics-target")
+
+    response = await registry.request("metrics-target", "POST", url, json={})
+
+    assert response.json() == {"records": []}
+    assert (
+        _sample("outbound_http_requests_total", target="metrics-target")
+        == requests_before + 1
+    )
+    assert (
+        _sample(
+            "outbound_http_request_duration_seconds_count",
+            target="metrics-target",
+            method="POST",
+            status_class="2xx",
+        )
+        == 1
+    )
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_new_connections_are_counted_through_the_trace_extension() -> None:
+    on_request = _metric_hooks("trace-target")["request"][0]
+    request = httpx.Request("GET", "http://runtime.test/")
+
+    await on_request(request)
+    trace = request.extensions["trace"]
+    await trace("connection.connect_tcp.complete", {})
+    await trace("http11.send_request_headers.complete", {})
+
+    assert _sample("outbound_http_connections_opened_total", target="trace-target") == 1
+
+
+@pytest.mark.asyncio
+async def test_server_errors_open_the_target_circuit(
+    httpx_mock: HTTPXMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_FAIL_MAX", 2)
+    url = "http://runtime.test/internal/rag/index"
+    httpx_mock.add_response(url=url, status_code=503, is_reusable=True)
+    registry = HttpClientRegistry()
+    registry.register(HttpTarget(name="breaker-target", circuit_breaker=True))
+
+    first = await registry.request("breaker-target", "POST", url)
+    second = await registry.request("breaker-target", "POST", url)
+    assert (first.status_code, second.status_code) == (503, 503)
+
+    with pytest.raises(CircuitBreakerOpenError):
+        await registry.request("breaker-target", "POST", url)
+    assert len(httpx_mock.get_requests()) == 2
+    await registry.aclose()
+
+
+def test_clients_are_kept_per_event_loop() -> None:
+    registry = HttpClientRegistry()
+    registry.register(HttpTarget(name="loop-target"))
+
+    async def use() -> httpx.AsyncClient:
+        client = registry.client("loop-target")
+        assert registry.client("loop-target") is client
+        return client
+
+    async def use_and_close() -> httpx.AsyncClient:
+        client = await use()
+        await registry.aclose()
+        return client
+
+    main_loop = asyncio.new_event_loop()
+    try:
+        main_client = main_loop.run_until_complete(use())
+        # A private loop gets its own client and closes it before exiting
+        scoped_client = asyncio.run(use_and_close())
+        assert scoped_client is not main_client
+        assert scoped_client.is_closed
+
+        # The main loop's pooled client survives the other loop's calls
+        assert not main_client.is_closed
+        assert main_loop.run_until_complete(use()) is main_client
+        main_loop.run_until_complete(registry.aclose())
+        assert main_client.is_closed
+    finally:
+        main_loop.close()
+    assert len(registry._clients) == 0
+
+
+def test_sync_wrapper_loops_close_their_clients(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from app.services.knowledge import knowledge_service
+
+    registry = HttpClientRegistry()
+    registry.register(HttpTarget(name="wrapper-target"))
+    monkeypatch.setattr(knowledge_service, "http_clients", registry)
+    clients = []
+
+    async def call() -> None:
+        clients.append(registry.client("wrapper-target"))
+
+    for _ in range(2):
+        knowledge_service._run_async_in_new_loop(call())
+
+    assert clients[0] is not clients[1]
+    assert all(client.is_closed for client in clients)
+    assert len(registry._clients) == 0
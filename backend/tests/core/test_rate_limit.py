@@ -7,37 +7,47 @@
 from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
+import pytest
 from starlette.requests import Request
 
 from app.core import rate_limit
 from app.core.config import settings
 
 
-class FakePipeline:
-    def __init__(self, counts):
-        self.counts = counts
-        self.keys = []
+class FakeScript:
+    """Stands in for the token bucket script; returns canned results."""
 
-    def incr(self, key):
-        self.keys.append(key)
-        return self
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = []
 
-    def expire(self, key, ttl):
-        return self
+    def __call__(self, keys, args):
+        self.calls.append((keys, args))
+        if len(self.results) > 1:
+            return self.results.pop(0)
+        return self.results[0]
 
-    def execute(self):
-        results = []
-        for count in self.counts:
-            results.extend([count, True])
-        return results
+    @property
+    def keys(self):
+        return [key for keys, _ in self.calls for key in keys]
 
 
 class FakeRedis:
-    def __init__(self, counts):
-        self.pipeline_instance = FakePipeline(counts)
+    def __init__(self, results):
+        self.script = FakeScript(results)
 
-    def pipeline(self):
-        return self.pipeline_instance
+    def register_script(self, script):
+        self.script.registered_client = self
+        return self.script
+
+
+@pytest.fixture(autouse=True)
+def reset_local_token_leases():
+    rate_limit._local_token_leases.clear()
+    rate_limit._token_bucket_script = None
+    yield
+    rate_limit._local_token_leases.clear()
+    rate_limit._token_bucket_script = None
 
 
 def _make_request() -> Request:
@@ -61,14 +71,13 @@ def _make_request_with_authorization(authorization: str) -> Request:
 
 
 def test_external_mcp_rate_limit_uses_ip_and_hashed_token_keys():
-    fake_redis = FakeRedis(counts=[1, 1])
+    fake_redis = FakeRedis(results=[[1, 1, 0]])
 
     with (
         patch.object(settings, "RATE_LIMIT_ENABLED", True),
         patch.object(
             rate_limit, "_get_rate_limit_redis_client", return_value=fake_redis
         ),
-        patch.object(rate_limit.time, "time", return_value=60),
     ):
         limited = rate_limit.is_external_mcp_rate_limited(
             _make_request(),
@@ -78,16 +87,17 @@ def test_external_mcp_rate_limit_uses_ip_and_hashed_token_keys():
         )
 
     assert limited is False
-    keys = fake_redis.pipeline_instance.keys
+    assert len(fake_redis.script.calls) == 1
+    keys = fake_redis.script.keys
     assert len(keys) == 2
-    assert all("external_kb_mcp:rate:transport:" in key for key in keys)
+    assert all("external_kb_mcp:bucket:transport:" in key for key in keys)
     assert any(":ip:" in key for key in keys)
     assert any(":token:" in key for key in keys)
     assert all("wg-secret-token" not in key for key in keys)
 
 
 def test_external_mcp_rate_limit_uses_same_bearer_parser_as_auth():
-    fake_redis = FakeRedis(counts=[1, 1])
+    fake_redis = FakeRedis(results=[[1, 1, 0]])
 
     with (
         patch.object(settings, "RATE_LIMIT_ENABLED", True),
@@ -103,14 +113,14 @@ def test_external_mcp_rate_limit_uses_same_bearer_parser_as_auth():
         )
 
     assert limited is False
-    keys = fake_redis.pipeline_instance.keys
+    keys = fake_redis.script.keys
     assert len(keys) == 2
     assert any(":token:" in key for key in keys)
     assert all("wg-secret-token" not in key for key in keys)
 
 
 def test_external_mcp_rate_limit_blocks_when_any_dimension_exceeds_limit():
-    fake_redis = FakeRedis(counts=[1, 3])
+    fake_redis = FakeRedis(results=[[0, 0, 1500]])
 
     with (
         patch.object(settings, "RATE_LIMIT_ENABLED", True),
@@ -137,12 +147,12 @@ def test_external_mcp_rate_limit_reports_unavailable_when_redis_client_missing()
             window_seconds=60,
         )
 
-    assert status == rate_limit.ExternalMcpRateLimitStatus.UNAVAILABLE
+    assert status.status == rate_limit.ExternalMcpRateLimitStatus.UNAVAILABLE
 
 
-def test_external_mcp_rate_limit_reports_unavailable_when_pipeline_fails():
-    fake_redis = FakeRedis(counts=[1])
-    fake_redis.pipeline_instance.execute = Mock(side_effect=RuntimeError("down"))
+def test_external_mcp_rate_limit_reports_unavailable_when_script_fails():
+    fake_redis = FakeRedis(results=[[1, 1, 0]])
+    fake_redis.register_script = Mock(side_effect=RuntimeError("down"))
 
     with patch.object(
         rate_limit, "_get_rate_limit_redis_client", return_value=fake_redis
@@ -154,11 +164,11 @@ def test_external_mcp_rate_limit_reports_unavailable_when_pipeline_fails():
             window_seconds=60,
         )
 
-    assert status == rate_limit.ExternalMcpRateLimitStatus.UNAVAILABLE
+    assert status.status == rate_limit.ExternalMcpRateLimitStatus.UNAVAILABLE
 
 
 def test_external_mcp_rate_limit_ignores_global_api_rate_limit_switch():
-    fake_redis = FakeRedis(counts=[3])
+    fake_redis = FakeRedis(results=[[0, 0, 1000]])
 
     with (
         patch.object(settings, "RATE_LIMIT_ENABLED", False),
@@ -177,6 +187,93 @@ def test_external_mcp_rate_limit_ignores_global_api_rate_limit_switch():
     get_client.assert_called_once_with(require_global_enabled=False)
 
 
+def test_token_bucket_rules_are_evaluated_in_one_script_call():
+    fake_redis = FakeRedis(results=[[1, 4, 0]])
+
+    with patch.object(
+        rate_limit, "_get_rate_limit_redis_client", return_value=fake_redis
+    ):
+        decision = rate_limit.check_external_mcp_rate_limits(
+            [
+                rate_limit.RateLimitRule("preauth_ip", "ip:a", 300, 60),
+                rate_limit.RateLimitRule("preauth_doc", "ip:a:doc:1", 60, 60, 90),
+            ]
+        )
+
+    assert decision.status == rate_limit.ExternalMcpRateLimitStatus.ALLOWED
+    assert decision.headers() == {
+        "X-RateLimit-Limit": "90",
+        "X-RateLimit-Remaining": "4",
+    }
+    ((keys, args),) = fake_redis.script.calls
+    assert keys == [
+        "external_kb_mcp:bucket:preauth_ip:ip:a",
+        "external_kb_mcp:bucket:preauth_doc:ip:a:doc:1",
+    ]
+    assert args == [1, 300, 5.0, 90, 1.0]
+
+
+def test_limited_decision_reports_retry_after():
+    fake_redis = FakeRedis(results=[[0, 0, 1500]])
+
+    with patch.object(
+        rate_limit, "_get_rate_limit_redis_client", return_value=fake_redis
+    ):
+        decision = rate_limit.check_external_mcp_dimension_rate_limit(
+            dimensions=["user:1"], namespace="search", limit=30, window_seconds=60
+        )
+
+    assert decision.status == rate_limit.ExternalMcpRateLimitStatus.LIMITED
+    assert decision.headers() == {
+        "X-RateLimit-Limit": "30",
+        "X-RateLimit-Remaining": "0",
+        "Retry-After": "2",
+    }
+
+
+def test_local_leases_absorb_bursts_and_follow_demand():
+    fake_redis = FakeRedis(
+        results=[[1, 99, 0], [2, 97, 0], [4, 93, 0], [4, 89, 0], [1, 88, 0]]
+    )
+
+    def check():
+        return rate_limit.check_external_mcp_dimension_rate_limit(
+            dimensions=["user:1"], namespace="search", limit=100, window_seconds=60
+        )
+
+    with (
+        patch.object(settings, "RATE_LIMIT_LOCAL_LEASE_MAX_TOKENS", 10),
+        patch.object(settings, "RATE_LIMIT_LOCAL_LEASE_SECONDS", 1.0),
+        patch.object(
+            rate_limit, "_get_rate_limit_redis_client", return_value=fake_redis
+        ),
+        patch.object(rate_limit.time, "monotonic", return_value=100.0) as monotonic,
+    ):
+        decisions = [check() for _ in range(7)]
+        monotonic.return_value = 102.0
+        decisions.append(check())
+        monotonic.return_value = 104.0
+        decisions.append(check())
+
+    assert all(
+        decision.status == rate_limit.ExternalMcpRateLimitStatus.ALLOWED
+        for decision in decisions
+    )
+    # A burst grows the lease 1 -> 2 -> 4 (capped at capacity / 20 = 5); a
+    # lease that expires shrinks the next one to the tokens actually used.
+    wanted = [args[0] for _, args in fake_redis.script.calls]
+    assert wanted == [1, 2, 4, 4, 1]
+    assert [decision.remaining for decision in decisions[:7]] == [
+        99,
+        98,
+        97,
+        96,
+        95,
+        94,
+        93,
+    ]
+
+
 def test_check_redis_available_returns_true_when_ping_succeeds():
     fake_client = Mock()
     fake_redis = SimpleNamespace(from_url=Mock(return_value=fake_client))
@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import logging
+
+import pytest
+
+from app.core.startup_profiler import StartupTracer
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_phases_and_imports_are_recorded_relative_to_origin():
+    clock = FakeClock()
+    tracer = StartupTracer(clock=clock)
+
+    clock.advance(0.5)
+    with tracer.timed_import("app.api.api"):
+        clock.advance(1.2)
+    with tracer.phase("yaml_initialization"):
+        clock.advance(0.3)
+    with tracer.phase("im_channels", deferred=True):
+        clock.advance(0.1)
+
+    snapshot = tracer.snapshot()
+    assert snapshot["imports"] == [
+        {
+            "module": "app.api.api",
+            "started_ms": 500.0,
+            "duration_ms": 1200.0,
+            "status": "ok",
+        }
+    ]
+    assert [
+        (phase["name"], phase["started_ms"], phase["duration_ms"], phase["deferred"])
+        for phase in snapshot["phases"]
+    ] == [
+        ("yaml_initialization", 1700.0, 300.0, False),
+        ("im_channels", 2000.0, 100.0, True),
+    ]
+    assert snapshot["ready_ms"] is None
+
+
+def test_failed_phase_is_recorded_and_reraised():
+    clock = FakeClock()
+    tracer = StartupTracer(clock=clock)
+
+    with pytest.raises(RuntimeError):
+        with tracer.phase("database_migrations"):
+            clock.advance(0.2)
+            raise RuntimeError("boom")
+
+    (phase,) = tracer.snapshot()["phases"]
+    assert phase["status"] == "error"
+    assert phase["duration_ms"] == 200.0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_phases_are_ordered_by_start_time():
+    tracer = StartupTracer()
+
+    async def run(name: str, delay: float) -> None:
+        with tracer.phase(name):
+            await asyncio.sleep(delay)
+
+    await asyncio.gather(run("slow", 0.05), run("fast", 0))
+
+    phases = tracer.snapshot()["phases"]
+    assert [phase["name"] for phase in phases] == ["slow", "fast"]
+    assert phases[0]["duration_ms"] >= phases[1]["duration_ms"]
+
+
+def test_mark_ready_logs_slowest_entries(caplog):
+    clock = FakeClock()
+    tracer = StartupTracer(clock=clock)
+    with tracer.phase("socketio"):
+        clock.advance(0.01)
+    with tracer.timed_import("app.api.api"):
+        clock.advance(2)
+
+    with caplog.at_level(logging.INFO, logger="app.core.startup_profiler"):
+        tracer.mark_ready()
+
+    assert tracer.snapshot()["ready_ms"] == 2010.0
+    assert "ready at 2010ms; slowest: app.api.api=2000ms, socketio=10ms" in caplog.text
@@ -15,7 +15,7 @@ from starlette.responses import JSONResponse, PlainTextResponse
 from starlette.routing import Route
 
 from app.core.config import settings
-from app.core.rate_limit import ExternalMcpRateLimitStatus
+from app.core.rate_limit import ExternalMcpRateLimitStatus, RateLimitDecision
 from app.main import create_app
 from app.mcp_server import server as mcp_server_module
 from app.mcp_server.server import (
@@ -50,16 +50,25 @@ class NonClosingSession:
         pass
 
 
+ALLOWED = RateLimitDecision(ExternalMcpRateLimitStatus.ALLOWED)
+LIMITED = RateLimitDecision(ExternalMcpRateLimitStatus.LIMITED)
+UNAVAILABLE = RateLimitDecision(ExternalMcpRateLimitStatus.UNAVAILABLE)
+
+
 @pytest.fixture(autouse=True)
 def allow_external_transport_rate_limit():
     with (
         patch(
             "app.mcp_server.external_knowledge_app.check_external_mcp_rate_limit",
-            return_value=ExternalMcpRateLimitStatus.ALLOWED,
+            return_value=ALLOWED,
         ),
         patch(
             "app.mcp_server.external_knowledge_app.check_external_mcp_dimension_rate_limit",
-            return_value=ExternalMcpRateLimitStatus.ALLOWED,
+            return_value=ALLOWED,
+        ),
+        patch(
+            "app.mcp_server.external_knowledge_app.check_external_mcp_rate_limits",
+            return_value=ALLOWED,
         ),
     ):
         yield
@@ -517,8 +526,15 @@ def test_external_knowledge_mcp_transport_is_rate_limited():
         patch(
             "app.mcp_server.external_knowledge_app.check_external_mcp_rate_limit",
             side_effect=[
-                ExternalMcpRateLimitStatus.ALLOWED,
-                ExternalMcpRateLimitStatus.LIMITED,
+                RateLimitDecision(
+                    ExternalMcpRateLimitStatus.ALLOWED, limit=120, remaining=1
+                ),
+                RateLimitDecision(
+                    ExternalMcpRateLimitStatus.LIMITED,
+                    limit=120,
+                    remaining=0,
+                    retry_after_seconds=1,
+                ),
             ],
         ) as rate_limit_check,
         patch.object(
@@ -540,7 +556,10 @@ def test_external_knowledge_mcp_transport_is_rate_limited():
         )
 
     assert first_response.status_code == 200
+    assert first_response.headers["X-RateLimit-Limit"] == "120"
+    assert first_response.headers["X-RateLimit-Remaining"] == "1"
     assert second_response.status_code == 429
+    assert second_response.headers["Retry-After"] == "1"
     assert second_response.json() == {
         "error": "Rate limit exceeded",
         "code": "rate_limited",
@@ -557,7 +576,7 @@ def test_external_knowledge_mcp_transport_fails_closed_when_rate_limit_unavailab
         patch.object(settings, "EXTERNAL_KNOWLEDGE_MCP_RATE_LIMIT_ENABLED", True),
         patch(
             "app.mcp_server.external_knowledge_app.check_external_mcp_rate_limit",
-            return_value=ExternalMcpRateLimitStatus.UNAVAILABLE,
+            return_value=UNAVAILABLE,
         ) as rate_limit_check,
         patch.object(
             external_knowledge_mcp_server,
@@ -582,7 +601,7 @@ def test_external_knowledge_mcp_transport_fails_closed_when_rate_limit_unavailab
     auth_handler.assert_called_once()
 
 
-def test_external_knowledge_document_file_applies_preauth_ip_rate_limit():
+def test_external_knowledge_document_file_applies_preauth_rate_limits_in_one_check():
     verify_token = MagicMock()
     load_document_file = MagicMock()
 
@@ -591,54 +610,13 @@ def test_external_knowledge_document_file_applies_preauth_ip_rate_limit():
             settings, "EXTERNAL_KNOWLEDGE_MCP_DOWNLOAD_RATE_LIMIT_ENABLED", True
         ),
         patch(
-            "app.mcp_server.external_knowledge_app.check_external_mcp_dimension_rate_limit",
-            return_value=ExternalMcpRateLimitStatus.LIMITED,
-        ) as rate_limit_check,
-        patch(
-            "app.mcp_server.external_knowledge_app.hash_rate_limit_value",
-            return_value="hashed-ip",
-        ),
-        patch(
-            "app.services.knowledge.external_document_access.verify_document_download_token",
-            verify_token,
-        ),
-        patch(
-            "app.services.knowledge.external_document_access.load_document_file_or_raise",
-            load_document_file,
-        ),
-    ):
-        app = _build_external_knowledge_mcp_app()
-        client = TestClient(app)
-        response = client.get("/documents/1/file")
-
-    assert response.status_code == 429
-    assert response.json() == {
-        "error": "Rate limit exceeded",
-        "code": "rate_limited",
-    }
-    rate_limit_check.assert_called_once()
-    assert rate_limit_check.call_args.kwargs["namespace"] == "download_preauth_ip"
-    assert rate_limit_check.call_args.kwargs["dimensions"] == ["ip:hashed-ip"]
-    assert rate_limit_check.call_args.kwargs["limit"] == 300
-    assert rate_limit_check.call_args.kwargs["window_seconds"] == 60
-    verify_token.assert_not_called()
-    load_document_file.assert_not_called()
-
-
-def test_external_knowledge_document_file_applies_preauth_document_rate_limit():
-    verify_token = MagicMock()
-    load_document_file = MagicMock()
-
-    with (
-        patch.object(
-            settings, "EXTERNAL_KNOWLEDGE_MCP_DOWNLOAD_RATE_LIMIT_ENABLED", True
-        ),
-        patch(
-            "app.mcp_server.external_knowledge_app.check_external_mcp_dimension_rate_limit",
-            side_effect=[
-                ExternalMcpRateLimitStatus.ALLOWED,
+            "app.mcp_server.external_knowledge_app.check_external_mcp_rate_limits",
+            return_value=RateLimitDecision(
                 ExternalMcpRateLimitStatus.LIMITED,
-            ],
+                limit=60,
+                remaining=0,
+                retry_after_seconds=2,
+            ),
         ) as rate_limit_check,
         patch(
             "app.mcp_server.external_knowledge_app.hash_rate_limit_value",
@@ -662,16 +640,16 @@ def test_external_knowledge_document_file_applies_preauth_document_rate_limit():
         "error": "Rate limit exceeded",
         "code": "rate_limited",
     }
-    assert rate_limit_check.call_count == 2
-    first_call, second_call = rate_limit_check.call_args_list
-    assert first_call.kwargs["namespace"] == "download_preauth_ip"
-    assert first_call.kwargs["dimensions"] == ["ip:hashed-ip"]
-    assert first_call.kwargs["limit"] == 300
-    assert first_call.kwargs["window_seconds"] == 60
-    assert second_call.kwargs["namespace"] == "download_preauth_document"
-    assert second_call.kwargs["dimensions"] == ["ip:hashed-ip:document:1"]
-    assert second_call.kwargs["limit"] == 60
-    assert second_call.kwargs["window_seconds"] == 60
+    assert response.headers["Retry-After"] == "2"
+    assert response.headers["X-RateLimit-Remaining"] == "0"
+    rate_limit_check.assert_called_once()
+    ip_rule, document_rule = rate_limit_check.call_args.args[0]
+    assert ip_rule.namespace == "download_preauth_ip"
+    assert ip_rule.dimension == "ip:hashed-ip"
+    assert (ip_rule.limit, ip_rule.window_seconds) == (300, 60)
+    assert document_rule.namespace == "download_preauth_document"
+    assert document_rule.dimension == "ip:hashed-ip:document:1"
+    assert (document_rule.limit, document_rule.window_seconds) == (60, 60)
     verify_token.assert_not_called()
     load_document_file.assert_not_called()
 
@@ -684,13 +662,9 @@ def test_external_knowledge_document_file_fails_closed_when_preauth_limiter_unav
             settings, "EXTERNAL_KNOWLEDGE_MCP_DOWNLOAD_RATE_LIMIT_ENABLED", True
         ),
         patch(
-            "app.mcp_server.external_knowledge_app.check_external_mcp_dimension_rate_limit",
-            return_value=ExternalMcpRateLimitStatus.UNAVAILABLE,
+            "app.mcp_server.external_knowledge_app.check_external_mcp_rate_limits",
+            return_value=UNAVAILABLE,
         ) as rate_limit_check,
-        patch(
-            "app.mcp_server.external_knowledge_app.hash_rate_limit_value",
-            return_value="hashed-ip",
-        ),
         patch(
             "app.services.knowledge.external_document_access.verify_document_download_token",
             verify_token,
@@ -706,8 +680,6 @@ def test_external_knowledge_document_file_fails_closed_when_preauth_limiter_unav
         "code": "rate_limit_unavailable",
     }
     rate_limit_check.assert_called_once()
-    assert rate_limit_check.call_args.kwargs["namespace"] == "download_preauth_ip"
-    assert rate_limit_check.call_args.kwargs["dimensions"] == ["ip:hashed-ip"]
     verify_token.assert_not_called()
 
 
@@ -725,11 +697,7 @@ def test_external_knowledge_document_file_applies_postauth_rate_limit(test_user)
         ),
         patch(
             "app.mcp_server.external_knowledge_app.check_external_mcp_dimension_rate_limit",
-            side_effect=[
-                ExternalMcpRateLimitStatus.ALLOWED,
-                ExternalMcpRateLimitStatus.ALLOWED,
-                ExternalMcpRateLimitStatus.LIMITED,
-            ],
+            return_value=LIMITED,
         ) as rate_limit_check,
         patch(
             "app.services.knowledge.external_document_access.load_document_file_or_raise",
@@ -748,7 +716,7 @@ def test_external_knowledge_document_file_applies_postauth_rate_limit(test_user)
         "error": "Rate limit exceeded",
         "code": "rate_limited",
     }
-    assert rate_limit_check.call_count == 3
+    rate_limit_check.assert_called_once()
     assert rate_limit_check.call_args.kwargs["namespace"] == "download"
     load_document_file.assert_not_called()
 
@@ -768,11 +736,7 @@ def test_external_knowledge_document_file_fails_closed_when_postauth_limiter_una
         ),
         patch(
             "app.mcp_server.external_knowledge_app.check_external_mcp_dimension_rate_limit",
-            side_effect=[
-                ExternalMcpRateLimitStatus.ALLOWED,
-                ExternalMcpRateLimitStatus.ALLOWED,
-                ExternalMcpRateLimitStatus.UNAVAILABLE,
-            ],
+            return_value=UNAVAILABLE,
         ) as rate_limit_check,
         patch(
             "app.services.knowledge.external_document_access.load_document_file_or_raise"
@@ -790,7 +754,7 @@ def test_external_knowledge_document_file_fails_closed_when_postauth_limiter_una
         "error": "Rate limit service unavailable",
         "code": "rate_limit_unavailable",
     }
-    assert rate_limit_check.call_count == 3
+    rate_limit_check.assert_called_once()
     assert rate_limit_check.call_args.kwargs["namespace"] == "download"
     load_document_file.assert_not_called()
 
@@ -1065,7 +1029,7 @@ def test_external_knowledge_mcp_public_paths_skip_auth_and_rate_limit_when_mount
         ),
         patch(
             "app.mcp_server.external_knowledge_app.check_external_mcp_rate_limit",
-            return_value=ExternalMcpRateLimitStatus.ALLOWED,
+            return_value=ALLOWED,
         ) as rate_limit_check,
         patch(
             "app.mcp_server.server._external_auth_handler",
@@ -1110,7 +1074,7 @@ def test_external_knowledge_mcp_transport_is_rate_limited_when_mounted():
         ),
         patch(
             "app.mcp_server.external_knowledge_app.check_external_mcp_rate_limit",
-            return_value=ExternalMcpRateLimitStatus.ALLOWED,
+            return_value=ALLOWED,
         ) as rate_limit_check,
         patch(
             "app.mcp_server.server._external_auth_handler",
@@ -48,10 +48,13 @@ class TestGiteaProviderPagination:
         """Test that pagination correctly uses X-Total-Count header"""
         # Mock cache_manager
         mock_cache = mocker.patch("app.repository.gitea_provider.cache_manager")
+        mock_list_cache = mocker.patch(
+            "app.repository.gitea_provider.repository_list_cache"
+        )
         mock_cache.is_building = AsyncMock(return_value=False)
         mock_cache.set_building = AsyncMock()
         mock_cache.generate_full_cache_key = Mock(return_value="test_cache_key")
-        mock_cache.set = AsyncMock()
+        mock_list_cache.set_user_repositories = AsyncMock()
 
         # Create mock responses for 3 pages (total 120 repos, 50 per page)
         def create_mock_response(page, repos_count, total_count):
@@ -94,9 +97,9 @@ class TestGiteaProviderPagination:
         )
 
         # Verify cache was set with all 120 repos
-        mock_cache.set.assert_called_once()
-        call_args = mock_cache.set.call_args
-        cached_repos = call_args[0][1]
+        mock_list_cache.set_user_repositories.assert_called_once()
+        call_args = mock_list_cache.set_user_repositories.call_args
+        cached_repos = call_args[0][2]
         assert len(cached_repos) == 120
 
     @pytest.mark.asyncio
@@ -105,10 +108,13 @@ class TestGiteaProviderPagination:
     ):
         """Test that pagination stops when total count is reached"""
         mock_cache = mocker.patch("app.repository.gitea_provider.cache_manager")
+        mock_list_cache = mocker.patch(
+            "app.repository.gitea_provider.repository_list_cache"
+        )
         mock_cache.is_building = AsyncMock(return_value=False)
         mock_cache.set_building = AsyncMock()
         mock_cache.generate_full_cache_key = Mock(return_value="test_cache_key")
-        mock_cache.set = AsyncMock()
+        mock_list_cache.set_user_repositories = AsyncMock()
 
         # Mock response with exactly 50 repos and X-Total-Count = 50
         response = Mock()
@@ -150,10 +156,13 @@ class TestGiteaProviderPagination:
     ):
         """Test fallback to old logic when X-Total-Count header is missing"""
         mock_cache = mocker.patch("app.repository.gitea_provider.cache_manager")
+        mock_list_cache = mocker.patch(
+            "app.repository.gitea_provider.repository_list_cache"
+        )
         mock_cache.is_building = AsyncMock(return_value=False)
         mock_cache.set_building = AsyncMock()
         mock_cache.generate_full_cache_key = Mock(return_value="test_cache_key")
-        mock_cache.set = AsyncMock()
+        mock_list_cache.set_user_repositories = AsyncMock()
 
         # Create responses without X-Total-Count header
         def create_mock_response(repos_count):
@@ -198,9 +207,9 @@ class TestGiteaProviderPagination:
         assert call_count[0] == 2
 
         # Verify cache was set with 80 repos
-        mock_cache.set.assert_called_once()
-        call_args = mock_cache.set.call_args
-        cached_repos = call_args[0][1]
+        mock_list_cache.set_user_repositories.assert_called_once()
+        call_args = mock_list_cache.set_user_repositories.call_args
+        cached_repos = call_args[0][2]
         assert len(cached_repos) == 80
 
     @pytest.mark.asyncio
@@ -209,10 +218,13 @@ class TestGiteaProviderPagination:
     ):
         """Test that malformed X-Total-Count header is handled gracefully"""
         mock_cache = mocker.patch("app.repository.gitea_provider.cache_manager")
+        mock_list_cache = mocker.patch(
+            "app.repository.gitea_provider.repository_list_cache"
+        )
         mock_cache.is_building = AsyncMock(return_value=False)
         mock_cache.set_building = AsyncMock()
         mock_cache.generate_full_cache_key = Mock(return_value="test_cache_key")
-        mock_cache.set = AsyncMock()
+        mock_list_cache.set_user_repositories = AsyncMock()
 
         # Create response with malformed X-Total-Count header
         def create_mock_response(repos_count):
@@ -263,10 +275,13 @@ class TestGiteaProviderPagination:
     ):
         """Test that get_repositories triggers async fetch when X-Total-Count indicates more repos"""
         mock_cache = mocker.patch("app.repository.gitea_provider.cache_manager")
+        mock_list_cache = mocker.patch(
+            "app.repository.gitea_provider.repository_list_cache"
+        )
         mock_cache.is_building = AsyncMock(return_value=False)
         mock_cache.set_building = AsyncMock()
         mock_cache.generate_full_cache_key = Mock(return_value="test_cache_key")
-        mock_cache.set = AsyncMock()
+        mock_list_cache.set_user_repositories = AsyncMock()
 
         # Mock _get_all_repositories_from_cache to return None (no cache)
         mocker.patch.object(
@@ -310,10 +325,13 @@ class TestGiteaProviderPagination:
     ):
         """Test that get_repositories caches directly when X-Total-Count shows all repos fetched"""
         mock_cache = mocker.patch("app.repository.gitea_provider.cache_manager")
+        mock_list_cache = mocker.patch(
+            "app.repository.gitea_provider.repository_list_cache"
+        )
         mock_cache.is_building = AsyncMock(return_value=False)
         mock_cache.set_building = AsyncMock()
         mock_cache.generate_full_cache_key = Mock(return_value="test_cache_key")
-        mock_cache.set = AsyncMock()
+        mock_list_cache.set_user_repositories = AsyncMock()
 
         # Mock _get_all_repositories_from_cache to return None (no cache)
         mocker.patch.object(
@@ -349,7 +367,7 @@ class TestGiteaProviderPagination:
         mock_create_task.assert_not_called()
 
         # Should cache directly
-        mock_cache.set.assert_called_once()
+        mock_list_cache.set_user_repositories.assert_called_once()
 
         # Should return 30 repos
         assert len(repos) == 30
@@ -51,11 +51,13 @@ def provider() -> GitLabProvider:
 def _no_cache():
     """Keep the result-caching side of get_repositories out of the way.
 
-    ``set`` is awaited, so it has to be an async double; ``generate_full_cache_key``
-    is not.
+    ``set_user_repositories`` is awaited, so it has to be an async double.
     """
-    cache = Mock(set=AsyncMock(), generate_full_cache_key=Mock(return_value="key"))
-    with patch("app.repository.gitlab_provider.cache_manager", cache):
+    cache = Mock(set_user_repositories=AsyncMock())
+    with (
+        patch("app.repository.gitlab_provider.cache_manager", Mock()),
+        patch("app.repository.gitlab_provider.repository_list_cache", cache),
+    ):
         yield cache
 
 
@@ -0,0 +1,245 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Tests for the repository search index and the indexed provider search path
+"""
+
+from unittest.mock import AsyncMock, Mock
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+from app.repository import repository_cache as repository_cache_module
+from app.repository.gitea_provider import GiteaProvider
+from app.repository.repository_cache import RepositoryListCache
+from app.repository.search_index import RepositorySearchIndex
+
+
+def _repo(idx, full_name):
+    return {
+        "id": idx,
+        "name": full_name.split("/")[-1],
+        "full_name": full_name,
+        "clone_url": f"https://git.example.com/{full_name}.git",
+        "private": False,
+    }
+
+
+@pytest.fixture
+def repos():
+    return [
+        _repo(1, "team/awesome-wegent-tools"),
+        _repo(2, "wegent/backend"),
+        _repo(3, "infra/wegent"),
+        _repo(4, "team/wegent-frontend"),
+        _repo(5, "other/unrelated"),
+        _repo(6, "wegent-labs/sandbox"),
+    ]
+
+
+@pytest.mark.unit
+class TestRepositorySearchIndex:
+    def test_results_are_ranked_by_match_quality(self, repos):
+        index = RepositorySearchIndex(repos)
+
+        result = index.search("wegent")
+
+        assert [repo["id"] for repo in result] == [3, 4, 2, 6, 1]
+
+    def test_exact_full_name_outranks_name_prefix(self, repos):
+        index = RepositorySearchIndex(repos)
+
+        result = index.search("wegent/backend")
+
+        assert [repo["id"] for repo in result] == [2]
+
+    def test_search_is_case_insensitive(self, repos):
+        index = RepositorySearchIndex(repos)
+
+        assert [repo["id"] for repo in index.search("BACKEND")] == [2]
+
+    def test_fullmatch_only_returns_exact_names(self, repos):
+        index = RepositorySearchIndex(repos)
+
+        assert [repo["id"] for repo in index.search("wegent", fullmatch=True)] == [3]
+        assert [
+            repo["id"] for repo in index.search("Team/Wegent-Frontend", fullmatch=True)
+        ] == [4]
+        assert index.search("wegen", fullmatch=True) == []
+
+    def test_trigram_and_scan_paths_agree_with_substring_semantics(self, repos):
+        index = RepositorySearchIndex(repos)
+
+        for query in ["we", "n", "ent", "nd/", "x", "zzz", "t/w"]:
+            expected = {
+                repo["id"]
+                for repo in repos
+                if query in repo["name"].lower() or query in repo["full_name"].lower()
+            }
+            assert {repo["id"] for repo in index.search(query)} == expected, query
+
+    def test_payload_round_trip_reuses_stored_trigrams(self, repos):
+        payload = orjson.loads(orjson.dumps(RepositorySearchIndex(repos).to_payload()))
+
+        restored = RepositorySearchIndex.from_payload(repos, payload)
+
+        assert restored._trigrams == payload["trigrams"]
+        assert [repo["id"] for repo in restored.search("wegent")] == [3, 4, 2, 6, 1]
+
+    def test_unusable_payload_is_rebuilt(self, repos):
+        restored = RepositorySearchIndex.from_payload(repos, {"format": -1})
+
+        assert [repo["id"] for repo in restored.search("sandbox")] == [6]
+
+
+@pytest.fixture
+def mock_user():
+    user = Mock()
+    user.id = 1
+    user.user_name = "testuser"
+    user.git_info = [
+        {
+            "type": "gitea",
+            "git_domain": "gitea.example.com",
+            "git_token": "test_token",
+            "user_name": "testuser",
+        }
+    ]
+    return user
+
+
+@pytest.mark.unit
+class TestIndexedProviderSearch:
+    @pytest.mark.asyncio
+    async def test_cached_results_come_from_the_index(self, mock_user, mocker, repos):
+        mock_cache = mocker.patch("app.repository.gitea_provider.cache_manager")
+        mock_list_cache = mocker.patch(
+            "app.repository.gitea_provider.repository_list_cache"
+        )
+        mock_list_cache.search_user_repositories = AsyncMock(
+            return_value=RepositorySearchIndex(repos).search("wegent")
+        )
+        mock_cache.is_building = AsyncMock(return_value=False)
+
+        result = await GiteaProvider().search_repositories(mock_user, "wegent")
+
+        assert [repo["full_name"] for repo in result][:2] == [
+            "infra/wegent",
+            "team/wegent-frontend",
+        ]
+        mock_cache.is_building.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_waits_for_a_running_build_instead_of_polling(
+        self, mock_user, mocker, repos
+    ):
+        mock_cache = mocker.patch("app.repository.gitea_provider.cache_manager")
+        mock_list_cache = mocker.patch(
+            "app.repository.gitea_provider.repository_list_cache"
+        )
+        mock_list_cache.search_user_repositories = AsyncMock(
+            side_effect=[None, repos[:1]]
+        )
+        mock_cache.is_building = AsyncMock(return_value=True)
+        mock_cache.wait_for_build = AsyncMock(return_value=True)
+        sleep = mocker.patch("asyncio.sleep")
+
+        result = await GiteaProvider().search_repositories(
+            mock_user, "awesome", timeout=5
+        )
+
+        assert [repo["id"] for repo in result] == [1]
+        mock_cache.wait_for_build.assert_awaited_once_with(1, "gitea.example.com", 5)
+        sleep.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_build_wait_timeout_is_reported(self, mock_user, mocker):
+        mock_cache = mocker.patch("app.repository.gitea_provider.cache_manager")
+        mock_list_cache = mocker.patch(
+            "app.repository.gitea_provider.repository_list_cache"
+        )
+        mock_list_cache.search_user_repositories = AsyncMock(return_value=None)
+        mock_cache.is_building = AsyncMock(return_value=True)
+        mock_cache.wait_for_build = AsyncMock(return_value=False)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await GiteaProvider().search_repositories(mock_user, "wegent", timeout=1)
+
+        assert exc_info.value.status_code == 408
+
+
+class _FakeCacheManager:
+    """Generic cache primitives over a dict, counting Redis round trips"""
+
+    def __init__(self):
+        self.values = {}
+        self.calls = []
+
+    def generate_full_cache_key(self, user_id, git_domain):
+        return f"git_repos:{user_id}:{git_domain}"
+
+    async def get(self, key):
+        self.calls.append(("get", key))
+        return self.values.get(key)
+
+    async def mget(self, keys):
+        self.calls.append(("mget", tuple(keys)))
+        return {key: self.values[key] for key in keys if key in self.values}
+
+    async def set_many(self, items, expire=None, transaction=False):
+        self.calls.append(("set_many", transaction))
+        # Round-trip through JSON like the Redis cache does
+        self.values.update(orjson.loads(orjson.dumps(items)))
+        return {key: True for key in items}
+
+    async def delete(self, *keys):
+        self.calls.append(("delete", keys))
+        return any([self.values.pop(key, None) is not None for key in keys])
+
+
+@pytest.mark.unit
+class TestRepositoryListCache:
+    @pytest.fixture
+    def fake_cache(self, monkeypatch):
+        fake = _FakeCacheManager()
+        monkeypatch.setattr(repository_cache_module, "cache_manager", fake)
+        return fake
+
+    @pytest.mark.asyncio
+    async def test_searches_reuse_the_local_index_while_the_stamp_is_current(
+        self, fake_cache, repos
+    ):
+        writer, reader = RepositoryListCache(), RepositoryListCache()
+        assert await writer.set_user_repositories(1, "git.example.com", repos)
+        assert fake_cache.calls == [("set_many", True)]
+
+        first = await reader.search_user_repositories(1, "git.example.com", "wegent")
+        fake_cache.calls.clear()
+        second = await reader.search_user_repositories(1, "git.example.com", "wegent")
+
+        assert first == second
+        assert [repo["full_name"] for repo in first][:2] == [
+            "infra/wegent",
+            "team/wegent-frontend",
+        ]
+        # Only the stamp is read once the index is held in memory
+        assert fake_cache.calls == [("get", "git_repos_stamp:1:git.example.com")]
+
+    @pytest.mark.asyncio
+    async def test_lists_cached_without_an_index_are_indexed_on_search(
+        self, fake_cache, repos
+    ):
+        fake_cache.values["git_repos:1:git.example.com"] = repos
+        cache = RepositoryListCache()
+
+        result = await cache.search_user_repositories(1, "git.example.com", "sandbox")
+
+        assert [repo["id"] for repo in result] == [6]
+        assert "git_repos_stamp:1:git.example.com" in fake_cache.values
+
+        assert await cache.delete_user_repositories(1, "git.example.com")
+        assert fake_cache.values == {}
+        assert await cache.search_user_repositories(1, "git.example.com", "x") is None
@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from app.schemas import subtask as subtask_schema
+from app.schemas.subtask import SubtaskInDB, SubtaskRole, SubtaskStatus
+
+SECRET = "ghp_" + "a" * 36
+
+
+@pytest.fixture(autouse=True)
+def masking(monkeypatch) -> Mock:
+    monkeypatch.setattr(
+        subtask_schema,
+        "_masked_result_cache",
+        type(subtask_schema._masked_result_cache)(),
+    )
+    mask = Mock(wraps=subtask_schema.mask_sensitive_data)
+    monkeypatch.setattr(subtask_schema, "mask_sensitive_data", mask)
+    return mask
+
+
+def _subtask(result, subtask_id=1, updated_at=datetime(2026, 1, 1, 12, 0, 0)):
+    return SubtaskInDB(
+        id=subtask_id,
+        user_id=1,
+        task_id=1,
+        team_id=1,
+        title="test",
+        role=SubtaskRole.ASSISTANT,
+        status=SubtaskStatus.COMPLETED,
+        created_at=datetime(2026, 1, 1, 12, 0, 0),
+        updated_at=updated_at,
+        result=result,
+    )
+
+
+def test_same_subtask_version_is_masked_once(masking) -> None:
+    first = _subtask({"value": f"token={SECRET}"}).model_dump()
+    second = _subtask({"value": f"token={SECRET}"}).model_dump()
+
+    assert masking.call_count == 1
+    assert first["result"] == second["result"]
+    assert SECRET not in first["result"]["value"]
+    assert first["result"] is not second["result"]
+
+
+def test_changed_result_or_version_is_masked_again(masking) -> None:
+    _subtask({"value": "first"}).model_dump()
+    _subtask({"value": "second"}).model_dump()
+    _subtask(
+        {"value": "second"}, updated_at=datetime(2026, 1, 1, 12, 0, 1)
+    ).model_dump()
+
+    assert masking.call_count == 3
+
+
+def test_mutating_a_dump_does_not_change_the_cached_masking() -> None:
+    dumped = _subtask({"value": f"token={SECRET}"}).model_dump()
+    masked_value = dumped["result"]["value"]
+    dumped["result"]["value"] = "changed"
+
+    again = _subtask({"value": f"token={SECRET}"}).model_dump()
+    assert again["result"]["value"] == masked_value
@@ -0,0 +1,139 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Unit tests for the attachment parse-result cache.
+"""
+
+import importlib
+from unittest.mock import Mock
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.config import settings
+from app.models.subtask_context import ContextStatus, SubtaskContext
+from app.services.attachment.parse_cache import AttachmentParseCache
+from app.services.attachment.parser import DocumentParser, ParseResult, TruncationInfo
+from app.services.attachment.truncation_strategies.base import SmartTruncationConfig
+from app.services.context.context_service import ContextService
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store: dict = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+        return True
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(settings, "ATTACHMENT_PARSE_CACHE_ENABLED", True)
+    cache = AttachmentParseCache(client=_FakeRedis())
+    # The package re-exports a ContextService instance under the module name
+    cs_module = importlib.import_module("app.services.context.context_service")
+    monkeypatch.setattr(cs_module, "attachment_parse_cache", cache)
+    return cache
+
+
+@pytest.mark.unit
+class TestAttachmentParseCache:
+    def test_round_trip_keeps_text_and_truncation_info(self, cache):
+        result = ParseResult(
+            text="head ... tail",
+            text_length=13,
+            truncation_info=TruncationInfo(
+                is_truncated=True,
+                original_length=900,
+                truncated_length=13,
+                truncation_type="smart",
+                kept_structure={"pages": [1, 9]},
+            ),
+        )
+        key = cache.build_key(b"pdf-bytes", ".pdf", DocumentParser())
+
+        assert cache.put(key, result) is True
+        assert cache.get(key) == result
+
+    def test_key_covers_content_extension_and_truncation_config(self):
+        cache = AttachmentParseCache(client=_FakeRedis())
+        parser = DocumentParser()
+
+        base = cache.build_key(b"same", ".txt", parser)
+
+        assert cache.build_key(b"same", ".TXT", parser) == base
+        assert cache.build_key(b"other", ".txt", parser) != base
+        assert cache.build_key(b"same", ".md", parser) != base
+        assert (
+            cache.build_key(
+                b"same",
+                ".txt",
+                DocumentParser(SmartTruncationConfig(text_head_lines=1)),
+            )
+            != base
+        )
+
+    def test_redis_errors_are_misses(self, monkeypatch):
+        monkeypatch.setattr(settings, "ATTACHMENT_PARSE_CACHE_ENABLED", True)
+        client = Mock()
+        client.get.side_effect = RedisConnectionError("down")
+        client.set.side_effect = RedisConnectionError("down")
+        cache = AttachmentParseCache(client=client)
+
+        assert cache.get("key") is None
+        assert cache.put("key", ParseResult(text="x", text_length=1)) is False
+
+    def test_oversized_results_are_not_cached(self, cache, monkeypatch):
+        monkeypatch.setattr(settings, "ATTACHMENT_PARSE_CACHE_MAX_ENTRY_BYTES", 10)
+
+        assert cache.put("key", ParseResult(text="x" * 100, text_length=100)) is False
+        assert cache.get("key") is None
+
+
+def _context(context_id: int) -> SubtaskContext:
+    return SubtaskContext(id=context_id, type_data={"mime_type": "text/plain"})
+
+
+@pytest.mark.unit
+class TestContextServiceParseCache:
+    def test_identical_uploads_are_parsed_once(self, cache):
+        service = ContextService()
+        parse = Mock(wraps=service.parser.parse)
+        service.parser.parse = parse
+
+        first = _context(1)
+        second = _context(2)
+        service._parse_and_update_context(first, b"hello world", ".txt")
+        service._parse_and_update_context(second, b"hello world", ".txt")
+
+        assert parse.call_count == 1
+        assert second.extracted_text == first.extracted_text == "hello world"
+        assert second.status == ContextStatus.READY.value
+        assert second.type_data["is_truncated"] is False
+
+    def test_different_bytes_are_parsed_again(self, cache):
+        service = ContextService()
+        parse = Mock(wraps=service.parser.parse)
+        service.parser.parse = parse
+
+        service._parse_and_update_context(_context(1), b"hello", ".txt")
+        service._parse_and_update_context(_context(2), b"world", ".txt")
+
+        assert parse.call_count == 2
+
+    def test_disabled_cache_always_parses(self, cache, monkeypatch):
+        monkeypatch.setattr(settings, "ATTACHMENT_PARSE_CACHE_ENABLED", False)
+        service = ContextService()
+        parse = Mock(wraps=service.parser.parse)
+        service.parser.parse = parse
+
+        service._parse_and_update_context(_context(1), b"hello", ".txt")
+        service._parse_and_update_context(_context(2), b"hello", ".txt")
+
+        assert parse.call_count == 2
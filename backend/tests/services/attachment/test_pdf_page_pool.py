@@ -0,0 +1,130 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Tests for parallel per-page PDF parsing through the shared process pool.
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.services.attachment.parser import DocumentParseError, DocumentParser
+from app.services.attachment.pdf_page_pool import PdfPagePool
+
+
+def _build_text_pdf(page_count: int, lines_per_page: int = 40) -> bytes:
+    """Build a minimal multi-page PDF with extractable Helvetica text."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_refs = []
+    for page in range(page_count):
+        lines = [
+            f"Page {page + 1} line {line + 1}: the quick brown fox jumps over"
+            for line in range(lines_per_page)
+        ]
+        stream = "BT /F1 10 Tf 12 TL 40 800 Td " + " ".join(
+            f"({text}) Tj T*" for text in lines
+        )
+        stream += " ET"
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream"
+            % (len(stream), stream.encode("latin-1"))
+        )
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        page_refs.append(len(objects))
+    kids = " ".join(f"{ref} 0 R" for ref in page_refs)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(out)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """A fresh two-worker pool used by the parser instead of the shared one."""
+    monkeypatch.setattr(settings, "PDF_PARSE_POOL_WORKERS", 2)
+    monkeypatch.setattr(settings, "PDF_PARSE_PARALLEL_MIN_PAGES", 4)
+    pool = PdfPagePool()
+    monkeypatch.setattr("app.services.attachment.parser.pdf_page_pool", pool)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.unit
+class TestPageRanges:
+    def test_ranges_cover_every_page_in_order(self, monkeypatch):
+        monkeypatch.setattr(settings, "PDF_PARSE_POOL_WORKERS", 3)
+
+        ranges = PdfPagePool().page_ranges(20)
+
+        assert ranges[0][0] == 0 and ranges[-1][1] == 20
+        assert all(prev[1] == nxt[0] for prev, nxt in zip(ranges, ranges[1:]))
+        assert len(ranges) == 5
+        assert all(end - start <= 4 for start, end in ranges)
+
+    def test_small_documents_and_disabled_pool_stay_serial(self, monkeypatch):
+        monkeypatch.setattr(settings, "PDF_PARSE_PARALLEL_MIN_PAGES", 10)
+        monkeypatch.setattr(settings, "PDF_PARSE_POOL_WORKERS", 0)
+        assert PdfPagePool().should_parallelize(100) is False
+
+        monkeypatch.setattr(settings, "PDF_PARSE_POOL_WORKERS", 2)
+        assert PdfPagePool().should_parallelize(9) is False
+        assert PdfPagePool().should_parallelize(10) is True
+
+
+@pytest.mark.unit
+class TestParallelPdfParsing:
+    def test_parallel_result_matches_serial(self, pool, monkeypatch):
+        pdf = _build_text_pdf(12, lines_per_page=5)
+        parser = DocumentParser()
+
+        parallel = parser.parse(pdf, ".pdf")
+        monkeypatch.setattr(settings, "PDF_PARSE_POOL_WORKERS", 0)
+        serial = parser.parse(pdf, ".pdf")
+
+        assert "Page 1 line 1" in parallel.text
+        assert parallel.text == serial.text
+        assert parallel.truncation_info == serial.truncation_info
+
+    def test_smart_truncation_applies_to_merged_pages(self, pool, monkeypatch):
+        pdf = _build_text_pdf(30, lines_per_page=20)
+        parser = DocumentParser()
+        monkeypatch.setattr(settings, "MAX_EXTRACTED_TEXT_LENGTH", 5000)
+
+        parallel = parser.parse(pdf, ".pdf")
+        monkeypatch.setattr(settings, "PDF_PARSE_POOL_WORKERS", 0)
+        serial = parser.parse(pdf, ".pdf")
+
+        assert parallel.truncation_info is not None
+        assert parallel.truncation_info.is_truncated
+        assert parallel.text == serial.text
+        assert "Page 1 line 1" in parallel.text
+        assert "Page 30 line" in parallel.text
+
+    def test_document_deadline_is_enforced(self, pool, monkeypatch):
+        monkeypatch.setattr(settings, "PDF_PARSE_DEADLINE_SECONDS", 0)
+
+        with pytest.raises(DocumentParseError) as exc_info:
+            DocumentParser().parse(_build_text_pdf(8, lines_per_page=2), ".pdf")
+
+        assert exc_info.value.error_code == DocumentParseError.PARSE_TIMEOUT
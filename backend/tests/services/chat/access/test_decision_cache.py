@@ -0,0 +1,205 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the task access decision cache of chat namespace events."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.resource_member import MemberStatus, ResourceMember, ResourceRole
+from app.models.share_link import ResourceType
+from app.models.task import TaskResource
+from app.services.chat.access.decision_cache import (
+    CHAT_TASK_ACCESS_CHECKS_TOTAL,
+    TaskAccessDecisionCache,
+    TaskAccessDecisionStore,
+)
+from app.services.chat.access.decision_cache_hooks import TaskAccessCacheHooks
+
+
+class _FakePipeline:
+    def __init__(self, redis: "_FakeRedis") -> None:
+        self._redis = redis
+        self._commands = []
+
+    def __getattr__(self, name):
+        return lambda *args: self._commands.append((name, args))
+
+    def execute(self):
+        results = []
+        for name, args in self._commands:
+            if name == "hget":
+                results.append(self._redis.hashes.get(args[0], {}).get(args[1]))
+            elif name == "get":
+                results.append(self._redis.values.get(args[0]))
+            elif name == "incr":
+                value = int(self._redis.values.get(args[0], 0)) + 1
+                self._redis.values[args[0]] = str(value)
+                results.append(value)
+            elif name == "delete":
+                self._redis.delete(*args)
+                results.append(1)
+            else:
+                results.append(True)
+        return results
+
+
+class _FakeAsyncPipeline(_FakePipeline):
+    async def execute(self):
+        return super().execute()
+
+
+class _FakeRedis:
+    """Shared in-memory hashes behind the async and sync client interfaces."""
+
+    def __init__(self) -> None:
+        self.hashes = {}
+        self.values = {}
+
+    def pipeline(self, transaction=True):
+        # Only the async client reads through a non-transactional pipeline
+        if transaction:
+            return _FakePipeline(self)
+        return _FakeAsyncPipeline(self)
+
+    async def eval(self, script, numkeys, key, generation_key, *args):
+        generation, field, expires_at, _ttl = args
+        if int(self.values.get(generation_key, 0)) != int(generation):
+            return 0
+        self.hashes.setdefault(key, {})[field] = str(expires_at)
+        return 1
+
+    def delete(self, *keys):
+        for key in keys:
+            self.hashes.pop(key, None)
+
+
+def _store(redis: _FakeRedis, ttl_seconds: int = 60) -> TaskAccessDecisionStore:
+    return TaskAccessDecisionStore(
+        ttl_seconds=ttl_seconds, client=redis, async_client=redis
+    )
+
+
+def _checks(source: str) -> float:
+    return CHAT_TASK_ACCESS_CHECKS_TOTAL.labels(source=source)._value.get()
+
+
+@pytest.mark.asyncio
+async def test_socket_reuses_positive_decision() -> None:
+    cache = TaskAccessDecisionCache(_store(_FakeRedis(), ttl_seconds=0))
+    check = AsyncMock(return_value=True)
+    socket_hits = _checks("socket")
+
+    assert await cache.can_access("sid-1", 1, 101, check) is True
+    assert await cache.can_access("sid-1", 1, 101, check) is True
+
+    check.assert_awaited_once_with(1, 101)
+    assert _checks("socket") == socket_hits + 1
+
+    cache.forget_socket("sid-1")
+    assert await cache.can_access("sid-1", 1, 101, check) is True
+    assert check.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_denials_are_not_cached() -> None:
+    redis = _FakeRedis()
+    cache = TaskAccessDecisionCache(_store(redis))
+    check = AsyncMock(side_effect=[False, True])
+
+    assert await cache.can_access("sid-1", 1, 101, check) is False
+    assert redis.hashes == {}
+    assert await cache.can_access("sid-1", 1, 101, check) is True
+
+
+@pytest.mark.asyncio
+async def test_redis_decision_is_shared_across_sockets_and_invalidated() -> None:
+    redis = _FakeRedis()
+    store = _store(redis)
+    first = TaskAccessDecisionCache(store)
+    second = TaskAccessDecisionCache(store)
+    check = AsyncMock(return_value=True)
+    redis_hits = _checks("redis")
+
+    await first.can_access("sid-1", 1, 101, check)
+    assert await second.can_access("sid-2", 1, 101, check) is True
+    assert check.await_count == 1
+    assert _checks("redis") == redis_hits + 1
+
+    store.invalidate([101])
+
+    assert redis.hashes == {}
+    await first.can_access("sid-1", 1, 101, check)
+    await second.can_access("sid-2", 1, 101, check)
+    assert check.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_check_racing_an_invalidation_is_not_stored() -> None:
+    redis = _FakeRedis()
+    store = _store(redis)
+    cache = TaskAccessDecisionCache(store)
+
+    async def revoked_during_check(user_id: int, task_id: int) -> bool:
+        store.invalidate([task_id])
+        return True
+
+    check = AsyncMock(side_effect=revoked_during_check)
+
+    assert await cache.can_access("sid-1", 1, 101, check) is True
+    assert redis.hashes == {}
+    assert redis.values == {"chat:task_access:101:generation": "1"}
+
+    check.side_effect = None
+    check.return_value = False
+    assert await cache.can_access("sid-1", 1, 101, check) is False
+    assert check.await_count == 2
+
+
+def test_hooks_invalidate_tasks_on_committed_revocations(test_db: Session) -> None:
+    invalidated = []
+    store = _store(_FakeRedis())
+    store.invalidate = lambda task_ids: invalidated.append(set(task_ids))
+    hooks = TaskAccessCacheHooks(test_db, store)
+    task = TaskResource(
+        id=101,
+        user_id=1,
+        kind="Task",
+        name="task-101",
+        namespace="default",
+        json={"kind": "Task"},
+        is_active=TaskResource.STATE_ACTIVE,
+    )
+    member = ResourceMember(
+        resource_type=ResourceType.TASK,
+        resource_id=101,
+        entity_type="user",
+        entity_id="2",
+        user_id=2,
+        role=ResourceRole.Maintainer.value,
+        status=MemberStatus.APPROVED,
+        copied_resource_id=0,
+    )
+    hooks.register()
+    try:
+        test_db.add_all([task, member])
+        test_db.commit()
+        assert invalidated == []
+
+        member.status = MemberStatus.REJECTED
+        test_db.flush()
+        test_db.rollback()
+        assert invalidated == []
+
+        test_db.delete(member)
+        test_db.commit()
+        assert invalidated == [{101}]
+
+        task.is_active = TaskResource.STATE_DELETED
+        test_db.commit()
+        assert invalidated == [{101}, {101}]
+    finally:
+        hooks.unregister()
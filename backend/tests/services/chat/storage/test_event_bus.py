@@ -0,0 +1,318 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the multiplexed, replayable subtask event bus."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.services.chat.storage import event_bus as event_bus_module
+from app.services.chat.storage import session as session_module
+from app.services.chat.storage.event_bus import SubtaskEventBus
+from app.services.chat.storage.session import SessionManager
+
+
+class FakePubSub:
+    def __init__(self, server):
+        self.server = server
+        self.channels = set()
+        self.messages = asyncio.Queue()
+        self.fail_next_read = False
+
+    async def subscribe(self, channel):
+        self.channels.add(channel)
+        self.server.subscribers.setdefault(channel, set()).add(self)
+        self.messages.put_nowait({"type": "subscribe", "channel": channel, "data": 1})
+
+    async def unsubscribe(self, channel):
+        self.channels.discard(channel)
+        self.server.subscribers.get(channel, set()).discard(self)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=None):
+        if self.fail_next_read:
+            self.fail_next_read = False
+            raise RedisConnectionError("connection lost")
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def ping(self):
+        return True
+
+    async def aclose(self):
+        return None
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        self.commands.append(("xadd", key, fields, maxlen))
+
+    def expire(self, key, seconds):
+        self.commands.append(("expire", key, seconds))
+
+    async def execute(self):
+        results = []
+        for command in self.commands:
+            if command[0] == "xadd":
+                _, key, fields, maxlen = command
+                results.append(self.redis.xadd_now(key, fields, maxlen))
+            else:
+                results.append(True)
+        return results
+
+
+class FakeRedis:
+    """In-memory streams and pubsub shared by every client of one server."""
+
+    def __init__(self, server):
+        self.server = server
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def xadd_now(self, key, fields, maxlen):
+        self.server.seq += 1
+        entry_id = f"{self.server.seq}-0"
+        entries = self.server.streams.setdefault(key, [])
+        entries.append((entry_id, dict(fields)))
+        del entries[: max(0, len(entries) - int(maxlen))]
+        return entry_id
+
+    async def publish(self, channel, data):
+        self.server.published.append((channel, data))
+        if self.server.drop_publishes:
+            return 0
+        for pubsub in self.server.subscribers.get(channel, ()):
+            pubsub.messages.put_nowait(
+                {"type": "message", "channel": channel, "data": data}
+            )
+        return len(self.server.subscribers.get(channel, ()))
+
+    async def xrange(self, key, min="-", max="+", count=None):
+        if min == "-":
+            entries = list(self.server.streams.get(key, []))
+        elif min.startswith("("):
+            after = int(min[1:].split("-")[0])
+            entries = [
+                entry
+                for entry in self.server.streams.get(key, [])
+                if int(entry[0].split("-")[0]) > after
+            ]
+        else:
+            start = int(min.split("-")[0])
+            entries = [
+                entry
+                for entry in self.server.streams.get(key, [])
+                if int(entry[0].split("-")[0]) >= start
+            ]
+        return entries[:count]
+
+    def pubsub(self):
+        pubsub = FakePubSub(self.server)
+        self.server.pubsubs.append(pubsub)
+        return pubsub
+
+    async def aclose(self):
+        return None
+
+
+@pytest.fixture
+def server():
+    return SimpleNamespace(
+        streams={},
+        subscribers={},
+        pubsubs=[],
+        published=[],
+        seq=0,
+        drop_publishes=False,
+    )
+
+
+@pytest.fixture
+def bus(server, monkeypatch):
+    monkeypatch.setattr(event_bus_module.settings, "SUBTASK_EVENT_BATCH_INTERVAL_MS", 0)
+    return SubtaskEventBus(client_factory=lambda: FakeRedis(server))
+
+
+@pytest.fixture
+def session_manager(bus, monkeypatch):
+    monkeypatch.setattr(session_module, "subtask_event_bus", bus)
+    return SessionManager()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_streams_share_one_pubsub_connection(bus, server):
+    subscriptions = [
+        await bus.subscribe(f"channel:{i}", f"events:{i}") for i in range(20)
+    ]
+    for i in range(20):
+        await bus.publish(f"channel:{i}", f"events:{i}", f"chunk-{i}", 60)
+
+    received = [await sub.get(timeout=1.0) for sub in subscriptions]
+
+    assert len(server.pubsubs) == 1
+    assert [event.data for event in received] == [f"chunk-{i}" for i in range(20)]
+    for sub in subscriptions:
+        await sub.close()
+    assert server.subscribers and not any(server.subscribers.values())
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_subscribers_of_one_channel_each_receive_every_event(bus):
+    first = await bus.subscribe("channel:1", "events:1")
+    second = await bus.subscribe("channel:1", "events:1")
+
+    await bus.publish("channel:1", "events:1", "a", 60)
+    assert (await first.get(timeout=1.0)).data == "a"
+    await first.close()
+    await bus.publish("channel:1", "events:1", "b", 60)
+
+    assert [(await second.get(timeout=1.0)).data for _ in range(2)] == ["a", "b"]
+    await second.close()
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_late_subscriber_replays_events_published_before_it_attached(bus, server):
+    await bus.publish("channel:1", "events:1", "early-1", 60)
+    await bus.flush()
+    await bus.publish("channel:1", "events:1", "early-2", 60)
+    await bus.flush()
+    first_id = server.streams["events:1"][0][0]
+
+    from_start = await bus.subscribe("channel:1", "events:1", after_id="0")
+    resumed = await bus.subscribe("channel:1", "events:1", after_id=first_id)
+    await bus.publish("channel:1", "events:1", "live", 60)
+
+    assert [(await from_start.get(timeout=1.0)).data for _ in range(3)] == [
+        "early-1",
+        "early-2",
+        "live",
+    ]
+    assert [(await resumed.get(timeout=1.0)).data for _ in range(2)] == [
+        "early-2",
+        "live",
+    ]
+    assert await resumed.get(timeout=0.05) is None
+    await from_start.close()
+    await resumed.close()
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_reconnect_replays_events_missed_while_disconnected(bus, server):
+    subscription = await bus.subscribe("channel:1", "events:1")
+    await bus.publish("channel:1", "events:1", "before", 60)
+    assert (await subscription.get(timeout=1.0)).data == "before"
+
+    server.drop_publishes = True
+    await bus.publish("channel:1", "events:1", "missed", 60)
+    await bus.flush()
+    server.drop_publishes = False
+    server.pubsubs[0].fail_next_read = True
+    server.pubsubs[0].messages.put_nowait(None)
+
+    event = await subscription.get(timeout=3.0)
+
+    assert event is not None and event.data == "missed"
+    await subscription.close()
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_burst_of_events_shares_one_entry_and_one_message(bus, server):
+    live = await bus.subscribe("channel:1", "events:1")
+    for i in range(5):
+        await bus.publish("channel:1", "events:1", f"token-{i}", 60)
+    await bus.flush()
+
+    received = [await live.get(timeout=1.0) for _ in range(5)]
+    ((entry_id, _fields),) = server.streams["events:1"]
+    resumed = await bus.subscribe("channel:1", "events:1", after_id=received[2].id)
+
+    assert len(server.published) == 1
+    assert [event.data for event in received] == [f"token-{i}" for i in range(5)]
+    assert [event.id for event in received] == [f"{entry_id}.{i}" for i in range(5)]
+    assert [(await resumed.get(timeout=1.0)).data for _ in range(2)] == [
+        "token-3",
+        "token-4",
+    ]
+    assert await resumed.get(timeout=0.05) is None
+    await live.close()
+    await resumed.close()
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_queue_is_bounded_and_catches_up_from_the_stream(
+    bus, monkeypatch
+):
+    monkeypatch.setattr(event_bus_module.settings, "SUBTASK_EVENT_QUEUE_MAXSIZE", 3)
+    subscription = await bus.subscribe("channel:1", "events:1")
+    for i in range(10):
+        await bus.publish("channel:1", "events:1", f"chunk-{i}", 60)
+        await bus.flush()
+    # Let the listener dispatch every live message
+    await asyncio.sleep(0.05)
+
+    assert subscription._queue.qsize() == 3
+    received = [await subscription.get(timeout=1.0) for _ in range(10)]
+
+    assert [event.data for event in received] == [f"chunk-{i}" for i in range(10)]
+    assert await subscription.get(timeout=0.05) is None
+    await subscription.close()
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_invalid_resume_id_is_rejected(bus):
+    with pytest.raises(ValueError):
+        await bus.subscribe("channel:1", "events:1", after_id="not-an-id")
+
+
+@pytest.mark.asyncio
+async def test_session_manager_callback_events_round_trip(session_manager, bus, server):
+    subscription = await session_manager.subscribe_callback_channel(7)
+    event = SimpleNamespace(to_dict=lambda: {"type": "done", "subtask_id": 7})
+
+    assert await session_manager.publish_callback_event(7, event) is True
+
+    received = await subscription.get(timeout=1.0)
+    assert json.loads(received.data) == {"type": "done", "subtask_id": 7}
+    # Callback events are only published, never recorded
+    assert received.id is None
+    assert server.streams == {}
+    await subscription.close()
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_session_manager_streaming_done_is_replayable(session_manager, bus):
+    await session_manager.publish_streaming_chunk(3, "hello")
+    await session_manager.publish_streaming_done(3, {"value": 1})
+    await bus.flush()
+
+    subscription = await session_manager.subscribe_streaming_channel(3, after_id="0")
+
+    assert (await subscription.get(timeout=1.0)).data == "hello"
+    done = json.loads((await subscription.get(timeout=1.0)).data)
+    assert done == {"__type__": "STREAM_DONE", "result": {"value": 1}}
+    await subscription.close()
+    await bus.close()
@@ -0,0 +1,146 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from app.api.ws.events import ServerEvents
+from app.services.chat.ws_emit_batcher import RoomEmitBatcher
+
+
+class RecordingEmit:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, Any, dict[str, Any]]] = []
+
+    async def __call__(self, event: str, data: Any, **kwargs: Any) -> None:
+        self.calls.append((event, data, kwargs))
+
+
+def _batcher(emit: RecordingEmit, window_ms: int = 20, max_events: int = 50):
+    return RoomEmitBatcher(emit, window_ms=window_ms, max_events=max_events)
+
+
+@pytest.mark.unit
+class TestRoomEmitBatcher:
+    @pytest.mark.asyncio
+    async def test_events_for_one_room_share_a_frame(self):
+        emit = RecordingEmit()
+        batcher = _batcher(emit)
+
+        for block_id in ("b1", "b2"):
+            await batcher.emit(
+                ServerEvents.CHAT_BLOCK_UPDATED,
+                {"task_id": 7, "block_id": block_id},
+                room="task:7",
+                namespace="/chat",
+            )
+        assert emit.calls == []
+
+        await asyncio.sleep(0.05)
+
+        assert emit.calls == [
+            (
+                ServerEvents.EVENTS_BATCH,
+                {
+                    "events": [
+                        {
+                            "event": ServerEvents.CHAT_BLOCK_UPDATED,
+                            "data": {"task_id": 7, "block_id": "b1"},
+                        },
+                        {
+                            "event": ServerEvents.CHAT_BLOCK_UPDATED,
+                            "data": {"task_id": 7, "block_id": "b2"},
+                        },
+                    ]
+                },
+                {"room": "task:7", "namespace": "/chat"},
+            )
+        ]
+
+    @pytest.mark.asyncio
+    async def test_single_event_window_is_sent_unwrapped(self):
+        emit = RecordingEmit()
+        batcher = _batcher(emit)
+
+        await batcher.emit(
+            ServerEvents.UNREAD_COUNT, {"count": 1}, room="user:1", namespace="/chat"
+        )
+        await batcher.flush_all()
+
+        assert [(event, data) for event, data, _ in emit.calls] == [
+            (ServerEvents.UNREAD_COUNT, {"count": 1})
+        ]
+
+    @pytest.mark.asyncio
+    async def test_lifecycle_event_flushes_pending_room_first(self):
+        emit = RecordingEmit()
+        batcher = _batcher(emit, window_ms=1000)
+
+        await batcher.emit(
+            ServerEvents.CHAT_BLOCK_UPDATED,
+            {"block_id": "b1"},
+            room="task:7",
+            namespace="/chat",
+        )
+        await batcher.emit(
+            ServerEvents.TASK_STATUS,
+            {"task_id": 9, "status": "RUNNING"},
+            room="user:1",
+            namespace="/chat",
+        )
+        await batcher.emit(
+            ServerEvents.CHAT_DONE, {"task_id": 7}, room="task:7", namespace="/chat"
+        )
+
+        assert [(event, kwargs["room"]) for event, _, kwargs in emit.calls] == [
+            (ServerEvents.CHAT_BLOCK_UPDATED, "task:7"),
+            (ServerEvents.CHAT_DONE, "task:7"),
+        ]
+        await batcher.flush_all()
+        assert emit.calls[-1][0] == ServerEvents.TASK_STATUS
+
+    @pytest.mark.asyncio
+    async def test_snapshot_events_supersede_pending_copies(self):
+        emit = RecordingEmit()
+        batcher = _batcher(emit, window_ms=1000)
+
+        for payload in (
+            (ServerEvents.UNREAD_COUNT, {"count": 1}),
+            (ServerEvents.TASK_STATUS, {"task_id": 1, "status": "RUNNING"}),
+            (ServerEvents.TASK_STATUS, {"task_id": 2, "status": "RUNNING"}),
+            (ServerEvents.UNREAD_COUNT, {"count": 2}),
+            (ServerEvents.TASK_STATUS, {"task_id": 1, "status": "COMPLETED"}),
+        ):
+            await batcher.emit(*payload, room="user:1", namespace="/chat")
+        await batcher.flush_all()
+
+        (call,) = emit.calls
+        assert call[0] == ServerEvents.EVENTS_BATCH
+        assert [(item["event"], item["data"]) for item in call[1]["events"]] == [
+            (ServerEvents.TASK_STATUS, {"task_id": 2, "status": "RUNNING"}),
+            (ServerEvents.UNREAD_COUNT, {"count": 2}),
+            (ServerEvents.TASK_STATUS, {"task_id": 1, "status": "COMPLETED"}),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_full_frame_and_disabled_window_send_immediately(self):
+        emit = RecordingEmit()
+        batcher = _batcher(emit, window_ms=1000, max_events=2)
+        for block_id in ("b1", "b2"):
+            await batcher.emit(
+                ServerEvents.CHAT_BLOCK_CREATED,
+                {"block": {"id": block_id}},
+                room="task:7",
+                namespace="/chat",
+            )
+        assert [event for event, _, _ in emit.calls] == [ServerEvents.EVENTS_BATCH]
+
+        emit = RecordingEmit()
+        batcher = _batcher(emit, window_ms=0)
+        await batcher.emit(
+            ServerEvents.UNREAD_COUNT, {"count": 3}, room="user:1", namespace="/chat"
+        )
+        assert [event for event, _, _ in emit.calls] == [ServerEvents.UNREAD_COUNT]
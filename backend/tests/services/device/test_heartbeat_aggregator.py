@@ -0,0 +1,192 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import copy
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.device import local_provider
+from app.services.device.heartbeat_aggregator import (
+    DeviceHeartbeat,
+    HeartbeatAggregator,
+)
+from app.services.device.local_provider import LocalDeviceProvider
+
+
+class _RecordingCache:
+    def __init__(self) -> None:
+        self.values: dict[str, dict] = {}
+        self.mget_calls: list[list[str]] = []
+        self.set_many_calls: list[dict[str, dict]] = []
+
+    async def get(self, key: str):
+        value = self.values.get(key)
+        return copy.deepcopy(value) if value is not None else None
+
+    async def set(self, key: str, value: dict, expire: int | None = None) -> bool:
+        self.values[key] = copy.deepcopy(value)
+        return True
+
+    async def mget(self, keys: list[str]) -> dict[str, dict]:
+        self.mget_calls.append(list(keys))
+        return {
+            key: copy.deepcopy(self.values[key]) for key in keys if key in self.values
+        }
+
+    async def set_many(
+        self, items: dict[str, dict], expire: int | None = None
+    ) -> dict[str, bool]:
+        self.set_many_calls.append(copy.deepcopy(items))
+        self.values.update(copy.deepcopy(items))
+        return {key: True for key in items}
+
+
+@pytest.fixture
+def cache(monkeypatch) -> _RecordingCache:
+    cache = _RecordingCache()
+    monkeypatch.setattr(local_provider, "cache_manager", cache)
+    return cache
+
+
+def _online(cache: _RecordingCache, device_id: str, socket_id: str, **fields) -> str:
+    key = LocalDeviceProvider.generate_online_key(7, device_id)
+    cache.values[key] = {"socket_id": socket_id, "status": "online", **fields}
+    return key
+
+
+def _aggregator(interval_ms: int = 0) -> tuple[HeartbeatAggregator, AsyncMock]:
+    on_slot_change = AsyncMock()
+    aggregator = HeartbeatAggregator(
+        interval_ms=interval_ms,
+        recover=AsyncMock(),
+        on_slot_change=on_slot_change,
+    )
+    return aggregator, on_slot_change
+
+
+@pytest.mark.asyncio
+async def test_heartbeats_are_coalesced_into_one_pipelined_write(cache) -> None:
+    first = _online(cache, "device-1", "sid-1")
+    second = _online(cache, "device-2", "sid-2")
+    aggregator, _ = _aggregator(interval_ms=10)
+
+    await aggregator.submit(DeviceHeartbeat(7, "device-1", "sid-1", [1]))
+    await aggregator.submit(DeviceHeartbeat(7, "device-1", "sid-1", [1, 2]))
+    await aggregator.submit(DeviceHeartbeat(7, "device-2", "sid-2", []))
+    await asyncio.sleep(0.05)
+
+    assert len(cache.mget_calls) == 1
+    assert len(cache.set_many_calls) == 1
+    assert set(cache.set_many_calls[0]) == {first, second}
+    assert cache.values[first]["running_task_ids"] == [1, 2]
+    assert cache.values[first]["socket_id"] == "sid-1"
+    assert "last_heartbeat" in cache.values[second]
+    assert aggregator.owner(7, "device-1") == "sid-1"
+
+
+@pytest.mark.asyncio
+async def test_slot_update_is_only_broadcast_when_slots_change(cache) -> None:
+    _online(cache, "device-1", "sid-1")
+    aggregator, on_slot_change = _aggregator()
+
+    await aggregator.submit(DeviceHeartbeat(7, "device-1", "sid-1", [3]))
+    await aggregator.submit(DeviceHeartbeat(7, "device-1", "sid-1", [3]))
+    assert on_slot_change.await_count == 1
+
+    await aggregator.submit(DeviceHeartbeat(7, "device-1", "sid-1", []))
+    assert on_slot_change.await_count == 2
+    on_slot_change.assert_awaited_with(7, "device-1")
+
+
+@pytest.mark.asyncio
+async def test_stale_heartbeat_is_not_written_and_updates_owner(cache) -> None:
+    key = _online(cache, "device-1", "sid-new", running_task_ids=[9])
+    aggregator, on_slot_change = _aggregator()
+    aggregator.remember_owner(7, "device-1", "sid-old")
+
+    await aggregator.submit(DeviceHeartbeat(7, "device-1", "sid-old", []))
+
+    assert cache.set_many_calls == [{}]
+    assert cache.values[key]["running_task_ids"] == [9]
+    assert aggregator.owner(7, "device-1") == "sid-new"
+    on_slot_change.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_missing_online_key_is_recovered(cache) -> None:
+    recover = AsyncMock()
+    on_slot_change = AsyncMock()
+    aggregator = HeartbeatAggregator(
+        interval_ms=0, recover=recover, on_slot_change=on_slot_change
+    )
+    heartbeat = DeviceHeartbeat(7, "device-1", "sid-1", [], device_name="Laptop")
+
+    await aggregator.submit(heartbeat)
+
+    recover.assert_awaited_once_with(heartbeat)
+    on_slot_change.assert_awaited_once_with(7, "device-1")
+
+
+@pytest.mark.asyncio
+async def test_discard_drops_pending_heartbeat_of_disconnected_socket(cache) -> None:
+    _online(cache, "device-1", "sid-1")
+    aggregator, _ = _aggregator(interval_ms=10)
+    aggregator.remember_owner(7, "device-1", "sid-1")
+
+    await aggregator.submit(DeviceHeartbeat(7, "device-1", "sid-1", [1]))
+    aggregator.discard(7, "device-1", "sid-1")
+    await asyncio.sleep(0.05)
+
+    assert cache.mget_calls == []
+    assert aggregator.owner(7, "device-1") is None
+
+
+@pytest.mark.asyncio
+async def test_disconnect_during_flush_does_not_revive_the_device(
+    cache, monkeypatch
+) -> None:
+    recover = AsyncMock()
+    on_slot_change = AsyncMock()
+    aggregator = HeartbeatAggregator(
+        interval_ms=0, recover=recover, on_slot_change=on_slot_change
+    )
+    aggregator.remember_owner(7, "device-1", "sid-1")
+    refresh_started = asyncio.Event()
+    release_refresh = asyncio.Event()
+
+    async def slow_refresh(heartbeats):
+        refresh_started.set()
+        await release_refresh.wait()
+        return [("missing", {}) for _ in heartbeats]
+
+    monkeypatch.setattr(
+        "app.services.device.heartbeat_aggregator.device_service."
+        "refresh_device_heartbeats",
+        slow_refresh,
+    )
+
+    flush = asyncio.create_task(
+        aggregator.submit(DeviceHeartbeat(7, "device-1", "sid-1", []))
+    )
+    await refresh_started.wait()
+    aggregator.discard(7, "device-1", "sid-1")
+    release_refresh.set()
+    await flush
+
+    recover.assert_not_awaited()
+    on_slot_change.assert_not_awaited()
+    assert aggregator.owner(7, "device-1") is None
+    assert aggregator._in_flight == {}
+
+
+@pytest.mark.asyncio
+async def test_disconnect_forgets_an_owner_learned_from_another_socket(cache) -> None:
+    aggregator, _ = _aggregator()
+    aggregator.remember_owner(7, "device-1", "sid-other-replica")
+
+    aggregator.discard(7, "device-1", "sid-1")
+
+    assert aggregator.owner(7, "device-1") is None
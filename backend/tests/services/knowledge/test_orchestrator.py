@@ -2087,3 +2087,137 @@ class TestListDocumentsCreatedBy:
         assert result.offset == 1
         assert result.limit == 1
         assert result.has_more is True
+
+
+class TestRefreshWebDocument:
+    """Tests for conditional web document refresh."""
+
+    @staticmethod
+    def _document(**source_config):
+        return SimpleNamespace(
+            id=7,
+            kind_id=10,
+            name="page.md",
+            origin="user",
+            attachment_id=42,
+            is_active=True,
+            index_status="success",
+            source_type=DocumentSourceType.WEB.value,
+            source_config={"url": "https://example.com/page", **source_config},
+            file_size=10,
+            clear_processing_error_payload=MagicMock(),
+        )
+
+    @staticmethod
+    def _scraped(content_hash):
+        from datetime import datetime
+
+        return SimpleNamespace(
+            success=True,
+            content="# Page",
+            url="https://example.com/page",
+            scraped_at=datetime(2026, 10, 1),
+            title="Page",
+            description=None,
+            etag='"v2"',
+            last_modified=None,
+            content_hash=content_hash,
+        )
+
+    async def _refresh(self, document, scraper):
+        orchestrator = KnowledgeOrchestrator()
+        db = MagicMock()
+        with (
+            patch(
+                "app.services.knowledge.orchestrator.KnowledgeService.get_document",
+                return_value=document,
+            ),
+            patch(
+                "app.services.knowledge.orchestrator.KnowledgeService._assert_can_manage_document"
+            ),
+            patch(
+                "app.services.knowledge.orchestrator.KnowledgeService.get_knowledge_base",
+                return_value=(MagicMock(), True),
+            ),
+            patch(
+                "app.services.web_scraper.get_web_scraper_service",
+                return_value=scraper,
+            ),
+            patch(
+                "app.services.knowledge.orchestrator.KnowledgeDocumentResponse"
+            ) as response_model,
+            patch.object(orchestrator, "_schedule_indexing_celery") as schedule,
+            patch.object(
+                context_service,
+                "overwrite_attachment_internal",
+                return_value=(MagicMock(id=42), None),
+            ) as overwrite,
+        ):
+            response_model.model_validate.side_effect = lambda doc: doc
+            result = await orchestrator.refresh_web_document(
+                db=db, user=SimpleNamespace(id=1), document_id=document.id
+            )
+        return result, schedule, overwrite
+
+    @staticmethod
+    def _scraper(status, scraped=None):
+        from app.services.web_scraper.freshness import FreshnessCheck, PageValidators
+
+        scraper = MagicMock()
+        scraper.check_for_changes = AsyncMock(
+            return_value=FreshnessCheck(
+                status=status, validators=PageValidators(etag='"v1"')
+            )
+        )
+        scraper.scrape_url = AsyncMock(return_value=scraped)
+        return scraper
+
+    @pytest.mark.asyncio
+    async def test_not_modified_page_skips_scrape_and_indexing(self):
+        from app.services.web_scraper.freshness import FreshnessStatus
+
+        document = self._document(etag='"v1"', content_hash="abc")
+        scraper = self._scraper(FreshnessStatus.NOT_MODIFIED)
+
+        result, schedule, overwrite = await self._refresh(document, scraper)
+
+        assert result["success"] is True
+        assert result["unchanged"] is True
+        scraper.check_for_changes.assert_awaited_once()
+        assert scraper.check_for_changes.await_args.args[1].etag == '"v1"'
+        scraper.scrape_url.assert_not_awaited()
+        schedule.assert_not_called()
+        overwrite.assert_not_called()
+        assert "checked_at" in document.source_config
+
+    @pytest.mark.asyncio
+    async def test_identical_content_is_not_reindexed(self):
+        from app.services.web_scraper.freshness import FreshnessStatus
+
+        document = self._document(content_hash="abc")
+        scraper = self._scraper(FreshnessStatus.UNKNOWN, self._scraped("abc"))
+
+        result, schedule, overwrite = await self._refresh(document, scraper)
+
+        assert result["unchanged"] is True
+        scraper.scrape_url.assert_awaited_once()
+        schedule.assert_not_called()
+        overwrite.assert_not_called()
+        assert document.is_active is True
+        assert document.source_config["etag"] == '"v2"'
+
+    @pytest.mark.asyncio
+    async def test_changed_content_is_stored_and_reindexed(self):
+        from app.services.web_scraper.freshness import FreshnessStatus
+
+        document = self._document(content_hash="abc")
+        scraper = self._scraper(FreshnessStatus.MODIFIED, self._scraped("def"))
+
+        result, schedule, overwrite = await self._refresh(document, scraper)
+
+        assert result["success"] is True
+        assert "unchanged" not in result
+        overwrite.assert_called_once()
+        schedule.assert_called_once()
+        assert document.is_active is False
+        assert document.source_config["content_hash"] == "def"
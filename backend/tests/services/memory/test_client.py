@@ -9,7 +9,11 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import aiohttp
 import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 
+from app.core.config import settings
+from app.services.memory import client as client_module
 from app.services.memory.client import LongTermMemoryClient
 from app.services.memory.schemas import MemorySearchResponse, MemorySearchResult
 
@@ -141,3 +145,99 @@ async def test_delete_memory_not_found(memory_client) -> None:
         result = await memory_client.delete_memory("non-existent-id")
 
         assert result is False
+
+
+class StubMemoryServer:
+    """Local mem0 stub recording deletes and peak concurrency."""
+
+    def __init__(self, *, batch: bool, fail_once: tuple = ()):
+        self.batch = batch
+        self.fail_once = set(fail_once)
+        self.deleted = []
+        self.batch_requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_delete("/memories/{memory_id}", self.delete_one)
+        if self.batch:
+            app.router.add_delete("/batch", self.delete_batch)
+        return app
+
+    async def delete_one(self, request: web.Request) -> web.Response:
+        memory_id = request.match_info["memory_id"]
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if memory_id in self.fail_once:
+                self.fail_once.discard(memory_id)
+                return web.Response(status=500, text="busy")
+            self.deleted.append(memory_id)
+            return web.json_response({"message": "deleted"})
+        finally:
+            self.in_flight -= 1
+
+    async def delete_batch(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.batch_requests += 1
+        self.deleted.extend(item["memory_id"] for item in body["memories"])
+        return web.json_response({"message": "deleted"})
+
+
+async def _bulk_delete(stub: StubMemoryServer, memory_ids, monkeypatch):
+    monkeypatch.setattr(settings, "MEMORY_DELETE_CONCURRENCY", 4)
+    monkeypatch.setattr(client_module, "BULK_DELETE_RETRY_BACKOFF_SECONDS", 0)
+    async with TestServer(stub.app()) as server:
+        client = LongTermMemoryClient(base_url=str(server.make_url("")))
+        return client, await client.delete_memories(memory_ids)
+
+
+@pytest.mark.asyncio
+async def test_delete_memories_uses_batch_endpoint(monkeypatch) -> None:
+    """Batch-capable services receive one request per 1000 memories."""
+    stub = StubMemoryServer(batch=True)
+    memory_ids = [f"mem-{i}" for i in range(1500)]
+
+    client, result = await _bulk_delete(stub, memory_ids, monkeypatch)
+
+    assert result.deleted == 1500 and result.failed == []
+    assert stub.batch_requests == 2
+    assert stub.deleted == memory_ids
+    assert client._batch_delete_supported is True
+
+
+@pytest.mark.asyncio
+async def test_delete_memories_falls_back_to_bounded_concurrent_deletes(
+    monkeypatch,
+) -> None:
+    """Without a batch endpoint, single deletes run concurrently up to the limit."""
+    stub = StubMemoryServer(batch=False)
+    memory_ids = [f"mem-{i}" for i in range(40)]
+
+    client, result = await _bulk_delete(stub, memory_ids, monkeypatch)
+
+    assert result.deleted == 40 and result.failed == []
+    assert sorted(stub.deleted) == sorted(memory_ids)
+    assert 1 < stub.peak_in_flight <= 4
+    assert client._batch_delete_supported is False
+
+
+@pytest.mark.asyncio
+async def test_delete_memories_retries_failed_deletes(monkeypatch) -> None:
+    """Deletes that fail are retried; persistent failures are reported."""
+    stub = StubMemoryServer(batch=False, fail_once=("mem-1", "mem-2"))
+    monkeypatch.setattr(settings, "MEMORY_DELETE_RETRIES", 1)
+
+    _, result = await _bulk_delete(stub, ["mem-0", "mem-1", "mem-2"], monkeypatch)
+
+    assert result.deleted == 3 and result.failed == []
+    assert sorted(stub.deleted) == ["mem-0", "mem-1", "mem-2"]
+
+    stub = StubMemoryServer(batch=False, fail_once=("mem-1",))
+    monkeypatch.setattr(settings, "MEMORY_DELETE_RETRIES", 0)
+
+    _, result = await _bulk_delete(stub, ["mem-0", "mem-1"], monkeypatch)
+
+    assert result.deleted == 1 and result.failed == ["mem-1"]
@@ -8,6 +8,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.services.memory.client import BulkDeleteResult
 from app.services.memory.manager import MemoryManager
 from app.services.memory.schemas import MemorySearchResponse, MemorySearchResult
 
@@ -243,7 +244,7 @@ async def test_cleanup_task_memories(memory_manager):
             ),
         ]
     )
-    mock_client.delete_memory.return_value = True
+    mock_client.delete_memories.return_value = BulkDeleteResult(deleted=2)
 
     memory_manager._client = mock_client
 
@@ -252,7 +253,7 @@ async def test_cleanup_task_memories(memory_manager):
     )
 
     assert deleted_count == 2
-    assert mock_client.delete_memory.call_count == 2
+    mock_client.delete_memories.assert_awaited_once_with(["mem-1", "mem-2"])
     # Verify search_memories was called with correct parameters
     mock_client.search_memories.assert_called()
     call_args = mock_client.search_memories.call_args
@@ -275,7 +276,7 @@ async def test_cleanup_task_memories_no_memories(memory_manager):
     )
 
     assert deleted_count == 0
-    mock_client.delete_memory.assert_not_called()
+    mock_client.delete_memories.assert_not_called()
 
 
 def test_inject_memories_to_prompt(memory_manager):
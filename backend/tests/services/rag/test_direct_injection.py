@@ -22,6 +22,19 @@ def set_auto_direct_injection_enabled_by_default(monkeypatch):
     )
 
 
+@pytest.fixture(autouse=True)
+def disable_direct_injection_bundles(monkeypatch):
+    """Route from the stubbed estimates and document reads below.
+
+    These tests run on MagicMock sessions, which the bundle generation query
+    cannot run against; bundle routing is covered in
+    test_direct_injection_bundle.py.
+    """
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "RAG_DIRECT_INJECTION_BUNDLE_ENABLED", False)
+
+
 @pytest.mark.unit
 class TestGetOriginalDocumentsFromKnowledgeBase:
     """Tests for get_original_documents_from_knowledge_base method."""
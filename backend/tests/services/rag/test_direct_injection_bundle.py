@@ -0,0 +1,296 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for precomputed direct-injection bundles."""
+
+from contextlib import nullcontext
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.models.knowledge import KnowledgeDocument
+from app.services.rag import direct_injection_bundle as bundle_module
+from app.services.rag import retrieval_service as retrieval_module
+from app.services.rag.direct_injection_bundle import DirectInjectionBundleStore
+from app.services.rag.retrieval_service import RetrievalService
+from app.tasks import knowledge_tasks
+from shared.models import RetrievalScope
+
+
+class FakeRedis:
+    def __init__(self):
+        self.hashes = {}
+
+    def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    def hmget(self, key, fields):
+        return [self.hashes.get(key, {}).get(field) for field in fields]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.hashes:
+            return None
+        self.hashes[key] = value
+        return True
+
+    def delete(self, key):
+        return int(self.hashes.pop(key, None) is not None)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def delete(self, key):
+        self.commands.append(lambda: self.redis.hashes.pop(key, None))
+
+    def hset(self, key, mapping):
+        self.commands.append(
+            lambda: self.redis.hashes.setdefault(key, {}).update(mapping)
+        )
+
+    def expire(self, key, ttl):
+        self.commands.append(lambda: None)
+
+    def execute(self):
+        for command in self.commands:
+            command()
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    KnowledgeDocument.__table__.create(engine)
+    with sessionmaker(bind=engine)() as session:
+        yield session
+
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.setattr(settings, "RAG_DIRECT_INJECTION_BUNDLE_ENABLED", True)
+    store = DirectInjectionBundleStore(client=FakeRedis())
+    monkeypatch.setattr(retrieval_module, "direct_injection_bundle_store", store)
+    monkeypatch.setattr(bundle_module, "direct_injection_bundle_store", store)
+    return store
+
+
+def _add_document(db, kind_id, name, **kwargs):
+    document = KnowledgeDocument(
+        kind_id=kind_id,
+        attachment_id=0,
+        name=name,
+        file_extension=".md",
+        user_id=1,
+        is_active=True,
+        **kwargs,
+    )
+    db.add(document)
+    db.commit()
+    return document
+
+
+def _record(document_id, content, kb_id=1):
+    return {
+        "content": content,
+        "score": 1.0,
+        "title": f"doc-{document_id}.md",
+        "metadata": {"document_id": document_id, "total_length": len(content)},
+        "knowledge_base_id": kb_id,
+    }
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = RetrievalService()
+    reads = MagicMock(
+        side_effect=lambda knowledge_base_ids, db, document_ids=None: [
+            _record(100 + kb_id, "x" * 400, kb_id) for kb_id in knowledge_base_ids
+        ]
+    )
+    estimates = MagicMock(return_value=300)
+    monkeypatch.setattr(service, "_read_original_documents", reads)
+    monkeypatch.setattr(
+        RetrievalService, "_estimate_total_tokens_for_knowledge_bases", estimates
+    )
+    service.reads, service.estimates = reads, estimates
+    return service
+
+
+@pytest.mark.asyncio
+async def test_repeated_turns_reuse_the_bundle(db, store, service):
+    _add_document(db, 1, "a.md")
+
+    first = await service.retrieve_with_routing(
+        query="q", knowledge_base_ids=[1], db=db, context_window=128000
+    )
+    second = await service.retrieve_with_routing(
+        query="q", knowledge_base_ids=[1], db=db, context_window=128000
+    )
+
+    assert first["mode"] == second["mode"] == "direct_injection"
+    assert second["records"] == first["records"]
+    assert second["total_estimated_tokens"] == (
+        RetrievalService._estimate_direct_injection_tokens(first["records"])
+    )
+    assert service.reads.call_count == 1
+    assert service.estimates.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_document_changes_rebuild_the_bundle(db, store, service):
+    document = _add_document(db, 1, "a.md")
+    await service.retrieve_with_routing(
+        query="q", knowledge_base_ids=[1], db=db, context_window=128000
+    )
+
+    document.index_generation = (document.index_generation or 0) + 1
+    db.commit()
+    await service.retrieve_with_routing(
+        query="q", knowledge_base_ids=[1], db=db, context_window=128000
+    )
+
+    _add_document(db, 1, "b.md")
+    await service.retrieve_with_routing(
+        query="q", knowledge_base_ids=[1], db=db, context_window=128000
+    )
+
+    assert service.reads.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_multiple_kbs_compose_per_kb_bundles_in_request_order(db, store, service):
+    _add_document(db, 1, "a.md")
+    _add_document(db, 2, "b.md")
+    service.warm_direct_injection_bundles(db, [1])
+
+    result = await service.retrieve_with_routing(
+        query="q", knowledge_base_ids=[2, 1], db=db, context_window=128000
+    )
+
+    assert [record["knowledge_base_id"] for record in result["records"]] == [2, 1]
+    # KB 1 was warmed ahead of the turn; only KB 2 is read during it
+    assert service.reads.call_count == 2
+    assert service.reads.call_args.kwargs["knowledge_base_ids"] == [2]
+
+
+@pytest.mark.asyncio
+async def test_document_scope_uses_its_own_bundle(db, store, service):
+    first = _add_document(db, 1, "a.md")
+    _add_document(db, 1, "b.md")
+    scope = RetrievalScope(document_ids=[first.id])
+
+    for _ in range(2):
+        await service.retrieve_with_routing(
+            query="q",
+            knowledge_base_ids=[1],
+            db=db,
+            scope=scope,
+            context_window=128000,
+        )
+
+    assert service.reads.call_count == 1
+    assert service.reads.call_args.kwargs["document_ids"] == [first.id]
+
+
+@pytest.mark.asyncio
+async def test_truncated_scope_falls_back_to_rag_without_rereading(
+    db, store, service, monkeypatch
+):
+    _add_document(db, 1, "a.md")
+    service.reads.side_effect = None
+    service.reads.return_value = None
+    monkeypatch.setattr(
+        service, "_do_rag_retrieval", MagicMock(side_effect=_fake_rag_retrieval)
+    )
+
+    for _ in range(2):
+        result = await service.retrieve_with_routing(
+            query="q", knowledge_base_ids=[1], db=db, context_window=128000
+        )
+        assert result["mode"] == "rag_retrieval"
+
+    assert service.reads.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_large_scopes_store_routing_totals_only(db, store, service, monkeypatch):
+    _add_document(db, 1, "a.md")
+    monkeypatch.setattr(settings, "RAG_DIRECT_INJECTION_BUNDLE_MAX_TOKENS", 100)
+    monkeypatch.setattr(
+        service, "_do_rag_retrieval", MagicMock(side_effect=_fake_rag_retrieval)
+    )
+
+    for _ in range(2):
+        assert (
+            service.decide_route_mode_for_chat_shell(
+                query="q", knowledge_base_ids=[1], db=db, context_window=128000
+            )
+            == "direct_injection"
+        )
+
+    assert service.estimates.call_count == 1
+    assert service.reads.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_finished_indexing_warms_each_kb_bundle_once_per_window(
+    db, store, service, monkeypatch
+):
+    _add_document(db, 1, "a.md")
+    _add_document(db, 1, "b.md")
+    # The warm-up task builds bundles on its own service instance
+    monkeypatch.setattr(RetrievalService, "_read_original_documents", service.reads)
+    monkeypatch.setattr(knowledge_tasks, "SessionLocal", lambda: nullcontext(db))
+
+    with patch.object(
+        knowledge_tasks.warm_direct_injection_bundle_task, "apply_async"
+    ) as apply_async:
+        # A bulk import finishing several documents schedules a single warm-up
+        for _ in range(3):
+            knowledge_tasks._schedule_direct_injection_bundle_warm(1)
+        apply_async.assert_called_once_with(
+            args=[1],
+            countdown=settings.RAG_DIRECT_INJECTION_BUNDLE_WARM_DELAY_SECONDS,
+        )
+
+        knowledge_tasks.warm_direct_injection_bundle_task.run(1)
+        assert service.reads.call_count == 1
+
+        # Documents finishing after the warm-up started schedule the next one
+        knowledge_tasks._schedule_direct_injection_bundle_warm(1)
+        assert apply_async.call_count == 2
+
+    result = await service.retrieve_with_routing(
+        query="q", knowledge_base_ids=[1], db=db, context_window=128000
+    )
+    assert result["mode"] == "direct_injection"
+    assert service.reads.call_count == 1
+
+
+def test_warm_up_skips_kbs_above_the_direct_injection_limit(
+    db, store, service, monkeypatch
+):
+    _add_document(db, 1, "a.md")
+    monkeypatch.setattr(settings, "RAG_DIRECT_INJECTION_BUNDLE_MAX_TOKENS", 100)
+
+    service.warm_direct_injection_bundles(db, [1])
+
+    assert service.reads.call_count == 0
+    assert store.kb_key(1) not in store._client.hashes
+
+
+async def _fake_rag_retrieval(**kwargs):
+    return {
+        "mode": "rag_retrieval",
+        "records": [],
+        "total": 0,
+        "total_estimated_tokens": 0,
+    }
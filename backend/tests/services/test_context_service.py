@@ -1497,6 +1497,13 @@ class TestContextServiceFormatting:
 class TestContextServiceOverwrite:
     """Test attachment overwrite functionality"""
 
+    @pytest.fixture(autouse=True)
+    def disable_parse_cache(self, monkeypatch):
+        """These tests stub parser.parse, so a shared Redis must not answer."""
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "ATTACHMENT_PARSE_CACHE_ENABLED", False)
+
     def test_overwrite_attachment_updates_existing_context(self):
         """Test overwriting an attachment updates metadata and storage data."""
         import sys
@@ -39,6 +39,7 @@ from app.services.loop_item_executions.service import (
     TaskContext,
     WeworkRuntimeConfigurationError,
     execution_display_state,
+    execution_scheduler_index,
     loop_item_execution_service,
 )
 from app.services.loop_items.external_provider import external_loop_item_provider
@@ -2614,6 +2615,134 @@ def test_single_claim_prefers_the_least_active_robot_within_priority(
     assert second_claim is not None and second_claim.id == second.id
 
 
+def _claim_next_cloud(db: Session, user: User, *, capacity: int = 4):
+    return loop_item_execution_service.claim_next_for_device(
+        db,
+        execution_device_id="cloud-device-1",
+        environment="cloud",
+        runtime_instance_id="runtime-1",
+        device_capacity=capacity,
+        runtime_active=0,
+        runtime_active_task_ids=set(),
+        owner_user_id=user.id,
+    )
+
+
+def test_device_claim_index_merges_runs_queued_after_it_loaded(
+    test_db: Session, test_user: User
+) -> None:
+    project = _make_project(test_db, test_user)
+    first_bot = _make_bot(test_db, project, test_user)
+    second_bot = _make_bot(test_db, project, test_user)
+    _make_execution(
+        test_db, _make_item(test_db, project, test_user), first_bot, test_user
+    )
+    assert _claim_next_cloud(test_db, test_user) is not None
+
+    _make_execution(
+        test_db,
+        _make_item(test_db, project, test_user, title="Medium"),
+        second_bot,
+        test_user,
+    )
+    urgent = _make_execution(
+        test_db,
+        _make_item(test_db, project, test_user, title="Urgent"),
+        second_bot,
+        test_user,
+        priority="urgent",
+    )
+
+    claimed = _claim_next_cloud(test_db, test_user)
+    assert claimed is not None and claimed.id == urgent.id
+
+
+def test_device_claim_index_skips_runs_taken_by_another_worker(
+    test_db: Session, test_user: User
+) -> None:
+    project = _make_project(test_db, test_user)
+    bots = [_make_bot(test_db, project, test_user) for _ in range(3)]
+    executions = [
+        _make_execution(
+            test_db,
+            _make_item(test_db, project, test_user, title=f"Run {index}"),
+            bot,
+            test_user,
+        )
+        for index, bot in enumerate(bots)
+    ]
+    assert _claim_next_cloud(test_db, test_user).id == executions[0].id
+
+    # Another worker claims the next run directly; the index still lists it
+    test_db.query(LoopItemExecution).filter(
+        LoopItemExecution.id == executions[1].id
+    ).update({"status": "running", "runtime_instance_id": "runtime-1"})
+    test_db.commit()
+
+    claimed = _claim_next_cloud(test_db, test_user)
+    assert claimed is not None and claimed.id == executions[2].id
+    assert _claim_next_cloud(test_db, test_user) is None
+
+
+def test_device_claim_index_rechecks_robot_limit_against_database(
+    test_db: Session, test_user: User
+) -> None:
+    project = _make_project(test_db, test_user)
+    bot = _make_bot(test_db, project, test_user)
+    queued = [
+        _make_execution(
+            test_db,
+            _make_item(test_db, project, test_user, title=f"Run {index}"),
+            bot,
+            test_user,
+        )
+        for index in range(2)
+    ]
+    first = _claim_next_cloud(test_db, test_user)
+    assert first is not None and first.id == queued[0].id
+    assert _claim_next_cloud(test_db, test_user) is None
+
+    # Released by another worker: the index learns it on the next claim
+    test_db.query(LoopItemExecution).filter(LoopItemExecution.id == first.id).update(
+        {"status": "completed"}
+    )
+    test_db.commit()
+
+    claimed = _claim_next_cloud(test_db, test_user)
+    assert claimed is not None and claimed.id == queued[1].id
+
+
+def test_device_claim_index_waits_for_caller_owned_commit(
+    test_db: Session, test_user: User
+) -> None:
+    project = _make_project(test_db, test_user)
+    bot = _make_bot(test_db, project, test_user)
+    first, second = [
+        _make_execution(
+            test_db,
+            _make_item(test_db, project, test_user, title=f"Run {index}"),
+            bot,
+            test_user,
+        )
+        for index in range(2)
+    ]
+    assert _claim_next_cloud(test_db, test_user).id == first.id
+    pool_key = (test_user.id, "cloud-device-1", "cloud")
+    assert execution_scheduler_index.queued_count(pool_key) == 1
+
+    cancelled = loop_item_execution_service.cancel(
+        test_db, execution_id=second.id, commit=False
+    )
+    assert cancelled.status == "cancelled"
+    assert execution_scheduler_index.queued_count(pool_key) == 1
+    test_db.rollback()
+    assert execution_scheduler_index.queued_count(pool_key) == 1
+
+    loop_item_execution_service.cancel(test_db, execution_id=second.id, commit=False)
+    test_db.commit()
+    assert execution_scheduler_index.queued_count(pool_key) == 0
+
+
 def test_ambiguous_active_capacity_identity_blocks_new_claims(
     test_db: Session, test_user: User
 ) -> None:
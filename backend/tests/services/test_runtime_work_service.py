@@ -16,6 +16,14 @@ from app.models.project import Project
 from app.models.task import TaskResource
 
 
+@pytest.fixture
+def disable_runtime_work_snapshots(monkeypatch):
+    """List over the stubbed runtime RPCs, not snapshots left in a shared Redis."""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "RUNTIME_WORK_SNAPSHOT_ENABLED", False)
+
+
 def _project(test_db, user_id: int, name: str = "Wegent") -> Project:
     project = Project(
         user_id=user_id,
@@ -586,6 +594,7 @@ async def test_prepare_git_device_workspace_rejects_nonmatching_nonempty_directo
 
 
 @pytest.mark.asyncio
+@pytest.mark.usefixtures("disable_runtime_work_snapshots")
 async def test_list_runtime_work_groups_executor_workspaces_without_project_mapping(
     test_db,
     test_user,
@@ -731,6 +740,7 @@ async def test_list_runtime_work_groups_executor_workspaces_without_project_mapp
 
 
 @pytest.mark.asyncio
+@pytest.mark.usefixtures("disable_runtime_work_snapshots")
 async def test_list_runtime_work_keeps_empty_executor_workspaces(
     test_db,
     test_user,
@@ -789,6 +799,7 @@ async def test_list_runtime_work_keeps_empty_executor_workspaces(
 
 
 @pytest.mark.asyncio
+@pytest.mark.usefixtures("disable_runtime_work_snapshots")
 async def test_list_runtime_work_orders_local_devices_first_and_keeps_executor_order(
     test_db,
     test_user,
@@ -866,6 +877,7 @@ async def test_list_runtime_work_orders_local_devices_first_and_keeps_executor_o
 
 
 @pytest.mark.asyncio
+@pytest.mark.usefixtures("disable_runtime_work_snapshots")
 async def test_list_runtime_work_preserves_executor_workspace_kind(
     test_db,
     test_user,
@@ -1065,6 +1077,7 @@ async def test_search_runtime_work_queries_online_devices_concurrently(
 
 
 @pytest.mark.asyncio
+@pytest.mark.usefixtures("disable_runtime_work_snapshots")
 async def test_list_runtime_work_skips_offline_devices(
     test_db,
     test_user,
@@ -1101,6 +1114,7 @@ async def test_list_runtime_work_skips_offline_devices(
 
 
 @pytest.mark.asyncio
+@pytest.mark.usefixtures("disable_runtime_work_snapshots")
 async def test_list_runtime_work_queries_online_devices_concurrently(
     test_db,
     test_user,
@@ -0,0 +1,262 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for Redis-backed runtime work snapshots."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.config import settings
+from app.services import runtime_work_snapshot as snapshot_module
+from app.services.runtime_work_snapshot import RuntimeWorkSnapshotStore
+
+
+class FakeRedis:
+    """In-memory hashes and lists running the store's scripts in Python."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.lists = {}
+
+    async def eval(self, script, numkeys, *args):
+        keys, argv = args[:numkeys], args[numkeys:]
+        handler = {
+            snapshot_module._BEGIN_REFRESH_SCRIPT: self._begin_refresh,
+            snapshot_module._PUT_SCRIPT: self._put,
+            snapshot_module._APPEND_SCRIPT: self._append,
+            snapshot_module._INVALIDATE_SCRIPT: self._invalidate,
+        }[script]
+        return handler(keys, argv)
+
+    def _begin_refresh(self, keys, argv):
+        return int(self.hashes.setdefault(keys[0], {}).setdefault("version", "0"))
+
+    def _put(self, keys, argv):
+        listing, base = argv[0], int(argv[1])
+        snapshot = self.hashes.setdefault(keys[0], {})
+        snapshot.update({"listing": listing, "base": str(base)})
+        snapshot.setdefault("version", str(base))
+        if int(snapshot.get("stale", 0)) <= base:
+            snapshot.pop("stale", None)
+        self.lists[keys[1]] = [
+            entry
+            for entry in self.lists.get(keys[1], [])
+            if int(entry.partition("\n")[0]) > base
+        ]
+        return int(snapshot["version"])
+
+    def _append(self, keys, argv):
+        snapshot = self.hashes.get(keys[0])
+        if snapshot is None:
+            return 0
+        version = int(snapshot["version"]) + 1
+        snapshot["version"] = str(version)
+        entries = self.lists.setdefault(keys[1], [])
+        entries.append(f"{version}\n{argv[0]}")
+        if len(entries) > int(argv[1]):
+            del entries[: len(entries) - int(argv[1])]
+            snapshot["stale"] = str(version)
+        return version
+
+    def _invalidate(self, keys, argv):
+        snapshot = self.hashes.get(keys[0])
+        if snapshot is None:
+            return 0
+        version = int(snapshot["version"]) + 1
+        snapshot.update({"version": str(version), "stale": str(version)})
+        return version
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.reads = []
+
+    def hmget(self, key, fields):
+        snapshot = self.redis.hashes.get(key, {})
+        self.reads.append([snapshot.get(field) for field in fields])
+
+    def lrange(self, key, start, end):
+        self.reads.append(list(self.redis.lists.get(key, [])))
+
+    async def execute(self):
+        return self.reads
+
+
+DEVICE = {
+    "device_id": "device-1",
+    "name": "MacBook",
+    "status": "online",
+    "device_type": "local",
+}
+
+
+def _listing(*task_ids):
+    return {
+        "workspaces": [
+            {
+                "workspacePath": "/repo/Wegent",
+                "tasks": [
+                    {
+                        "taskId": task_id,
+                        "workspacePath": "/repo/Wegent",
+                        "title": task_id,
+                        "runtime": "codex",
+                        "running": False,
+                    }
+                    for task_id in task_ids
+                ],
+            }
+        ]
+    }
+
+
+@pytest.fixture
+def store(monkeypatch):
+    from app.services import runtime_work_service
+
+    monkeypatch.setattr(settings, "RUNTIME_WORK_SNAPSHOT_ENABLED", True)
+    store = RuntimeWorkSnapshotStore(client=FakeRedis())
+    monkeypatch.setattr(runtime_work_service, "runtime_work_snapshot_store", store)
+    monkeypatch.setattr(
+        runtime_work_service.device_service,
+        "get_all_devices",
+        AsyncMock(return_value=[DEVICE]),
+    )
+    return store
+
+
+@pytest.fixture
+def rpc(monkeypatch):
+    from app.services import runtime_work_service
+
+    rpc = AsyncMock(return_value=_listing("task-1"))
+    monkeypatch.setattr(runtime_work_service.runtime_rpc_service, "call", rpc)
+    return rpc
+
+
+async def _list(test_db, test_user):
+    from app.services import runtime_work_service
+
+    return await runtime_work_service.list_runtime_work(
+        db=test_db, user_id=test_user.id
+    )
+
+
+def _tasks(response):
+    return [
+        task
+        for project in response.projects
+        for workspace in project.device_workspaces
+        for task in workspace.tasks
+    ]
+
+
+@pytest.mark.asyncio
+async def test_repeated_lists_are_served_from_the_snapshot(
+    test_db, test_user, store, rpc
+):
+    first = await _list(test_db, test_user)
+    second = await _list(test_db, test_user)
+
+    assert rpc.await_count == 1
+    assert [task.local_task_id for task in _tasks(second)] == ["task-1"]
+    assert second.version == first.version == "device-1:0"
+
+
+@pytest.mark.asyncio
+async def test_task_patches_update_the_snapshot_without_rpc(
+    test_db, test_user, store, rpc
+):
+    await _list(test_db, test_user)
+
+    await store.apply_task_patch(test_user.id, "device-1", "task-1", {"running": True})
+    response = await _list(test_db, test_user)
+
+    assert rpc.await_count == 1
+    assert _tasks(response)[0].running is True
+    assert response.version == "device-1:1"
+
+
+@pytest.mark.asyncio
+async def test_invalidation_and_unknown_tasks_refresh_the_device(
+    test_db, test_user, store, rpc
+):
+    await _list(test_db, test_user)
+
+    await store.invalidate(test_user.id, "device-1")
+    rpc.return_value = _listing("task-1", "task-2")
+    await _list(test_db, test_user)
+    assert rpc.await_count == 2
+
+    await store.apply_task_patch(test_user.id, "device-1", "task-3", {"running": True})
+    rpc.return_value = _listing("task-1", "task-2", "task-3")
+    response = await _list(test_db, test_user)
+
+    assert rpc.await_count == 3
+    assert [task.local_task_id for task in _tasks(response)] == [
+        "task-1",
+        "task-2",
+        "task-3",
+    ]
+    # Served from the refreshed snapshot again
+    await _list(test_db, test_user)
+    assert rpc.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_patches_recorded_during_a_refresh_survive_it(store):
+    base = await store.begin_refresh(1, "device-1")
+    await store.apply_task_patch(1, "device-1", "task-1", {"title": "Renamed"})
+    await store.put(1, "device-1", _listing("task-1")["workspaces"], base)
+
+    snapshot = await store.get(1, "device-1")
+
+    assert snapshot.version == 1
+    assert snapshot.workspaces[0]["tasks"][0]["title"] == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_a_refresh_keeps_the_listing_stale(store):
+    base = await store.begin_refresh(1, "device-1")
+    await store.invalidate(1, "device-1")
+    await store.put(1, "device-1", _listing("task-1")["workspaces"], base)
+
+    assert await store.get(1, "device-1") is None
+
+
+@pytest.mark.asyncio
+async def test_mutating_runtime_rpcs_invalidate_the_device_snapshot(monkeypatch):
+    from app.services.device import runtime_rpc_service as module
+
+    invalidate = AsyncMock()
+    monkeypatch.setattr(
+        module, "runtime_work_snapshot_store", SimpleNamespace(invalidate=invalidate)
+    )
+    route = SimpleNamespace(
+        logical_device_id="device-1",
+        runtime_device_id="device-1",
+        socket_id="sid-1",
+    )
+    monkeypatch.setattr(
+        module.runtime_route_resolver, "resolve", AsyncMock(return_value=route)
+    )
+    monkeypatch.setattr(
+        module, "get_sio", lambda: SimpleNamespace(call=AsyncMock(return_value={}))
+    )
+    service = module.RuntimeRpcService()
+
+    await service.call(
+        user_id=1, device_id="device-1", method="runtime.tasks.list", payload={}
+    )
+    invalidate.assert_not_awaited()
+    await service.call(
+        user_id=1, device_id="device-1", method="runtime.tasks.rename", payload={}
+    )
+    invalidate.assert_awaited_once_with(1, "device-1")
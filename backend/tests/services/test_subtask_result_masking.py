@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert
+
+from app.models.subtask import Subtask, SubtaskRole, SubtaskStatus
+from app.schemas.subtask import SubtaskInDB
+from app.services.subtask_result_masking import (
+    backfill_masked_results,
+    masked_subtask_result,
+    subtask_result_masking_hooks,
+)
+from shared.utils.sensitive_data_masker import MASKING_RULES_VERSION
+
+SECRET = "ghp_" + "a" * 36
+LEAKY_RESULT = {"value": f"export GH_TOKEN={SECRET}"}
+
+
+@pytest.fixture
+def masking_hooks():
+    subtask_result_masking_hooks.register()
+    try:
+        yield subtask_result_masking_hooks
+    finally:
+        subtask_result_masking_hooks.unregister()
+
+
+def _subtask(status: SubtaskStatus, result) -> Subtask:
+    return Subtask(
+        user_id=1,
+        task_id=1,
+        team_id=1,
+        title="Run",
+        bot_ids=[],
+        role=SubtaskRole.ASSISTANT,
+        status=status,
+        result=result,
+    )
+
+
+def test_projection_is_stored_when_result_is_finalized(test_db, masking_hooks):
+    subtask = _subtask(SubtaskStatus.RUNNING, LEAKY_RESULT)
+    test_db.add(subtask)
+    test_db.commit()
+    assert subtask.result_mask_version == 0
+    assert subtask.masked_result is None
+
+    subtask.status = SubtaskStatus.COMPLETED
+    test_db.commit()
+
+    assert subtask.result_mask_version == MASKING_RULES_VERSION
+    assert SECRET not in subtask.masked_result["value"]
+    assert masked_subtask_result(subtask) == subtask.masked_result
+    assert subtask.result == LEAKY_RESULT
+
+
+def test_clean_result_is_not_stored_twice(test_db, masking_hooks):
+    subtask = _subtask(SubtaskStatus.COMPLETED, {"value": "all tests passed"})
+    test_db.add(subtask)
+    test_db.commit()
+
+    assert subtask.result_mask_version == MASKING_RULES_VERSION
+    assert subtask.masked_result is None
+    assert masked_subtask_result(subtask) == {"value": "all tests passed"}
+
+
+def test_projection_is_dropped_when_result_changes_again(test_db, masking_hooks):
+    subtask = _subtask(SubtaskStatus.COMPLETED, LEAKY_RESULT)
+    test_db.add(subtask)
+    test_db.commit()
+
+    subtask.status = SubtaskStatus.RUNNING
+    subtask.result = {"value": f"token={SECRET}"}
+    test_db.commit()
+
+    assert subtask.result_mask_version == 0
+    assert subtask.masked_result is None
+    assert SECRET not in masked_subtask_result(subtask)["value"]
+
+
+def test_backfill_stores_projection_without_touching_updated_at(test_db):
+    updated_at = datetime(2026, 1, 1, 12, 0, 0)
+    test_db.execute(
+        insert(Subtask).values(
+            user_id=1,
+            task_id=1,
+            team_id=1,
+            title="Run",
+            bot_ids=[],
+            role=SubtaskRole.ASSISTANT,
+            status=SubtaskStatus.COMPLETED,
+            result=LEAKY_RESULT,
+            updated_at=updated_at,
+        )
+    )
+    test_db.commit()
+
+    assert backfill_masked_results(test_db, batch_size=10, max_batches=2) == 1
+    assert backfill_masked_results(test_db, batch_size=10, max_batches=2) == 0
+
+    subtask = test_db.query(Subtask).one()
+    test_db.refresh(subtask)
+    assert subtask.result_mask_version == MASKING_RULES_VERSION
+    assert SECRET not in subtask.masked_result["value"]
+    assert subtask.updated_at == updated_at
+
+
+def test_schema_serves_the_stored_projection(test_db, masking_hooks):
+    subtask = _subtask(SubtaskStatus.COMPLETED, LEAKY_RESULT)
+    test_db.add(subtask)
+    test_db.commit()
+    subtask.masked_result = {"value": "stored projection"}
+
+    dumped = SubtaskInDB.model_validate(subtask).model_dump()
+
+    assert dumped["result"] == {"value": "stored projection"}
+    assert "masked_result" not in dumped
+    assert "result_mask_version" not in dumped
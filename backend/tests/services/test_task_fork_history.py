@@ -8,7 +8,11 @@ import pytest
 
 from app.models.subtask import Subtask, SubtaskRole, SubtaskStatus
 from app.models.task import TaskResource
-from app.services.task_fork_history import task_fork_history_resolver
+from app.services.task_fork_history import (
+    ForkHistoryItem,
+    task_fork_history_resolver,
+    trim_to_message_groups,
+)
 
 
 def _task(task_id: int, user_id: int, fork: dict | None = None) -> TaskResource:
@@ -175,6 +179,73 @@ def test_resolve_for_fork_uses_parent_task_owner(monkeypatch):
     ] == [(1, 8, 1), (2, 7, 2)]
 
 
+def test_resolve_with_limit_loads_only_window_per_node(monkeypatch):
+    root = _task(1, 7)
+    fork = _task(
+        2,
+        7,
+        fork={"sourceTaskId": 1, "afterMessageId": 4, "rootTaskId": 1},
+    )
+    subtasks = {
+        1: [
+            _subtask(message_id, 1, 7, message_id, SubtaskRole.USER)
+            for message_id in range(1, 7)
+        ],
+        2: [
+            _subtask(10 + message_id, 2, 7, message_id, SubtaskRole.USER)
+            for message_id in range(5, 7)
+        ],
+    }
+    calls = []
+
+    def list_message_window(
+        _db,
+        *,
+        task_id,
+        limit,
+        before_message_id=None,
+        after_message_id=None,
+        max_message_id=None,
+        owner_user_id=None,
+    ):
+        calls.append((task_id, limit, before_message_id, max_message_id))
+        rows = [
+            subtask
+            for subtask in subtasks[task_id]
+            if (max_message_id is None or subtask.message_id <= max_message_id)
+            and (before_message_id is None or subtask.message_id < before_message_id)
+        ]
+        return rows[-limit:]
+
+    monkeypatch.setattr(
+        "app.services.task_fork_history.task_store.get_by_id",
+        lambda db, task_id, owner_user_id=None: {1: root, 2: fork}.get(task_id),
+    )
+    monkeypatch.setattr(
+        "app.services.task_fork_history.subtask_store.list_message_window",
+        list_message_window,
+    )
+    monkeypatch.setattr(
+        "app.services.task_fork_history.subtask_store.list_by_task_ordered",
+        lambda *args, **kwargs: pytest.fail("limited history should not load all"),
+    )
+
+    items = task_fork_history_resolver.resolve_for_task(
+        db=None,
+        task_id=2,
+        user_id=7,
+        before_message_id=6,
+        limit=3,
+    )
+
+    assert calls == [(1, 3, 6, 4), (2, 3, 6, None)]
+    assert [(item.origin_task_id, item.subtask.message_id) for item in items] == [
+        (1, 3),
+        (1, 4),
+        (2, 5),
+    ]
+
+
 def test_next_message_id_uses_inherited_boundary(monkeypatch):
     fork = _task(
         2,
@@ -196,6 +267,19 @@ def test_next_message_id_uses_inherited_boundary(monkeypatch):
     )
 
 
+def test_trim_to_message_groups_keeps_whole_messages():
+    items = [
+        ForkHistoryItem(
+            _subtask(index, 1, 7, message_id, SubtaskRole.ASSISTANT), False, 1, index
+        )
+        for index, message_id in enumerate([1, 2, 2, 3], start=1)
+    ]
+
+    assert [item.subtask.id for item in trim_to_message_groups(items, 2)] == [2, 3, 4]
+    assert [item.subtask.id for item in trim_to_message_groups(items, 1)] == [4]
+    assert trim_to_message_groups(items, 10) == items
+
+
 def test_resolver_rejects_cycles(monkeypatch):
     task = _task(
         1,
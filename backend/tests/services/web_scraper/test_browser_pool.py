@@ -0,0 +1,202 @@
+import asyncio
+from typing import Any
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.services.web_scraper.browser_pool import BrowserPool, ScrapePriority
+
+
+class FakeCrawler:
+    def __init__(self, number: int) -> None:
+        self.number = number
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class CrawlerFactory:
+    def __init__(self) -> None:
+        self.crawlers: list[FakeCrawler] = []
+
+    async def __call__(self) -> FakeCrawler:
+        crawler = FakeCrawler(len(self.crawlers))
+        self.crawlers.append(crawler)
+        return crawler
+
+
+def _pool(factory: CrawlerFactory, **kwargs: Any) -> BrowserPool:
+    options = {
+        "browsers": 1,
+        "pages_per_browser": 1,
+        "per_domain_limit": 10,
+        "recycle_after_pages": 0,
+        "memory_probe": lambda crawler: None,
+    }
+    options.update(kwargs)
+    return BrowserPool(factory, **options)
+
+
+async def _hold(
+    pool: BrowserPool,
+    url: str,
+    order: list[str],
+    release: asyncio.Event,
+    priority: ScrapePriority = ScrapePriority.INTERACTIVE,
+) -> None:
+    async with pool.lease(url, priority):
+        order.append(url)
+        await pool.leased_crawler()
+        await release.wait()
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_slots_bound_concurrent_scrapes_and_start_browsers_lazily() -> None:
+    factory = CrawlerFactory()
+    pool = _pool(factory, browsers=2, pages_per_browser=2)
+    order: list[str] = []
+    release = asyncio.Event()
+    pages_before = _sample("web_scraper_pool_pages_in_use")
+    browsers_before = _sample("web_scraper_pool_browsers_running")
+    waiting_before = _sample("web_scraper_pool_waiting", priority="interactive")
+
+    tasks = [
+        asyncio.create_task(_hold(pool, f"https://site{i}.test/", order, release))
+        for i in range(5)
+    ]
+    await _settle()
+
+    assert len(order) == 4
+    assert _sample("web_scraper_pool_pages_in_use") == pages_before + 4
+    assert _sample("web_scraper_pool_browsers_running") == browsers_before + 2
+    assert (
+        _sample("web_scraper_pool_waiting", priority="interactive")
+        == waiting_before + 1
+    )
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert len(order) == 5
+    assert len(factory.crawlers) == 2
+    assert _sample("web_scraper_pool_pages_in_use") == pages_before
+
+
+@pytest.mark.asyncio
+async def test_domain_limit_does_not_block_other_hosts() -> None:
+    pool = _pool(CrawlerFactory(), pages_per_browser=3, per_domain_limit=1)
+    order: list[str] = []
+    release = asyncio.Event()
+
+    tasks = [
+        asyncio.create_task(_hold(pool, url, order, release))
+        for url in (
+            "https://a.test/1",
+            "https://a.test/2",
+            "https://b.test/1",
+        )
+    ]
+    await _settle()
+
+    assert order == ["https://a.test/1", "https://b.test/1"]
+    release.set()
+    await asyncio.gather(*tasks)
+    assert order[-1] == "https://a.test/2"
+
+
+@pytest.mark.asyncio
+async def test_interactive_scrapes_are_served_before_bulk() -> None:
+    pool = _pool(CrawlerFactory())
+    order: list[str] = []
+    first, rest = asyncio.Event(), asyncio.Event()
+    rest.set()
+    waiting_before = {
+        priority: _sample("web_scraper_pool_waiting", priority=priority)
+        for priority in ("interactive", "bulk")
+    }
+
+    holder = asyncio.create_task(_hold(pool, "https://a.test/hold", order, first))
+    await _settle()
+    bulk = asyncio.create_task(
+        _hold(pool, "https://b.test/bulk", order, rest, ScrapePriority.BULK)
+    )
+    await _settle()
+    interactive = asyncio.create_task(_hold(pool, "https://c.test/ui", order, rest))
+    await _settle()
+    for priority in ("interactive", "bulk"):
+        assert (
+            _sample("web_scraper_pool_waiting", priority=priority)
+            == waiting_before[priority] + 1
+        )
+
+    first.set()
+    await asyncio.gather(holder, bulk, interactive)
+    assert order == ["https://a.test/hold", "https://c.test/ui", "https://b.test/bulk"]
+
+
+@pytest.mark.asyncio
+async def test_browsers_are_recycled_after_page_budget_and_memory_growth() -> None:
+    factory = CrawlerFactory()
+    pool = _pool(factory, recycle_after_pages=2)
+    for _ in range(3):
+        async with pool.lease("https://a.test/"):
+            await pool.leased_crawler()
+        await _settle()
+
+    assert factory.crawlers[0].closed is True
+    assert len(factory.crawlers) == 2
+
+    factory = CrawlerFactory()
+    pool = _pool(factory, max_rss_mb=100, memory_probe=lambda crawler: 200 * 2**20)
+    browsers_before = _sample("web_scraper_pool_browsers_running")
+    memory_recycles = _sample("web_scraper_pool_recycles_total", reason="memory")
+    async with pool.lease("https://a.test/"):
+        await pool.leased_crawler()
+    await _settle()
+    assert factory.crawlers[0].closed is True
+    assert _sample("web_scraper_pool_browsers_running") == browsers_before
+    assert (
+        _sample("web_scraper_pool_recycles_total", reason="memory")
+        == memory_recycles + 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiters_leave_the_queue() -> None:
+    pool = _pool(CrawlerFactory())
+    order: list[str] = []
+    release = asyncio.Event()
+    pages_before = _sample("web_scraper_pool_pages_in_use")
+    waiting_before = _sample("web_scraper_pool_waiting", priority="interactive")
+    holder = asyncio.create_task(_hold(pool, "https://a.test/", order, release))
+    await _settle()
+
+    waiter = asyncio.create_task(_hold(pool, "https://b.test/", order, release))
+    await _settle()
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert _sample("web_scraper_pool_waiting", priority="interactive") == (
+        waiting_before
+    )
+    release.set()
+    await holder
+    assert _sample("web_scraper_pool_pages_in_use") == pages_before
+
+
+@pytest.mark.asyncio
+async def test_crawler_requires_a_lease() -> None:
+    pool = _pool(CrawlerFactory())
+
+    with pytest.raises(RuntimeError):
+        await pool.leased_crawler()
@@ -0,0 +1,103 @@
+import httpx
+import pytest
+
+import app.services.web_scraper.freshness as freshness_module
+import app.services.web_scraper.security as security_module
+from app.services.web_scraper.freshness import (
+    ConditionalFetcher,
+    FreshnessStatus,
+    PageValidators,
+    content_fingerprint,
+)
+from app.services.web_scraper.proxy import ProxyMode, ProxyPlan
+from app.services.web_scraper.security import WebScraperUrlGuard
+
+VALIDATORS = PageValidators(etag='"v1"', last_modified="Mon, 05 Oct 2026 00:00:00 GMT")
+
+
+@pytest.fixture
+def serve(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(security_module, "_validate_url_for_ssrf", lambda url: True)
+    requests: list[httpx.Request] = []
+    real_client = httpx.AsyncClient
+
+    def install(handler):
+        def recording_handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return handler(request)
+
+        monkeypatch.setattr(
+            freshness_module.httpx,
+            "AsyncClient",
+            lambda **kwargs: real_client(
+                transport=httpx.MockTransport(recording_handler), **kwargs
+            ),
+        )
+        return requests
+
+    return install
+
+
+async def _check(validators: PageValidators = VALIDATORS):
+    return await ConditionalFetcher().check(
+        "https://example.com/page",
+        validators,
+        ProxyPlan(mode=ProxyMode.NONE),
+        WebScraperUrlGuard(),
+    )
+
+
+def test_content_fingerprint_ignores_whitespace_only_changes() -> None:
+    assert content_fingerprint("# Title\r\n\r\n\r\nBody  \n") == content_fingerprint(
+        "# Title\n\nBody"
+    )
+    assert content_fingerprint("# Title\n\nBody") != content_fingerprint(
+        "# Title\n\nOther body"
+    )
+
+
+@pytest.mark.asyncio
+async def test_not_modified_response_sends_validators(serve) -> None:
+    requests = serve(lambda request: httpx.Response(304, headers={"etag": '"v1"'}))
+
+    result = await _check()
+
+    assert result.status == FreshnessStatus.NOT_MODIFIED
+    assert result.validators.etag == '"v1"'
+    assert requests[0].headers["if-none-match"] == '"v1"'
+    assert requests[0].headers["if-modified-since"] == VALIDATORS.last_modified
+
+
+@pytest.mark.asyncio
+async def test_changed_page_follows_redirects_and_returns_new_validators(
+    serve,
+) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/page":
+            return httpx.Response(301, headers={"location": "/moved"})
+        return httpx.Response(200, headers={"ETag": '"v2"'}, content=b"<html>")
+
+    requests = serve(handler)
+
+    result = await _check()
+
+    assert result.status == FreshnessStatus.MODIFIED
+    assert result.validators.etag == '"v2"'
+    assert [request.url.path for request in requests] == ["/page", "/moved"]
+
+
+@pytest.mark.asyncio
+async def test_matching_strong_etag_counts_as_not_modified(serve) -> None:
+    serve(lambda request: httpx.Response(200, headers={"etag": '"v1"'}))
+
+    assert (await _check()).status == FreshnessStatus.NOT_MODIFIED
+
+
+@pytest.mark.asyncio
+async def test_inconclusive_checks_are_unknown(serve) -> None:
+    requests = serve(lambda request: httpx.Response(503))
+
+    assert (await _check()).status == FreshnessStatus.UNKNOWN
+    # Nothing to compare against: the server is not asked
+    assert (await _check(PageValidators())).status == FreshnessStatus.UNKNOWN
+    assert len(requests) == 1
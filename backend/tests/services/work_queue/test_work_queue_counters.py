@@ -0,0 +1,184 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for materialized work queue counters and their transaction hooks."""
+
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+from unittest.mock import patch
+
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.work_queue import (
+    QueueMessage,
+    QueueMessagePriority,
+    QueueMessageStatus,
+)
+from app.services.work_queue_counter_hooks import WorkQueueCounterHooks
+from app.services.work_queue_counters import (
+    CounterDelta,
+    count_queue_messages,
+    count_user_unread,
+)
+from app.services.work_queue_service import QueueMessageService, WorkQueueService
+
+
+class _RecordingCounterStore:
+    def __init__(self) -> None:
+        self.deltas: List[CounterDelta] = []
+        self.invalidated_queues: set = set()
+
+    def apply_deltas(self, deltas: Iterable[CounterDelta]) -> None:
+        self.deltas.extend(d for d in deltas if d.total or d.unread)
+
+    def invalidate(self, queue_ids=(), user_ids=()) -> None:
+        self.invalidated_queues.update(queue_ids)
+
+
+class _DictCounterStore:
+    """In-memory stand-in for the Redis counter store."""
+
+    def __init__(self) -> None:
+        self.queue_counts: Dict[int, Tuple[int, int]] = {}
+        self.user_unread: Dict[int, Dict[int, int]] = {}
+
+    def get_queue_counts(self, queue_ids):
+        found = {q: self.queue_counts[q] for q in queue_ids if q in self.queue_counts}
+        return found, [q for q in queue_ids if q not in self.queue_counts]
+
+    def set_queue_counts(self, counts) -> None:
+        self.queue_counts.update(counts)
+
+    def get_user_unread(self, user_id: int) -> Optional[Dict[int, int]]:
+        return self.user_unread.get(user_id)
+
+    def set_user_unread(self, user_id: int, by_queue) -> None:
+        self.user_unread[user_id] = dict(by_queue)
+
+
+def _new_message(
+    user: User, queue_id: int, status: QueueMessageStatus = QueueMessageStatus.UNREAD
+) -> QueueMessage:
+    return QueueMessage(
+        queue_id=queue_id,
+        sender_user_id=user.id,
+        recipient_user_id=user.id,
+        source_task_id=0,
+        source_subtask_ids=[],
+        content_snapshot=[],
+        note="",
+        priority=QueueMessagePriority.NORMAL,
+        status=status,
+        process_result={},
+        process_task_id=0,
+    )
+
+
+def _net(deltas: List[CounterDelta]) -> Tuple[int, int]:
+    return sum(d.total for d in deltas), sum(d.unread for d in deltas)
+
+
+def test_hooks_publish_deltas_for_create_read_and_archive(
+    test_db: Session, test_user: User
+) -> None:
+    store = _RecordingCounterStore()
+    hooks = WorkQueueCounterHooks(test_db, store)  # type: ignore[arg-type]
+    hooks.register()
+    try:
+        message = _new_message(test_user, queue_id=7)
+        test_db.add(message)
+        test_db.commit()
+        assert _net(store.deltas) == (1, 1)
+
+        message.status = QueueMessageStatus.READ
+        test_db.commit()
+        assert _net(store.deltas) == (1, 0)
+
+        message.status = QueueMessageStatus.ARCHIVED
+        test_db.commit()
+        assert _net(store.deltas) == (0, 0)
+        assert {d.queue_id for d in store.deltas} == {7}
+    finally:
+        hooks.unregister()
+
+
+def test_hooks_do_not_publish_rolled_back_changes(
+    test_db: Session, test_user: User
+) -> None:
+    store = _RecordingCounterStore()
+    hooks = WorkQueueCounterHooks(test_db, store)  # type: ignore[arg-type]
+    hooks.register()
+    try:
+        test_db.add(_new_message(test_user, queue_id=7))
+        test_db.flush()
+        test_db.rollback()
+
+        assert store.deltas == []
+    finally:
+        hooks.unregister()
+
+
+def test_hooks_ignore_non_counter_changes(test_db: Session, test_user: User) -> None:
+    store = _RecordingCounterStore()
+    hooks = WorkQueueCounterHooks(test_db, store)  # type: ignore[arg-type]
+    hooks.register()
+    try:
+        message = _new_message(test_user, queue_id=7)
+        test_db.add(message)
+        test_db.commit()
+        store.deltas.clear()
+
+        message.priority = QueueMessagePriority.HIGH
+        test_db.commit()
+
+        assert store.deltas == []
+        assert store.invalidated_queues == set()
+    finally:
+        hooks.unregister()
+
+
+def test_database_counts_match_materialized_semantics(
+    test_db: Session, test_user: User
+) -> None:
+    test_db.add(_new_message(test_user, 3, QueueMessageStatus.UNREAD))
+    test_db.add(_new_message(test_user, 3, QueueMessageStatus.READ))
+    test_db.add(_new_message(test_user, 3, QueueMessageStatus.ARCHIVED))
+    test_db.add(_new_message(test_user, 4, QueueMessageStatus.UNREAD))
+    test_db.commit()
+
+    assert count_queue_messages(test_db, [3, 4, 5]) == {
+        3: (2, 1),
+        4: (1, 1),
+        5: (0, 0),
+    }
+    assert count_user_unread(test_db, [test_user.id]) == {test_user.id: {3: 1, 4: 1}}
+
+
+def test_service_reads_seed_and_then_serve_from_counter_store(
+    test_db: Session, test_user: User
+) -> None:
+    test_db.add(_new_message(test_user, 3, QueueMessageStatus.UNREAD))
+    test_db.add(_new_message(test_user, 3, QueueMessageStatus.READ))
+    test_db.commit()
+
+    @contextmanager
+    def fake_db():
+        yield test_db
+
+    store = _DictCounterStore()
+    queue_service = WorkQueueService()
+    message_service = QueueMessageService()
+    queue_service.get_db = fake_db  # type: ignore[method-assign]
+    message_service.get_db = fake_db  # type: ignore[method-assign]
+    with patch("app.services.work_queue_service.work_queue_counter_store", store):
+        assert queue_service._get_batch_message_counts([3]) == {3: (2, 1)}
+        assert store.queue_counts == {3: (2, 1)}
+        assert message_service.get_unread_counts(test_user.id) == (1, {3: 1})
+
+        # Subsequent reads are served from the store without counting again
+        store.queue_counts[3] = (10, 5)
+        store.user_unread[test_user.id] = {3: 5}
+        assert queue_service._get_batch_message_counts([3]) == {3: (10, 5)}
+        assert message_service.get_unread_counts(test_user.id) == (5, {3: 5})
@@ -305,6 +305,67 @@ def test_list_by_task_ordered_filters_ids_and_deleted_status(
     assert [subtask.id for subtask in subtasks] == [active.id]
 
 
+def test_list_message_window_returns_latest_messages_in_order(
+    test_db: Session,
+) -> None:
+    store = SqlAlchemySubtaskStore()
+    test_db.add(_task(18, owner_id=10))
+    test_db.add_all(
+        [
+            _subtask(
+                subtask_id=180 + message_id,
+                task_id=18,
+                user_id=10,
+                message_id=message_id,
+            )
+            for message_id in range(1, 9)
+        ]
+    )
+    test_db.commit()
+
+    latest = store.list_message_window(test_db, task_id=18, limit=3)
+    page = store.list_message_window(
+        test_db, task_id=18, limit=3, before_message_id=6, max_message_id=4
+    )
+    bounded = store.list_message_window(
+        test_db, task_id=18, limit=10, after_message_id=6
+    )
+
+    assert [subtask.message_id for subtask in latest] == [6, 7, 8]
+    assert [subtask.message_id for subtask in page] == [2, 3, 4]
+    assert [subtask.message_id for subtask in bounded] == [7, 8]
+    assert (
+        store.list_message_window(test_db, task_id=18, limit=3, owner_user_id=11) == []
+    )
+
+
+def test_list_message_window_keeps_whole_messages(test_db: Session) -> None:
+    store = SqlAlchemySubtaskStore()
+    test_db.add(_task(19, owner_id=10))
+    message_ids = [1, 2, 2, 2, 3]
+    test_db.add_all(
+        [
+            _subtask(
+                subtask_id=190 + index,
+                task_id=19,
+                user_id=10,
+                message_id=message_id,
+            )
+            for index, message_id in enumerate(message_ids, start=1)
+        ]
+    )
+    test_db.commit()
+
+    window = store.list_message_window(test_db, task_id=19, limit=2)
+    page = store.list_message_window(
+        test_db, task_id=19, limit=2, before_message_id=window[0].message_id
+    )
+
+    # The limit cuts into message 2, so the rest of it is loaded too
+    assert [subtask.id for subtask in window] == [192, 193, 194, 195]
+    assert [subtask.id for subtask in page] == [191]
+
+
 def test_get_by_task_message_or_parent_role(test_db: Session) -> None:
     store = SqlAlchemySubtaskStore()
     test_db.add(_task(17, owner_id=10))
@@ -12,12 +12,25 @@ import pytest
 
 from app.core.config import settings
 from app.models.knowledge import DocumentIndexStatus
+from app.services.rag import direct_injection_bundle as bundle_module
+from app.services.rag.direct_injection_bundle import DirectInjectionBundleStore
 from app.tasks.knowledge_tasks import (
     _build_stale_processing_error,
     index_document_task,
+    warm_direct_injection_bundle_task,
 )
 
 
+@pytest.fixture(autouse=True)
+def bundle_warm_apply_async(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Keep warm-ups scheduled by finished indexing off Redis and the broker."""
+    store = DirectInjectionBundleStore(client=MagicMock())
+    monkeypatch.setattr(bundle_module, "direct_injection_bundle_store", store)
+    apply_async = MagicMock()
+    monkeypatch.setattr(warm_direct_injection_bundle_task, "apply_async", apply_async)
+    return apply_async
+
+
 @contextmanager
 def _lock_context(acquired: bool):
     yield acquired
@@ -189,7 +202,9 @@ def test_index_document_task_marks_skip_result_as_failed():
     assert result["index_generation"] == 5
 
 
-def test_index_document_task_routes_indexing_through_gateway():
+def test_index_document_task_routes_indexing_through_gateway(
+    bundle_warm_apply_async: MagicMock,
+):
     start_decision = MagicMock(should_execute=True, reason="started")
     success_finalize_mock = MagicMock(return_value=True)
     task_db = MagicMock()
@@ -266,6 +281,10 @@ def test_index_document_task_routes_indexing_through_gateway():
         mock_resolve.return_value,
         db=None,
     )
+    bundle_warm_apply_async.assert_called_once_with(
+        args=[1],
+        countdown=settings.RAG_DIRECT_INJECTION_BUNDLE_WARM_DELAY_SECONDS,
+    )
 
 
 def test_index_document_task_enqueues_summary_after_finalize(
@@ -3,8 +3,15 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
+from types import SimpleNamespace
 
-from app.main import _request_context_fields
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from starlette.responses import StreamingResponse
+
+from app.core import request_logging
+from app.core.request_logging import RequestLoggingMiddleware, _request_context_fields
 
 
 def test_request_context_fields_ignore_non_object_json() -> None:
@@ -27,7 +34,7 @@ def test_access_logs_include_forwarded_headers(test_client, caplog):
         "Forwarded": "for=203.0.113.9;proto=https;host=api.example.com",
     }
 
-    with caplog.at_level(logging.INFO, logger="app.main"):
+    with caplog.at_level(logging.INFO, logger="app.core.request_logging"):
         response = test_client.get("/api/health", headers=headers)
 
     assert response.status_code == 200
@@ -52,3 +59,93 @@ def test_access_logs_include_forwarded_headers(test_client, caplog):
             "x-real-ip=203.0.113.9, "
             "forwarded=for=203.0.113.9;proto=https;host=api.example.com}"
         ) in log_message
+
+
+class RecordingSpan:
+    def __init__(self):
+        self.attributes = {}
+
+    def is_recording(self):
+        return True
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+
+@pytest.fixture
+def telemetry_app(monkeypatch):
+    span = RecordingSpan()
+    logged_bodies = []
+    otel_config = SimpleNamespace(
+        enabled=True,
+        capture_request_body=True,
+        capture_response_headers=True,
+        capture_response_body=True,
+        max_body_size=8,
+    )
+    monkeypatch.setattr(request_logging, "is_telemetry_enabled", lambda: True)
+    monkeypatch.setattr(
+        request_logging,
+        "log_json_body",
+        lambda name, body: logged_bodies.append((name, body)),
+    )
+
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        return {"size": len(await request.body())}
+
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            for index in range(3):
+                yield f"data: {index}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    middleware = RequestLoggingMiddleware(app, otel_config)
+    middleware._trace = SimpleNamespace(get_current_span=lambda: span)
+    return middleware, span, logged_bodies
+
+
+async def _call(app, method, path, **kwargs):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.request(method, path, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_request_and_response_bodies_are_teed_up_to_max_size(telemetry_app):
+    app, span, logged_bodies = telemetry_app
+
+    response = await _call(
+        app,
+        "POST",
+        "/echo",
+        content=b'{"task_id": 12345678}',
+        headers={"X-Request-ID": "req-1"},
+    )
+
+    # The handler still receives the full body
+    assert response.json() == {"size": 21}
+    assert response.headers["x-request-id"] == "req-1"
+    assert logged_bodies == [
+        ("http.request.body", '{"task_i... [truncated, total size: 21 bytes]')
+    ]
+    assert (
+        span.attributes["http.response.body"]
+        == '{"size":... [truncated, total size: 11 bytes]'
+    )
+    assert span.attributes["http.response.header.content-type"] == "application/json"
+
+
+@pytest.mark.asyncio
+async def test_streaming_responses_pass_through_untouched(telemetry_app):
+    app, span, _ = telemetry_app
+
+    response = await _call(app, "GET", "/stream")
+
+    assert response.text == "data: 0\n\ndata: 1\n\ndata: 2\n\n"
+    assert response.headers["x-request-id"]
+    assert "http.response.body" not in span.attributes
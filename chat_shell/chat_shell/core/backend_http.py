@@ -0,0 +1,179 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Process-wide pooled HTTP clients for tools.
+
+Tools call Backend internal APIs (knowledge base search, listing, tables,
+skill binaries) and external search engines. Instead of opening an
+``httpx.AsyncClient`` per call, which costs a TCP (and TLS) handshake every
+time, they share keep-alive clients from this registry:
+
+- one traced client per pool: ``backend`` for Backend internal APIs and
+  ``external`` for third-party services such as web search;
+- every request names a logical endpoint, which selects its timeout from
+  ``ENDPOINT_TIMEOUTS`` and labels the ``wegent.backend_http.duration``
+  latency histogram;
+- clients are closed on shutdown by :meth:`BackendHttpClients.close`.
+
+Usage:
+    from chat_shell.core.backend_http import backend_http_clients
+
+    response = await backend_http_clients.post(
+        "rag.retrieve", f"{backend_url}/api/internal/rag/retrieve", json=payload
+    )
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional, Set
+
+import httpx
+
+from chat_shell.core.config import settings
+from shared.telemetry.metrics import record_backend_http_request
+from shared.utils.http_client import traced_async_client
+
+logger = logging.getLogger(__name__)
+
+BACKEND_POOL = "backend"
+EXTERNAL_POOL = "external"
+
+DEFAULT_TIMEOUT = 30.0
+
+# Request timeout in seconds per logical endpoint
+ENDPOINT_TIMEOUTS: Dict[str, float] = {
+    "rag.kb_size": 30.0,
+    "rag.retrieve": 60.0,
+    "rag.list_docs": 60.0,
+    "rag.read_docs": 60.0,
+    "knowledge.list_documents": 60.0,
+    "tables.query": 60.0,
+    "skills.binary": 30.0,
+    "web_search": 30.0,
+}
+
+# pool -> client
+_PoolClients = Dict[str, httpx.AsyncClient]
+
+
+class BackendHttpClients:
+    """Registry of pooled, traced ``httpx.AsyncClient`` instances."""
+
+    def __init__(
+        self,
+        *,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+    ) -> None:
+        self._limits = httpx.Limits(
+            max_connections=max_connections or settings.BACKEND_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=(
+                max_keepalive_connections
+                or settings.BACKEND_HTTP_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            keepalive_expiry=keepalive_expiry or settings.BACKEND_HTTP_KEEPALIVE_EXPIRY,
+        )
+        # event loop -> pool -> client; pooled connections belong to one loop
+        self._clients: Dict[asyncio.AbstractEventLoop, _PoolClients] = {}
+        self._closing: Set[asyncio.Task] = set()
+
+    def get_client(self, pool: str = BACKEND_POOL) -> httpx.AsyncClient:
+        """Return the shared client of ``pool``, creating it on first use.
+
+        Pooled connections cannot be reused across event loops, so each loop
+        (CLI commands, sync tool wrappers) gets its own clients. Clients of
+        loops that have been closed since are closed when a new loop asks.
+        """
+        loop = asyncio.get_running_loop()
+        clients = self._clients.get(loop)
+        if clients is None:
+            self._close_clients_of_closed_loops()
+            clients = self._clients[loop] = {}
+        client = clients.get(pool)
+        if client is None or client.is_closed:
+            client = traced_async_client(timeout=DEFAULT_TIMEOUT, limits=self._limits)
+            clients[pool] = client
+        return client
+
+    async def request(
+        self,
+        endpoint: str,
+        method: str,
+        url: str,
+        *,
+        pool: str = BACKEND_POOL,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a request on the pooled client and record its latency.
+
+        Args:
+            endpoint: Logical endpoint name, used for the timeout and metrics
+            method: HTTP method
+            url: Absolute request URL
+            pool: Client pool to use
+            timeout: Overrides the endpoint timeout for this call
+            **kwargs: Additional arguments passed to the httpx request method
+        """
+        if timeout is None:
+            timeout = ENDPOINT_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT)
+        client = self.get_client(pool)
+        send = getattr(client, method.lower())
+
+        start = time.perf_counter()
+        status_code: Optional[int] = None
+        try:
+            response = await send(url, timeout=timeout, **kwargs)
+            status_code = response.status_code
+            return response
+        finally:
+            record_backend_http_request(
+                endpoint,
+                method.upper(),
+                (time.perf_counter() - start) * 1000,
+                status_code,
+            )
+
+    async def get(self, endpoint: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a GET request; see :meth:`request`."""
+        return await self.request(endpoint, "GET", url, **kwargs)
+
+    async def post(self, endpoint: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a POST request; see :meth:`request`."""
+        return await self.request(endpoint, "POST", url, **kwargs)
+
+    async def close(self) -> None:
+        """Close every client created on the current event loop.
+
+        Also waits for clients of closed loops that are still being closed.
+        """
+        loop = asyncio.get_running_loop()
+        clients = self._clients.pop(loop, {})
+        for pool, client in clients.items():
+            await self._close_client(pool, client)
+        self._close_clients_of_closed_loops()
+        closing = [task for task in self._closing if task.get_loop() is loop]
+        if closing:
+            await asyncio.gather(*closing)
+
+    def _close_clients_of_closed_loops(self) -> None:
+        for loop in [loop for loop in self._clients if loop.is_closed()]:
+            for pool, client in self._clients.pop(loop).items():
+                logger.debug("[backend_http] Closing %s client of a closed loop", pool)
+                task = asyncio.ensure_future(self._close_client(pool, client))
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_client(pool: str, client: httpx.AsyncClient) -> None:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"[backend_http] Failed to close {pool} client: {e}")
+
+
+backend_http_clients = BackendHttpClients()
@@ -124,6 +124,15 @@ class Settings(BaseSettings):
     # Backend RAG service configuration (for knowledge base HTTP fallback)
     BACKEND_RAG_URL: str = "http://localhost:8000/api/knowledge/v1/retrieve"
 
+    # Pooled HTTP clients shared by tools (see chat_shell.core.backend_http)
+    BACKEND_HTTP_MAX_CONNECTIONS: int = 100
+    BACKEND_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    BACKEND_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+
+    # Knowledge base search results reused by repeated calls within a turn
+    # (same KBs, normalized query, scope and retrieval options). 0 disables.
+    KB_RETRIEVAL_MEMO_TTL_SECONDS: int = 120
+
     # OpenTelemetry configuration
     OTEL_ENABLED: bool = False
 
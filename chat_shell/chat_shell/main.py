@@ -136,6 +136,11 @@ async def lifespan(app: FastAPI):
     else:
         logger.info("No active streams, proceeding with shutdown")
 
+    # Close pooled tool HTTP clients
+    from chat_shell.core.backend_http import backend_http_clients
+
+    await backend_http_clients.close()
+
     # Shutdown OpenTelemetry
     from shared.telemetry.core import is_telemetry_enabled, shutdown_telemetry
 
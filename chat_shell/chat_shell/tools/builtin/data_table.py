@@ -17,6 +17,7 @@ from langchain_core.callbacks import CallbackManagerForToolRun
 from langchain_core.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from chat_shell.core.backend_http import backend_http_clients
 from chat_shell.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -161,47 +162,48 @@ class DataTableTool(BaseTool):
         }
 
         # Call backend internal API (no authentication required for internal endpoints)
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                # Use internal API endpoint for service-to-service communication
-                url = f"{backend_url}/api/internal/tables/query"
-                logger.info(f"[DataTableTool] Calling backend internal API: {url}")
-                logger.debug(f"[DataTableTool] Request data: {request_data}")
+        try:
+            # Use internal API endpoint for service-to-service communication
+            url = f"{backend_url}/api/internal/tables/query"
+            logger.info(f"[DataTableTool] Calling backend internal API: {url}")
+            logger.debug(f"[DataTableTool] Request data: {request_data}")
 
-                response = await client.post(url, json=request_data)
-                response.raise_for_status()
+            response = await backend_http_clients.post(
+                "tables.query", url, json=request_data
+            )
+            response.raise_for_status()
 
-                result = response.json()
-                logger.info(
-                    f"[DataTableTool] Backend API returned {result.get('total_count', 0)} records"
-                )
+            result = response.json()
+            logger.info(
+                f"[DataTableTool] Backend API returned {result.get('total_count', 0)} records"
+            )
 
-                return result
+            return result
 
-            except httpx.HTTPStatusError as e:
-                error_detail = "Unknown error"
-                try:
-                    error_data = e.response.json()
-                    error_detail = error_data.get("detail", str(e))
-                except Exception:
-                    error_detail = e.response.text or str(e)
+        except httpx.HTTPStatusError as e:
+            error_detail = "Unknown error"
+            try:
+                error_data = e.response.json()
+                error_detail = error_data.get("detail", str(e))
+            except Exception:
+                error_detail = e.response.text or str(e)
 
-                logger.error(
-                    f"[DataTableTool] Backend API error: {e.response.status_code} - {error_detail}"
-                )
-                return {
-                    "error": f"Backend API error: {error_detail}",
-                    "httpStatus": e.response.status_code,
-                }
-
-            except httpx.RequestError as e:
-                logger.error(f"[DataTableTool] Request error: {e}")
-                return {
-                    "error": f"Failed to connect to backend: {str(e)}",
-                }
-
-            except Exception as e:
-                logger.error(f"[DataTableTool] Unexpected error: {e}", exc_info=True)
-                return {
-                    "error": f"Unexpected error: {str(e)}",
-                }
+            logger.error(
+                f"[DataTableTool] Backend API error: {e.response.status_code} - {error_detail}"
+            )
+            return {
+                "error": f"Backend API error: {error_detail}",
+                "httpStatus": e.response.status_code,
+            }
+
+        except httpx.RequestError as e:
+            logger.error(f"[DataTableTool] Request error: {e}")
+            return {
+                "error": f"Failed to connect to backend: {str(e)}",
+            }
+
+        except Exception as e:
+            logger.error(f"[DataTableTool] Unexpected error: {e}", exc_info=True)
+            return {
+                "error": f"Unexpected error: {str(e)}",
+            }
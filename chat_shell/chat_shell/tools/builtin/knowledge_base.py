@@ -8,8 +8,10 @@ This tool implements smart injection strategy that automatically chooses
 between direct injection and RAG retrieval based on context window capacity.
 """
 
+import copy
 import json
 import logging
+import time
 from typing import Any, Dict, List, Optional
 
 from langchain_core.callbacks import CallbackManagerForToolRun
@@ -36,6 +38,11 @@ TOKEN_CHARS_PER_TOKEN = 4  # ~4 chars/token for English, 1-2 for CJK
 DEFAULT_MAX_CALLS_PER_CONVERSATION = 10
 DEFAULT_EXEMPT_CALLS_BEFORE_CHECK = 5
 
+# Route modes whose results are memoized within a turn. Direct injection is
+# routed against the remaining context budget, which shrinks as the turn
+# goes on, so it is always re-routed.
+MEMOIZED_ROUTE_MODES = frozenset({"rag_retrieval"})
+
 
 def _retrieval_source_entry(provider: Any, source_id: Any) -> dict[str, str] | None:
     """Build a provider/source entry when source identity exists."""
@@ -177,6 +184,11 @@ class KnowledgeBaseTool(BaseTool):
     # Cache for KB info (fetched once per conversation)
     _kb_info_cache: Optional[Dict[str, Any]] = PrivateAttr(default=None)
 
+    # Memoized retrieval results of this turn: key -> (expires_at, mode, result)
+    _retrieval_memo: Dict[tuple, tuple[float, str, Dict[str, Any]]] = PrivateAttr(
+        default_factory=dict
+    )
+
     @property
     def injection_strategy(self) -> InjectionStrategy:
         """Get or create injection strategy instance."""
@@ -619,7 +631,8 @@ class KnowledgeBaseTool(BaseTool):
         0. Fetch KB info (size, config, name) and populate cache if not already fetched
         1. Check call limits (count and token thresholds)
         2. If rejected, return rejection message
-        3. Ask Backend internal retrieve to choose the coarse route
+        3. Ask Backend internal retrieve to choose the coarse route, unless the
+           same search already ran in this turn (see MEMOIZED_ROUTE_MODES)
         4. If Backend selects direct injection, run the local fit check against
            the current conversation and fall back to RAG if needed
         5. Format the final result and update call statistics
@@ -728,19 +741,38 @@ class KnowledgeBaseTool(BaseTool):
             elif self.injection_mode == InjectionMode.DIRECT_INJECTION:
                 preferred_route_mode = "direct_injection"
 
-            route_mode, raw_result = await self._retrieve_with_strategy_from_all_kbs(
-                query=query,
+            # Calls repeated within the turn reuse the retrieval result, but
+            # still count against the call limits above
+            memo_key = self._retrieval_memo_key(
+                query,
                 max_results=max_results,
-                search_hints=search_hints,
                 route_mode=preferred_route_mode,
+                search_hints=search_hints,
                 document_ids=effective_document_ids,
                 document_names=effective_document_names,
+                kb_info=kb_info,
             )
+            memoized = self._get_memoized_retrieval(memo_key)
+            if memoized is not None:
+                route_mode, raw_result = memoized
+            else:
+                route_mode, raw_result = (
+                    await self._retrieve_with_strategy_from_all_kbs(
+                        query=query,
+                        max_results=max_results,
+                        search_hints=search_hints,
+                        route_mode=preferred_route_mode,
+                        document_ids=effective_document_ids,
+                        document_names=effective_document_names,
+                    )
+                )
+                self._memoize_retrieval(memo_key, route_mode, raw_result)
 
             logger.info(
-                "[KnowledgeBaseTool] Backend route result: mode=%s, record_count=%d",
+                "[KnowledgeBaseTool] Backend route result: mode=%s, record_count=%d, cached=%s",
                 route_mode,
                 len(raw_result.get("records", [])),
+                memoized is not None,
             )
 
             if route_mode == "restricted_safe_summary":
@@ -772,6 +804,8 @@ class KnowledgeBaseTool(BaseTool):
                 records=retrieved_records,
                 mode=route_mode,
             )
+            if memoized is not None:
+                retrieval_summary = {**(retrieval_summary or {}), "cached": True}
             if not kb_chunks:
                 default_message = (
                     "No documents found in the knowledge base."
@@ -811,6 +845,93 @@ class KnowledgeBaseTool(BaseTool):
             logger.error(f"[KnowledgeBaseTool] Search failed: {e}", exc_info=True)
             return json.dumps({"error": f"Knowledge base search failed: {str(e)}"})
 
+    def _retrieval_memo_key(
+        self,
+        query: str,
+        *,
+        max_results: int,
+        route_mode: str,
+        search_hints: SearchHints | None,
+        document_ids: list[int],
+        document_names: list[str],
+        kb_info: Dict[str, Any],
+    ) -> tuple:
+        """Build the memo key of a retrieval call.
+
+        Queries differing only in case or whitespace share a key. KB sizes and
+        document counts stand in for the index generation, so a re-fetched KB
+        info with changed documents misses the memo.
+        """
+        kb_generation = tuple(
+            sorted(
+                (
+                    item.get("id"),
+                    item.get("document_count"),
+                    item.get("total_file_size"),
+                    item.get("estimated_tokens"),
+                )
+                for item in kb_info.get("items", [])
+            )
+        )
+        scope = json.dumps(
+            {
+                "document_ids": sorted(document_ids),
+                "document_names": sorted(document_names),
+                "knowledge_base_scopes": self._scope_payloads(),
+                "external_knowledge_refs": self.external_knowledge_refs,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        retrieval_config = (
+            max_results,
+            route_mode,
+            self.tool_access_mode,
+            json.dumps(
+                search_hints.model_dump(exclude_none=True) if search_hints else None,
+                sort_keys=True,
+            ),
+        )
+        return (
+            tuple(sorted(self.knowledge_base_ids)),
+            " ".join(query.split()).casefold(),
+            scope,
+            retrieval_config,
+            kb_generation,
+        )
+
+    def _get_memoized_retrieval(
+        self, key: tuple
+    ) -> Optional[tuple[str, Dict[str, Any]]]:
+        """Return a memoized (route_mode, result) that has not expired."""
+        entry = self._retrieval_memo.get(key)
+        if entry is None:
+            return None
+        expires_at, route_mode, result = entry
+        if expires_at <= time.monotonic():
+            del self._retrieval_memo[key]
+            return None
+        return route_mode, copy.deepcopy(result)
+
+    def _memoize_retrieval(
+        self, key: tuple, route_mode: str, result: Dict[str, Any]
+    ) -> None:
+        """Memoize a successful RAG result for the rest of the turn."""
+        from chat_shell.core.config import settings
+
+        ttl_seconds = settings.KB_RETRIEVAL_MEMO_TTL_SECONDS
+        if (
+            ttl_seconds <= 0
+            or route_mode not in MEMOIZED_ROUTE_MODES
+            or result.get("error_code")
+        ):
+            return
+        self._retrieval_memo[key] = (
+            time.monotonic() + ttl_seconds,
+            route_mode,
+            copy.deepcopy(result),
+        )
+
     async def _get_kb_info(self) -> Dict[str, Any]:
         """Get complete knowledge base information (cached).
 
@@ -837,8 +958,7 @@ class KnowledgeBaseTool(BaseTool):
         Returns:
             Dictionary with total_file_size, total_estimated_tokens, and items list
         """
-        import httpx
-
+        from chat_shell.core.backend_http import backend_http_clients
         from chat_shell.core.config import settings
 
         # Get backend API URL
@@ -849,39 +969,39 @@ class KnowledgeBaseTool(BaseTool):
             backend_url = getattr(settings, "BACKEND_API_URL", "http://localhost:8000")
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                headers = {}
-                auth_token = (
-                    getattr(settings, "INTERNAL_SERVICE_TOKEN", "") or self.auth_token
-                )
-                if auth_token:
-                    headers["Authorization"] = f"Bearer {auth_token}"
+            headers = {}
+            auth_token = (
+                getattr(settings, "INTERNAL_SERVICE_TOKEN", "") or self.auth_token
+            )
+            if auth_token:
+                headers["Authorization"] = f"Bearer {auth_token}"
 
-                response = await client.post(
-                    f"{backend_url}/api/internal/rag/kb-size",
-                    json={"knowledge_base_ids": self.knowledge_base_ids},
-                    headers=headers,
-                )
+            response = await backend_http_clients.post(
+                "rag.kb_size",
+                f"{backend_url}/api/internal/rag/kb-size",
+                json={"knowledge_base_ids": self.knowledge_base_ids},
+                headers=headers,
+            )
 
-                if response.status_code == 200:
-                    data = response.json()
-                    logger.info(
-                        f"[KnowledgeBaseTool] KB info fetched: "
-                        f"total_file_size={data.get('total_file_size', 0)} bytes, "
-                        f"total_estimated_tokens={data.get('total_estimated_tokens', 0)} "
-                        f"(via HTTP)"
-                    )
-                    return data
-                else:
-                    logger.warning(
-                        f"[KnowledgeBaseTool] HTTP KB info request failed: {response.status_code}, "
-                        f"returning defaults"
-                    )
-                    return {
-                        "total_file_size": 0,
-                        "total_estimated_tokens": 0,
-                        "items": [],
-                    }
+            if response.status_code == 200:
+                data = response.json()
+                logger.info(
+                    f"[KnowledgeBaseTool] KB info fetched: "
+                    f"total_file_size={data.get('total_file_size', 0)} bytes, "
+                    f"total_estimated_tokens={data.get('total_estimated_tokens', 0)} "
+                    f"(via HTTP)"
+                )
+                return data
+            else:
+                logger.warning(
+                    f"[KnowledgeBaseTool] HTTP KB info request failed: {response.status_code}, "
+                    f"returning defaults"
+                )
+                return {
+                    "total_file_size": 0,
+                    "total_estimated_tokens": 0,
+                    "items": [],
+                }
 
         except Exception as e:
             logger.warning(
@@ -1527,8 +1647,7 @@ class KnowledgeBaseTool(BaseTool):
         document_names: Optional[list[str]] = None,
     ) -> Dict[str, Any]:
         """Retrieve KB data from Backend internal retrieve endpoint."""
-        import httpx
-
+        from chat_shell.core.backend_http import backend_http_clients
         from chat_shell.core.config import settings
 
         remote_url = getattr(settings, "REMOTE_STORAGE_URL", "")
@@ -1570,51 +1689,51 @@ class KnowledgeBaseTool(BaseTool):
         if auth_token:
             headers["Authorization"] = f"Bearer {auth_token}"
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{backend_url}/api/internal/rag/retrieve",
-                json=payload,
-                headers=headers,
-            )
-
-            if response.status_code != 200:
-                logger.warning(
-                    "[KnowledgeBaseTool] HTTP internal retrieve returned %s: %s",
-                    response.status_code,
-                    response.text,
-                )
-                try:
-                    error_detail = response.json().get("detail")
-                    if (
-                        isinstance(error_detail, dict)
-                        and error_detail.get("error_code") == "document_scope_violation"
-                    ):
-                        return {
-                            "mode": InjectionMode.RAG_ONLY,
-                            "records": [],
-                            "total": 0,
-                            "status": "error",
-                            "error_code": "document_scope_violation",
-                            "message": error_detail.get(
-                                "message",
-                                "Requested documents are outside the allowed knowledge scope.",
-                            ),
-                        }
-                except Exception:
-                    pass
-                return {
-                    "mode": InjectionMode.RAG_ONLY,
-                    "records": [],
-                    "total": 0,
-                }
+        response = await backend_http_clients.post(
+            "rag.retrieve",
+            f"{backend_url}/api/internal/rag/retrieve",
+            json=payload,
+            headers=headers,
+        )
 
-            data = response.json()
-            logger.info(
-                "[KnowledgeBaseTool] HTTP internal retrieve mode=%s records=%d",
-                data.get("mode"),
-                len(data.get("records", [])),
+        if response.status_code != 200:
+            logger.warning(
+                "[KnowledgeBaseTool] HTTP internal retrieve returned %s: %s",
+                response.status_code,
+                response.text,
             )
-            return data
+            try:
+                error_detail = response.json().get("detail")
+                if (
+                    isinstance(error_detail, dict)
+                    and error_detail.get("error_code") == "document_scope_violation"
+                ):
+                    return {
+                        "mode": InjectionMode.RAG_ONLY,
+                        "records": [],
+                        "total": 0,
+                        "status": "error",
+                        "error_code": "document_scope_violation",
+                        "message": error_detail.get(
+                            "message",
+                            "Requested documents are outside the allowed knowledge scope.",
+                        ),
+                    }
+            except Exception:
+                pass
+            return {
+                "mode": InjectionMode.RAG_ONLY,
+                "records": [],
+                "total": 0,
+            }
+
+        data = response.json()
+        logger.info(
+            "[KnowledgeBaseTool] HTTP internal retrieve mode=%s records=%d",
+            data.get("mode"),
+            len(data.get("records", [])),
+        )
+        return data
 
     async def _format_direct_injection_result(
         self,
@@ -19,6 +19,7 @@ from langchain_core.callbacks import CallbackManagerForToolRun
 from langchain_core.tools import BaseTool
 from pydantic import BaseModel, Field, PrivateAttr
 
+from chat_shell.core.backend_http import backend_http_clients
 from shared.models.knowledge import KnowledgeBaseScope
 from shared.telemetry.context.large_data import log_large_string_list
 from shared.telemetry.decorators import add_span_event, set_span_attribute, trace_async
@@ -409,8 +410,6 @@ class KbLsTool(BaseTool):
         limit: int,
     ) -> str:
         """List documents via HTTP API."""
-        import httpx
-
         add_span_event("listing_documents")
         set_span_attribute("knowledge_base_id", knowledge_base_id)
         set_span_attribute("mode", "http")
@@ -429,79 +428,76 @@ class KbLsTool(BaseTool):
                     self.knowledge_base_scopes
                 )
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{backend_url}/api/internal/rag/list-docs",
-                    **_build_backend_post_kwargs(request_data, self.auth_token),
-                )
+            response = await backend_http_clients.post(
+                "rag.list_docs",
+                f"{backend_url}/api/internal/rag/list-docs",
+                **_build_backend_post_kwargs(request_data, self.auth_token),
+            )
 
-                if response.status_code != 200:
-                    logger.warning(
-                        f"[KbLsTool] HTTP list-docs returned {response.status_code}"
-                    )
-                    try:
-                        error_detail = response.json().get("detail")
-                        if (
-                            isinstance(error_detail, dict)
-                            and error_detail.get("error_code")
-                            == "document_scope_violation"
-                        ):
-                            return json.dumps(
-                                {
-                                    "status": "error",
-                                    "error_code": "document_scope_violation",
-                                    "message": error_detail.get(
-                                        "message",
-                                        "Requested documents are outside the allowed knowledge scope.",
-                                    ),
-                                },
-                                ensure_ascii=False,
-                            )
-                    except Exception:
-                        pass
-                    return json.dumps(
-                        {
-                            "error": f"Failed to list documents: HTTP {response.status_code}"
-                        },
-                        ensure_ascii=False,
-                    )
+            if response.status_code != 200:
+                logger.warning(
+                    f"[KbLsTool] HTTP list-docs returned {response.status_code}"
+                )
+                try:
+                    error_detail = response.json().get("detail")
+                    if (
+                        isinstance(error_detail, dict)
+                        and error_detail.get("error_code") == "document_scope_violation"
+                    ):
+                        return json.dumps(
+                            {
+                                "status": "error",
+                                "error_code": "document_scope_violation",
+                                "message": error_detail.get(
+                                    "message",
+                                    "Requested documents are outside the allowed knowledge scope.",
+                                ),
+                            },
+                            ensure_ascii=False,
+                        )
+                except Exception:
+                    pass
+                return json.dumps(
+                    {"error": f"Failed to list documents: HTTP {response.status_code}"},
+                    ensure_ascii=False,
+                )
 
-                data = response.json()
-                documents = data.get("documents", [])
+            data = response.json()
+            documents = data.get("documents", [])
 
-                # Format response for AI consumption
-                doc_items = []
-                for doc in documents:
-                    doc_items.append(
-                        {
-                            "id": doc.get("id"),
-                            "name": doc.get("name"),
-                            "type": doc.get("file_extension", ""),
-                            "size": _format_file_size(doc.get("file_size", 0)),
-                            "summary": doc.get("short_summary"),
-                            "is_active": doc.get("is_active", False),
-                        }
-                    )
+            # Format response for AI consumption
+            doc_items = []
+            for doc in documents:
+                doc_items.append(
+                    {
+                        "id": doc.get("id"),
+                        "name": doc.get("name"),
+                        "type": doc.get("file_extension", ""),
+                        "size": _format_file_size(doc.get("file_size", 0)),
+                        "summary": doc.get("short_summary"),
+                        "is_active": doc.get("is_active", False),
+                    }
+                )
 
-                set_span_attribute("document_count", len(doc_items))
+            set_span_attribute("document_count", len(doc_items))
 
-                logger.info(
-                    f"[KbLsTool] Listed {len(doc_items)} documents from KB {knowledge_base_id} "
-                    f"(HTTP mode, offset={offset}, limit={limit}, total={data.get('total', 0)})"
-                )
+            logger.info(
+                f"[KbLsTool] Listed {len(doc_items)} documents from KB {knowledge_base_id} "
+                f"(HTTP mode, offset={offset}, limit={limit}, total={data.get('total', 0)})"
+            )
 
-                return json.dumps(
-                    {
-                        "knowledge_base_id": knowledge_base_id,
-                        "documents": doc_items,
-                        "total": data.get("total", len(doc_items)),
-                        "returned_count": data.get("returned_count", len(doc_items)),
-                        "offset": data.get("offset", offset),
-                        "limit": data.get("limit", limit),
-                        "has_more": data.get("has_more", False),
-                    },
-                    ensure_ascii=False,
-                )
+            return json.dumps(
+                {
+                    "knowledge_base_id": knowledge_base_id,
+                    "documents": doc_items,
+                    "total": data.get("total", len(doc_items)),
+                    "returned_count": data.get("returned_count", len(doc_items)),
+                    "offset": data.get("offset", offset),
+                    "limit": data.get("limit", limit),
+                    "has_more": data.get("has_more", False),
+                },
+                ensure_ascii=False,
+            )
 
         except Exception as e:
             logger.error(f"[KbLsTool] HTTP list-docs failed: {e}")
@@ -750,55 +746,52 @@ class KnowledgeListDocumentsTool(BaseTool):
         if not self.knowledge_base_ids:
             return []
 
-        import httpx
-
         documents: list[dict[str, Any]] = []
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            for knowledge_base_id in self.knowledge_base_ids:
-                request_data: dict[str, Any] = {
-                    "knowledge_base_id": knowledge_base_id,
-                    "offset": offset,
-                    "limit": limit,
-                }
-                if self.knowledge_base_scopes:
-                    request_data["knowledge_base_scopes"] = _scope_payloads(
-                        self.knowledge_base_scopes
-                    )
-                response = await client.post(
-                    f"{_get_backend_url()}/api/internal/rag/list-docs",
-                    **_build_backend_post_kwargs(request_data, self.auth_token),
+        for knowledge_base_id in self.knowledge_base_ids:
+            request_data: dict[str, Any] = {
+                "knowledge_base_id": knowledge_base_id,
+                "offset": offset,
+                "limit": limit,
+            }
+            if self.knowledge_base_scopes:
+                request_data["knowledge_base_scopes"] = _scope_payloads(
+                    self.knowledge_base_scopes
                 )
-                if response.status_code != 200:
-                    logger.warning(
-                        "[KnowledgeListDocumentsTool] Internal list-docs returned %s: %s",
-                        response.status_code,
-                        response.text,
-                    )
-                    continue
+            response = await backend_http_clients.post(
+                "rag.list_docs",
+                f"{_get_backend_url()}/api/internal/rag/list-docs",
+                **_build_backend_post_kwargs(request_data, self.auth_token),
+            )
+            if response.status_code != 200:
+                logger.warning(
+                    "[KnowledgeListDocumentsTool] Internal list-docs returned %s: %s",
+                    response.status_code,
+                    response.text,
+                )
+                continue
 
-                payload = response.json()
-                for doc in payload.get("documents") or []:
-                    documents.append(
-                        {
-                            "provider": "internal",
-                            "source_id": str(knowledge_base_id),
-                            "source_name": payload.get("knowledge_base_name")
-                            or f"KB-{knowledge_base_id}",
-                            "document_id": doc.get("id"),
-                            "title": doc.get("name"),
-                            "node_id": (
-                                f"document:{doc.get('id')}"
-                                if doc.get("id") is not None
-                                else None
-                            ),
-                            "parent_id": doc.get("folder_id"),
-                            "mime_type": doc.get("mime_type"),
-                            "file_extension": doc.get("file_extension")
-                            or doc.get("type"),
-                            "source_uri": None,
-                            "summary": doc.get("short_summary") or doc.get("summary"),
-                        }
-                    )
+            payload = response.json()
+            for doc in payload.get("documents") or []:
+                documents.append(
+                    {
+                        "provider": "internal",
+                        "source_id": str(knowledge_base_id),
+                        "source_name": payload.get("knowledge_base_name")
+                        or f"KB-{knowledge_base_id}",
+                        "document_id": doc.get("id"),
+                        "title": doc.get("name"),
+                        "node_id": (
+                            f"document:{doc.get('id')}"
+                            if doc.get("id") is not None
+                            else None
+                        ),
+                        "parent_id": doc.get("folder_id"),
+                        "mime_type": doc.get("mime_type"),
+                        "file_extension": doc.get("file_extension") or doc.get("type"),
+                        "source_uri": None,
+                        "summary": doc.get("short_summary") or doc.get("summary"),
+                    }
+                )
 
         return documents
 
@@ -812,8 +805,6 @@ class KnowledgeListDocumentsTool(BaseTool):
         if not self.external_knowledge_refs:
             return {"documents": [], "total_returned": 0, "warnings": []}
 
-        import httpx
-
         request_data: dict[str, Any] = {
             "external_knowledge_refs": self.external_knowledge_refs,
             "user_id": self.user_id,
@@ -823,11 +814,11 @@ class KnowledgeListDocumentsTool(BaseTool):
         if self.user_name is not None:
             request_data["user_name"] = self.user_name
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{_get_backend_url()}/api/internal/knowledge/list-documents",
-                **_build_backend_post_kwargs(request_data, self.auth_token),
-            )
+        response = await backend_http_clients.post(
+            "knowledge.list_documents",
+            f"{_get_backend_url()}/api/internal/knowledge/list-documents",
+            **_build_backend_post_kwargs(request_data, self.auth_token),
+        )
 
         if response.status_code != 200:
             logger.warning(
@@ -1078,8 +1069,6 @@ class KbHeadTool(BaseTool):
         self, document_ids: list[int], offset: int, limit: int
     ) -> str:
         """Read documents via HTTP API."""
-        import httpx
-
         add_span_event("reading_documents")
         log_large_string_list("document_ids", [str(d) for d in document_ids])
         set_span_attribute("offset", offset)
@@ -1107,42 +1096,42 @@ class KbHeadTool(BaseTool):
 
         add_span_event("http_request_started")
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{backend_url}/api/internal/rag/read-docs",
-                **_build_backend_post_kwargs(request_data, self.auth_token),
-            )
+        response = await backend_http_clients.post(
+            "rag.read_docs",
+            f"{backend_url}/api/internal/rag/read-docs",
+            **_build_backend_post_kwargs(request_data, self.auth_token),
+        )
 
-            if response.status_code != 200:
-                logger.warning(
-                    f"[KbHeadTool] HTTP read-docs returned {response.status_code}"
-                )
-                try:
-                    error_detail = response.json().get("detail")
-                    if (
-                        isinstance(error_detail, dict)
-                        and error_detail.get("error_code") == "document_scope_violation"
-                    ):
-                        return json.dumps(
-                            {
-                                "status": "error",
-                                "error_code": "document_scope_violation",
-                                "message": error_detail.get(
-                                    "message",
-                                    "Requested documents are outside the allowed knowledge scope.",
-                                ),
-                            },
-                            ensure_ascii=False,
-                        )
-                except Exception:
-                    pass
-                return json.dumps(
-                    {"error": f"Failed to read documents: HTTP {response.status_code}"},
-                    ensure_ascii=False,
-                )
+        if response.status_code != 200:
+            logger.warning(
+                f"[KbHeadTool] HTTP read-docs returned {response.status_code}"
+            )
+            try:
+                error_detail = response.json().get("detail")
+                if (
+                    isinstance(error_detail, dict)
+                    and error_detail.get("error_code") == "document_scope_violation"
+                ):
+                    return json.dumps(
+                        {
+                            "status": "error",
+                            "error_code": "document_scope_violation",
+                            "message": error_detail.get(
+                                "message",
+                                "Requested documents are outside the allowed knowledge scope.",
+                            ),
+                        },
+                        ensure_ascii=False,
+                    )
+            except Exception:
+                pass
+            return json.dumps(
+                {"error": f"Failed to read documents: HTTP {response.status_code}"},
+                ensure_ascii=False,
+            )
 
-            data = response.json()
-            results = data.get("documents", [])
+        data = response.json()
+        results = data.get("documents", [])
 
         set_span_attribute("document_count", len(results))
 
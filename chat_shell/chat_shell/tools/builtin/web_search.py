@@ -141,8 +141,7 @@ class WebSearchTool(BaseTool):
         Returns:
             JSON string with search results
         """
-        import httpx
-
+        from chat_shell.core.backend_http import EXTERNAL_POOL, backend_http_clients
         from chat_shell.core.config import settings
 
         # Get engine configuration
@@ -208,56 +207,61 @@ class WebSearchTool(BaseTool):
             if auth_header:
                 headers.update(auth_header)
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(base_url, params=params, headers=headers)
-
-                if response.status_code != 200:
-                    logger.warning(
-                        f"[WebSearchTool] Search API returned {response.status_code}: {response.text[:200]}"
-                    )
-                    return json.dumps(
-                        {
-                            "error": f"Search API returned status {response.status_code}",
-                            "query": query,
-                        }
-                    )
-
-                data = response.json()
-
-                # Extract results using response_path
-                results = data
-                for path_part in response_path.split("."):
-                    if path_part and isinstance(results, dict):
-                        results = results.get(path_part, [])
-
-                if not isinstance(results, list):
-                    results = []
-
-                # Format results
-                formatted_results = []
-                for result in results[:max_results]:
-                    formatted_result = {
-                        "title": result.get(title_field, ""),
-                        "url": result.get(url_field, ""),
-                        "snippet": result.get(snippet_field, ""),
-                    }
-                    if content_field and result.get(content_field):
-                        formatted_result["content"] = result.get(content_field, "")
-                    formatted_results.append(formatted_result)
+            response = await backend_http_clients.get(
+                "web_search",
+                base_url,
+                pool=EXTERNAL_POOL,
+                params=params,
+                headers=headers,
+            )
 
-                logger.info(
-                    f"[WebSearchTool] Retrieved {len(formatted_results)} results for query: {query[:50]}"
+            if response.status_code != 200:
+                logger.warning(
+                    f"[WebSearchTool] Search API returned {response.status_code}: {response.text[:200]}"
                 )
-
                 return json.dumps(
                     {
+                        "error": f"Search API returned status {response.status_code}",
                         "query": query,
-                        "results": formatted_results,
-                        "count": len(formatted_results),
-                    },
-                    ensure_ascii=False,
+                    }
                 )
 
+            data = response.json()
+
+            # Extract results using response_path
+            results = data
+            for path_part in response_path.split("."):
+                if path_part and isinstance(results, dict):
+                    results = results.get(path_part, [])
+
+            if not isinstance(results, list):
+                results = []
+
+            # Format results
+            formatted_results = []
+            for result in results[:max_results]:
+                formatted_result = {
+                    "title": result.get(title_field, ""),
+                    "url": result.get(url_field, ""),
+                    "snippet": result.get(snippet_field, ""),
+                }
+                if content_field and result.get(content_field):
+                    formatted_result["content"] = result.get(content_field, "")
+                formatted_results.append(formatted_result)
+
+            logger.info(
+                f"[WebSearchTool] Retrieved {len(formatted_results)} results for query: {query[:50]}"
+            )
+
+            return json.dumps(
+                {
+                    "query": query,
+                    "results": formatted_results,
+                    "count": len(formatted_results),
+                },
+                ensure_ascii=False,
+            )
+
         except Exception as e:
             logger.error(f"[WebSearchTool] HTTP search failed: {e}", exc_info=True)
             return json.dumps(
@@ -319,7 +319,7 @@ async def _check_any_kb_has_rag_enabled(
     from chat_shell.core.config import settings
 
     try:
-        import httpx
+        from chat_shell.core.backend_http import backend_http_clients
 
         add_span_event("querying_backend_api")
         headers = {}
@@ -333,33 +333,33 @@ async def _check_any_kb_has_rag_enabled(
 
         # Query KB info from Backend API
         url = f"{settings.BACKEND_URL}/api/internal/rag/kb-size"
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                url,
-                json={"knowledge_base_ids": knowledge_base_ids},
-                headers=headers or None,
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            # Check if any KB has rag_enabled=True
-            items = data.get("items", [])
-            for item in items:
-                if item.get("rag_enabled", False):
-                    logger.debug(
-                        f"[knowledge_factory] KB {item.get('id')} has RAG enabled"
-                    )
-                    add_span_event("rag_enabled_found")
-                    set_span_attribute("rag_enabled", True)
-                    set_span_attribute("kb_id_with_rag", item.get("id"))
-                    return True
-
-            logger.info(
-                f"[knowledge_factory] No KB has RAG enabled among {knowledge_base_ids}"
-            )
-            add_span_event("no_rag_enabled")
-            set_span_attribute("rag_enabled", False)
-            return False
+        response = await backend_http_clients.post(
+            "rag.kb_size",
+            url,
+            # Tool creation waits on this probe, keep it short
+            timeout=10.0,
+            json={"knowledge_base_ids": knowledge_base_ids},
+            headers=headers or None,
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        # Check if any KB has rag_enabled=True
+        items = data.get("items", [])
+        for item in items:
+            if item.get("rag_enabled", False):
+                logger.debug(f"[knowledge_factory] KB {item.get('id')} has RAG enabled")
+                add_span_event("rag_enabled_found")
+                set_span_attribute("rag_enabled", True)
+                set_span_attribute("kb_id_with_rag", item.get("id"))
+                return True
+
+        logger.info(
+            f"[knowledge_factory] No KB has RAG enabled among {knowledge_base_ids}"
+        )
+        add_span_event("no_rag_enabled")
+        set_span_attribute("rag_enabled", False)
+        return False
 
     except Exception as e:
         logger.warning(
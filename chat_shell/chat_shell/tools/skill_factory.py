@@ -20,6 +20,7 @@ from typing import Any, Optional
 
 import httpx
 
+from chat_shell.core.backend_http import backend_http_clients
 from chat_shell.core.config import settings
 from shared.models.execution import ExecutionRequest
 from shared.telemetry.context import get_request_id
@@ -134,16 +135,17 @@ async def _download_skill_binary(download_url: str, skill_name: str) -> Optional
         if request_id:
             headers["X-Request-ID"] = request_id
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(download_url, headers=headers)
-            response.raise_for_status()
+        response = await backend_http_clients.get(
+            "skills.binary", download_url, headers=headers
+        )
+        response.raise_for_status()
 
-            logger.debug(
-                "[skill_factory] Downloaded skill binary for '%s': %d bytes",
-                skill_name,
-                len(response.content),
-            )
-            return response.content
+        logger.debug(
+            "[skill_factory] Downloaded skill binary for '%s': %d bytes",
+            skill_name,
+            len(response.content),
+        )
+        return response.content
 
     except httpx.HTTPStatusError as e:
         logger.error(
@@ -0,0 +1,89 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the pooled HTTP clients shared by tools."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from chat_shell.core.backend_http import (
+    EXTERNAL_POOL,
+    BackendHttpClients,
+)
+
+
+@pytest.mark.asyncio
+async def test_requests_reuse_pooled_client_with_endpoint_timeout(
+    httpx_mock: HTTPXMock,
+) -> None:
+    url = "http://backend:8000/api/internal/rag/retrieve"
+    httpx_mock.add_response(url=url, json={"records": []}, is_reusable=True)
+    clients = BackendHttpClients()
+
+    with patch(
+        "chat_shell.core.backend_http.record_backend_http_request"
+    ) as record_metric:
+        first = await clients.post("rag.retrieve", url, json={"query": "a"})
+        await clients.post("rag.retrieve", url, timeout=5.0, json={"query": "b"})
+
+    assert first.json() == {"records": []}
+    client = clients.get_client()
+    assert clients.get_client() is client
+    assert clients.get_client(EXTERNAL_POOL) is not client
+
+    first_request, second_request = httpx_mock.get_requests()
+    assert first_request.extensions["timeout"]["read"] == 60.0
+    assert second_request.extensions["timeout"]["read"] == 5.0
+
+    endpoint, method, duration_ms, status_code = record_metric.call_args.args
+    assert (endpoint, method, status_code) == ("rag.retrieve", "POST", 200)
+    assert duration_ms >= 0
+
+    await clients.close()
+    assert client.is_closed
+    assert clients.get_client() is not client
+    await clients.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_request_is_recorded_without_status(
+    httpx_mock: HTTPXMock,
+) -> None:
+    url = "http://backend:8000/api/internal/skills/1/binary"
+    httpx_mock.add_exception(ConnectionError("refused"), url=url)
+    clients = BackendHttpClients()
+
+    with (
+        patch(
+            "chat_shell.core.backend_http.record_backend_http_request"
+        ) as record_metric,
+        pytest.raises(ConnectionError),
+    ):
+        await clients.get("skills.binary", url)
+
+    assert record_metric.call_args.args[3] is None
+    await clients.close()
+
+
+def test_clients_of_a_closed_loop_are_closed_when_a_new_loop_asks() -> None:
+    clients = BackendHttpClients()
+
+    async def get_client():
+        return clients.get_client()
+
+    first = asyncio.run(get_client())
+    assert not first.is_closed
+
+    async def switch_loop():
+        client = clients.get_client()
+        await clients.close()
+        return client
+
+    second = asyncio.run(switch_loop())
+    assert second is not first
+    assert first.is_closed
+    assert second.is_closed
@@ -0,0 +1,110 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for turn-scoped memoization of knowledge base retrieval."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from chat_shell.core.config import settings
+from chat_shell.tools.builtin import KnowledgeBaseTool
+
+KB_INFO = {
+    "items": [
+        {
+            "id": 1,
+            "name": "Handbook",
+            "rag_enabled": True,
+            "document_count": 3,
+            "max_calls_per_conversation": 10,
+            "exempt_calls_before_check": 5,
+        }
+    ]
+}
+
+
+def _rag_result(mode: str = "rag_retrieval") -> dict:
+    return {
+        "mode": mode,
+        "records": [
+            {
+                "knowledge_base_id": 1,
+                "content": "Release steps",
+                "score": 0.9,
+                "title": "release.md",
+            }
+        ],
+        "total": 1,
+    }
+
+
+async def _search(tool: KnowledgeBaseTool, retrieve: AsyncMock, *queries: str):
+    format_rag = AsyncMock(return_value="{}")
+    with (
+        patch.object(tool, "_get_kb_info", AsyncMock(return_value=KB_INFO)),
+        patch.object(tool, "_retrieve_with_strategy_from_all_kbs", retrieve),
+        patch.object(tool, "_format_rag_result", format_rag),
+    ):
+        for query in queries:
+            await tool._arun(query=query, max_results=5)
+    return format_rag
+
+
+@pytest.mark.asyncio
+async def test_repeated_query_reuses_retrieval_and_counts_the_call() -> None:
+    tool = KnowledgeBaseTool(knowledge_base_ids=[1], user_id=7)
+    retrieve = AsyncMock(return_value=("rag_retrieval", _rag_result()))
+
+    format_rag = await _search(
+        tool, retrieve, "Release checklist", "  release   CHECKLIST "
+    )
+
+    retrieve.assert_awaited_once()
+    assert tool._call_count == 2
+    first_summary = format_rag.await_args_list[0].args[4]
+    second_summary = format_rag.await_args_list[1].args[4]
+    assert "cached" not in (first_summary or {})
+    assert second_summary["cached"] is True
+
+
+@pytest.mark.asyncio
+async def test_memo_is_keyed_by_scope_and_options() -> None:
+    tool = KnowledgeBaseTool(knowledge_base_ids=[1], user_id=7)
+    retrieve = AsyncMock(return_value=("rag_retrieval", _rag_result()))
+
+    with (
+        patch.object(tool, "_get_kb_info", AsyncMock(return_value=KB_INFO)),
+        patch.object(tool, "_retrieve_with_strategy_from_all_kbs", retrieve),
+        patch.object(tool, "_format_rag_result", AsyncMock(return_value="{}")),
+    ):
+        await tool._arun(query="release", max_results=5)
+        await tool._arun(query="release", max_results=10)
+        await tool._arun(query="release", max_results=5, document_ids=[101])
+
+    assert retrieve.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_direct_injection_and_expired_results_are_not_reused(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    tool = KnowledgeBaseTool(knowledge_base_ids=[1], user_id=7)
+    retrieve = AsyncMock(return_value=("direct_injection", _rag_result("x")))
+    with (
+        patch.object(tool, "_get_kb_info", AsyncMock(return_value=KB_INFO)),
+        patch.object(tool, "_retrieve_with_strategy_from_all_kbs", retrieve),
+        patch.object(
+            tool, "_format_direct_injection_result", AsyncMock(return_value="{}")
+        ),
+        patch.object(tool, "_build_backend_direct_injection_result", return_value={}),
+    ):
+        await tool._arun(query="release", max_results=5)
+        await tool._arun(query="release", max_results=5)
+    assert retrieve.await_count == 2
+
+    monkeypatch.setattr(settings, "KB_RETRIEVAL_MEMO_TTL_SECONDS", 0)
+    retrieve = AsyncMock(return_value=("rag_retrieval", _rag_result()))
+    await _search(tool, retrieve, "release", "release")
+    assert retrieve.await_count == 2
@@ -56,7 +56,9 @@ async def test_http_mode_forwards_document_names_and_ids():
     }
 
     with (
-        patch("httpx.AsyncClient") as mock_client,
+        patch(
+            "chat_shell.core.backend_http.backend_http_clients.get_client"
+        ) as mock_client,
         patch.object(
             tool,
             "_get_kb_info",
@@ -76,7 +78,7 @@ async def test_http_mode_forwards_document_names_and_ids():
         ),
     ):
         post = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value.post = post
+        mock_client.return_value.post = post
 
         await tool._arun(
             query="release checklist",
@@ -101,9 +103,11 @@ async def test_http_mode_forwards_search_hints() -> None:
         "total_estimated_tokens": 0,
     }
 
-    with patch("httpx.AsyncClient") as mock_client:
+    with patch(
+        "chat_shell.core.backend_http.backend_http_clients.get_client"
+    ) as mock_client:
         post = AsyncMock(return_value=mock_response)
-        mock_client.return_value.__aenter__.return_value.post = post
+        mock_client.return_value.post = post
         await tool._retrieve_with_strategy_via_http(
             "release checklist",
             8,
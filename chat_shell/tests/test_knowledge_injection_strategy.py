@@ -392,11 +392,11 @@ class TestKnowledgeBaseTool:
         }
         mock_client = AsyncMock()
         mock_client.post = AsyncMock(return_value=mock_response)
-        mock_async_client = AsyncMock()
-        mock_async_client.__aenter__.return_value = mock_client
-        mock_async_client.__aexit__.return_value = None
 
-        with patch("httpx.AsyncClient", return_value=mock_async_client):
+        with patch(
+            "chat_shell.core.backend_http.backend_http_clients.get_client",
+            return_value=mock_client,
+        ):
             await tool._retrieve_with_strategy_via_http("test query", 5)
 
         payload = mock_client.post.await_args.kwargs["json"]
@@ -48,10 +48,12 @@ class TestKbLsTool:
                 "chat_shell.tools.builtin.knowledge_listing._get_backend_url",
                 return_value="http://backend",
             ),
-            patch("httpx.AsyncClient") as mock_client,
+            patch(
+                "chat_shell.core.backend_http.backend_http_clients.get_client"
+            ) as mock_client,
         ):
             post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value.post = post
+            mock_client.return_value.post = post
 
             result = await tool._arun(knowledge_base_id=3, offset=2, limit=1)
 
@@ -100,10 +102,12 @@ class TestKbLsTool:
                 "chat_shell.tools.builtin.knowledge_listing._get_backend_url",
                 return_value="http://backend",
             ),
-            patch("httpx.AsyncClient") as mock_client,
+            patch(
+                "chat_shell.core.backend_http.backend_http_clients.get_client"
+            ) as mock_client,
         ):
             post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value.post = post
+            mock_client.return_value.post = post
 
             await tool._arun(knowledge_base_id=3)
 
@@ -217,10 +221,12 @@ class TestKnowledgeListDocumentsTool:
                 "chat_shell.tools.builtin.knowledge_listing._get_backend_url",
                 return_value="http://backend",
             ),
-            patch("httpx.AsyncClient") as mock_client,
+            patch(
+                "chat_shell.core.backend_http.backend_http_clients.get_client"
+            ) as mock_client,
         ):
             post = AsyncMock(side_effect=[internal_response, external_response])
-            mock_client.return_value.__aenter__.return_value.post = post
+            mock_client.return_value.post = post
 
             result = json.loads(await tool._arun())
 
@@ -342,10 +348,12 @@ class TestKnowledgeListDocumentsTool:
                 "chat_shell.tools.builtin.knowledge_listing._get_backend_url",
                 return_value="http://backend",
             ),
-            patch("httpx.AsyncClient") as mock_client,
+            patch(
+                "chat_shell.core.backend_http.backend_http_clients.get_client"
+            ) as mock_client,
         ):
             post = AsyncMock(side_effect=[internal_response, external_response])
-            mock_client.return_value.__aenter__.return_value.post = post
+            mock_client.return_value.post = post
 
             result = json.loads(await tool._arun())
 
@@ -389,10 +397,12 @@ class TestKnowledgeListDocumentsTool:
                 "chat_shell.tools.builtin.knowledge_listing._get_backend_url",
                 return_value="http://backend",
             ),
-            patch("httpx.AsyncClient") as mock_client,
+            patch(
+                "chat_shell.core.backend_http.backend_http_clients.get_client"
+            ) as mock_client,
         ):
             post = AsyncMock(return_value=external_response)
-            mock_client.return_value.__aenter__.return_value.post = post
+            mock_client.return_value.post = post
 
             result = json.loads(await tool._arun())
 
@@ -438,10 +448,12 @@ class TestKnowledgeListDocumentsTool:
                 "chat_shell.tools.builtin.knowledge_listing._get_backend_url",
                 return_value="http://backend",
             ),
-            patch("httpx.AsyncClient") as mock_client,
+            patch(
+                "chat_shell.core.backend_http.backend_http_clients.get_client"
+            ) as mock_client,
         ):
             post = AsyncMock(return_value=external_response)
-            mock_client.return_value.__aenter__.return_value.post = post
+            mock_client.return_value.post = post
 
             result = json.loads(await tool._arun())
 
@@ -500,10 +512,12 @@ class TestKbHeadTool:
                 "chat_shell.tools.builtin.knowledge_listing._get_backend_url",
                 return_value="http://backend",
             ),
-            patch("httpx.AsyncClient") as mock_client,
+            patch(
+                "chat_shell.core.backend_http.backend_http_clients.get_client"
+            ) as mock_client,
         ):
             post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value.post = post
+            mock_client.return_value.post = post
 
             result = await tool._arun(document_ids=[101], offset=12, limit=20)
 
@@ -546,10 +560,12 @@ class TestKbHeadTool:
                 "chat_shell.tools.builtin.knowledge_listing._get_backend_url",
                 return_value="http://backend",
             ),
-            patch("httpx.AsyncClient") as mock_client,
+            patch(
+                "chat_shell.core.backend_http.backend_http_clients.get_client"
+            ) as mock_client,
         ):
             post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value.post = post
+            mock_client.return_value.post = post
 
             await tool._arun(document_ids=[101], offset=0, limit=50)
 
@@ -22,6 +22,8 @@ export const ClientEvents = {
   TASK_JOIN: 'task:join',
   TASK_LEAVE: 'task:leave',
   HISTORY_SYNC: 'history:sync',
+  HISTORY_PAGE: 'history:page',
+  HISTORY_EXPAND: 'history:expand',
 } as const
 
 // ============================================================
@@ -191,6 +193,8 @@ export interface TaskJoinPayload {
   task_id: number
   /** If provided, only return messages after this message_id (for incremental sync on reconnect) */
   after_message_id?: number
+  /** If provided without after_message_id, only return the latest N messages plus a history cursor */
+  window?: number
 }
 
 export interface TaskLeavePayload {
@@ -202,6 +206,18 @@ export interface HistorySyncPayload {
   after_message_id: number
 }
 
+export interface HistoryPagePayload {
+  task_id: number
+  /** History cursor from the previous task:join or history:page ack */
+  before_message_id: number
+  limit?: number
+}
+
+export interface HistoryExpandPayload {
+  task_id: number
+  subtask_id: number
+}
+
 // ============================================================
 // Server -> Client Payloads
 // ============================================================
@@ -735,6 +751,8 @@ export interface TaskJoinAck {
   subtasks?: Array<Record<string, unknown>>
   /** Latest cached status snapshot for active streaming recovery. */
   status_updated?: ChatStatusUpdatedPayload
+  /** For windowed joins, before_message_id of the next history:page (null when no older messages) */
+  history_cursor?: number | null
   error?: string
 }
 
@@ -750,6 +768,19 @@ export interface HistorySyncAck {
   error?: string
 }
 
+export interface HistoryPageAck {
+  /** Older subtasks, oldest first; trimmed ones carry result_truncated: true */
+  subtasks: Array<Record<string, unknown>>
+  history_cursor?: number | null
+  error?: string
+}
+
+export interface HistoryExpandAck {
+  /** Subtask with its full result */
+  subtask?: Record<string, unknown>
+  error?: string
+}
+
 export interface GenericAck {
   success: boolean
   error?: string
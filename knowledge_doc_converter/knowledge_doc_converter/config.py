@@ -86,6 +86,14 @@ class ConverterSettings(BaseSettings):
     WORKER_CONVERSION_S3_BUCKET_NAME: str = ""
     WORKER_CONVERSION_S3_REGION_NAME: str = "us-east-1"
 
+    # ---- Conversion Result Cache ----
+    # Converted Markdown is cached on local disk keyed by
+    # (content sha256, converter version, conversion options) so identical
+    # documents skip MinerU. Mount a shared volume to share it across workers.
+    CONVERSION_CACHE_ENABLED: bool = False
+    CONVERSION_CACHE_DIR: str = "./conversion_cache"
+    CONVERSION_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024  # 2 GB
+
     # ---- Task Timeout ----
     # Constraint chain (cross-service):
     #   soft_time_limit < time_limit < lock_timeout <= stale_threshold (backend)
@@ -17,6 +17,7 @@ Metrics:
     - Active conversions (gauge)
     - Lock acquisition results (counter)
     - Backend callback results (counter)
+    - Conversion cache lookups and saved conversion seconds (counters)
 """
 
 import logging
@@ -162,6 +163,20 @@ CALLBACK_RESULTS_TOTAL = Counter(
     ],  # request_type: started/completed/failed/download, status: success/failed
 )
 
+# Conversion result cache lookups
+CONVERSION_CACHE_RESULTS_TOTAL = Counter(
+    "converter_conversion_cache_results_total",
+    "Conversion result cache lookups",
+    ["result"],  # result: hit, miss
+)
+
+# Conversion time avoided by serving results from the cache
+CONVERSION_CACHE_SAVED_SECONDS_TOTAL = Counter(
+    "converter_conversion_cache_saved_seconds_total",
+    "Conversion seconds saved by conversion result cache hits",
+    ["file_extension"],
+)
+
 
 # ---- Metrics Server ----
 
@@ -341,3 +356,22 @@ def record_http_request_failed(request_type: str):
         request_type: Type of request (e.g., "download").
     """
     CALLBACK_RESULTS_TOTAL.labels(request_type=request_type, status="failed").inc()
+
+
+def record_conversion_cache_hit(file_extension: str, saved_seconds: float):
+    """Record a conversion result cache hit.
+
+    Args:
+        file_extension: File extension (e.g., "pdf", "pptx").
+        saved_seconds: Original conversion time of the cached result.
+    """
+    CONVERSION_CACHE_RESULTS_TOTAL.labels(result="hit").inc()
+    if saved_seconds > 0:
+        CONVERSION_CACHE_SAVED_SECONDS_TOTAL.labels(file_extension=file_extension).inc(
+            saved_seconds
+        )
+
+
+def record_conversion_cache_miss():
+    """Record a conversion result cache miss."""
+    CONVERSION_CACHE_RESULTS_TOTAL.labels(result="miss").inc()
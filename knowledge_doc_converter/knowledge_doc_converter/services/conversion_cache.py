@@ -0,0 +1,228 @@
+"""Content-addressed cache for document conversion results.
+
+The same binary is frequently converted more than once (the same PDF uploaded
+to several knowledge bases, or re-uploaded by another user). MinerU conversion
+of a large PDF takes minutes, so the converter keeps the resulting Markdown on
+local disk keyed by:
+
+    sha256(binary) + converter version + conversion options fingerprint
+
+A cache hit lets the task skip MinerU entirely and go straight to the
+``notify_completed`` callback. The cache directory is bounded by
+``CONVERSION_CACHE_MAX_BYTES``. The total size is tracked in memory (the
+directory is scanned once, on the first write); when a write pushes it over
+the cap, the least recently used entries are evicted down to
+``_EVICT_TARGET_RATIO`` of the cap so that the next scan is far away.
+
+Layout (one directory per key prefix to keep directories small)::
+
+    <CONVERSION_CACHE_DIR>/<key[:2]>/<key>.md    Markdown bytes
+    <CONVERSION_CACHE_DIR>/<key[:2]>/<key>.json  Metadata (conversion seconds)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from knowledge_doc_converter.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when the converter output format changes in a way that makes
+# previously cached Markdown unusable.
+CACHE_FORMAT_VERSION = "1"
+
+_MARKDOWN_SUFFIX = ".md"
+_META_SUFFIX = ".json"
+
+# Eviction frees space down to this share of the size cap
+_EVICT_TARGET_RATIO = 0.9
+
+
+def _engine_version() -> str:
+    """Return the installed knowledge_engine version (part of the cache key)."""
+    try:
+        from importlib.metadata import version
+
+        return version("wegent-knowledge-engine")
+    except Exception:
+        return "unknown"
+
+
+@dataclass
+class CachedConversion:
+    """A conversion result served from the cache."""
+
+    markdown_bytes: bytes
+    conversion_seconds: float
+
+
+class ConversionCache:
+    """Local-disk, size-capped cache for converted Markdown."""
+
+    def __init__(self):
+        self._evict_lock = threading.Lock()
+        # Markdown bytes on disk; None until the first write scans the directory
+        self._total_bytes: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.CONVERSION_CACHE_ENABLED)
+
+    @property
+    def cache_dir(self) -> str:
+        return settings.CONVERSION_CACHE_DIR
+
+    def build_key(self, binary_data: bytes, file_extension: str, options: dict) -> str:
+        """Build the cache key for a document.
+
+        Args:
+            binary_data: Raw document bytes.
+            file_extension: Source extension (e.g., "pdf").
+            options: Conversion options that influence the output (MinerU
+                backend, parse method, languages, S3 image upload, ...).
+
+        Returns:
+            Hex sha256 digest identifying the conversion result.
+        """
+        content_hash = hashlib.sha256(binary_data).hexdigest()
+        fingerprint = json.dumps(
+            {
+                "content": content_hash,
+                "ext": file_extension.lower(),
+                "format": CACHE_FORMAT_VERSION,
+                "engine": _engine_version(),
+                "options": options,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str) -> tuple[str, str]:
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return base + _MARKDOWN_SUFFIX, base + _META_SUFFIX
+
+    def get(self, key: str) -> Optional[CachedConversion]:
+        """Return the cached conversion for ``key``, or None on a miss.
+
+        Read errors are treated as misses so a corrupt entry never fails a
+        conversion task.
+        """
+        if not self.enabled:
+            return None
+        md_path, meta_path = self._paths(key)
+        try:
+            with open(md_path, "rb") as f:
+                markdown_bytes = f.read()
+            conversion_seconds = 0.0
+            if os.path.exists(meta_path):
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    conversion_seconds = float(
+                        json.load(f).get("conversion_seconds", 0.0)
+                    )
+            # Touch the entry so LRU eviction keeps recently used results
+            os.utime(md_path, None)
+            return CachedConversion(
+                markdown_bytes=markdown_bytes,
+                conversion_seconds=conversion_seconds,
+            )
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"[ConversionCache] Failed to read entry {key}: {e}")
+            return None
+
+    def put(self, key: str, markdown_bytes: bytes, conversion_seconds: float) -> bool:
+        """Store a conversion result. Returns True when the entry was written."""
+        if not self.enabled:
+            return False
+        if len(markdown_bytes) > settings.CONVERSION_CACHE_MAX_BYTES:
+            return False
+        md_path, meta_path = self._paths(key)
+        try:
+            replaced_bytes = os.path.getsize(md_path)
+        except OSError:
+            replaced_bytes = 0
+        try:
+            os.makedirs(os.path.dirname(md_path), exist_ok=True)
+            self._atomic_write(
+                meta_path,
+                json.dumps({"conversion_seconds": conversion_seconds}).encode(),
+            )
+            # Markdown is written last: its presence marks the entry complete
+            self._atomic_write(md_path, markdown_bytes)
+        except Exception as e:
+            logger.warning(f"[ConversionCache] Failed to write entry {key}: {e}")
+            return False
+        self._evict_if_needed(len(markdown_bytes) - replaced_bytes)
+        return True
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _scan(self) -> tuple[list[tuple[float, int, str]], int]:
+        """Return (mtime, size, path) for every Markdown entry and their total."""
+        entries = []
+        total = 0
+        for root, _dirs, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(_MARKDOWN_SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        return entries, total
+
+    def _evict_if_needed(self, added_bytes: int) -> None:
+        """Evict least recently used entries once the cache exceeds the size cap.
+
+        The directory is only walked on the first write and when the tracked
+        total goes over the cap. That walk also resyncs the total with entries
+        written by other worker processes sharing the directory.
+        """
+        max_bytes = settings.CONVERSION_CACHE_MAX_BYTES
+        with self._evict_lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan()[1]
+            else:
+                self._total_bytes += added_bytes
+            if self._total_bytes <= max_bytes:
+                return
+
+            entries, total = self._scan()
+            target_bytes = int(max_bytes * _EVICT_TARGET_RATIO)
+            entries.sort()
+            for _mtime, size, path in entries:
+                if total <= target_bytes:
+                    break
+                meta_path = path[: -len(_MARKDOWN_SUFFIX)] + _META_SUFFIX
+                for p in (path, meta_path):
+                    try:
+                        os.unlink(p)
+                    except FileNotFoundError:
+                        pass
+                total -= size
+                logger.info(f"[ConversionCache] Evicted {os.path.basename(path)}")
+            self._total_bytes = total
+
+
+conversion_cache = ConversionCache()
@@ -18,6 +18,8 @@ import time
 from knowledge_doc_converter.celery_app import celery_app
 from knowledge_doc_converter.config import settings
 from knowledge_doc_converter.core.metrics import (
+    record_conversion_cache_hit,
+    record_conversion_cache_miss,
     record_conversion_failed,
     record_conversion_skipped,
     record_conversion_started,
@@ -28,6 +30,7 @@ from knowledge_doc_converter.core.metrics import (
 )
 from knowledge_doc_converter.services.callback_client import callback_client
 from knowledge_doc_converter.services.content_fetcher import content_fetcher
+from knowledge_doc_converter.services.conversion_cache import conversion_cache
 from knowledge_doc_converter.services.error_mapper import map_conversion_failure
 from knowledge_doc_converter.services.lock_service import lock_service
 
@@ -68,6 +71,29 @@ def _build_s3_config() -> S3Config:
     )
 
 
+def _conversion_cache_options(s3_base_path: str) -> dict:
+    """Conversion options that affect the Markdown output (cache key part)."""
+    options = {
+        "mineru_backend": settings.MINERU_BACKEND,
+        "mineru_parse_method": settings.MINERU_PARSE_METHOD,
+        "mineru_lang_list": settings.MINERU_LANG_LIST,
+        "mineru_formula_enable": settings.MINERU_FORMULA_ENABLE,
+        "mineru_table_enable": settings.MINERU_TABLE_ENABLE,
+        "s3_enabled": settings.WORKER_CONVERSION_S3_ENABLED,
+    }
+    if settings.WORKER_CONVERSION_S3_ENABLED:
+        # Image links in the Markdown point at objects under this document's
+        # S3 path, so the result must never be served to another document.
+        options.update(
+            {
+                "s3_endpoint": settings.WORKER_CONVERSION_S3_ENDPOINT,
+                "s3_bucket_name": settings.WORKER_CONVERSION_S3_BUCKET_NAME,
+                "s3_base_path": s3_base_path,
+            }
+        )
+    return options
+
+
 @celery_app.task(
     bind=True,
     name="knowledge_doc_converter.convert_document",
@@ -97,7 +123,7 @@ def convert_document_task(
         1. Acquire distributed lock
         2. Callback: conversion_started
         3. Fetch binary content from backend
-        4. Convert using knowledge_engine
+        4. Look up the conversion cache; on a miss convert using knowledge_engine
         5. Callback: conversion_completed (with markdown bytes)
     On exception:
         6. Callback: conversion_failed
@@ -198,11 +224,6 @@ def convert_document_task(
                 f"size={len(binary_data)}"
             )
 
-            # Step 3: Convert using knowledge_engine
-            from knowledge_engine.conversion import convert_document
-
-            mineru_config = _build_mineru_config()
-            s3_config = _build_s3_config()
             filename_without_ext = os.path.splitext(original_filename)[0]
             # Sanitize path components to prevent S3 path traversal
             safe_kb_name = (
@@ -213,19 +234,60 @@ def convert_document_task(
             )
             s3_base_path = f"doc-converter/{safe_kb_name}/{document_id}/{safe_filename}"
 
-            result = convert_document(
-                binary_data=binary_data,
-                file_extension=file_extension,
-                mineru_config=mineru_config,
-                s3_config=s3_config,
-                s3_base_path=s3_base_path,
-            )
+            # Step 3: Serve from the conversion cache when the same content was
+            # already converted with the same options. With S3 image upload the
+            # key includes this document's S3 path, so only re-conversions of
+            # the same document hit; without it any KB or user can share.
+            cache_key = None
+            cached = None
+            if conversion_cache.enabled:
+                cache_key = conversion_cache.build_key(
+                    binary_data,
+                    file_extension,
+                    _conversion_cache_options(s3_base_path),
+                )
+                cached = conversion_cache.get(cache_key)
 
-            logger.info(
-                f"[Conversion] Done: document_id={document_id}, "
-                f"md_size={len(result.markdown_bytes)}, "
-                f"images={len(result.uploaded_images)}"
-            )
+            if cached is not None:
+                markdown_bytes = cached.markdown_bytes
+                record_conversion_cache_hit(file_extension, cached.conversion_seconds)
+                logger.info(
+                    f"[Conversion] Cache hit: document_id={document_id}, "
+                    f"md_size={len(markdown_bytes)}, "
+                    f"saved_seconds={cached.conversion_seconds:.1f}"
+                )
+            else:
+                if cache_key is not None:
+                    record_conversion_cache_miss()
+
+                # Step 3b: Convert using knowledge_engine
+                from knowledge_engine.conversion import convert_document
+
+                mineru_config = _build_mineru_config()
+                s3_config = _build_s3_config()
+
+                convert_start = time.monotonic()
+                result = convert_document(
+                    binary_data=binary_data,
+                    file_extension=file_extension,
+                    mineru_config=mineru_config,
+                    s3_config=s3_config,
+                    s3_base_path=s3_base_path,
+                )
+                markdown_bytes = result.markdown_bytes
+
+                logger.info(
+                    f"[Conversion] Done: document_id={document_id}, "
+                    f"md_size={len(markdown_bytes)}, "
+                    f"images={len(result.uploaded_images)}"
+                )
+
+                if cache_key is not None:
+                    conversion_cache.put(
+                        cache_key,
+                        markdown_bytes,
+                        conversion_seconds=time.monotonic() - convert_start,
+                    )
 
             # Step 4: Notify conversion completed (backend handles
             # state transition, attachment overwrite, and index dispatch atomically)
@@ -236,8 +298,8 @@ def convert_document_task(
                 generation=index_generation,
                 converted_name=md_filename,
                 converted_extension="md",
-                file_size=len(result.markdown_bytes),
-                markdown_bytes=result.markdown_bytes,
+                file_size=len(markdown_bytes),
+                markdown_bytes=markdown_bytes,
                 index_dispatch_payload=index_dispatch_payload,
             )
 
@@ -261,7 +323,7 @@ def convert_document_task(
                 file_extension=file_extension,
                 duration_seconds=duration,
                 input_size=len(binary_data),
-                output_size=len(result.markdown_bytes),
+                output_size=len(markdown_bytes),
             )
             logger.info(
                 f"[Conversion] Completed: document_id={document_id}, "
@@ -0,0 +1,110 @@
+"""Tests for the content-addressed conversion result cache."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from knowledge_doc_converter.config import ConverterSettings
+from knowledge_doc_converter.services.conversion_cache import ConversionCache
+
+
+@pytest.fixture
+def cache_settings(tmp_path):
+    """Settings with the conversion cache enabled in a temp directory."""
+    test_settings = ConverterSettings(
+        CONVERSION_CACHE_ENABLED=True,
+        CONVERSION_CACHE_DIR=str(tmp_path / "cache"),
+        CONVERSION_CACHE_MAX_BYTES=1024,
+    )
+    with patch(
+        "knowledge_doc_converter.services.conversion_cache.settings", test_settings
+    ):
+        yield test_settings
+
+
+class TestBuildKey:
+    """Tests for cache key construction."""
+
+    def test_same_content_and_options_same_key(self):
+        cache = ConversionCache()
+        key1 = cache.build_key(b"pdf", "pdf", {"parse_method": "ocr"})
+        key2 = cache.build_key(b"pdf", "PDF", {"parse_method": "ocr"})
+        assert key1 == key2
+
+    def test_different_content_or_options_different_key(self):
+        cache = ConversionCache()
+        base = cache.build_key(b"pdf", "pdf", {"parse_method": "ocr"})
+        assert cache.build_key(b"other", "pdf", {"parse_method": "ocr"}) != base
+        assert cache.build_key(b"pdf", "pdf", {"parse_method": "txt"}) != base
+        assert cache.build_key(b"pdf", "pptx", {"parse_method": "ocr"}) != base
+
+
+class TestConversionCache:
+    """Tests for get/put and eviction."""
+
+    def test_disabled_cache_is_noop(self, tmp_path):
+        test_settings = ConverterSettings(
+            CONVERSION_CACHE_ENABLED=False,
+            CONVERSION_CACHE_DIR=str(tmp_path / "cache"),
+        )
+        with patch(
+            "knowledge_doc_converter.services.conversion_cache.settings",
+            test_settings,
+        ):
+            cache = ConversionCache()
+            assert cache.put("ab" * 32, b"# md", 10.0) is False
+            assert cache.get("ab" * 32) is None
+            assert not os.path.exists(tmp_path / "cache")
+
+    def test_put_then_get_roundtrip(self, cache_settings):
+        cache = ConversionCache()
+        key = cache.build_key(b"pdf", "pdf", {})
+        assert cache.get(key) is None
+
+        assert cache.put(key, b"# Markdown", conversion_seconds=42.5) is True
+        cached = cache.get(key)
+
+        assert cached is not None
+        assert cached.markdown_bytes == b"# Markdown"
+        assert cached.conversion_seconds == 42.5
+
+    def test_oversized_entry_not_stored(self, cache_settings):
+        cache = ConversionCache()
+        key = cache.build_key(b"pdf", "pdf", {})
+        assert cache.put(key, b"x" * 2048, conversion_seconds=1.0) is False
+        assert cache.get(key) is None
+
+    def test_evicts_least_recently_used(self, cache_settings):
+        cache = ConversionCache()
+        old_key = cache.build_key(b"old", "pdf", {})
+        new_key = cache.build_key(b"new", "pdf", {})
+
+        cache.put(old_key, b"o" * 600, conversion_seconds=1.0)
+        md_path, _ = cache._paths(old_key)
+        os.utime(md_path, (1, 1))
+        cache.put(new_key, b"n" * 600, conversion_seconds=1.0)
+
+        assert cache.get(old_key) is None
+        assert cache.get(new_key) is not None
+
+    def test_puts_under_the_cap_do_not_walk_the_directory(self, cache_settings):
+        cache = ConversionCache()
+        cache.put(cache.build_key(b"first", "pdf", {}), b"f" * 100, 1.0)
+
+        with patch("knowledge_doc_converter.services.conversion_cache.os.walk") as walk:
+            for i in range(5):
+                cache.put(cache.build_key(bytes([i]), "pdf", {}), b"x" * 100, 1.0)
+            walk.assert_not_called()
+
+        assert cache._total_bytes == 600
+
+    def test_rewriting_an_entry_does_not_count_it_twice(self, cache_settings):
+        cache = ConversionCache()
+        key = cache.build_key(b"pdf", "pdf", {})
+
+        for _ in range(3):
+            cache.put(key, b"m" * 400, conversion_seconds=1.0)
+
+        assert cache._total_bytes == 400
+        assert cache.get(key) is not None
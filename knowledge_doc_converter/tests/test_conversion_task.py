@@ -412,3 +412,75 @@ class TestConvertDocumentTask:
 
         assert result["status"] == "skipped"
         assert result["reason"] == "document_deleted"
+
+    @patch("knowledge_doc_converter.tasks.conversion_task.conversion_cache")
+    @patch("knowledge_doc_converter.tasks.conversion_task.lock_service")
+    @patch("knowledge_doc_converter.tasks.conversion_task.callback_client")
+    @patch("knowledge_doc_converter.tasks.conversion_task.content_fetcher")
+    def test_cache_hit_skips_conversion(
+        self, mock_fetcher, mock_callback, mock_lock, mock_cache, mock_settings
+    ):
+        """A conversion cache hit goes straight to notify_completed."""
+        from knowledge_doc_converter.services.conversion_cache import (
+            CachedConversion,
+        )
+
+        mock_self = _make_mock_task()
+
+        mock_ctx = MagicMock()
+        mock_ctx.__enter__ = MagicMock(return_value=True)
+        mock_ctx.__exit__ = MagicMock(return_value=False)
+        mock_lock.acquire_watchdog_context.return_value = mock_ctx
+
+        mock_callback.notify_started.return_value = {
+            "ok": True,
+            "document_exists": True,
+        }
+        mock_fetcher.download.return_value = b"PDF content"
+        mock_cache.enabled = True
+        mock_cache.build_key.return_value = "cache-key"
+        mock_cache.get.return_value = CachedConversion(
+            markdown_bytes=b"# Cached", conversion_seconds=120.0
+        )
+        mock_callback.notify_completed.return_value = {
+            "ok": True,
+            "index_task_id": "index-task-123",
+            "skipped": False,
+        }
+
+        with patch(
+            "knowledge_doc_converter.tasks.conversion_task.settings", mock_settings
+        ):
+            with patch("knowledge_engine.conversion.convert_document") as mock_convert:
+                from knowledge_doc_converter.tasks.conversion_task import (
+                    convert_document_task,
+                )
+
+                result = convert_document_task._get_current_object().run.__func__(
+                    mock_self, **TASK_KWARGS
+                )
+
+        assert result["status"] == "converted"
+        mock_convert.assert_not_called()
+        mock_cache.put.assert_not_called()
+        call_kwargs = mock_callback.notify_completed.call_args[1]
+        assert call_kwargs["markdown_bytes"] == b"# Cached"
+        assert call_kwargs["file_size"] == len(b"# Cached")
+
+
+def test_cache_options_scope_s3_image_links_to_the_document(mock_settings):
+    """With S3 upload, cached Markdown is only reused for the same S3 path."""
+    from knowledge_doc_converter.tasks.conversion_task import (
+        _conversion_cache_options,
+    )
+
+    with patch("knowledge_doc_converter.tasks.conversion_task.settings", mock_settings):
+        mock_settings.WORKER_CONVERSION_S3_ENABLED = False
+        assert _conversion_cache_options("kb-a/1/doc") == _conversion_cache_options(
+            "kb-b/2/doc"
+        )
+
+        mock_settings.WORKER_CONVERSION_S3_ENABLED = True
+        options = _conversion_cache_options("kb-a/1/doc")
+        assert options["s3_base_path"] == "kb-a/1/doc"
+        assert options != _conversion_cache_options("kb-b/2/doc")
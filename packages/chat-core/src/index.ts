@@ -64,5 +64,6 @@ export type {
   SocketClientSocket,
   SocketClientState,
   SocketClientStateListener,
+  SocketEventBatch,
   SocketReconnectCallback,
 } from './socket'
@@ -172,6 +172,36 @@ describe('createAuthenticatedSocketClient', () => {
     expect(handler).toHaveBeenCalledWith({ message: 'ready' })
   })
 
+  test('dispatches each event of a batched frame to its facade handlers in order', async () => {
+    const rawSocket = createMockSocket()
+    mockIo.mockReturnValue(rawSocket.socket)
+    const client = createAuthenticatedSocketClient({
+      socketBaseUrl: () => 'http://socket',
+      path: '/socket.io',
+      namespace: '/chat',
+      getToken: () => 'token',
+    })
+    const received: Array<[string, unknown]> = []
+    const onStatus = vi.fn((payload: unknown) => received.push(['task:status', payload]))
+    const onUnread = vi.fn((payload: unknown) => received.push(['unread:count', payload]))
+
+    client.socket.on('task:status', onStatus)
+    client.socket.on('unread:count', onUnread)
+    await client.connect()
+    rawSocket.trigger('events:batch', {
+      events: [
+        { event: 'task:status', data: { task_id: 1, status: 'RUNNING' } },
+        { event: 'chat:block_updated', data: { block_id: 'b1' } },
+        { event: 'unread:count', data: { count: 3 } },
+      ],
+    })
+
+    expect(received).toEqual([
+      ['task:status', { task_id: 1, status: 'RUNNING' }],
+      ['unread:count', { count: 3 }],
+    ])
+  })
+
   test('does not create a socket when disconnected during pending connect resolution', async () => {
     let resolveBaseUrl!: (value: string) => void
     const socketBaseUrl = vi.fn(
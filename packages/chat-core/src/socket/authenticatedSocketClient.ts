@@ -32,6 +32,11 @@ export interface SocketClientState {
   reconnectAttempts: number
 }
 
+/** Frame carrying several server events coalesced for one room */
+export interface SocketEventBatch {
+  events: Array<{ event: string; data: unknown }>
+}
+
 export type SocketClientStateListener = (state: SocketClientState) => void
 export type SocketReconnectCallback = () => void
 
@@ -44,6 +49,8 @@ export interface AuthenticatedSocketClientOptions {
   transports?: string[]
   reconnectDelayMs?: (attempt: number) => number
   authErrorEvent?: string
+  /** Event name of coalesced frames; each inner event reaches its own listeners */
+  batchEvent?: string
   onAuthError?: (error: unknown) => void
   isAuthError?: (error: Error) => boolean
   auth?: Record<string, unknown>
@@ -67,6 +74,7 @@ const DEFAULT_SOCKET_PATH = '/socket.io'
 const DEFAULT_TIMEOUT_MS = 20_000
 const DEFAULT_TRANSPORTS = ['websocket']
 const RECONNECT_THROTTLE_MS = 500
+const DEFAULT_BATCH_EVENT = 'events:batch'
 
 function defaultReconnectDelayMs(attempt: number): number {
   return Math.min(1000 * 2 ** Math.min(attempt - 1, 3), 5000)
@@ -92,12 +100,24 @@ class AuthenticatedSocketClientImpl implements AuthenticatedSocketClient {
   private readonly options: Required<
     Pick<
       AuthenticatedSocketClientOptions,
-      'namespace' | 'path' | 'timeout' | 'transports' | 'reconnectDelayMs' | 'isAuthError'
+      | 'namespace'
+      | 'path'
+      | 'timeout'
+      | 'transports'
+      | 'reconnectDelayMs'
+      | 'isAuthError'
+      | 'batchEvent'
     >
   > &
     Omit<
       AuthenticatedSocketClientOptions,
-      'namespace' | 'path' | 'timeout' | 'transports' | 'reconnectDelayMs' | 'isAuthError'
+      | 'namespace'
+      | 'path'
+      | 'timeout'
+      | 'transports'
+      | 'reconnectDelayMs'
+      | 'isAuthError'
+      | 'batchEvent'
     >
 
   private readonly socketListeners = new Map<string, Set<SocketHandler>>()
@@ -131,6 +151,7 @@ class AuthenticatedSocketClientImpl implements AuthenticatedSocketClient {
       transports: DEFAULT_TRANSPORTS,
       reconnectDelayMs: defaultReconnectDelayMs,
       isAuthError: defaultIsAuthError,
+      batchEvent: DEFAULT_BATCH_EVENT,
       ...options,
     }
 
@@ -342,6 +363,14 @@ class AuthenticatedSocketClientImpl implements AuthenticatedSocketClient {
       }
     })
 
+    socket.on(this.options.batchEvent, (frame: SocketEventBatch) => {
+      if (this.rawSocket !== socket) {
+        return
+      }
+
+      this.dispatchBatch(frame)
+    })
+
     if (this.options.authErrorEvent) {
       socket.on(this.options.authErrorEvent, error => {
         if (this.rawSocket !== socket) {
@@ -358,6 +387,27 @@ class AuthenticatedSocketClientImpl implements AuthenticatedSocketClient {
     }
   }
 
+  private dispatchBatch(frame: SocketEventBatch): void {
+    if (!Array.isArray(frame?.events)) {
+      return
+    }
+
+    frame.events.forEach(({ event, data }) => {
+      const handlers = this.socketListeners.get(event)
+      if (!handlers) {
+        return
+      }
+
+      Array.from(handlers).forEach(handler => {
+        try {
+          ;(handler as unknown as (payload: unknown) => void)(data)
+        } catch (error) {
+          this.options.logger?.error?.(`[Socket.IO] Error handling batched ${event}:`, error)
+        }
+      })
+    })
+  }
+
   private addFacadeListener<TArgs extends unknown[]>(
     event: string,
     handler: (...args: TArgs) => void
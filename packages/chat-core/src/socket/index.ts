@@ -8,5 +8,6 @@ export type {
   SocketClientSocket,
   SocketClientState,
   SocketClientStateListener,
+  SocketEventBatch,
   SocketReconnectCallback,
 } from './authenticatedSocketClient'
@@ -8,7 +8,7 @@ from datetime import datetime
 
 from sqlalchemy import JSON, Boolean, Column, DateTime
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy import Integer, String, Text
+from sqlalchemy import Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -40,6 +40,11 @@ class Subtask(Base):
     )
     progress = Column(Integer, nullable=False, default=0)
     result = Column(JSON)
+    # Masked projection of result, stored once the subtask is finalized. NULL
+    # when masking leaves the result unchanged; see result_mask_version.
+    masked_result = Column(JSON)
+    # MASKING_RULES_VERSION the projection was computed with, 0 for none
+    result_mask_version = Column(Integer, nullable=False, default=0)
     error_message = Column(Text)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
@@ -69,6 +74,10 @@ class Subtask(Base):
     )
 
     __table_args__ = (
+        # Finds finalized subtasks whose masked projection is missing or stale
+        Index("ix_subtasks_status_mask_version", "status", "result_mask_version"),
+        # Serves the newest-first message windows of task:join and history:page
+        Index("ix_subtasks_task_message", "task_id", "message_id"),
         {
             "sqlite_autoincrement": True,
             "mysql_engine": "InnoDB",
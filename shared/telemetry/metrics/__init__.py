@@ -12,6 +12,7 @@ Provides pre-defined business metrics and decorators for automatic metric collec
 from shared.telemetry.metrics.business import (
     WegentMetrics,
     get_wegent_metrics,
+    record_backend_http_request,
     record_message_sent,
     record_model_call,
     record_session_active_change,
@@ -37,6 +38,7 @@ __all__ = [
     "record_task_failed",
     "record_user_activity",
     "record_model_call",
+    "record_backend_http_request",
     # Decorators
     "track_metric",
     "track_duration",
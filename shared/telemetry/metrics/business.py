@@ -174,6 +174,16 @@ class WegentMetrics:
             unit="tokens",
         )
 
+    # Outbound HTTP metrics
+    @property
+    def backend_http_duration(self) -> Histogram:
+        """Histogram for outbound HTTP request duration by endpoint."""
+        return self._get_or_create_histogram(
+            "wegent.backend_http.duration",
+            "Outbound HTTP request duration in milliseconds",
+            unit="ms",
+        )
+
 
 def get_wegent_metrics() -> WegentMetrics:
     """
@@ -403,3 +413,32 @@ def record_model_call(
 
     except Exception as e:
         logger.debug(f"Failed to record model call metric: {e}")
+
+
+def record_backend_http_request(
+    endpoint: str,
+    method: str,
+    duration_ms: float,
+    status_code: Optional[int] = None,
+) -> None:
+    """
+    Record the duration of an outbound HTTP request.
+
+    Args:
+        endpoint: Logical endpoint name (e.g., "rag.retrieve"), never a raw URL
+        method: HTTP method
+        duration_ms: Request duration in milliseconds
+        status_code: Response status code, None if no response was received
+    """
+    if not is_telemetry_enabled():
+        return
+
+    try:
+        # Status codes are grouped by class to keep cardinality bounded
+        status_class = f"{status_code // 100}xx" if status_code else "error"
+        get_wegent_metrics().backend_http_duration.record(
+            duration_ms,
+            {"endpoint": endpoint, "method": method, "status_class": status_class},
+        )
+    except Exception as e:
+        logger.debug(f"Failed to record backend HTTP metric: {e}")
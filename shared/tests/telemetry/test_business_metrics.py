@@ -5,6 +5,7 @@
 from unittest.mock import MagicMock, patch
 
 from shared.telemetry.metrics.business import (
+    record_backend_http_request,
     record_message_sent,
     record_session_opened,
     record_task_completed,
@@ -48,3 +49,22 @@ def test_identifiers_are_not_metric_attributes(mock_get_metrics, _mock_enabled):
         25, {"agent_type": "ClaudeCode"}
     )
     metrics.task_failed.add.assert_called_once_with(1, {"agent_type": "ClaudeCode"})
+
+
+@patch("shared.telemetry.metrics.business.is_telemetry_enabled", return_value=True)
+@patch("shared.telemetry.metrics.business.get_wegent_metrics")
+def test_backend_http_status_is_grouped_by_class(mock_get_metrics, _mock_enabled):
+    metrics = MagicMock()
+    mock_get_metrics.return_value = metrics
+
+    record_backend_http_request("rag.retrieve", "POST", 12.5, 404)
+    record_backend_http_request("rag.retrieve", "POST", 30.0, None)
+
+    assert metrics.backend_http_duration.record.call_args_list[0].args == (
+        12.5,
+        {"endpoint": "rag.retrieve", "method": "POST", "status_class": "4xx"},
+    )
+    assert metrics.backend_http_duration.record.call_args_list[1].args == (
+        30.0,
+        {"endpoint": "rag.retrieve", "method": "POST", "status_class": "error"},
+    )
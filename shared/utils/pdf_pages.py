@@ -0,0 +1,62 @@
+# SPDX-FileCopyrightText: 2026 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Per-page PDF text extraction and OCR over page ranges.
+
+The functions work on ``[start, end)`` page ranges of an in-memory PDF and are
+module-level so they can run in a process pool; heavy dependencies are
+imported lazily inside them.
+"""
+
+import io
+import logging
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def select_ocr_language() -> str:
+    """Pick the tesseract language, preferring Chinese + English."""
+    import pytesseract
+
+    available_langs = pytesseract.get_languages()
+    if "chi_sim" in available_langs:
+        return "chi_sim+eng"
+    if "eng" in available_langs:
+        return "eng"
+    return available_langs[0] if available_langs else "eng"
+
+
+def extract_text_range(binary_data: bytes, start: int, end: int) -> List[str]:
+    """Extract the text of pages ``[start, end)``; empty pages yield ""."""
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(io.BytesIO(binary_data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def ocr_range(
+    binary_data: bytes, start: int, end: Optional[int], lang: str
+) -> List[str]:
+    """OCR pages ``[start, end)`` (to the last page when ``end`` is None).
+
+    Pages that fail or have no text yield "".
+    """
+    import pytesseract
+    from pdf2image import convert_from_bytes
+
+    # 150 DPI is usually sufficient for OCR and much faster than the default
+    images = convert_from_bytes(
+        binary_data, dpi=150, first_page=start + 1, last_page=end
+    )
+    pages_text = []
+    for offset, image in enumerate(images):
+        try:
+            # PSM 3: fully automatic page segmentation for document pages
+            page_text = pytesseract.image_to_string(image, lang=lang, config="--psm 3")
+            pages_text.append(page_text.strip() if page_text else "")
+        except Exception as e:
+            logger.warning(f"OCR failed for page {start + offset + 1}: {e}")
+            pages_text.append("")
+    return pages_text
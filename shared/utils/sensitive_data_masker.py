@@ -14,7 +14,44 @@ This module provides functionality to detect and mask sensitive data such as:
 """
 
 import re
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+# Version of the masking rules below. Bump it whenever a change to them alters
+# masking output, so that stored masked projections are computed again.
+MASKING_RULES_VERSION = 1
+
+# Pattern: export VAR_NAME="value" or export VAR_NAME=value
+_EXPORT_STATEMENT_PATTERN = re.compile(
+    r'(export\s+)([A-Z_][A-Z0-9_]*)(=)(["\']?)([^"\'\s]+)(["\']?)',
+    re.IGNORECASE,
+)
+
+# Non-ASCII characters that re.IGNORECASE matches against ASCII letters
+_IGNORECASE_FOLDS = str.maketrans(
+    {"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"}
+)
+
+
+class _AnchorPrefilter:
+    """
+    Find which literal anchors occur in a text.
+
+    The text is lowercased once and every anchor is looked up with a substring
+    search, which is far cheaper than running a case-insensitive regex over
+    the whole text. Lowercasing also maps the few non-ASCII characters that
+    re.IGNORECASE treats as ASCII letters, so an anchor reported missing can
+    never be matched by a pattern.
+    """
+
+    def __init__(self, anchors: Iterable[str]):
+        self._anchors = [anchor.lower() for anchor in dict.fromkeys(anchors)]
+
+    def scan(self, text: str) -> Set[str]:
+        """Return the anchors that occur in the text."""
+        if not text.isascii():
+            text = text.translate(_IGNORECASE_FOLDS)
+        folded = text.lower()
+        return {anchor for anchor in self._anchors if anchor in folded}
 
 
 class SensitiveDataMasker:
@@ -62,6 +99,33 @@ class SensitiveDataMasker:
         ),
     ]
 
+    # Literal each pattern above needs in order to match, in the same order.
+    # Only the patterns whose anchor occurs in a string are run on it.
+    PATTERN_ANCHORS = [
+        "github_pat_",
+        "ghp_",
+        "gho_",
+        "glpat-",
+        "sk-",
+        "sk-",
+        "akia",
+        "secret",
+        "secret",
+        "token",
+        "secret",
+        "api",
+        "token",
+        "eyj",
+        "password",
+        "passwd",
+        "pwd",
+        "mysql://",
+        "postgresql://",
+        "mongodb://",
+        "-----begin ",
+    ]
+    EXPORT_ANCHOR = "export"
+
     # Environment variable patterns that contain sensitive data
     # Using more specific patterns to avoid false positives
     SENSITIVE_ENV_VARS = [
@@ -119,6 +183,25 @@ class SensitiveDataMasker:
             (re.compile(pattern, re.IGNORECASE | re.MULTILINE), label)
             for pattern, label in self.SENSITIVE_PATTERNS
         ]
+        self._prefilter = self._build_prefilter()
+
+    def _build_prefilter(self) -> Optional[_AnchorPrefilter]:
+        """
+        Build the anchor prefilter, or None when every pattern must always run.
+
+        Masking keeps only characters that were already adjacent in the input,
+        separated by mask characters, so it never creates an anchor that was
+        not in the original string. That stops being true when the mask
+        characters can be part of an anchor themselves.
+        """
+        if len(self.PATTERN_ANCHORS) != len(self.SENSITIVE_PATTERNS):
+            return None
+        anchors = self.PATTERN_ANCHORS + [self.EXPORT_ANCHOR]
+        if not self.mask_char or re.search(
+            f"[{re.escape(self.mask_char)}]", "".join(anchors), re.IGNORECASE
+        ):
+            return None
+        return _AnchorPrefilter(anchors)
 
     def _mask_value(self, value: str, min_length: int = 8) -> str:
         """
@@ -156,39 +239,55 @@ class SensitiveDataMasker:
         if not text or not isinstance(text, str):
             return text
 
-        masked_text = text
-
-        # Apply all patterns
-        for pattern, label in self.compiled_patterns:
-
-            def replace_match(match):
-                # Handle different group patterns
-                if len(match.groups()) == 1:
-                    # Single group: entire match is sensitive
-                    return self._mask_value(match.group(1))
-                elif len(match.groups()) == 2:
-                    # Two groups: first is context, second is sensitive value
-                    prefix = match.group(1) if match.group(1) else ""
-                    sensitive_value = match.group(2)
-                    masked_value = self._mask_value(sensitive_value)
-                    return f"{prefix}{masked_value}"
-                elif len(match.groups()) >= 3:
-                    # Multiple groups: first is context, second is sensitive value, third is suffix
-                    prefix = match.group(1) if match.group(1) else ""
-                    sensitive_value = match.group(2)
-                    masked_value = self._mask_value(sensitive_value)
-                    suffix = match.group(3) if match.group(3) else ""
-                    return f"{prefix}{masked_value}{suffix}"
+        if self._prefilter is None:
+            candidates = self.compiled_patterns
+            has_exports = True
+        else:
+            anchors = self._prefilter.scan(text)
+            if not anchors:
+                return text
+            candidates = [
+                compiled
+                for compiled, anchor in zip(
+                    self.compiled_patterns, self.PATTERN_ANCHORS
+                )
+                if anchor in anchors
+            ]
+            has_exports = self.EXPORT_ANCHOR in anchors
 
-                return match.group(0)
+        masked_text = text
 
-            masked_text = pattern.sub(replace_match, masked_text)
+        # Apply the candidate patterns in order, each on the previous output
+        for pattern, label in candidates:
+            masked_text = pattern.sub(self._replace_match, masked_text)
 
         # Special handling for export statements with sensitive vars
-        masked_text = self._mask_export_statements(masked_text)
+        if has_exports:
+            masked_text = self._mask_export_statements(masked_text)
 
         return masked_text
 
+    def _replace_match(self, match: re.Match) -> str:
+        # Handle different group patterns
+        if len(match.groups()) == 1:
+            # Single group: entire match is sensitive
+            return self._mask_value(match.group(1))
+        elif len(match.groups()) == 2:
+            # Two groups: first is context, second is sensitive value
+            prefix = match.group(1) if match.group(1) else ""
+            sensitive_value = match.group(2)
+            masked_value = self._mask_value(sensitive_value)
+            return f"{prefix}{masked_value}"
+        elif len(match.groups()) >= 3:
+            # Multiple groups: first is context, second is sensitive value, third is suffix
+            prefix = match.group(1) if match.group(1) else ""
+            sensitive_value = match.group(2)
+            masked_value = self._mask_value(sensitive_value)
+            suffix = match.group(3) if match.group(3) else ""
+            return f"{prefix}{masked_value}{suffix}"
+
+        return match.group(0)
+
     def _mask_export_statements(self, text: str) -> str:
         """
         Mask values in export statements that contain sensitive environment variables.
@@ -199,11 +298,6 @@ class SensitiveDataMasker:
         Returns:
             Text with export values masked
         """
-        # Pattern: export VAR_NAME="value" or export VAR_NAME=value
-        export_pattern = re.compile(
-            r'(export\s+)([A-Z_][A-Z0-9_]*)(=)(["\']?)([^"\'\s]+)(["\']?)',
-            re.IGNORECASE,
-        )
 
         def replace_export(match):
             keyword = match.group(1)  # "export "
@@ -236,7 +330,7 @@ class SensitiveDataMasker:
 
             return match.group(0)
 
-        return export_pattern.sub(replace_export, text)
+        return _EXPORT_STATEMENT_PATTERN.sub(replace_export, text)
 
     def mask_dict(self, data: Dict[str, Any], recursive: bool = True) -> Dict[str, Any]:
         """